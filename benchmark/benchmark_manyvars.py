@@ -46,6 +46,17 @@ class BM(unittest.TestCase):
         prob.setup(check=False)
         prob.final_setup()
 
+    # setup time should grow linearly with the number of variables
+    def benchmark_10Kvars(self):
+        prob = _build_comp(5000, 5000)
+        prob.setup(check=False)
+        prob.final_setup()
+
+    def benchmark_100Kvars(self):
+        prob = _build_comp(50000, 50000)
+        prob.setup(check=False)
+        prob.final_setup()
+
 
 if __name__ == '__main__':
     prob = _build_comp(1, 2000)
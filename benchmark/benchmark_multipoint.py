@@ -4,7 +4,8 @@ from six.moves import range
 import numpy as np
 
 import time
-from openmdao.api import Problem, Group, ExplicitComponent, IndepVarComp, ExecComp
+from openmdao.api import Problem, Group, ParallelGroup, ExplicitComponent, IndepVarComp, \
+     ExecComp, DefaultVector, SharedMemoryVector
 
 
 class Plus(ExplicitComponent):
@@ -62,33 +63,44 @@ class Summer(ExplicitComponent):
 
 class MultiPoint(Group):
 
-    def __init__(self, adders, scalars):
+    def __init__(self, adders, scalars, executor=False):
         super(MultiPoint, self).__init__()
         self.adders = adders
         self.scalars = scalars
+        self.executor = executor
 
     def setup(self):
 
         size = len(self.adders)
 
+        # executor=False puts the points directly in this group; otherwise they go into a
+        # ParallelGroup that uses the given executor.
+        if self.executor is False:
+            points = self
+            prefix = ''
+        else:
+            points = self.add_subsystem('points', ParallelGroup())
+            points.options['executor'] = self.executor
+            prefix = 'points.'
+
         for i,(a,s) in enumerate(zip(self.adders, self.scalars)):
             c_name = 'p%d'%i
-            self.add_subsystem(c_name, Point(a,s))
-            self.connect(c_name+'.f2','aggregate.y%d'%i)
+            points.add_subsystem(c_name, Point(a,s))
+            self.connect(prefix+c_name+'.f2','aggregate.y%d'%i)
 
         self.add_subsystem('aggregate', Summer(size))
 
 class BM(unittest.TestCase):
     """A few 'brute force' multipoint cases (1K, 2K, 5K)"""
 
-    def _setup_bm(self, npts):
+    def _setup_bm(self, npts, executor=False, vector_class=DefaultVector):
 
         size = npts
         adders =  np.random.random(size)
         scalars = np.random.random(size)
 
-        prob = Problem(MultiPoint(adders, scalars))
-        prob.setup(check=False)
+        prob = Problem(MultiPoint(adders, scalars, executor))
+        prob.setup(vector_class=vector_class, check=False)
 
         return prob
 
@@ -111,3 +123,18 @@ class BM(unittest.TestCase):
         for i in range(3):
             p = self._setup_bm(1000)
             p.run_model()
+
+    def benchmark_run_1K_parallel_serial(self):
+        for i in range(3):
+            p = self._setup_bm(1000, executor=None)
+            p.run_model()
+
+    def benchmark_run_1K_parallel_thread(self):
+        for i in range(3):
+            p = self._setup_bm(1000, executor='thread')
+            p.run_model()
+
+    def benchmark_run_1K_parallel_process(self):
+        for i in range(3):
+            p = self._setup_bm(1000, executor='process', vector_class=SharedMemoryVector)
+            p.run_model()
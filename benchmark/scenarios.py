@@ -0,0 +1,140 @@
+"""
+Benchmark scenarios for the benchmark harness in openmdao.devtools.benchmark.
+
+Run all of them, store the results in benchmarks.db under the current git commit and report
+regressions against the previously run commit with:
+
+    python benchmark/scenarios.py
+
+Use -h for the options, e.g., to select scenarios by glob pattern or to pick the baseline.
+"""
+from __future__ import division
+
+import sys
+
+import numpy as np
+
+from openmdao.api import Problem, Group, IndepVarComp, ExecComp, NewtonSolver, DirectSolver, \
+    ScipyKrylov, LinearBlockGS, NonlinearBlockGS, CSCJacobian, DenseJacobian
+from openmdao.devtools.benchmark import Scenario, benchmark_main
+from openmdao.test_suite.build4test import DynComp
+from openmdao.test_suite.groups.cycle_group import CycleGroup
+
+from benchmark_multipoint import MultiPoint
+
+
+def _add_dyncomps(parent, ncomps, ninputs, noutputs, nconns):
+    # like create_dyncomps, but without the sleeps in compute and compute_partials
+    for i in range(ncomps):
+        parent.add_subsystem("C%d" % i, DynComp(ninputs, noutputs, nl_sleep=0., ln_sleep=0.))
+        if i > 0:
+            for j in range(nconns):
+                parent.connect("C%d.o%d" % (i - 1, j), "C%d.i%d" % (i, j))
+
+
+def _add_subtree(parent, levels, nsubgroups=2, ncomps=10):
+    if levels == 1:
+        _add_dyncomps(parent, ncomps, 10, 10, 5)
+    else:
+        for i in range(nsubgroups):
+            _add_subtree(parent.add_subsystem("G%d" % i, Group()), levels - 1, nsubgroups, ncomps)
+
+
+def build_manycomps(ncomps):
+    prob = Problem()
+    _add_dyncomps(prob.model, ncomps, 10, 10, 5)
+    return prob
+
+
+def build_manyvars(nvars):
+    prob = Problem()
+    prob.model.add_subsystem("C1", DynComp(nvars, nvars, nl_sleep=0., ln_sleep=0.))
+    return prob
+
+
+def build_tree(levels):
+    prob = Problem()
+    _add_subtree(prob.model, levels)
+    return prob
+
+
+def build_multipoint(npts):
+    np.random.seed(11)
+    return Problem(MultiPoint(np.random.random(npts), np.random.random(npts)))
+
+
+def _build_cycle(num_comp, solver_class, linear_solver_class, jacobian=None, **options):
+    args = dict(num_comp=num_comp, num_var=5, var_shape=(3,), component_class='explicit',
+                connection_type='explicit', partial_type='array', finite_difference=False)
+    args.update(options)
+    prob = Problem(CycleGroup(**args))
+    model = prob.model
+    if jacobian is not None:
+        model.jacobian = jacobian
+    model.nonlinear_solver = solver_class(maxiter=100)
+    model.linear_solver = linear_solver_class(maxiter=200, atol=1e-10, rtol=1e-10)
+    prob.set_solver_print(level=0)
+    return prob
+
+
+def build_cycle_rev(num_comp):
+    return _build_cycle(num_comp, NonlinearBlockGS, LinearBlockGS)
+
+
+def build_cycle_newton_direct(num_comp):
+    prob = _build_cycle(num_comp, NewtonSolver, ScipyKrylov, jacobian=DenseJacobian(),
+                        jacobian_type='dense')
+    prob.model.linear_solver = DirectSolver()
+    return prob
+
+
+def build_cycle_sparse(num_comp):
+    prob = _build_cycle(num_comp, NewtonSolver, ScipyKrylov, jacobian=CSCJacobian(),
+                        jacobian_type='sparse-csc', partial_type='sparse')
+    prob.model.linear_solver = DirectSolver()
+    return prob
+
+
+def build_cycle_fd(num_comp):
+    return _build_cycle(num_comp, NewtonSolver, ScipyKrylov, jacobian_type='dense',
+                        finite_difference=True)
+
+
+def build_exec_chain(ncomps):
+    # ExecComps compute their partials by complex step
+    prob = Problem()
+    model = prob.model
+    model.add_subsystem('px', IndepVarComp('x', np.ones(10)))
+    last = 'px.x'
+    for i in range(ncomps):
+        model.add_subsystem('c%d' % i, ExecComp('y = 0.5*x + sin(x)', x=np.ones(10),
+                                               y=np.ones(10)))
+        model.connect(last, 'c%d.x' % i)
+        last = 'c%d.y' % i
+    model.add_design_var('px.x')
+    model.add_objective(last, index=0)
+    return prob
+
+
+def _cycle_totals(prob):
+    return prob.model.total_of, prob.model.total_wrt
+
+
+SCENARIOS = [
+    Scenario('manycomps', build_manycomps, [100, 500, 1000]),
+    Scenario('manyvars', build_manyvars, [1000, 5000, 20000]),
+    Scenario('trees', build_tree, [4, 6]),
+    Scenario('multipoint', build_multipoint, [1000, 2000]),
+    Scenario('cycle_rev_totals', build_cycle_rev, [20, 50], setup_kwargs={'mode': 'rev'},
+             totals=_cycle_totals),
+    Scenario('cycle_newton_direct', build_cycle_newton_direct, [50, 100],
+             setup_kwargs={'mode': 'fwd'}, totals=_cycle_totals),
+    Scenario('cycle_sparse_jac', build_cycle_sparse, [50, 100], totals=_cycle_totals),
+    Scenario('cycle_fd_partials', build_cycle_fd, [10, 20], totals=_cycle_totals),
+    Scenario('exec_cs_partials', build_exec_chain, [50, 200], totals=True),
+    Scenario('cycle_recording', build_cycle_rev, [20, 50], record=True),
+]
+
+
+if __name__ == '__main__':
+    sys.exit(benchmark_main(SCENARIOS))
@@ -19,6 +19,8 @@ from openmdao.components.meta_model import MetaModel
 from openmdao.components.multifi_meta_model import MultiFiMetaModel
 
 # Solvers
+from openmdao.solvers.linear.algebraic_precon import DiagonalPrecon, BlockJacobiPrecon, \
+    ILUPrecon
 from openmdao.solvers.linear.linear_block_gs import LinearBlockGS
 from openmdao.solvers.linear.linear_block_jac import LinearBlockJac
 from openmdao.solvers.linear.direct import DirectSolver
@@ -44,6 +46,7 @@ from openmdao.surrogate_models.surrogate_model import SurrogateModel, \
 
 # Vectors
 from openmdao.vectors.default_vector import DefaultVector
+from openmdao.vectors.shared_memory_vector import SharedMemoryVector
 try:
     from openmdao.vectors.petsc_vector import PETScVector
 except ImportError:
@@ -89,6 +89,8 @@ class ApproximationScheme(object):
                 outputs._views_flat[in_name][idxs] += delta
             else:
                 inputs._views_flat[in_name][idxs] += delta
+        inputs._bump_version()
+        outputs._bump_version()
 
         run_model()
 
@@ -101,5 +103,6 @@ class ApproximationScheme(object):
             for in_name, idxs, delta in input_deltas:
                 if in_name in outputs._views_flat:
                     outputs._views_flat[in_name][idxs] -= delta
+            outputs._bump_version()
 
         return result_array
@@ -2,12 +2,36 @@
 
 import numpy as np
 from copy import deepcopy
+from six import string_types
 
 from openmdao.core.explicitcomponent import ExplicitComponent
+from openmdao.surrogate_models.surrogate_cache import SurrogateCache
 from openmdao.surrogate_models.surrogate_model import SurrogateModel
 from openmdao.utils.class_util import overrides_method
 
 
+def _mapped_view(val, shape):
+    """
+    Return memory-mapped training data with the given shape, without copying it.
+
+    Parameters
+    ----------
+    val : ndarray, list or None
+        Training data.
+    shape : tuple
+        Shape of the training matrix, (number of points, size of the variable).
+
+    Returns
+    -------
+    ndarray or None
+        The training data, or None if it isn't memory-mapped float data, which is copied
+        into a training matrix instead.
+    """
+    if isinstance(val, np.memmap) and val.dtype == np.float64:
+        return np.reshape(val, shape)
+    return None
+
+
 class MetaModel(ExplicitComponent):
     """
     Class that creates a reduced order model for outputs from inputs.
@@ -16,7 +40,15 @@ class MetaModel(ExplicitComponent):
     Training inputs and outputs are automatically created with
     'train:' prepended to the corresponding inputeter/output name.
 
-    For a Float variable, the training data is an array of length m.
+    For a Float variable, the training data is an array of length m. The training data can also
+    be given as a memory-mapped array, or as the name of an .npy file, which is memory-mapped.
+    Memory-mapped float training data of the outputs, and of the input if there is only one, is
+    passed to the surrogates in place rather than copied.
+
+    The derivatives of an output with respect to the inputs at the training points can be given
+    as 'train_grad:' followed by its name, of shape (m, size of the output, size of all of the
+    inputs). The surrogate of that output is then trained with them as well, which requires a
+    surrogate that supports it, such as KrigingSurrogate or ResponseSurface.
     """
 
     def __init__(self, default_surrogate=None, vectorize=None):
@@ -46,6 +78,7 @@ class MetaModel(ExplicitComponent):
         self.train = True
         self._training_input = np.zeros(0)
         self._training_output = {}
+        self._training_grad = {}
 
         # When set to False (default), the metamodel retrains with the new
         # dataset whenever the training data values are changed. When set to
@@ -53,6 +86,11 @@ class MetaModel(ExplicitComponent):
         # is used to train.
         self.warm_restart = False
 
+        # Name of a directory in which the trained surrogates are stored, keyed by a hash of
+        # their class, options and training data. A surrogate whose training data is found
+        # there is restored rather than trained again. None (default) disables the cache.
+        self.cache_dir = None
+
         # keeps track of which sur_<name> slots are full
         self._surrogate_overrides = set()
 
@@ -70,9 +108,9 @@ class MetaModel(ExplicitComponent):
         val : float or ndarray
             Initial value for the input.
 
-        training_data : float or ndarray
-            training data for this variable. Optional, can be set
-            by the problem later.
+        training_data : float, ndarray or str
+            training data for this variable, or the name of an .npy file holding it. Optional,
+            can be set by the problem later.
         """
         metadata = super(MetaModel, self).add_input(name, val, **kwargs)
 
@@ -94,7 +132,8 @@ class MetaModel(ExplicitComponent):
 
         return metadata
 
-    def add_output(self, name, val=1.0, training_data=None, num_training_points=None, **kwargs):
+    def add_output(self, name, val=1.0, training_data=None, training_grad=None,
+                   num_training_points=None, **kwargs):
         """
         Add an output to this component and a corresponding training output.
 
@@ -107,9 +146,13 @@ class MetaModel(ExplicitComponent):
             Initial value for the output. While the value is overwritten during
             execution, it is useful for inferring size.
 
-        training_data : float or ndarray
-            training data for this variable. Optional, can be set
-            by the problem later.
+        training_data : float, ndarray or str
+            training data for this variable, or the name of an .npy file holding it. Optional,
+            can be set by the problem later.
+
+        training_grad : ndarray or str
+            derivatives of this variable with respect to the inputs at the training points, or
+            the name of an .npy file holding them. Optional, can be set by the problem later.
         """
         surrogate = kwargs.pop('surrogate', None)
 
@@ -127,6 +170,7 @@ class MetaModel(ExplicitComponent):
 
         self._surrogate_output_names.append((name, output_shape))
         self._training_output[name] = np.zeros(0)
+        self._training_grad[name] = None
 
         if surrogate:
             metadata['surrogate'] = surrogate
@@ -139,6 +183,12 @@ class MetaModel(ExplicitComponent):
         if training_data is not None:
             self.metadata[train_name] = training_data
 
+        grad_name = 'train_grad:%s' % name
+        self.metadata.declare(grad_name, default=None,
+                              desc='Training derivatives of %s with respect to the inputs' % name)
+        if training_grad is not None:
+            self.metadata[grad_name] = training_grad
+
         return metadata
 
     def _setup_vars(self, recurse=True):
@@ -223,8 +273,8 @@ class MetaModel(ExplicitComponent):
                         predicted = predicted[0]
                     outputs[name] = np.reshape(predicted, outputs[name].shape)
                 elif overrides_method('vectorized_predict', surrogate, SurrogateModel):
-                    # multiple inputs flattened, one prediction of multiple outputs
-                    predicted = surrogate.vectorized_predict(inputs.flat)
+                    # multiple inputs, all predicted at once
+                    predicted = surrogate.vectorized_predict(inputs)
                     if isinstance(predicted, tuple):  # rmse option
                         self._metadata(name)['rmse'] = predicted[1]
                         predicted = predicted[0]
@@ -239,10 +289,10 @@ class MetaModel(ExplicitComponent):
                     rmse = self._metadata(name)['rmse'] = []
                     for i in range(self._vectorize):
                         pred_i = surrogate.predict(inputs[i])
+                        if isinstance(pred_i, tuple):  # rmse option
+                            rmse.append(pred_i[1])
+                            pred_i = pred_i[0]
                         predicted[i] = np.reshape(pred_i, shape)
-                        if isinstance(predicted[i], tuple):  # rmse option
-                            rmse.append(predicted[i][1])
-                            predicted[i] = predicted[i][0]
                     outputs[name] = np.reshape(predicted, output_shape)
 
     def _vec_to_array(self, vec):
@@ -259,22 +309,14 @@ class MetaModel(ExplicitComponent):
         ndarray
             flattened array of input data
         """
-        array_real = True
+        vals = [vec[name] for name, _ in self._surrogate_input_names]
 
-        arr = np.zeros(self._input_size)
+        arr = np.empty(self._input_size, dtype=np.result_type(float, *vals))
 
         idx = 0
-        for name, sz in self._surrogate_input_names:
-            val = vec[name]
-            if isinstance(val, np.ndarray):
-                if array_real and np.issubdtype(val.dtype, complex):
-                    array_real = False
-                    arr = arr.astype(complex)
-                arr[idx:idx + sz] = val.flat
-                idx += sz
-            else:
-                arr[idx] = val
-                idx += 1
+        for val, (name, sz) in zip(vals, self._surrogate_input_names):
+            arr[idx:idx + sz] = np.ravel(val)
+            idx += sz
 
         return arr
 
@@ -292,23 +334,14 @@ class MetaModel(ExplicitComponent):
         ndarray
             2d array, self._vectorize rows of flattened input data.
         """
-        array_real = True
+        vals = [vec[name] for name, _ in self._surrogate_input_names]
 
-        arr = np.zeros((self._vectorize, self._input_size))
+        arr = np.empty((self._vectorize, self._input_size), dtype=np.result_type(float, *vals))
 
-        for row in range(self._vectorize):
-            idx = 0
-            for name, sz in self._surrogate_input_names:
-                val = vec[name]
-                if isinstance(val, np.ndarray):
-                    if array_real and np.issubdtype(val.dtype, complex):
-                        array_real = False
-                        arr = arr.astype(complex)
-                    arr[row][idx:idx + sz] = val[row].flat
-                    idx += sz
-                else:
-                    arr[row][idx] = val
-                    idx += 1
+        idx = 0
+        for val, (name, sz) in zip(vals, self._surrogate_input_names):
+            arr[:, idx:idx + sz] = np.reshape(val, (self._vectorize, sz))
+            idx += sz
 
         return arr
 
@@ -323,6 +356,20 @@ class MetaModel(ExplicitComponent):
         partials : Jacobian
             sub-jac components written to partials[output_name, input_name]
         """
+        if self._vectorize is not None:
+            arr = self._vec_to_array2d(inputs)
+
+            for uname, _ in self._surrogate_output_names:
+                surrogate = self._metadata(uname).get('surrogate')
+                sjac = surrogate.vectorized_linearize(arr)
+
+                # values of the block diagonal subjacs, in the order declared in _setup_partials
+                idx = 0
+                for pname, sz in self._surrogate_input_names:
+                    partials[(uname, pname)] = sjac[:, :, idx:idx + sz].flatten()
+                    idx += sz
+            return
+
         arr = self._vec_to_array(inputs)
 
         for uname, _ in self._surrogate_output_names:
@@ -346,18 +393,33 @@ class MetaModel(ExplicitComponent):
             Whether to call this method in subsystems.
         """
         super(MetaModel, self)._setup_partials()
-        self._declare_partials(of=[name[0] for name in self._surrogate_output_names],
-                               wrt=[name[0] for name in self._surrogate_input_names])
+
+        if self._vectorize is None:
+            self._declare_partials(of=[name[0] for name in self._surrogate_output_names],
+                                   wrt=[name[0] for name in self._surrogate_input_names])
+            return
+
+        # Each row of the outputs only depends on the same row of the inputs, so the subjacs
+        # are block diagonal.
+        vec_size = self._vectorize
+        for of, shape in self._surrogate_output_names:
+            of_size = int(np.prod(shape))
+            for wrt, wrt_size in self._surrogate_input_names:
+                rows = np.repeat(np.arange(vec_size * of_size), wrt_size)
+                cols = np.tile(np.arange(wrt_size), vec_size * of_size) + \
+                    np.repeat(np.arange(vec_size) * wrt_size, of_size * wrt_size)
+                self._declare_partials(of=of, wrt=wrt, rows=rows, cols=cols)
 
     def _train(self):
         """
         Train the metamodel, if necessary, using the provided training data.
         """
         missing_training_data = []
+        training_data = {}
         num_sample = None
         for name, sz in self._surrogate_input_names:
             train_name = 'train:' + name
-            val = self.metadata[train_name]
+            val = training_data[name] = self._training_data(train_name)
             if val is None:
                 missing_training_data.append(train_name)
                 continue
@@ -372,7 +434,7 @@ class MetaModel(ExplicitComponent):
 
         for name, shape in self._surrogate_output_names:
             train_name = 'train:' + name
-            val = self.metadata[train_name]
+            val = training_data[name] = self._training_data(train_name)
             if val is None:
                 missing_training_data.append(train_name)
                 continue
@@ -389,12 +451,20 @@ class MetaModel(ExplicitComponent):
                   str(missing_training_data)
             raise RuntimeError(msg)
 
+        # A single memory-mapped input is used in place rather than copied.
+        mapped_input = None
+        if not self.warm_restart and len(self._surrogate_input_names) == 1:
+            name, sz = self._surrogate_input_names[0]
+            mapped_input = _mapped_view(training_data[name], (num_sample, sz))
+
         if self.warm_restart:
             num_old_pts = self._training_input.shape[0]
             inputs = np.zeros((num_sample + num_old_pts, self._input_size))
             if num_old_pts > 0:
                 inputs[:num_old_pts, :] = self._training_input
             new_input = inputs[num_old_pts:, :]
+        elif mapped_input is not None:
+            inputs = new_input = mapped_input
         else:
             inputs = np.zeros((num_sample, self._input_size))
             new_input = inputs
@@ -402,23 +472,22 @@ class MetaModel(ExplicitComponent):
         self._training_input = inputs
 
         # add training data for each input
-        if num_sample > 0:
+        if num_sample > 0 and mapped_input is None:
             idx = 0
             for name, sz in self._surrogate_input_names:
-                val = self.metadata['train:' + name]
-                if isinstance(val[0], float):
-                    new_input[:, idx] = val
-                    idx += 1
-                else:
-                    for row_idx, v in enumerate(val):
-                        if not isinstance(v, np.ndarray):
-                            v = np.array(v)
-                        new_input[row_idx, idx:idx + sz] = v.flat
+                val = training_data[name]
+                new_input[:, idx:idx + sz] = np.reshape(val, (num_sample, sz))
+                idx += sz
 
         # add training data for each output
         for name, shape in self._surrogate_output_names:
             if num_sample > 0:
                 output_size = np.prod(shape)
+                val = training_data[name]
+
+                mapped_output = None
+                if not self.warm_restart:
+                    mapped_output = _mapped_view(val, (num_sample, output_size))
 
                 if self.warm_restart:
                     outputs = np.zeros((num_sample + num_old_pts,
@@ -427,27 +496,139 @@ class MetaModel(ExplicitComponent):
                         outputs[:num_old_pts, :] = self._training_output[name]
                     self._training_output[name] = outputs
                     new_output = outputs[num_old_pts:, :]
+                elif mapped_output is not None:
+                    self._training_output[name] = new_output = mapped_output
                 else:
                     outputs = np.zeros((num_sample, output_size))
                     self._training_output[name] = outputs
                     new_output = outputs
 
-                val = self.metadata['train:' + name]
+                if mapped_output is None:
+                    new_output[:] = np.reshape(val, (num_sample, output_size))
 
-                if isinstance(val[0], float):
-                    new_output[:, 0] = val
-                else:
-                    for row_idx, v in enumerate(val):
-                        if not isinstance(v, np.ndarray):
-                            v = np.array(v)
-                        new_output[row_idx, :] = v.flat
+            grad = self._train_grad(name, shape, num_sample,
+                                    num_old_pts if self.warm_restart else 0)
 
             surrogate = self._metadata(name).get('surrogate')
-            if surrogate is not None:
-                surrogate.train(self._training_input,
-                                self._training_output[name])
+            if surrogate is None:
+                continue
+
+            if grad is not None:
+                if not overrides_method('train_grad', surrogate, SurrogateModel):
+                    msg = "MetaModel: The surrogate of output '{0}' ({1}) does not support " \
+                          "training with derivatives.".format(name, type(surrogate).__name__)
+                    raise RuntimeError(msg)
+
+                # the derivatives change the whole training problem, so it's always solved again
+                self._train_surrogate(surrogate, surrogate.train_grad, self._training_input,
+                                      self._training_output[name], grad)
+            elif self.warm_restart and num_old_pts > 0 and surrogate.trained and \
+                    overrides_method('update', surrogate, SurrogateModel):
+                # the surrogate already holds the old points, so only add the new ones
+                if num_sample > 0:
+                    surrogate.update(new_input, new_output)
+            else:
+                self._train_surrogate(surrogate, surrogate.train, self._training_input,
+                                      self._training_output[name])
 
         self.train = False
 
+    def _train_grad(self, name, shape, num_sample, num_old_pts):
+        """
+        Collect the training derivatives of an output, if they are given.
+
+        Parameters
+        ----------
+        name : str
+            Name of the output.
+        shape : int or tuple
+            Shape of the output.
+        num_sample : int
+            Number of new training points.
+        num_old_pts : int
+            Number of training points kept from previous training, when warm_restart is True.
+
+        Returns
+        -------
+        ndarray or None
+            Derivatives of the output at all of the training points, of shape
+            (points, output size, input size), or None if they aren't given.
+        """
+        val = self._training_data('train_grad:' + name)
+        old_grad = self._training_grad[name]
+
+        if num_old_pts > 0 and (val is None) != (old_grad is None):
+            msg = "MetaModel: Training derivatives of '{0}' must be given for all of the " \
+                  "training points or for none of them.".format(name)
+            raise RuntimeError(msg)
+
+        if val is None:
+            self._training_grad[name] = None
+            return None
+
+        grad_shape = (num_sample, int(np.prod(shape)), self._input_size)
+        if np.size(val) != np.prod(grad_shape):
+            msg = "MetaModel: Training derivatives of '{0}' must have {1} values, {2} per " \
+                  "training point, but found {3}." \
+                  .format(name, np.prod(grad_shape), np.prod(grad_shape[1:]), np.size(val))
+            raise RuntimeError(msg)
+
+        grad = np.reshape(val, grad_shape)
+        if num_old_pts > 0:
+            grad = np.concatenate([old_grad, grad])
+
+        self._training_grad[name] = grad
+        return grad
+
+    def _training_data(self, train_name):
+        """
+        Return the training data of a variable.
+
+        Training data given as the name of an .npy file is memory-mapped, so it is only read
+        from the file as needed.
+
+        Parameters
+        ----------
+        train_name : str
+            Name of the training data, 'train:' followed by the name of the variable.
+
+        Returns
+        -------
+        ndarray, list or None
+            Training data, or None if it hasn't been provided.
+        """
+        val = self.metadata[train_name]
+        if isinstance(val, string_types):
+            val = np.load(val, mmap_mode='r')
+        return val
+
+    def _train_surrogate(self, surrogate, train, x, y, grad=None):
+        """
+        Train a surrogate, or restore it from the cache if it was trained on the same data.
+
+        Parameters
+        ----------
+        surrogate : <SurrogateModel>
+            The surrogate model.
+        train : callable
+            Method of the surrogate that trains it with x and y, and grad if it's given.
+        x : ndarray or list of ndarray
+            Training inputs.
+        y : ndarray or list of ndarray
+            Training outputs.
+        grad : ndarray or None
+            Derivatives of the training outputs with respect to the inputs.
+        """
+        args = (x, y) if grad is None else (x, y, grad)
+
+        if self.cache_dir is None:
+            train(*args)
+            return
+
+        cache = SurrogateCache(self.cache_dir)
+        if not cache.load(surrogate, x, y, grad):
+            train(*args)
+            cache.save(surrogate, x, y, grad)
+
     def _metadata(self, name):
         return self._static_var_rel2data_io[name]['metadata']
@@ -191,11 +191,17 @@ class MultiFiMetaModel(MetaModel):
             super(MultiFiMetaModel, self)._train()
             return
 
+        for name, shape in self._surrogate_output_names:
+            if self.metadata['train_grad:' + name] is not None:
+                msg = "MultiFiMetaModel: Training derivatives of '{0}' are not supported with " \
+                      "multi-fidelity training data.".format(name)
+                raise RuntimeError(msg)
+
         num_sample = self._nfi * [None]
         for name, sz in self._surrogate_input_names:
             for fi in range(self._nfi):
                 name = _get_name_fi(name, fi)
-                val = self.metadata['train:' + name]
+                val = self._training_data('train:' + name)
                 if num_sample[fi] is None:
                     num_sample[fi] = len(val)
                 elif len(val) != num_sample[fi]:
@@ -208,7 +214,7 @@ class MultiFiMetaModel(MetaModel):
         for name, shape in self._surrogate_output_names:
             for fi in range(self._nfi):
                 name = _get_name_fi(name, fi)
-                val = self.metadata['train:' + name]
+                val = self._training_data('train:' + name)
                 if len(val) != num_sample[fi]:
                     msg = "MetaModel: Each variable must have the same number" \
                           " of training points. Expected {0} but found {1} " \
@@ -240,7 +246,7 @@ class MultiFiMetaModel(MetaModel):
             for fi in range(self._nfi):
                 if num_sample[fi] > 0:
                     name = _get_name_fi(name, fi)
-                    val = self.metadata['train:' + name]
+                    val = self._training_data('train:' + name)
                     if isinstance(val[0], float):
                         new_inputs[fi][:, idx[fi]] = val
                         idx[fi] += 1
@@ -273,7 +279,7 @@ class MultiFiMetaModel(MetaModel):
                         self._training_output[name].extend(outputs)
                         new_outputs = outputs
 
-                    val = self.metadata['train:' + name_fi]
+                    val = self._training_data('train:' + name_fi)
 
                     if isinstance(val[0], float):
                         new_outputs[fi][:, 0] = val
@@ -285,7 +291,7 @@ class MultiFiMetaModel(MetaModel):
 
             surrogate = self._metadata(name).get('surrogate')
             if surrogate is not None:
-                surrogate.train_multifi(self._training_input,
-                                        self._training_output[name])
+                self._train_surrogate(surrogate, surrogate.train_multifi,
+                                      self._training_input, self._training_output[name])
 
         self.train = False
@@ -1,8 +1,11 @@
 import numpy as np
+import os
+import shutil
+import tempfile
 import unittest
 
 from openmdao.api import Group, Problem, MetaModel, IndepVarComp, ResponseSurface, \
-    FloatKrigingSurrogate, KrigingSurrogate, MultiFiCoKrigingSurrogate
+    FloatKrigingSurrogate, KrigingSurrogate, MultiFiCoKrigingSurrogate, NearestNeighbor
 from openmdao.devtools.testutil import assert_rel_error
 
 from openmdao.devtools.testutil import TestLogger
@@ -231,6 +234,236 @@ class MetaModelTestCase(unittest.TestCase):
         assert_rel_error(self, prob['mm.y1'], 2.0, .00001)
         assert_rel_error(self, prob['mm.y2'], 4.0, .00001)
 
+    def test_warm_start_update(self):
+        class CountingKriging(FloatKrigingSurrogate):
+            def __init__(self):
+                # the nugget keeps R well conditioned, so that update extends its factorization
+                super(CountingKriging, self).__init__(nugget=1e-3)
+                self.counts = {'train': 0, 'update': 0}
+
+            def train(self, x, y):
+                self.counts['train'] += 1
+                super(CountingKriging, self).train(x, y)
+
+            def update(self, x, y):
+                self.counts['update'] += 1
+                super(CountingKriging, self).update(x, y)
+
+        mm = MetaModel()
+        mm.add_input('x', 0.)
+        mm.add_output('f', 0., surrogate=CountingKriging())
+        mm.warm_restart = True
+
+        prob = Problem()
+        prob.model.add_subsystem('mm', mm)
+        prob.setup(check=False)
+
+        x = np.linspace(0., 10., 10)
+        mm.metadata['train:x'] = x[:8]
+        mm.metadata['train:f'] = np.sin(x[:8])
+        prob['mm.x'] = 1.2
+        prob.run_model()
+
+        # only the new points are passed to the surrogate
+        mm.metadata['train:x'] = x[8:]
+        mm.metadata['train:f'] = np.sin(x[8:])
+        mm.train = True
+        prob.run_model()
+
+        surrogate = mm._metadata('f')['surrogate']
+        self.assertEqual(surrogate.counts, {'train': 1, 'update': 1})
+        self.assertEqual(surrogate.n_samples, 10)
+        assert_rel_error(self, prob['mm.f'], np.sin(1.2), 1e-2)
+
+    def test_surrogate_cache(self):
+        class CountingKriging(FloatKrigingSurrogate):
+            def __init__(self):
+                super(CountingKriging, self).__init__()
+                self.num_train = 0
+
+            def train(self, x, y):
+                self.num_train += 1
+                super(CountingKriging, self).train(x, y)
+
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+
+        def run(y_train):
+            mm = MetaModel()
+            mm.add_input('x', 0.)
+            mm.add_output('f', 0., surrogate=CountingKriging())
+            mm.cache_dir = cache_dir
+
+            prob = Problem()
+            prob.model.add_subsystem('mm', mm)
+            prob.setup(check=False)
+
+            mm.metadata['train:x'] = np.linspace(0., 10., 10)
+            mm.metadata['train:f'] = y_train
+            prob['mm.x'] = 1.2
+            prob.run_model()
+
+            return prob['mm.f'], mm._metadata('f')['surrogate'].num_train
+
+        y = np.sin(np.linspace(0., 10., 10))
+        f1, num_train = run(y)
+        self.assertEqual(num_train, 1)
+
+        # the second run restores the trained surrogate from the cache
+        f2, num_train = run(y)
+        self.assertEqual(num_train, 0)
+        assert_rel_error(self, f2, f1, 1e-15)
+
+        # but other training data is trained on
+        f3, num_train = run(2. * y)
+        self.assertEqual(num_train, 1)
+        assert_rel_error(self, f3, 2. * f1, 1e-6)
+
+    def test_memmap_training_data(self):
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir, ignore_errors=True)
+
+        x = np.linspace(0., 10., 50)
+        y = np.vstack([np.sin(x), np.cos(x)]).T
+
+        x_file = os.path.join(tempdir, 'x.npy')
+        np.save(x_file, x)
+        y_file = os.path.join(tempdir, 'y.npy')
+        np.save(y_file, y)
+
+        def run(x_train, y_train):
+            mm = MetaModel(default_surrogate=ResponseSurface())
+            mm.add_input('x', 0.)
+            mm.add_output('y', np.zeros(2))
+
+            prob = Problem()
+            prob.model.add_subsystem('mm', mm)
+            prob.setup(check=False)
+
+            mm.metadata['train:x'] = x_train
+            mm.metadata['train:y'] = y_train
+            prob['mm.x'] = 1.2
+            prob.run_model()
+
+            return mm, prob['mm.y']
+
+        mm, expected = run(x, y)
+
+        # an .npy file name and a memory-mapped array
+        mm, y_pred = run(x_file, np.load(y_file, mmap_mode='r'))
+        assert_rel_error(self, y_pred, expected, 1e-12)
+
+        # memory-mapped training data is used without copying it
+        self.assertIsInstance(mm._training_input, np.memmap)
+        self.assertIsInstance(mm._training_output['y'], np.memmap)
+
+        # memory-mapped data of another type is converted
+        x_file = os.path.join(tempdir, 'x32.npy')
+        np.save(x_file, x.astype(np.float32))
+        mm, y_pred = run(x_file, y_file)
+        self.assertNotIsInstance(mm._training_input, np.memmap)
+        self.assertEqual(mm._training_input.dtype, np.float64)
+        assert_rel_error(self, y_pred, expected, 1e-5)
+
+    def test_train_grad(self):
+        def f(x1, x2):
+            return np.sin(3. * x1) * np.cos(2. * x2) + x1 ** 2
+
+        def df(x1, x2):
+            return np.stack([3. * np.cos(3. * x1) * np.cos(2. * x2) + 2. * x1,
+                             -2. * np.sin(3. * x1) * np.sin(2. * x2)], axis=-1)
+
+        def g(x1, x2):
+            return 1. + x1 - 2. * x1 * x2 + 3. * x2 ** 2
+
+        def dg(x1, x2):
+            return np.stack([1. - 2. * x2, -2. * x1 + 6. * x2], axis=-1)
+
+        rand = np.random.RandomState(0)
+        x1, x2 = rand.uniform(-1., 1., (2, 12))
+
+        def run(grads):
+            mm = MetaModel()
+            mm.add_input('x1', 0.)
+            mm.add_input('x2', 0.)
+            mm.add_output('f', 0., surrogate=FloatKrigingSurrogate())
+            mm.add_output('g', 0., surrogate=ResponseSurface(), training_data=g(x1, x2))
+
+            prob = Problem()
+            prob.model.add_subsystem('mm', mm)
+            prob.setup(check=False)
+
+            mm.metadata['train:x1'] = x1
+            mm.metadata['train:x2'] = x2
+            mm.metadata['train:f'] = f(x1, x2)
+            if grads:
+                mm.metadata['train_grad:f'] = df(x1, x2)
+                mm.metadata['train_grad:g'] = dg(x1, x2)
+
+            prob['mm.x1'] = 0.3
+            prob['mm.x2'] = -0.6
+            prob.run_model()
+
+            return prob
+
+        # the derivatives make the surrogate of f several times more accurate
+        prob = run(grads=True)
+        plain = run(grads=False)
+        self.assertLess(3. * abs(prob['mm.f'][0] - f(0.3, -0.6)),
+                        abs(plain['mm.f'][0] - f(0.3, -0.6)))
+        assert_rel_error(self, prob['mm.g'], g(0.3, -0.6), 1e-12)
+
+        data = prob.check_partials(suppress_output=True)
+        assert_rel_error(self, data['mm'][('f', 'x1')]['J_fwd'][0][0], df(0.3, -0.6)[0], 1e-2)
+        assert_rel_error(self, data['mm'][('g', 'x2')]['J_fwd'][0][0], dg(0.3, -0.6)[1], 1e-12)
+
+        # the derivatives are stored with the training data
+        mm = prob.model.mm
+        self.assertEqual(mm._training_grad['f'].shape, (12, 1, 2))
+
+    def test_train_grad_errors(self):
+        def run(surrogate, grad, warm_restart=False):
+            mm = MetaModel()
+            mm.add_input('x', 0.)
+            mm.add_output('f', 0., surrogate=surrogate)
+            mm.warm_restart = warm_restart
+
+            prob = Problem()
+            prob.model.add_subsystem('mm', mm)
+            prob.setup(check=False)
+
+            x = np.linspace(0., 10., 10)
+            mm.metadata['train:x'] = x
+            mm.metadata['train:f'] = np.sin(x)
+            mm.metadata['train_grad:f'] = grad
+            prob.run_model()
+
+            return prob, mm
+
+        with self.assertRaises(RuntimeError) as cm:
+            run(NearestNeighbor(), np.ones(10))
+        self.assertEqual(str(cm.exception),
+                         "MetaModel: The surrogate of output 'f' (NearestNeighbor) does not "
+                         "support training with derivatives.")
+
+        with self.assertRaises(RuntimeError) as cm:
+            run(ResponseSurface(), np.ones(9))
+        self.assertEqual(str(cm.exception),
+                         "MetaModel: Training derivatives of 'f' must have 10 values, 1 per "
+                         "training point, but found 9.")
+
+        # with warm_restart, every set of training points must have derivatives or none
+        prob, mm = run(ResponseSurface(), None, warm_restart=True)
+        mm.metadata['train:x'] = [11.]
+        mm.metadata['train:f'] = [np.sin(11.)]
+        mm.metadata['train_grad:f'] = [np.cos(11.)]
+        mm.train = True
+        with self.assertRaises(RuntimeError) as cm:
+            prob.run_model()
+        self.assertEqual(str(cm.exception),
+                         "MetaModel: Training derivatives of 'f' must be given for all of the "
+                         "training points or for none of them.")
+
     def test_vector_inputs(self):
         mm = MetaModel()
         mm.add_input('x', np.zeros(4))
@@ -567,6 +800,75 @@ class MetaModelTestCase(unittest.TestCase):
                          )),
                          1e-4)
 
+    def test_metamodel_vector_derivatives(self):
+        size = 3
+
+        for surrogate in [KrigingSurrogate(), ResponseSurface()]:
+            mm = MetaModel(vectorize=size, default_surrogate=surrogate)
+            mm.add_input('x', np.zeros(size))
+            mm.add_input('z', np.zeros((size, 2)))
+            mm.add_output('y', np.zeros((size, 2)))
+
+            prob = Problem()
+            prob.model.add_subsystem('mm', mm)
+            prob.setup(check=False)
+
+            x = np.linspace(0, 2, 5)
+            z = np.array([[a, b] for a in x for b in x])
+            x = np.repeat(x, 5)
+            mm.metadata['train:x'] = x
+            mm.metadata['train:z'] = z
+            mm.metadata['train:y'] = np.column_stack((x * z[:, 0] + z[:, 1],
+                                                      x + 2. * z[:, 0] - z[:, 1]))
+
+            prob['mm.x'] = np.array([0.5, 1.1, 1.7])
+            prob['mm.z'] = np.array([[0.3, 1.2], [1.4, 0.1], [0.8, 0.6]])
+            prob.run_model()
+
+            data = prob.check_partials(suppress_output=True)
+
+            # the subjacs are block diagonal
+            J = data['mm']['y', 'z']['J_fwd']
+            self.assertEqual(np.count_nonzero(J[:2, 2:]), 0)
+            self.assertEqual(np.count_nonzero(J[2:4, :2]), 0)
+
+            for key in [('y', 'x'), ('y', 'z')]:
+                assert_rel_error(self, data['mm'][key]['J_fwd'], data['mm'][key]['J_fd'], 1e-4)
+
+    def test_array_inputs_packing(self):
+        # an array input followed by a scalar input, with a linear response that the
+        # ResponseSurface reproduces exactly
+        np.random.seed(3)
+        a = np.random.random((20, 2))
+        b = np.random.random(20)
+        f = 2. * a[:, 0] - 3. * a[:, 1] + 5. * b
+
+        for vec_size in [None, 3]:
+            mm = MetaModel(vectorize=vec_size, default_surrogate=ResponseSurface())
+            if vec_size is None:
+                mm.add_input('a', np.zeros(2), training_data=a)
+                mm.add_input('b', 0., training_data=b)
+                mm.add_output('f', 0., training_data=f)
+            else:
+                mm.add_input('a', np.zeros((vec_size, 2)), training_data=a)
+                mm.add_input('b', np.zeros(vec_size), training_data=b)
+                mm.add_output('f', np.zeros(vec_size), training_data=f)
+
+            prob = Problem()
+            prob.model.add_subsystem('mm', mm)
+            prob.setup(check=False)
+
+            a_val = np.array([[0.1, 0.7], [0.4, 0.2], [0.9, 0.5]])
+            b_val = np.array([0.3, 0.8, 0.6])
+            if vec_size is None:
+                a_val, b_val = a_val[0], b_val[0]
+            prob['mm.a'] = a_val
+            prob['mm.b'] = b_val
+            prob.run_model()
+
+            expected = 2. * a_val[..., 0] - 3. * a_val[..., 1] + 5. * b_val
+            assert_rel_error(self, prob['mm.f'], expected, 1e-10)
+
     def test_metamodel_vector_errors(self):
         # invalid values for vectorize argument. Bad.
         for bad_value in [True, -1, 0, 1, 1.5]:
@@ -1,7 +1,11 @@
 import numpy as np
+import shutil
+import tempfile
 import unittest
 
-from openmdao.api import Group, Problem, MultiFiMetaModel, MultiFiSurrogateModel
+from openmdao.api import Group, Problem, MultiFiMetaModel, MultiFiSurrogateModel, \
+    MultiFiCoKrigingSurrogate
+from openmdao.devtools.testutil import assert_rel_error
 
 
 class MockSurrogate(MultiFiSurrogateModel):
@@ -203,6 +207,69 @@ class MultiFiMetaModelTestCase(unittest.TestCase):
         np.testing.assert_array_equal(surr.xtrain[1], expected_xtrain[1])
         np.testing.assert_array_equal(surr.ytrain[0], expected_ytrain[0])
         np.testing.assert_array_equal(surr.ytrain[1], expected_ytrain[1])
+    def test_surrogate_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+
+        def f_expensive(x):
+            return ((x*6-2)**2)*np.sin((x*6-2)*2)
+
+        def f_cheap(x):
+            return 0.5*((x*6-2)**2)*np.sin((x*6-2)*2)+(x-0.5)*10. - 5
+
+        x_hi = np.array([0.0, 0.4, 0.6, 1.0])
+        x_lo = np.array([0.1, 0.2, 0.3, 0.5, 0.7, 0.8, 0.9, 0.0, 0.4, 0.6, 1.0])
+
+        def run():
+            mm = MultiFiMetaModel(nfi=2)
+            mm.add_input('x', 0.)
+            mm.add_output('y', 0., surrogate=MultiFiCoKrigingSurrogate())
+            mm.cache_dir = cache_dir
+
+            prob = Problem(Group())
+            prob.model.add_subsystem('mm', mm)
+            prob.setup(check=False)
+
+            mm.metadata['train:x'] = x_hi
+            mm.metadata['train:x_fi2'] = x_lo
+            mm.metadata['train:y'] = f_expensive(x_hi)
+            mm.metadata['train:y_fi2'] = f_cheap(x_lo)
+
+            prob['mm.x'] = 0.75
+            prob.run_model()
+
+            return prob['mm.y'], mm._metadata('y')['surrogate'].model._nfev
+
+        y1, nfev = run()
+        self.assertGreater(nfev, 0)
+
+        # the second run takes the autocorrelation parameters from the cache
+        y2, nfev = run()
+        self.assertEqual(nfev, 0)
+        assert_rel_error(self, y2, y1, 1e-10)
+
+    def test_train_grad_not_supported(self):
+        mm = MultiFiMetaModel(nfi=2)
+        mm.add_input('x', 0.)
+        mm.add_output('y', 0., surrogate=MockSurrogate())
+
+        prob = Problem(Group())
+        prob.model.add_subsystem('mm', mm)
+        prob.setup(check=False)
+
+        mm.metadata['train:x'] = [0.0, 0.4, 1.0]
+        mm.metadata['train:x_fi2'] = [0.1, 0.2, 0.0, 0.4, 1.0]
+        mm.metadata['train:y'] = [3.02720998, 0.11477697, 15.82973195]
+        mm.metadata['train:y_fi2'] = [-9.32828839, -8.31986355, -8.48639501, -5.94261151,
+                                      7.91486597]
+        mm.metadata['train_grad:y'] = [-1., 2., 3.]
+
+        with self.assertRaises(RuntimeError) as cm:
+            prob.run_model()
+        self.assertEqual(str(cm.exception),
+                         "MultiFiMetaModel: Training derivatives of 'y' are not supported with "
+                         "multi-fidelity training data.")
+
 
 if __name__ == "__main__":
     unittest.main()
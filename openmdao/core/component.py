@@ -51,6 +51,9 @@ class Component(System):
         Cached storage of user-declared approximations.
     _declared_partial_checks : list
         Cached storage of user-declared check partial options.
+    _eval_state : tuple or None
+        Versions of the inputs, outputs, and residuals vectors at the end of the last evaluation,
+        or None if the result of that evaluation can't be reused.
     """
 
     def __init__(self, **kwargs):
@@ -81,6 +84,13 @@ class Component(System):
         self._approximated_partials = []
         self._declared_partial_checks = []
 
+        self._eval_state = None
+
+        self.options.declare('skip_unchanged', types=bool, default=False,
+                             desc='If True, skip the evaluation of this component when none of '
+                                  'its inputs, outputs, or residuals have changed since it was '
+                                  'last evaluated. It must be set before setup.')
+
     def setup(self):
         """
         Declare inputs and outputs.
@@ -93,6 +103,65 @@ class Component(System):
         """
         pass
 
+    def _setup_vectors(self, root_vectors, resize=False, alloc_complex=False):
+        """
+        Compute all vectors for all vec names and assign excluded variables lists.
+
+        Parameters
+        ----------
+        root_vectors : dict of dict of Vector
+            Root vectors: first key is 'input', 'output', or 'residual'; second key is vec_name.
+        resize : bool
+            Whether to resize the root vectors - i.e, because this system is initiating a reconf.
+        alloc_complex : bool
+            Whether to allocate any imaginary storage to perform complex step. Default is False.
+        """
+        super(Component, self)._setup_vectors(root_vectors, resize=resize,
+                                              alloc_complex=alloc_complex)
+        self._eval_state = None
+
+    def _get_eval_state(self):
+        """
+        Return the current versions of the nonlinear vectors.
+
+        Returns
+        -------
+        tuple of int
+            Versions of the inputs, outputs, and residuals vectors.
+        """
+        return (self._inputs._get_version(), self._outputs._get_version(),
+                self._residuals._get_version())
+
+    def _is_unchanged(self):
+        """
+        Return True if the last evaluation of this component can be reused.
+
+        Returns
+        -------
+        bool
+            True if 'skip_unchanged' is set and no vector has changed since the last evaluation.
+        """
+        if not self.options['skip_unchanged']:
+            return False
+
+        if self._inputs._versions is None:
+            # the vectors only track their modifications if the option was set at setup
+            raise RuntimeError("%s: The 'skip_unchanged' option must be set before setup."
+                               % self.pathname)
+
+        return (self._eval_state is not None and
+                not self._inputs._vector_info._under_complex_step and
+                self._eval_state == self._get_eval_state())
+
+    def _save_eval_state(self):
+        """
+        Record the versions of the nonlinear vectors after an evaluation.
+        """
+        if self._inputs._versions is None or self._inputs._vector_info._under_complex_step:
+            self._eval_state = None
+        else:
+            self._eval_state = self._get_eval_state()
+
     def _setup_vars(self, recurse=True):
         """
         Call setup in components and count variables, total and by var_set.
@@ -812,11 +881,16 @@ class Component(System):
         """
         of_list = [of] if isinstance(of, string_types) else of
         wrt_list = [wrt] if isinstance(wrt, string_types) else wrt
-        outs = list(self._var_allprocs_prom2abs_list['output'])
-        ins = list(self._var_allprocs_prom2abs_list['input'])
-
-        of_pattern_matches = [(pattern, find_matches(pattern, outs)) for pattern in of_list]
-        wrt_pattern_matches = [(pattern, find_matches(pattern, outs + ins)) for pattern in wrt_list]
+        outs = self._var_allprocs_prom2abs_list['output']
+        ins = self._var_allprocs_prom2abs_list['input']
+
+        # exact names are looked up directly rather than by scanning all the variables
+        of_pattern_matches = [(pattern, [pattern] if pattern in outs else
+                               find_matches(pattern, list(outs)))
+                              for pattern in of_list]
+        wrt_pattern_matches = [(pattern, [pattern] if pattern in outs or pattern in ins else
+                                find_matches(pattern, list(outs) + list(ins)))
+                               for pattern in wrt_list]
         return of_pattern_matches, wrt_pattern_matches
 
     def _check_partials_meta(self, abs_key, meta):
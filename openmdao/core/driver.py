@@ -411,7 +411,10 @@ class Driver(object):
         if indices is None:
             indices = slice(None)
 
-        desvar = self._problem.model._outputs._views_flat[name]
+        outputs = self._problem.model._outputs
+        outputs._bump_version()
+
+        desvar = outputs._views_flat[name]
         desvar[indices] = value
 
         # Scale design variable values
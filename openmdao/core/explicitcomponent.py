@@ -4,12 +4,10 @@ from __future__ import division
 
 import numpy as np
 from six import itervalues, iteritems
-from itertools import product
 
 from openmdao.core.component import Component
 from openmdao.utils.class_util import overrides_method
 from openmdao.recorders.recording_iteration_stack import Recording
-from openmdao.jacobians.assembled_jacobian import SUBJAC_META_DEFAULTS
 
 _inst_functs = ['compute_jacvec_product', 'compute_multi_jacvec_product']
 
@@ -173,10 +171,18 @@ class ExplicitComponent(Component):
         with self.jacobian_context() as J:
             outputs = self._var_abs_names['output']
             inputs = self._var_abs_names['input']
+            out_idx = {name: i for i, name in enumerate(outputs)}
 
             for wrt_name, wrt_vars in (('output', outputs), ('input', inputs)):
-                for abs_key in product(outputs, wrt_vars):
-                    meta = self._subjacs_info.get(abs_key, SUBJAC_META_DEFAULTS.copy())
+                # Undeclared subjacs are not dependent, so only visit the declared ones (in the
+                # order of product(outputs, wrt_vars)) rather than every pair of variables.
+                wrt_idx = {name: i for i, name in enumerate(wrt_vars)}
+                keys = sorted((key for key in self._subjacs_info
+                               if key[0] in out_idx and key[1] in wrt_idx),
+                              key=lambda key: (out_idx[key[0]], wrt_idx[key[1]]))
+
+                for abs_key in keys:
+                    meta = self._subjacs_info[abs_key]
                     dependent = meta['dependent']
 
                     if not dependent:
@@ -200,6 +206,9 @@ class ExplicitComponent(Component):
         """
         Compute residuals. The model is assumed to be in a scaled state.
         """
+        if self._is_unchanged():
+            return
+
         with Recording(self.pathname + '._apply_nonlinear', self.iter_count, self):
             with self._unscaled_context(
                     outputs=[self._outputs], residuals=[self._residuals]):
@@ -214,6 +223,8 @@ class ExplicitComponent(Component):
                 self._residuals -= self._outputs
                 self._outputs += self._residuals
 
+        self._save_eval_state()
+
     def _solve_nonlinear(self):
         """
         Compute outputs. The model is assumed to be in a scaled state.
@@ -229,11 +240,22 @@ class ExplicitComponent(Component):
         """
         super(ExplicitComponent, self)._solve_nonlinear()
 
+        if self._is_unchanged():
+            # The residuals hold u - f(x) from the last evaluation, so recover f(x) directly.
+            with self._unscaled_context(
+                    outputs=[self._outputs], residuals=[self._residuals]):
+                self._outputs -= self._residuals
+                self._residuals.set_const(0.0)
+            self._save_eval_state()
+            return False, 0., 0.
+
         with Recording(self.pathname + '._solve_nonlinear', self.iter_count, self):
             with self._unscaled_context(
                     outputs=[self._outputs], residuals=[self._residuals]):
                 self._residuals.set_const(0.0)
                 failed = self.compute(self._inputs, self._outputs)
+
+        self._save_eval_state()
         return bool(failed), 0., 0.
 
     def _apply_linear(self, vec_names, rel_systems, mode, scope_out=None, scope_in=None):
@@ -21,7 +21,9 @@ from openmdao.jacobians.assembled_jacobian import SUBJAC_META_DEFAULTS
 from openmdao.recorders.recording_iteration_stack import Recording
 from openmdao.solvers.nonlinear.nonlinear_runonce import NonlinearRunOnce
 from openmdao.solvers.linear.linear_runonce import LinearRunOnce
+from openmdao.solvers.solver import LinearSolver
 from openmdao.utils.array_utils import convert_neg
+from openmdao.utils.concurrent import discard_process_pools
 from openmdao.utils.general_utils import warn_deprecation, ContainsAll, all_ancestors
 from openmdao.utils.units import is_compatible
 from openmdao.utils.mpi import MPI
@@ -42,6 +44,12 @@ class Group(System):
         Object used to allocate MPI processes to subsystems.
     _proc_info : dict of subsys_name: (min_procs, max_procs, weight)
         Information used to determine MPI process allocation to subsystems.
+    _transfer_indices : dict
+        Index arrays of the transfers owned by this group, keyed by vec_name, as returned by
+        _compute_transfer_indices.
+    _transfer_plan : dict or None
+        Transfer index arrays loaded from a setup plan, to be used by the next transfer setup
+        instead of being recomputed.
     """
 
     def __init__(self, **kwargs):
@@ -65,6 +73,8 @@ class Group(System):
             self._linear_solver = LinearRunOnce()
         self._mpi_proc_allocator = DefaultAllocator()
         self._proc_info = {}
+        self._transfer_indices = {}
+        self._transfer_plan = None
 
     def setup(self):
         """
@@ -332,17 +342,22 @@ class Group(System):
                     set_name: {} for set_name in set2iset[type_]
                 }
 
+                # cumulative counts, so that entry isub is the number of vars before subsystem isub
+                offsets = np.zeros(nsub_allprocs + 1, int)
+                np.cumsum(allprocs_counters[type_], out=offsets[1:])
+                counters_byset = allprocs_counters_byset[type_]
+                offsets_byset = np.zeros((nsub_allprocs + 1, counters_byset.shape[1]), int)
+                np.cumsum(counters_byset, axis=0, out=offsets_byset[1:])
+
                 for subsys, isub in zip(self._subsystems_myproc, self._subsystems_myproc_inds):
                     if vec_name not in subsys._rel_vec_names:
                         continue
                     subsystems_var_range[vec_name][type_][subsys.name] = (
-                        np.sum(allprocs_counters[type_][:isub]),
-                        np.sum(allprocs_counters[type_][:isub + 1]))
+                        offsets[isub], offsets[isub + 1])
                     for set_name, rng in iteritems(subsystems_var_range_byset[vec_name][type_]):
                         iset = set2iset[type_][set_name]
-                        rng[subsys.name] = (np.sum(allprocs_counters_byset[type_][:isub, iset]),
-                                            np.sum(allprocs_counters_byset[type_][:isub + 1,
-                                                                                  iset]))
+                        rng[subsys.name] = (offsets_byset[isub, iset],
+                                            offsets_byset[isub + 1, iset])
 
         subsystems_var_range['nonlinear'] = subsystems_var_range['linear']
         subsystems_var_range_byset['nonlinear'] = subsystems_var_range_byset['linear']
@@ -890,8 +905,6 @@ class Group(System):
             for vec_name in subsys._lin_rel_vec_name_list:
                 subsystems_var_range = self._subsystems_var_range[vec_name]
                 subsystems_var_range_byset = self._subsystems_var_range_byset[vec_name]
-                sizes = self._var_sizes[vec_name]
-                sizes_byset = self._var_sizes_byset[vec_name]
 
                 sub_ext_num_vars[vec_name] = {}
                 sub_ext_sizes[vec_name] = {}
@@ -901,8 +914,9 @@ class Group(System):
                 for type_ in ['input', 'output']:
                     num = self._num_var[vec_name][type_]
                     idx1, idx2 = subsystems_var_range[type_][subsys.name]
-                    size1 = np.sum(sizes[type_][iproc, :idx1])
-                    size2 = np.sum(sizes[type_][iproc, idx2:])
+                    offsets = self._get_var_offsets(vec_name, type_)[iproc]
+                    size1 = offsets[idx1]
+                    size2 = offsets[-1] - offsets[idx2]
 
                     sub_ext_num_vars[vec_name][type_] = (
                         ext_num_vars[vec_name][type_][0] + idx1,
@@ -917,8 +931,9 @@ class Group(System):
                     sub_ext_num_vars_byset[vec_name][type_] = {}
                     for set_name, num in iteritems(self._num_var_byset[vec_name][type_]):
                         idx1, idx2 = subsystems_var_range_byset[type_][set_name][subsys.name]
-                        size1 = np.sum(sizes_byset[type_][set_name][iproc, :idx1])
-                        size2 = np.sum(sizes_byset[type_][set_name][iproc, idx2:])
+                        offsets = self._get_var_offsets(vec_name, type_, set_name)[iproc]
+                        size1 = offsets[idx1]
+                        size2 = offsets[-1] - offsets[idx2]
 
                         sub_ext_num_vars_byset[vec_name][type_][set_name] = (
                             ext_num_vars_byset[vec_name][type_][set_name][0] + idx1,
@@ -950,155 +965,37 @@ class Group(System):
         """
         super(Group, self)._setup_transfers()
 
-        def merge(indices_list):
-            if len(indices_list) > 0:
-                return np.concatenate(indices_list)
-            else:
-                return np.array([], int)
-
         if recurse:
             for subsys in self._subsystems_myproc:
                 subsys._setup_transfers(recurse)
 
-        # Pre-compute map from abs_names to the index of the containing subsystem
-        abs2isub = {'input': {}, 'output': {}}
-        for subsys, isub in zip(self._subsystems_myproc, self._subsystems_myproc_inds):
-            for type_ in ['input', 'output']:
-                for abs_name in subsys._var_allprocs_abs_names[type_]:
-                    abs2isub[type_][abs_name] = isub
-
-        abs2meta_in = self._var_abs2meta['input']
-        allprocs_abs2meta_out = self._var_allprocs_abs2meta['output']
+        # The index arrays may have been loaded from a setup plan; they're only valid once.
+        transfer_plan = self._transfer_plan
+        self._transfer_plan = None
 
+        abs2isub = None
         transfers = self._transfers
         vectors = self._vectors
+        self._transfer_indices = {}
         for vec_name in self._lin_rel_vec_name_list:
-            relvars, _ = self._relevant[vec_name]['@all']
+            if transfer_plan is not None and vec_name in transfer_plan:
+                indices = transfer_plan[vec_name]
+            else:
+                if abs2isub is None:
+                    # Pre-compute map from abs_names to the index of the containing subsystem
+                    abs2isub = {'input': {}, 'output': {}}
+                    for subsys, isub in zip(self._subsystems_myproc,
+                                            self._subsystems_myproc_inds):
+                        for type_ in ['input', 'output']:
+                            for abs_name in subsys._var_allprocs_abs_names[type_]:
+                                abs2isub[type_][abs_name] = isub
 
-            # Initialize empty lists for the transfer indices
-            nsub_allprocs = len(self._subsystems_allprocs)
-            xfer_in = {}
-            xfer_out = {}
-            fwd_xfer_in = [{} for i in range(nsub_allprocs)]
-            fwd_xfer_out = [{} for i in range(nsub_allprocs)]
-            rev_xfer_in = [{} for i in range(nsub_allprocs)]
-            rev_xfer_out = [{} for i in range(nsub_allprocs)]
-            for set_name_in in self._num_var_byset[vec_name]['input']:
-                for set_name_out in self._num_var_byset[vec_name]['output']:
-                    key = (set_name_in, set_name_out)
-                    xfer_in[key] = []
-                    xfer_out[key] = []
-                    for isub in range(nsub_allprocs):
-                        fwd_xfer_in[isub][key] = []
-                        fwd_xfer_out[isub][key] = []
-                        rev_xfer_in[isub][key] = []
-                        rev_xfer_out[isub][key] = []
-
-            allprocs_abs2idx_byset_in = self._var_allprocs_abs2idx_byset[vec_name]['input']
-            allprocs_abs2idx_byset_out = self._var_allprocs_abs2idx_byset[vec_name]['output']
-            sizes_byset_in = self._var_sizes_byset[vec_name]['input']
-            sizes_byset_out = self._var_sizes_byset[vec_name]['output']
-
-            # Loop through all explicit / implicit connections owned by this system
-            for abs_in, abs_out in iteritems(self._conn_abs_in2out):
-                if abs_out not in relvars['output']:
-                    continue
-
-                # Only continue if the input exists on this processor
-                if abs_in in abs2meta_in and abs_in in relvars['input']:
-
-                    # Get meta
-                    meta_in = abs2meta_in[abs_in]
-                    meta_out = allprocs_abs2meta_out[abs_out]
-
-                    # Get varset info
-                    set_name_in = meta_in['var_set']
-                    set_name_out = meta_out['var_set']
-                    idx_byset_in = allprocs_abs2idx_byset_in[abs_in]
-                    idx_byset_out = allprocs_abs2idx_byset_out[abs_out]
-
-                    # Get the sizes (byset) array
-                    sizes_in = sizes_byset_in[set_name_in]
-                    sizes_out = sizes_byset_out[set_name_out]
-
-                    # Read in and process src_indices
-                    shape_in = meta_in['shape']
-                    shape_out = meta_out['shape']
-                    global_shape_out = meta_out['global_shape']
-                    global_size_out = meta_out['global_size']
-                    src_indices = meta_in['src_indices']
-                    if src_indices is None:
-                        src_indices = np.arange(meta_in['size'], dtype=int)
-                    elif src_indices.ndim == 1:
-                        src_indices = convert_neg(src_indices, global_size_out)
-                    else:
-                        if len(shape_out) == 1 or shape_in == src_indices.shape:
-                            src_indices = src_indices.flatten()
-                            src_indices = convert_neg(src_indices, global_size_out)
-                        else:
-                            # TODO: this duplicates code found
-                            # in System._setup_scaling.
-                            entries = [list(range(x)) for x in shape_in]
-                            cols = np.vstack(src_indices[i] for i in product(*entries))
-                            dimidxs = [convert_neg(cols[:, i], global_shape_out[i])
-                                       for i in range(cols.shape[1])]
-                            src_indices = np.ravel_multi_index(dimidxs, global_shape_out)
-
-                    # 1. Compute the output indices
-                    output_inds = np.zeros(src_indices.shape[0], int)
-                    ind1 = ind2 = 0
-                    for iproc in range(self.comm.size):
-                        ind2 += sizes_out[iproc, idx_byset_out]
-
-                        # The part of src on iproc
-                        on_iproc = np.logical_and(ind1 <= src_indices, src_indices < ind2)
-
-                        # This converts from iproc-then-ivar to ivar-then-iproc ordering
-                        # Subtract off part of previous procs
-                        # Then add all variables on previous procs
-                        # Then all previous variables on this proc
-                        # - np.sum(out_sizes[:iproc, idx_byset_out])
-                        # + np.sum(out_sizes[:iproc, :])
-                        # + np.sum(out_sizes[iproc, :idx_byset_out])
-                        # + inds
-                        offset = -ind1
-                        offset += np.sum(sizes_out[:iproc, :])
-                        offset += np.sum(sizes_out[iproc, :idx_byset_out])
-                        output_inds[on_iproc] = src_indices[on_iproc] + offset
-
-                        ind1 += sizes_out[iproc, idx_byset_out]
-
-                    # 2. Compute the input indices
-                    iproc = self.comm.rank
-                    ind1 = ind2 = np.sum(sizes_in[:iproc, :])
-                    ind1 += np.sum(sizes_in[iproc, :idx_byset_in])
-                    ind2 += np.sum(sizes_in[iproc, :idx_byset_in + 1])
-                    input_inds = np.arange(ind1, ind2)
-
-                    # Now the indices are ready - input_inds, output_inds
-                    key = (set_name_in, set_name_out)
-                    xfer_in[key].append(input_inds)
-                    xfer_out[key].append(output_inds)
-
-                    isub = abs2isub['input'][abs_in]
-                    fwd_xfer_in[isub][key].append(input_inds)
-                    fwd_xfer_out[isub][key].append(output_inds)
-                    if abs_out in abs2isub['output']:
-                        isub = abs2isub['output'][abs_out]
-                        rev_xfer_in[isub][key].append(input_inds)
-                        rev_xfer_out[isub][key].append(output_inds)
-
-            for set_name_in in self._num_var_byset[vec_name]['input']:
-                for set_name_out in self._num_var_byset[vec_name]['output']:
-                    key = (set_name_in, set_name_out)
-                    xfer_in[key] = merge(xfer_in[key])
-                    xfer_out[key] = merge(xfer_out[key])
-                    for isub in range(nsub_allprocs):
-                        fwd_xfer_in[isub][key] = merge(fwd_xfer_in[isub][key])
-                        fwd_xfer_out[isub][key] = merge(fwd_xfer_out[isub][key])
-                        rev_xfer_in[isub][key] = merge(rev_xfer_in[isub][key])
-                        rev_xfer_out[isub][key] = merge(rev_xfer_out[isub][key])
+                indices = self._compute_transfer_indices(vec_name, abs2isub)
+
+            self._transfer_indices[vec_name] = indices
+            xfer_in, xfer_out, fwd_xfer_in, fwd_xfer_out, rev_xfer_in, rev_xfer_out = indices
 
+            nsub_allprocs = len(self._subsystems_allprocs)
             out_vec = vectors['output'][vec_name]
             transfer_class = out_vec.TRANSFER
 
@@ -1117,6 +1014,176 @@ class Group(System):
 
         transfers['nonlinear'] = transfers['linear']
 
+    def _compute_transfer_indices(self, vec_name, abs2isub):
+        """
+        Compute the index arrays of the transfers for the given vector.
+
+        Parameters
+        ----------
+        vec_name : str
+            Name of the vector.
+        abs2isub : {'input': dict, 'output': dict}
+            Map from absolute variable names to the index of the containing subsystem.
+
+        Returns
+        -------
+        tuple of (dict, dict, list of dict, list of dict, list of dict, list of dict)
+            Input and output indices of the full transfer, then of the fwd and the rev
+            transfers of each subsystem, keyed by (in_set_name, out_set_name).
+        """
+        def merge(indices_list):
+            if len(indices_list) > 0:
+                return np.concatenate(indices_list)
+            else:
+                return np.array([], int)
+
+        abs2meta_in = self._var_abs2meta['input']
+        allprocs_abs2meta_out = self._var_allprocs_abs2meta['output']
+
+        relvars, _ = self._relevant[vec_name]['@all']
+
+        # Initialize empty lists for the transfer indices
+        nsub_allprocs = len(self._subsystems_allprocs)
+        xfer_in = {}
+        xfer_out = {}
+        fwd_xfer_in = [{} for i in range(nsub_allprocs)]
+        fwd_xfer_out = [{} for i in range(nsub_allprocs)]
+        rev_xfer_in = [{} for i in range(nsub_allprocs)]
+        rev_xfer_out = [{} for i in range(nsub_allprocs)]
+        for set_name_in in self._num_var_byset[vec_name]['input']:
+            for set_name_out in self._num_var_byset[vec_name]['output']:
+                key = (set_name_in, set_name_out)
+                xfer_in[key] = []
+                xfer_out[key] = []
+                for isub in range(nsub_allprocs):
+                    fwd_xfer_in[isub][key] = []
+                    fwd_xfer_out[isub][key] = []
+                    rev_xfer_in[isub][key] = []
+                    rev_xfer_out[isub][key] = []
+
+        allprocs_abs2idx_byset_in = self._var_allprocs_abs2idx_byset[vec_name]['input']
+        allprocs_abs2idx_byset_out = self._var_allprocs_abs2idx_byset[vec_name]['output']
+        sizes_byset_out = self._var_sizes_byset[vec_name]['output']
+
+        # offset tables by var_set and the sizes of the data on all previous procs
+        offsets_byset_in = {}
+        proc_offsets_byset_in = {}
+        for set_name in self._num_var_byset[vec_name]['input']:
+            offsets = self._get_var_offsets(vec_name, 'input', set_name)
+            offsets_byset_in[set_name] = offsets
+            proc_offsets_byset_in[set_name] = np.cumsum(offsets[:, -1]) - offsets[:, -1]
+        offsets_byset_out = {}
+        proc_offsets_byset_out = {}
+        for set_name in self._num_var_byset[vec_name]['output']:
+            offsets = self._get_var_offsets(vec_name, 'output', set_name)
+            offsets_byset_out[set_name] = offsets
+            proc_offsets_byset_out[set_name] = np.cumsum(offsets[:, -1]) - offsets[:, -1]
+
+        # Loop through all explicit / implicit connections owned by this system
+        for abs_in, abs_out in iteritems(self._conn_abs_in2out):
+            if abs_out not in relvars['output']:
+                continue
+
+            # Only continue if the input exists on this processor
+            if abs_in in abs2meta_in and abs_in in relvars['input']:
+
+                # Get meta
+                meta_in = abs2meta_in[abs_in]
+                meta_out = allprocs_abs2meta_out[abs_out]
+
+                # Get varset info
+                set_name_in = meta_in['var_set']
+                set_name_out = meta_out['var_set']
+                idx_byset_in = allprocs_abs2idx_byset_in[abs_in]
+                idx_byset_out = allprocs_abs2idx_byset_out[abs_out]
+
+                # Get the sizes and offsets (byset) arrays
+                sizes_out = sizes_byset_out[set_name_out]
+                offsets_in = offsets_byset_in[set_name_in]
+                offsets_out = offsets_byset_out[set_name_out]
+                proc_offsets_in = proc_offsets_byset_in[set_name_in]
+                proc_offsets_out = proc_offsets_byset_out[set_name_out]
+
+                # Read in and process src_indices
+                shape_in = meta_in['shape']
+                shape_out = meta_out['shape']
+                global_shape_out = meta_out['global_shape']
+                global_size_out = meta_out['global_size']
+                src_indices = meta_in['src_indices']
+                if src_indices is None:
+                    src_indices = np.arange(meta_in['size'], dtype=int)
+                elif src_indices.ndim == 1:
+                    src_indices = convert_neg(src_indices, global_size_out)
+                else:
+                    if len(shape_out) == 1 or shape_in == src_indices.shape:
+                        src_indices = src_indices.flatten()
+                        src_indices = convert_neg(src_indices, global_size_out)
+                    else:
+                        # TODO: this duplicates code found
+                        # in System._setup_scaling.
+                        entries = [list(range(x)) for x in shape_in]
+                        cols = np.vstack(src_indices[i] for i in product(*entries))
+                        dimidxs = [convert_neg(cols[:, i], global_shape_out[i])
+                                   for i in range(cols.shape[1])]
+                        src_indices = np.ravel_multi_index(dimidxs, global_shape_out)
+
+                # 1. Compute the output indices
+                output_inds = np.zeros(src_indices.shape[0], int)
+                ind1 = ind2 = 0
+                for iproc in range(self.comm.size):
+                    ind2 += sizes_out[iproc, idx_byset_out]
+
+                    # The part of src on iproc
+                    on_iproc = np.logical_and(ind1 <= src_indices, src_indices < ind2)
+
+                    # This converts from iproc-then-ivar to ivar-then-iproc ordering
+                    # Subtract off part of previous procs
+                    # Then add all variables on previous procs
+                    # Then all previous variables on this proc
+                    # - np.sum(out_sizes[:iproc, idx_byset_out])
+                    # + np.sum(out_sizes[:iproc, :])
+                    # + np.sum(out_sizes[iproc, :idx_byset_out])
+                    # + inds
+                    offset = -ind1
+                    offset += proc_offsets_out[iproc]
+                    offset += offsets_out[iproc, idx_byset_out]
+                    output_inds[on_iproc] = src_indices[on_iproc] + offset
+
+                    ind1 += sizes_out[iproc, idx_byset_out]
+
+                # 2. Compute the input indices
+                iproc = self.comm.rank
+                ind1 = ind2 = proc_offsets_in[iproc]
+                ind1 += offsets_in[iproc, idx_byset_in]
+                ind2 += offsets_in[iproc, idx_byset_in + 1]
+                input_inds = np.arange(ind1, ind2)
+
+                # Now the indices are ready - input_inds, output_inds
+                key = (set_name_in, set_name_out)
+                xfer_in[key].append(input_inds)
+                xfer_out[key].append(output_inds)
+
+                isub = abs2isub['input'][abs_in]
+                fwd_xfer_in[isub][key].append(input_inds)
+                fwd_xfer_out[isub][key].append(output_inds)
+                if abs_out in abs2isub['output']:
+                    isub = abs2isub['output'][abs_out]
+                    rev_xfer_in[isub][key].append(input_inds)
+                    rev_xfer_out[isub][key].append(output_inds)
+
+        for set_name_in in self._num_var_byset[vec_name]['input']:
+            for set_name_out in self._num_var_byset[vec_name]['output']:
+                key = (set_name_in, set_name_out)
+                xfer_in[key] = merge(xfer_in[key])
+                xfer_out[key] = merge(xfer_out[key])
+                for isub in range(nsub_allprocs):
+                    fwd_xfer_in[isub][key] = merge(fwd_xfer_in[isub][key])
+                    fwd_xfer_out[isub][key] = merge(fwd_xfer_out[isub][key])
+                    rev_xfer_in[isub][key] = merge(rev_xfer_in[isub][key])
+                    rev_xfer_out[isub][key] = merge(rev_xfer_out[isub][key])
+
+        return xfer_in, xfer_out, fwd_xfer_in, fwd_xfer_out, rev_xfer_in, rev_xfer_out
+
     def add(self, name, subsys, promotes=None):
         """
         Add a subsystem (deprecated version of <Group.add_subsystem>).
@@ -1375,8 +1442,19 @@ class Group(System):
         self._transfer('nonlinear', 'fwd')
         # Apply recursion
         with Recording(name + '._apply_nonlinear', self.iter_count, self):
-            for subsys in self._subsystems_myproc:
-                subsys._apply_nonlinear()
+            self._run_subsystems_nonlinear(_apply_nonlinear)
+
+    def _run_subsystems_nonlinear(self, func):
+        """
+        Call func on each local subsystem, which may only modify its own nonlinear vectors.
+
+        Parameters
+        ----------
+        func : callable
+            Function taking a subsystem.
+        """
+        for subsys in self._subsystems_myproc:
+            func(subsys)
 
     def _solve_nonlinear(self):
         """
@@ -1512,6 +1590,9 @@ class Group(System):
         do_ln : boolean
             Flag indicating if the linear solver should be linearized.
         """
+        # worker processes of linear solvers that were forked before would use the old jacobians
+        discard_process_pools(LinearSolver)
+
         with self.jacobian_context() as J:
 
             sub_do_nl = (self._nonlinear_solver is not None) and \
@@ -1828,3 +1909,15 @@ def get_relevant_vars(graph, desvars, responses, mode):
     relevant['nonlinear'] = relevant['linear']
 
     return relevant
+
+
+def _apply_nonlinear(subsys):
+    """
+    Compute the residuals of the given subsystem.
+
+    Parameters
+    ----------
+    subsys : <System>
+        The subsystem.
+    """
+    subsys._apply_nonlinear()
@@ -73,10 +73,15 @@ class ImplicitComponent(Component):
         """
         Compute residuals. The model is assumed to be in a scaled state.
         """
+        if self._is_unchanged():
+            return
+
         with self._unscaled_context(outputs=[self._outputs], residuals=[self._residuals]):
             with Recording(self.pathname + '._apply_nonlinear', self.iter_count, self):
                 self.apply_nonlinear(self._inputs, self._outputs, self._residuals)
 
+        self._save_eval_state()
+
     def _solve_nonlinear(self):
         """
         Compute outputs. The model is assumed to be in a scaled state.
@@ -96,12 +101,16 @@ class ImplicitComponent(Component):
         if self._nonlinear_solver is not None:
             with Recording(self.pathname + '._solve_nonlinear', self.iter_count, self):
                 result = self._nonlinear_solver.solve()
+            self._eval_state = None
             return result
 
         else:
             with self._unscaled_context(outputs=[self._outputs]):
                 with Recording(self.pathname + '._solve_nonlinear', self.iter_count, self):
                     result = self.solve_nonlinear(self._inputs, self._outputs)
+
+            # The outputs were modified in place, so the residuals must be recomputed.
+            self._eval_state = None
             if result is None:
                 return False, 0., 0.
             elif type(result) is bool:
@@ -115,6 +124,7 @@ class ImplicitComponent(Component):
         """
         with self._unscaled_context(outputs=[self._outputs], residuals=[self._residuals]):
             self.guess_nonlinear(self._inputs, self._outputs, self._residuals)
+        self._eval_state = None
 
     def _apply_linear(self, vec_names, rel_systems, mode, scope_out=None, scope_in=None):
         """
@@ -1,6 +1,7 @@
 """Define the ParallelGroup class."""
 
 from openmdao.core.group import Group
+from openmdao.utils.concurrent import run_subsystems, get_nonlinear_vectors
 
 
 class ParallelGroup(Group):
@@ -20,3 +21,39 @@ class ParallelGroup(Group):
         """
         super(ParallelGroup, self).__init__(**kwargs)
         self._mpi_proc_allocator.parallel = True
+
+        self.options.declare('executor', values=[None, 'thread', 'process'], default=None,
+                             desc="If 'thread' or 'process', run the local subsystems "
+                                  "concurrently on a pool of threads or forked processes when "
+                                  "solving and evaluating residuals. Derivatives are always "
+                                  "computed serially.")
+        self.options.declare('max_workers', types=int, default=None, allow_none=True, lower=1,
+                             desc='Maximum number of threads or processes used by the '
+                                  'executor. If None, use up to one per cpu.')
+
+    def _run_subsystems_nonlinear(self, func):
+        """
+        Call func on each local subsystem, which may only modify its own nonlinear vectors.
+
+        Parameters
+        ----------
+        func : callable
+            Module level function taking a subsystem.
+        """
+        # func is sent to the workers, so that solving and evaluating residuals share a pool
+        run_subsystems(_call, self._subsystems_myproc, get_nonlinear_vectors,
+                       self.options['executor'], self.options['max_workers'], (func,), self)
+
+
+def _call(subsys, func):
+    """
+    Call func on the given subsystem.
+
+    Parameters
+    ----------
+    subsys : <System>
+        The subsystem.
+    func : callable
+        Function taking a subsystem.
+    """
+    func(subsys)
@@ -22,10 +22,13 @@ from openmdao.core.group import Group
 from openmdao.core.indepvarcomp import IndepVarComp
 from openmdao.error_checking.check_config import check_config
 from openmdao.recorders.recording_iteration_stack import recording_iteration
+from openmdao.utils.concurrent import discard_process_pools, shutdown_pools
 from openmdao.utils.general_utils import warn_deprecation, ContainsAll
 from openmdao.utils.logger_utils import get_logger
 from openmdao.utils.mpi import MPI, FakeComm
 from openmdao.utils.name_maps import prom_name2abs_name
+from openmdao.utils.setup_cache import SetupCache
+from openmdao.utils.timing import ExecutionTimer
 from openmdao.vectors.default_vector import DefaultVector
 try:
     from openmdao.vectors.petsc_vector import PETScVector
@@ -40,6 +43,70 @@ MagnitudeTuple = namedtuple('MagnitudeTuple', ['forward', 'reverse', 'fd'])
 _contains_all = ContainsAll()
 
 
+class VarAccessor(object):
+    """
+    Handle for fast repeated access to the value of one variable of a <Problem>.
+
+    The variable name is resolved once, when the accessor is created, so get and set only cost
+    a lookup of the view.
+
+    Attributes
+    ----------
+    name : str
+        Promoted or relative name of the variable in the model's namespace.
+    _system : <System>
+        The model.
+    _vec_attr : str
+        Attribute of the model holding the vector of the variable, '_outputs' or '_inputs'.
+    _abs_name : str
+        Absolute name of the variable.
+    """
+
+    def __init__(self, name, system, vec_attr, abs_name):
+        """
+        Store the resolved variable.
+
+        Parameters
+        ----------
+        name : str
+            Promoted or relative name of the variable in the model's namespace.
+        system : <System>
+            The model.
+        vec_attr : str
+            Attribute of the model holding the vector of the variable, '_outputs' or '_inputs'.
+        abs_name : str
+            Absolute name of the variable.
+        """
+        self.name = name
+        self._system = system
+        self._vec_attr = vec_attr
+        self._abs_name = abs_name
+
+    def get(self):
+        """
+        Return the value of the variable.
+
+        Returns
+        -------
+        ndarray
+            View of the variable in the vector, so in-place changes modify the variable.
+        """
+        return getattr(self._system, self._vec_attr)._views[self._abs_name]
+
+    def set(self, value):
+        """
+        Set the value of the variable.
+
+        Parameters
+        ----------
+        value : float or ndarray
+            Value that can be broadcast to the shape of the variable.
+        """
+        vec = getattr(self._system, self._vec_attr)
+        vec._views[self._abs_name][...] = value
+        vec._bump_version()
+
+
 class Problem(object):
     """
     Top-level container for the systems and drivers.
@@ -53,6 +120,9 @@ class Problem(object):
     driver : <Driver>
         Slot for the driver. The default driver is `Driver`, which just runs
         the model once.
+    timer : <ExecutionTimer> or None
+        Call counts and times of the execution methods of the model, if setup was called with
+        timing=True.
     _mode : 'fwd' or 'rev'
         Derivatives calculation mode, 'fwd' for forward, and 'rev' for
         reverse (adjoint).
@@ -68,6 +138,13 @@ class Problem(object):
         0 -- Newly initialized problem or newly added model.
         1 -- The `setup` method has been called, but vectors not initialized.
         2 -- The `final_setup` has been run, everything ready to run.
+    _setup_cache : <SetupCache> or None
+        Cache of setup data that is reused between setups of structurally identical models.
+    _pool_deriv_vectors : bool
+        If True, the derivative vectors of different vectorized or parallel derivative vois share
+        their storage wherever their linear solves never run together.
+    _timing : bool
+        If True, the model is instrumented by the timer at final setup.
     """
 
     def __init__(self, model=None, comm=None, use_ref_vector=True, root=None):
@@ -113,6 +190,10 @@ class Problem(object):
         self._solver_print_cache = []
 
         self._mode = None  # mode is assigned in setup()
+        self._setup_cache = None
+        self._pool_deriv_vectors = False
+        self._timing = False
+        self.timer = None
 
         recording_iteration.stack = []
 
@@ -225,6 +306,36 @@ class Problem(object):
                 msg = 'Variable name "{}" not found.'
                 raise KeyError(msg.format(name))
 
+    def get_accessor(self, name):
+        """
+        Return an object that gets and sets the given variable without resolving its name.
+
+        This is faster than item access when the same variable is read or written many times,
+        e.g., in a loop around run_model. Like item access, an output is returned in preference
+        to an input of the same promoted name.
+
+        Parameters
+        ----------
+        name : str
+            Promoted or relative variable name in the root system's namespace.
+
+        Returns
+        -------
+        <VarAccessor>
+            Accessor bound to the variable.
+        """
+        if self._setup_status < 2:
+            raise RuntimeError("get_accessor requires the vectors, so it must be called after "
+                               "final_setup, run_model, or run_driver.")
+
+        for vec_attr in ('_outputs', '_inputs'):
+            abs_name = getattr(self.model, vec_attr)._name2abs_name(name)
+            if abs_name is not None:
+                return VarAccessor(name, self.model, vec_attr, abs_name)
+
+        msg = 'Variable name "{}" not found.'
+        raise KeyError(msg.format(name))
+
     def _set_initial_conditions(self):
         """
         Set all initial conditions that have been saved in cache after setup.
@@ -280,6 +391,8 @@ class Problem(object):
             raise RuntimeError("The `setup` method must be called before `run_model`.")
 
         self.final_setup()
+        # the model may have been changed since the process pools were forked
+        discard_process_pools()
         self.model._clear_iprint()
         return self.model.run_solve_nonlinear()
 
@@ -296,6 +409,7 @@ class Problem(object):
             raise RuntimeError("The `setup` method must be called before `run_driver`.")
 
         self.final_setup()
+        discard_process_pools()
         self.model._clear_iprint()
         with self.model._scaled_context_all():
             return self.driver.run()
@@ -337,9 +451,10 @@ class Problem(object):
         Clean up resources prior to exit.
         """
         self.driver.cleanup()
+        shutdown_pools()
 
     def setup(self, vector_class=DefaultVector, check=True, logger=None, mode='rev',
-              force_alloc_complex=False):
+              force_alloc_complex=False, setup_cache=None, pool_deriv_vectors=False, timing=False):
         """
         Set up the model hierarchy.
 
@@ -363,6 +478,18 @@ class Problem(object):
             Force allocation of imaginary part in nonlinear vectors. OpenMDAO can generally
             detect when you need to do this, but in some cases (e.g., complex step is used
             after a reconfiguration) you may need to set this to True.
+        setup_cache : str or None
+            Name of a file in which the data that setup derives from the structure of the model
+            (relevance and transfer indices) is stored. If the file already holds the data of
+            a structurally identical model, it is reused rather than recomputed.
+        pool_deriv_vectors : bool
+            If True, the derivative vectors of the vectorized and parallel derivative design
+            variables (in fwd mode) or responses (in rev mode) share their storage wherever their
+            linear solves never run together. This saves memory when there are many of them.
+            Only supported when running on a single process.
+        timing : bool
+            If True, count and time the calls of the execution methods of all systems and solvers
+            in the model. The results are collected in the `timer` attribute.
 
         Returns
         -------
@@ -383,15 +510,25 @@ class Problem(object):
             msg = "Unsupported mode: '%s'. Use either 'fwd' or 'rev'." % mode
             raise ValueError(msg)
 
+        if pool_deriv_vectors and comm.size > 1:
+            raise ValueError("The `pool_deriv_vectors` argument is not supported when running "
+                             "in parallel under MPI.")
+
         self._mode = mode
 
-        model._setup(comm, 'full', mode)
+        if setup_cache is not None:
+            setup_cache = SetupCache(setup_cache)
+        self._setup_cache = setup_cache
+
+        model._setup(comm, 'full', mode, setup_cache)
 
         # Cache all args for final setup.
         self._vector_class = vector_class
         self._check = check
         self._logger = logger
         self._force_alloc_complex = force_alloc_complex
+        self._pool_deriv_vectors = pool_deriv_vectors
+        self._timing = timing
 
         self._setup_status = 1
         return self
@@ -416,7 +553,16 @@ class Problem(object):
         mode = self._mode
 
         if self._setup_status < 2:
-            model._final_setup(comm, vector_class, 'full', force_alloc_complex=force_alloc_complex)
+            model._final_setup(comm, vector_class, 'full', force_alloc_complex=force_alloc_complex,
+                               pool_deriv_vectors=self._pool_deriv_vectors)
+
+            if self._setup_cache is not None:
+                self._setup_cache.save(model)
+
+            if self._timing:
+                if self.timer is None:
+                    self.timer = ExecutionTimer()
+                self.timer.instrument(model)
 
         self.driver._setup_driver(self)
 
@@ -1130,6 +1276,21 @@ class Problem(object):
 
         return voi_info
 
+    def _zero_lin_vectors(self, vec_names):
+        """
+        Zero the derivative vectors of the given vec_names before they are solved for.
+
+        Parameters
+        ----------
+        vec_names : [str, ...]
+            Names of the linear vectors.
+        """
+        vectors = self.model._vectors
+        for vec_name in vec_names:
+            vectors['input'][vec_name].set_const(0.0)
+            vectors['output'][vec_name].set_const(0.0)
+            vectors['residual'][vec_name].set_const(0.0)
+
     def _compute_totals_multi(self, totals, vois, voi_info, lin_vec_names, mode,
                               output_list, old_output_list, output_vois,
                               use_rel_reduction, rel_systems, return_format):
@@ -1319,15 +1480,12 @@ class Problem(object):
         # -------------------------------------------------------------------
 
         # Prepare model for calculation by cleaning out the derivatives
-        # vectors.
+        # vectors. The vectors of the other vec_names are cleaned out right before they are used,
+        # since they may share their storage.
         matmat = False
-        for vec_name in model._lin_vec_names:
-
-            # TODO: Do all three deriv vectors have the same keys?
-
-            vec_dinput[vec_name].set_const(0.0)
-            vec_doutput[vec_name].set_const(0.0)
-            vec_dresid[vec_name].set_const(0.0)
+        vec_dinput['linear'].set_const(0.0)
+        vec_doutput['linear'].set_const(0.0)
+        vec_dresid['linear'].set_const(0.0)
 
         # Linearize Model
         model._linearize()
@@ -1403,6 +1561,10 @@ class Problem(object):
                 meta = input_vois[name]
                 parallel_deriv_color = meta['parallel_deriv_color']
                 varmatmat |= (meta['vectorize_derivs'] and meta['size'] > 1)
+
+                # pooled vectors of vectorized vois can't be solved for together
+                if parallel_deriv_color == '@matmat' and self._pool_deriv_vectors:
+                    parallel_deriv_color = None
             else:
                 parallel_deriv_color = None
                 use_rel_reduction = False
@@ -1425,12 +1587,16 @@ class Problem(object):
 
             matmat |= varmatmat
 
-        lin_vec_names = sorted(set(inp2rhs_name.values()))
+        # only the vec_names of the variables in the same voi list are solved together
+        voi_vec_names = {key: sorted(set(inp2rhs_name[name] for name, _ in vois))
+                         for key, vois in iteritems(voi_lists)}
 
         voi_info = self._get_voi_info(voi_lists, inp2rhs_name, input_vec, output_vec, input_vois)
 
         if matmat:
-            for vois in itervalues(voi_lists):
+            for key, vois in iteritems(voi_lists):
+                lin_vec_names = voi_vec_names[key]
+                self._zero_lin_vectors(lin_vec_names)
                 if use_rel_reduction:
                     rel_systems = set()
                     for voi, _ in vois:
@@ -1444,9 +1610,11 @@ class Problem(object):
             recording_iteration.stack.pop()
             return totals
 
-        for vois in itervalues(voi_lists):
+        for key, vois in iteritems(voi_lists):
             # If Forward mode, solve linear system for each 'wrt'
             # If Adjoint mode, solve linear system for each 'of'
+            lin_vec_names = voi_vec_names[key]
+            self._zero_lin_vectors(lin_vec_names)
 
             if use_rel_reduction:
                 rel_systems = set()
@@ -7,7 +7,7 @@ from fnmatch import fnmatchcase
 import sys
 from itertools import product
 
-from six import iteritems, string_types
+from six import iteritems, itervalues, string_types
 from six.moves import range
 
 import numpy as np
@@ -23,6 +23,7 @@ from openmdao.utils.mpi import MPI
 from openmdao.utils.options_dictionary import OptionsDictionary
 from openmdao.utils.units import get_conversion
 from openmdao.utils.array_utils import convert_neg
+from openmdao.utils.concurrent import discard_process_pools
 from openmdao.utils.record_util import create_local_meta, check_path
 from openmdao.utils.logger_utils import get_logger
 
@@ -109,6 +110,8 @@ class System(object):
         owned by this system and num_var is the number of allprocs variables.
     _var_sizes_byset : {'input': dict of ndarray, 'output': dict of ndarray}
         Same as above, but by var_set name.
+    _var_offsets : {(vec_name, type_, set_name): ndarray}
+        Cache of the cumulative offset tables computed from _var_sizes and _var_sizes_byset.
     #
     _manual_connections : dict
         Dictionary of input_name: (output_name, src_indices) connections.
@@ -310,6 +313,7 @@ class System(object):
 
         self._var_sizes = None
         self._var_sizes_byset = None
+        self._var_offsets = {}
 
         self._manual_connections = {}
         self._conn_global_abs_in2out = {}
@@ -383,8 +387,12 @@ class System(object):
 
         if reconf:
             with self._unscaled_context_all():
-                # Backup input values
-                old = {'input': self._inputs, 'output': self._outputs}
+                # Backup input and output values; the root vectors are resized in place, so
+                # the old views don't keep them.
+                old = {}
+                for type_, vec in [('input', self._inputs), ('output', self._outputs)]:
+                    old[type_] = {abs_name: view.copy()
+                                  for abs_name, view in iteritems(vec._views_flat)}
 
                 # Perform reconfiguration
                 self.resetup('reconf')
@@ -393,7 +401,7 @@ class System(object):
 
                 # Reload input and output values where possible
                 for type_ in ['input', 'output']:
-                    for abs_name, old_view in iteritems(old[type_]._views_flat):
+                    for abs_name, old_view in iteritems(old[type_]):
                         if abs_name in new[type_]._views_flat:
                             new_view = new[type_]._views_flat[abs_name]
 
@@ -523,7 +531,8 @@ class System(object):
 
             return ext_num_vars, ext_num_vars_byset, ext_sizes, ext_sizes_byset
 
-    def _get_root_vectors(self, vector_class, initial, force_alloc_complex=False):
+    def _get_root_vectors(self, vector_class, initial, force_alloc_complex=False,
+                          pool_deriv_vectors=False):
         """
         Get the root vectors for the nonlinear and linear vectors for the model.
 
@@ -537,6 +546,9 @@ class System(object):
             Force allocation of imaginary part in nonlinear vectors. OpenMDAO can generally
             detect when you need to do this, but in some cases (e.g., complex step is used
             after a reconfiguration) you may need to set this to True.
+        pool_deriv_vectors : bool
+            If True, the vectors of the vectorized and parallel derivative vois share their
+            storage wherever their linear solves never run together.
 
         Returns
         -------
@@ -576,7 +588,8 @@ class System(object):
                 if vec_name == 'nonlinear':
                     alloc_complex = nl_alloc_complex
                 else:
-                    alloc_complex = force_alloc_complex
+                    # complex step only ever runs on the nonlinear vectors
+                    alloc_complex = False
 
                     if vec_name != 'linear':
                         voi = vois[vec_name]
@@ -593,6 +606,9 @@ class System(object):
                     root_vectors[key][vec_name] = vector_class(vec_name, key, self,
                                                                alloc_complex=alloc_complex,
                                                                ncol=ncol, relevant=rel)
+
+            if pool_deriv_vectors:
+                self._pool_root_vectors(root_vectors)
         else:
 
             for key, vardict in iteritems(self._vectors):
@@ -601,6 +617,54 @@ class System(object):
 
         return root_vectors
 
+    def _pool_root_vectors(self, root_vectors):
+        """
+        Let the root vectors of the vectorized and parallel derivative vois share storage.
+
+        Only the vec_names of the same parallel_deriv_color are solved together, so each of them
+        is given a different slot. All vec_names in the same slot share one buffer per vector
+        kind and var_set, sized for the largest of them. The vectorized vois that were only
+        grouped under the '@matmat' color for speed are solved one at a time when pooling.
+
+        Parameters
+        ----------
+        root_vectors : dict of dict of Vector
+            Root vectors: first key is 'input', 'output', or 'residual'; second key is vec_name.
+        """
+        vois = self._vois
+        slots = {}
+        ncolors = defaultdict(int)
+        for vec_name in self._rel_vec_name_list:
+            if vec_name in ('nonlinear', 'linear'):
+                continue
+            color = vois[vec_name]['parallel_deriv_color']
+            if color is None or color == '@matmat':
+                slots[vec_name] = 0
+            else:
+                slots[vec_name] = ncolors[color]
+                ncolors[color] += 1
+
+        for vectors in itervalues(root_vectors):
+            sizes = defaultdict(int)
+            for vec_name, slot in iteritems(slots):
+                for set_name, data in iteritems(vectors[vec_name]._data):
+                    sizes[slot, set_name] = max(sizes[slot, set_name], data.size)
+
+            buffers = {key: np.zeros(size) for key, size in iteritems(sizes)}
+            imag_buffers = {}
+
+            for vec_name, slot in iteritems(slots):
+                vec = vectors[vec_name]
+                if vec._alloc_complex:
+                    for set_name in vec._data:
+                        if (slot, set_name) not in imag_buffers:
+                            imag_buffers[slot, set_name] = np.zeros(sizes[slot, set_name])
+
+                vec._use_pool_data(
+                    {set_name: buffers[slot, set_name] for set_name in vec._data},
+                    {set_name: imag_buffers[slot, set_name] for set_name in vec._data
+                     if (slot, set_name) in imag_buffers})
+
     def _get_bounds_root_vectors(self, vector_class, initial):
         """
         Get the root vectors for the lower and upper bounds vectors.
@@ -637,10 +701,13 @@ class System(object):
         setup_mode : str
             Must be one of 'full', 'reconf', or 'update'.
         """
+        # forked worker processes would keep using the old vectors, which may be reallocated
+        discard_process_pools()
+
         self._setup(self.comm, setup_mode=setup_mode, mode=self._mode)
         self._final_setup(self.comm, self._outputs.__class__, setup_mode=setup_mode)
 
-    def _setup(self, comm, setup_mode, mode):
+    def _setup(self, comm, setup_mode, mode, setup_cache=None):
         """
         Perform setup for this system and its descendant systems.
 
@@ -657,6 +724,9 @@ class System(object):
             Must be one of 'full', 'reconf', or 'update'.
         mode : str or None
             Derivative direction, either 'fwd', or 'rev', or None
+        setup_cache : <SetupCache> or None
+            If given in a full setup, cached setup data of a structurally identical model is
+            reused rather than recomputed.
         """
         # 1. Full setup that must be called in the root system.
         if setup_mode == 'full':
@@ -694,7 +764,12 @@ class System(object):
         self._setup_var_data(recurse=recurse)
         self._setup_vec_names(mode, self._vec_names, self._vois)
         self._setup_global_connections(recurse=recurse)
-        self._setup_relevance(mode, self._relevant)
+
+        relevant = self._relevant
+        if setup_mode == 'full' and setup_cache is not None:
+            relevant = setup_cache.apply(self, mode)
+
+        self._setup_relevance(mode, relevant)
         self._setup_vars(recurse=recurse)
         self._setup_var_index_ranges(self._get_initial_var_indices(initial), recurse=recurse)
         self._setup_var_index_maps(recurse=recurse)
@@ -732,7 +807,8 @@ class System(object):
             for subsys in self._subsystems_myproc:
                 subsys._setup_case_recording(recurse)
 
-    def _final_setup(self, comm, vector_class, setup_mode, force_alloc_complex=False):
+    def _final_setup(self, comm, vector_class, setup_mode, force_alloc_complex=False,
+                     pool_deriv_vectors=False):
         """
         Perform final setup for this system and its descendant systems.
 
@@ -755,6 +831,9 @@ class System(object):
             Force allocation of imaginary part in nonlinear vectors. OpenMDAO can generally
             detect when you need to do this, but in some cases (e.g., complex step is used
             after a reconfiguration) you may need to set this to True.
+        pool_deriv_vectors : bool
+            If True, the vectors of the vectorized and parallel derivative vois share their
+            storage wherever their linear solves never run together.
         """
         # 1. Full setup that must be called in the root system.
         if setup_mode == 'full':
@@ -778,7 +857,8 @@ class System(object):
             self._get_initial_global(initial)
         self._setup_global(ext_num_vars, ext_num_vars_byset, ext_sizes, ext_sizes_byset)
         root_vectors = self._get_root_vectors(vector_class, initial,
-                                              force_alloc_complex=force_alloc_complex)
+                                              force_alloc_complex=force_alloc_complex,
+                                              pool_deriv_vectors=pool_deriv_vectors)
         self._setup_vectors(root_vectors, resize=resize)
         self._setup_bounds(*self._get_bounds_root_vectors(vector_class, initial), resize=resize)
 
@@ -921,8 +1001,51 @@ class System(object):
         """
         self._var_sizes = {}
         self._var_sizes_byset = {}
+        self._var_offsets = {}
         self._owning_rank = {'input': defaultdict(int), 'output': defaultdict(int)}
 
+    def _get_var_offsets(self, vec_name, type_, set_name=None):
+        """
+        Return the table of local offsets of this system's allprocs variables.
+
+        Entry [iproc, idx] of the table is the offset of variable idx in the local data on iproc,
+        i.e., np.sum(sizes[iproc, :idx]), so the last column holds the total local sizes. The
+        table is computed once from _var_sizes (or _var_sizes_byset if set_name is given) and
+        cached, so that looking up the offsets of all the variables takes linear time.
+
+        Parameters
+        ----------
+        vec_name : str
+            Name of the vector.
+        type_ : str
+            'input' or 'output'.
+        set_name : str or None
+            Name of the var_set, or None to use the offsets among all variables.
+
+        Returns
+        -------
+        ndarray[nproc, num_var + 1]
+            The offset table.
+        """
+        if vec_name == 'nonlinear':
+            vec_name = 'linear'  # the sizes are shared
+
+        key = (vec_name, type_, set_name)
+        try:
+            return self._var_offsets[key]
+        except KeyError:
+            pass
+
+        if set_name is None:
+            sizes = self._var_sizes[vec_name][type_]
+        else:
+            sizes = self._var_sizes_byset[vec_name][type_][set_name]
+
+        offsets = np.zeros((sizes.shape[0], sizes.shape[1] + 1), int)
+        np.cumsum(sizes, axis=1, out=offsets[:, 1:])
+        self._var_offsets[key] = offsets
+        return offsets
+
     def _setup_global_shapes(self):
         """
         Compute the global size and shape of all variables on this system.
@@ -1431,29 +1554,34 @@ class System(object):
             If int, perform a partial transfer for linear Gauss--Seidel.
         """
         vec_inputs = self._vectors['input'][vec_name]
+        vec_outputs = self._vectors['output'][vec_name]
+        transfer = self._transfers[vec_name][mode, isub]
 
         if mode == 'fwd':
             if self._has_input_scaling:
                 vec_inputs.scale('norm')
-                self._transfers[vec_name][mode, isub].transfer(vec_inputs,
-                                                               self._vectors['output'][vec_name],
-                                                               mode)
+                changed = transfer.transfer(vec_inputs, vec_outputs, mode)
                 vec_inputs.scale('phys')
             else:
-                self._transfers[vec_name][mode, isub].transfer(vec_inputs,
-                                                               self._vectors['output'][vec_name],
-                                                               mode)
+                changed = transfer.transfer(vec_inputs, vec_outputs, mode)
+
+            # Transfers that report no change leave the inputs' version alone so that
+            # components with 'skip_unchanged' set can avoid re-evaluation.
+            if changed is not False and vec_inputs._versions is not None:
+                if isub is None:
+                    vec_inputs._bump_version()
+                else:
+                    name = self._subsystems_allprocs[isub].name
+                    pathname = self.pathname + '.' + name if self.pathname else name
+                    vec_inputs._bump_version(pathname)
         else:  # rev
             if self._has_input_scaling:
                 vec_inputs.scale('phys')
-                self._transfers[vec_name][mode, isub].transfer(vec_inputs,
-                                                               self._vectors['output'][vec_name],
-                                                               mode)
+                transfer.transfer(vec_inputs, vec_outputs, mode)
                 vec_inputs.scale('norm')
             else:
-                self._transfers[vec_name][mode, isub].transfer(vec_inputs,
-                                                               self._vectors['output'][vec_name],
-                                                               mode)
+                transfer.transfer(vec_inputs, vec_outputs, mode)
+            vec_outputs._bump_version()
 
     def _get_maps(self, prom_names):
         """
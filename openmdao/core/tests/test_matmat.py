@@ -448,6 +448,45 @@ class MatMatTestCase(unittest.TestCase):
             assert_rel_error(self, expected, p['p%d.y_lgl' % i], 1.e-5)
 
 
+class PoolDerivVectorsTestCase(unittest.TestCase):
+
+    def _check_totals(self, mode, dvgroup, congroup):
+        totals = []
+        for pool in (False, True):
+            p, _ = phase_model(order=5, nphases=3, dvgroup=dvgroup, congroup=congroup,
+                               vectorize=True)
+            p.setup(check=False, mode=mode, pool_deriv_vectors=pool)
+            p.run_model()
+            totals.append(p.driver._compute_totals(return_format='dict'))
+
+        for of, subtotals in totals[0].items():
+            for wrt, val in subtotals.items():
+                assert_rel_error(self, totals[1][of][wrt], val, 1e-12)
+
+        return p
+
+    def _shares_memory(self, p, name1, name2):
+        vec1 = p.model._vectors['output'][name1]
+        vec2 = p.model._vectors['output'][name2]
+        return np.shares_memory(vec1._data[0], vec2._data[0])
+
+    def test_pool_fwd(self):
+        p = self._check_totals('fwd', None, None)
+        self.assertTrue(self._shares_memory(p, 'p0.y_lgl_ivc.y_lgl', 'p2.y_lgl_ivc.y_lgl'))
+
+    def test_pool_rev(self):
+        p = self._check_totals('rev', None, None)
+        self.assertTrue(self._shares_memory(p, 'p0.defect.defect', 'p1.defect.defect'))
+
+    def test_pool_parallel_deriv_color(self):
+        # vois of the same parallel_deriv_color are solved together, so they can't share
+        p = self._check_totals('fwd', 'pardv', 'parc')
+        self.assertFalse(self._shares_memory(p, 'p0.y_lgl_ivc.y_lgl', 'p1.y_lgl_ivc.y_lgl'))
+
+        p = self._check_totals('rev', 'pardv', 'parc')
+        self.assertFalse(self._shares_memory(p, 'p0.defect.defect', 'p1.defect.defect'))
+
+
 class JacVec(ExplicitComponent):
 
     def __init__(self, size):
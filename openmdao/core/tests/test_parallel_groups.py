@@ -2,6 +2,7 @@
 
 from __future__ import division, print_function
 
+import mmap
 import unittest
 import numpy
 
@@ -305,6 +306,153 @@ class TestParallelGroups(unittest.TestCase):
             self.assertTrue(msg in testlogger.get('info')[0])
 
 
+class TestParallelGroupExecutors(unittest.TestCase):
+
+    def _build_multipoint(self, executor, vector_class, npoints=4):
+        prob = Problem()
+        model = prob.model
+
+        model.add_subsystem('iv', IndepVarComp('x', numpy.arange(npoints, dtype=float)))
+
+        par = model.add_subsystem('par', ParallelGroup())
+        par.options['executor'] = executor
+        par.options['max_workers'] = 2
+        for i in range(npoints):
+            point = par.add_subsystem('p%d' % i, Group())
+            point.add_subsystem('plus', ExecComp('y = x + %d.0' % i))
+            point.add_subsystem('times', ExecComp('y = 2.0 * x**2'))
+            point.connect('plus.y', 'times.x')
+
+            model.connect('iv.x', 'par.p%d.plus.x' % i, src_indices=[i])
+
+        names = ['x%d' % i for i in range(npoints)]
+        model.add_subsystem('total', ExecComp('y = ' + ' + '.join(names)))
+        for i in range(npoints):
+            model.connect('par.p%d.times.y' % i, 'total.x%d' % i)
+
+        prob.setup(vector_class=vector_class, check=False)
+        prob.set_solver_print(level=0)
+
+        return prob
+
+    def test_executors(self):
+        from openmdao.api import DefaultVector, SharedMemoryVector
+
+        for vector_class in (DefaultVector, SharedMemoryVector):
+            for executor in (None, 'thread', 'process'):
+                prob = self._build_multipoint(executor, vector_class)
+                prob.run_model()
+
+                for i in range(4):
+                    assert_rel_error(self, prob['par.p%d.times.y' % i], 2.0 * (2 * i)**2)
+
+                # residuals are evaluated concurrently too
+                prob.model.run_apply_nonlinear()
+                assert_rel_error(self, prob.model._residuals.get_norm(), 0.0, 1e-12)
+
+                prob['iv.x'] = numpy.ones(4)
+                prob.run_model()
+
+                for i in range(4):
+                    assert_rel_error(self, prob['par.p%d.times.y' % i], 2.0 * (1 + i)**2)
+                assert_rel_error(self, prob['total.y'], 60.0)
+
+                J = prob.compute_totals(of=['par.p1.times.y'], wrt=['iv.x'],
+                                        return_format='flat_dict')
+                assert_rel_error(self, J['par.p1.times.y', 'iv.x'], [[0.0, 8.0, 0.0, 0.0]], 1e-6)
+
+    def test_shared_memory(self):
+        from openmdao.api import SharedMemoryVector
+
+        prob = self._build_multipoint('process', SharedMemoryVector)
+        prob.run_model()
+        assert_rel_error(self, prob['par.p3.times.y'], 72.0)
+
+        for data in prob.model._outputs._data.values():
+            base = data
+            while isinstance(base, numpy.ndarray):
+                base = base.base
+            # newer versions of numpy keep a memoryview of the buffer
+            if isinstance(base, memoryview):
+                base = base.obj
+            self.assertIsInstance(base, mmap.mmap)
+
+    def test_process_pool(self):
+        from openmdao.api import DefaultVector, SharedMemoryVector
+        from openmdao.utils import concurrent
+
+        for vector_class in (DefaultVector, SharedMemoryVector):
+            prob = self._build_multipoint('process', vector_class)
+            prob.run_model()
+
+            # solving and evaluating residuals use the same workers, which see new inputs
+            pools = list(concurrent._process_pools.values())
+            self.assertEqual(len(pools), 1)
+
+            prob.model._outputs['par.p2.times.y'] = 0.0
+            prob.model.run_apply_nonlinear()
+            assert_rel_error(self, prob.model._residuals['par.p2.times.y'], -32.0)
+
+            prob['iv.x'] = numpy.ones(4)
+            prob.model.run_solve_nonlinear()
+            assert_rel_error(self, prob['par.p2.times.y'], 18.0)
+            self.assertEqual(list(concurrent._process_pools.values()), pools)
+
+            prob.cleanup()
+            self.assertEqual(concurrent._process_pools, {})
+
+    def test_process_pool_reconf(self):
+        from openmdao.api import DefaultVector, SharedMemoryVector
+        from openmdao.utils import concurrent
+
+        for vector_class in (DefaultVector, SharedMemoryVector):
+            prob = Problem()
+            model = prob.model
+            model.add_subsystem('iv', IndepVarComp('x', 1.0))
+            par = model.add_subsystem('par', ParallelGroup())
+            par.options['executor'] = 'process'
+            par.add_subsystem('c1', ExecComp('y = 2.0 * x'))
+            par.add_subsystem('c2', ExecComp('y = 3.0 * x'))
+            model.add_subsystem('grow', GrowingComp())
+            model.connect('iv.x', ['par.c1.x', 'par.c2.x', 'grow.x'])
+
+            prob.setup(vector_class=vector_class, check=False)
+            prob.run_model()
+            self.assertEqual(len(concurrent._process_pools), 1)
+
+            # growing the root vectors reallocates them, so the workers are forked again
+            data = prob.model._outputs._data.copy()
+            model.grow.resetup('reconf')
+            model.resetup('update')
+            self.assertEqual(concurrent._process_pools, {})
+            for set_name, array in prob.model._outputs._data.items():
+                self.assertFalse(numpy.shares_memory(array, data[set_name]))
+
+            prob['iv.x'] = 2.0
+            prob.model.run_solve_nonlinear()
+            assert_rel_error(self, prob['par.c1.y'], 4.0)
+            assert_rel_error(self, prob['par.c2.y'], 6.0)
+            assert_rel_error(self, prob['grow.y'], 2.0 * numpy.ones(2))
+            self.assertEqual(len(concurrent._process_pools), 1)
+
+            prob.cleanup()
+
+
+class GrowingComp(ExplicitComponent):
+
+    def __init__(self):
+        super(GrowingComp, self).__init__()
+        self.size = 0
+
+    def setup(self):
+        self.size += 1
+        self.add_input('x', val=1.0)
+        self.add_output('y', val=numpy.zeros(self.size))
+
+    def compute(self, inputs, outputs):
+        outputs['y'] = inputs['x']
+
+
 if __name__ == "__main__":
     from openmdao.utils.mpi import mpirun_tests
     mpirun_tests()
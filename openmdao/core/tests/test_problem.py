@@ -531,6 +531,91 @@ class TestProblem(unittest.TestCase):
         assert_rel_error(self, prob['y1'], 9.87161739688, 1e-6)
         assert_rel_error(self, prob['y2'], 8.14191301549, 1e-6)
 
+    def test_feature_get_accessor(self):
+        import numpy as np
+
+        from openmdao.api import Problem, NonlinearBlockGS
+        from openmdao.test_suite.components.sellar import SellarDerivatives
+
+        prob = Problem()
+        prob.model = SellarDerivatives()
+        prob.model.nonlinear_solver = NonlinearBlockGS()
+
+        prob.setup()
+        prob.final_setup()
+
+        # resolve the names once, then get and set the values in a loop
+        x = prob.get_accessor('x')
+        z = prob.get_accessor('z')
+        y1 = prob.get_accessor('y1')
+
+        x.set(2.75)
+        results = []
+        for val in (1.5, 2.5):
+            z.set(np.array([val, val]))
+            prob.run_model()
+            results.append(y1.get()[0])
+
+        assert_rel_error(self, results[0], 5.43379016853, 1e-6)
+        assert_rel_error(self, results[1], 9.87161739688, 1e-6)
+        assert_rel_error(self, prob['z'], [2.5, 2.5], 1e-6)
+
+    def test_get_accessor(self):
+        prob = Problem()
+        model = prob.model = SellarDerivatives()
+        model.nonlinear_solver = NonlinearBlockGS()
+
+        with self.assertRaises(RuntimeError) as cm:
+            prob.get_accessor('x')
+        self.assertEqual(str(cm.exception),
+                         "get_accessor requires the vectors, so it must be called after "
+                         "final_setup, run_model, or run_driver.")
+
+        prob.setup(check=False)
+        prob.final_setup()
+
+        # the output is preferred over the promoted input of the same name
+        x = prob.get_accessor('x')
+        self.assertEqual(x._vec_attr, '_outputs')
+        self.assertEqual(x._abs_name, 'px.x')
+
+        x_in = prob.get_accessor('d1.x')
+        self.assertEqual(x_in._vec_attr, '_inputs')
+
+        x.set(3.0)
+        assert_rel_error(self, prob['x'], 3.0)
+        prob.run_model()
+        assert_rel_error(self, x_in.get(), 3.0)
+
+        # get returns a view
+        x.get()[:] = 4.0
+        assert_rel_error(self, prob['x'], 4.0)
+
+        with self.assertRaises(KeyError) as cm:
+            prob.get_accessor('junk')
+        self.assertEqual(str(cm.exception), '\'Variable name "junk" not found.\'')
+
+    def test_name_cache(self):
+        prob = Problem()
+        model = prob.model = Group()
+        model.add_subsystem('c1', ExecComp('y = 2.0*x'), promotes_inputs=['x'])
+        model.add_subsystem('c2', ExecComp('y = 3.0*x'), promotes_inputs=['x'])
+        prob.setup(check=False)
+        prob.run_model()
+
+        inputs = model._inputs
+        self.assertTrue('c1.x' in inputs)
+        self.assertFalse('junk' in inputs)
+        self.assertEqual(inputs._abs_name_cache['c1.x'], 'c1.x')
+        self.assertIsNone(inputs._abs_name_cache['junk'])
+
+        # errors are not cached, so they are raised every time
+        for i in range(2):
+            with self.assertRaises(KeyError) as cm:
+                inputs['x']
+            self.assertIn('non-unique', str(cm.exception))
+        self.assertNotIn('x', inputs._abs_name_cache)
+
     def test_feature_residuals(self):
         from openmdao.api import Problem, NonlinearBlockGS
         from openmdao.test_suite.components.sellar import SellarDerivatives
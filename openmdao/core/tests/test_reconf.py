@@ -109,6 +109,52 @@ class Test(unittest.TestCase):
         assert_rel_error(self, p['z'], 9.0)
         assert_rel_error(self, totals['y', 'x'], 2.0 * np.ones((4, 1)))
 
+    def test_repeated_growth(self):
+        p = Problem()
+
+        p.model = Group()
+        p.model.add_subsystem('c1', IndepVarComp('x', 1.0), promotes_outputs=['x'])
+        p.model.add_subsystem('c2', ReconfComp(), promotes_inputs=['x'], promotes_outputs=['y'])
+        sub = p.model.add_subsystem('sub', Group(), promotes=['*'])
+        sub.add_subsystem('c3', Comp(), promotes_inputs=['x'], promotes_outputs=['z'])
+
+        p.setup(force_alloc_complex=True)
+        p['x'] = 3
+        p.run_model()
+
+        root_vec = p.model._outputs._root_vector
+        sub_transfers = sub._transfers
+
+        set_name, = root_vec._data.keys()
+        buf = None
+        nalloc = 0
+        for size in range(2, 12):
+            # reconfigure from c2 and update in root; the following outputs are moved
+            p.model.c2.resetup('reconf')
+            p.model.resetup('update')
+
+            # with complex step, the real and imaginary data live in one complex buffer
+            if root_vec._cplx_buffers[set_name] is not buf:
+                buf = root_vec._cplx_buffers[set_name]
+                nalloc += 1
+            self.assertEqual(root_vec._data[set_name].size, size + 2)
+            self.assertEqual(root_vec._imag_data[set_name].size, size + 2)
+            assert_rel_error(self, p['x'], 3.0)
+            assert_rel_error(self, p['z'], 9.0)
+
+            p.run_model()
+            assert_rel_error(self, p['y'], 6.0 * np.ones(size))
+
+        # the root data is only reallocated when it outgrows its buffer
+        self.assertLess(nalloc, 6)
+
+        # the transfers of the sibling group are not rebuilt
+        self.assertIs(sub._transfers, sub_transfers)
+
+        totals = p.compute_totals(wrt=['x'], of=['y', 'z'])
+        assert_rel_error(self, totals['y', 'x'], 2.0 * np.ones((11, 1)))
+        assert_rel_error(self, totals['z', 'x'], [[3.0]])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -7,6 +7,7 @@ from six import assertRaisesRegex
 import numpy as np
 
 from openmdao.api import Problem, Group, ExplicitComponent, ImplicitComponent, IndepVarComp
+from openmdao.api import ExecComp
 from openmdao.api import NewtonSolver, ScipyKrylov, NonlinearBlockGS, DirectSolver
 from openmdao.api import AssembledJacobian
 
@@ -243,6 +244,61 @@ class TestScaling(unittest.TestCase):
         assert_rel_error(self, prob['sys2.new_length'], 3.e-1)
         assert_rel_error(self, prob.model._outputs['sys2.new_length'], 3.e-1)
 
+    def _voi_scaling_problem(self, irrelevant, vectorize=True):
+        group = Group()
+        group.add_subsystem('sys1', IndepVarComp('x', 1.0, ref=1e5))
+        group.add_subsystem('sys2', ExecComp('y = 2.0 * x', y={'ref': 0.1}))
+        group.connect('sys1.x', 'sys2.x')
+        if irrelevant:
+            group.add_subsystem('sys3', IndepVarComp('z', 1.0, ref=3.))
+        group.add_design_var('sys1.x', vectorize_derivs=vectorize)
+        group.add_objective('sys2.y')
+
+        prob = Problem(group)
+        prob.setup(check=False, mode='fwd')
+        prob.set_solver_print(level=0)
+        prob.final_setup()
+        return prob
+
+    def _check_voi_totals(self, prob, irrelevant):
+        # the totals must match those computed with the linear vectors
+        expected = self._voi_scaling_problem(irrelevant, vectorize=False)
+        expected.run_model()
+        totals = prob.compute_totals(of=['sys2.y'], wrt=['sys1.x'])
+        assert_rel_error(self, totals['sys2.y', 'sys1.x'],
+                         expected.compute_totals(of=['sys2.y'], wrt=['sys1.x'])['sys2.y', 'sys1.x'])
+
+    def test_voi_scaling_shared(self):
+        prob = self._voi_scaling_problem(irrelevant=False)
+
+        # all variables are relevant, so the scaling of the linear vectors is used
+        vecs = prob.model._vectors['output']
+        self.assertTrue(np.shares_memory(vecs['sys1.x']._scaling['phys'][0][1],
+                                         vecs['linear']._scaling['phys'][0][1]))
+
+        prob.run_model()
+        self._check_voi_totals(prob, irrelevant=False)
+
+    def test_voi_scaling_built_on_first_use(self):
+        prob = self._voi_scaling_problem(irrelevant=True)
+
+        vec = prob.model._vectors['output']['sys1.x']
+        sub = prob.model.sys2._vectors['output']['sys1.x']
+        self.assertIsNone(vec._scaling)
+        self.assertIsNone(sub._scaling)
+
+        prob.run_model()
+        self._check_voi_totals(prob, irrelevant=True)
+
+        # only sys1.x and sys2.y are relevant
+        for typ, expected in (('phys', [1e5, 0.1]), ('norm', [1e-5, 10.])):
+            adder, factor = vec._scaling[typ][0]
+            self.assertIsNone(adder)
+            assert_rel_error(self, factor, np.array(expected))
+
+        self.assertTrue(np.shares_memory(sub._scaling['phys'][0][1], vec._scaling['phys'][0][1]))
+        assert_rel_error(self, sub._scaling['phys'][0][1], np.array([0.1]))
+
     def test_speed(self):
         comp = IndepVarComp()
         comp.add_output('distance', 1., units='km')
@@ -0,0 +1,213 @@
+"""Test the 'skip_unchanged' component option."""
+from __future__ import division
+
+import unittest
+
+import numpy as np
+
+from openmdao.api import Problem, IndepVarComp, ExplicitComponent, ImplicitComponent, \
+    NewtonSolver, DirectSolver
+from openmdao.devtools.testutil import assert_rel_error
+from openmdao.test_suite.components.sellar import SellarDerivatives, SellarDerivativesGrouped, \
+    SellarStateConnection
+
+
+class CountingComp(ExplicitComponent):
+
+    def setup(self):
+        self.add_input('x', 1.0)
+        self.add_output('y', 1.0, ref=2.0, res_ref=10.0)
+
+        self.declare_partials('y', 'x', method='fd')
+
+        self.count = 0
+
+    def compute(self, inputs, outputs):
+        outputs['y'] = 3.0 * inputs['x'] ** 2
+        self.count += 1
+
+
+class CountingImplComp(ImplicitComponent):
+
+    def setup(self):
+        self.add_input('x', 1.0)
+        self.add_output('y', 1.0)
+
+        self.declare_partials('y', ['x', 'y'])
+
+        self.count = 0
+
+    def apply_nonlinear(self, inputs, outputs, residuals):
+        residuals['y'] = outputs['y'] - 2.0 * inputs['x']
+        self.count += 1
+
+    def linearize(self, inputs, outputs, partials):
+        partials['y', 'x'] = -2.0
+        partials['y', 'y'] = 1.0
+
+
+def _set_skip(group):
+    for subsys in group.system_iter(recurse=True, typ=ExplicitComponent):
+        subsys.options['skip_unchanged'] = True
+    for subsys in group.system_iter(recurse=True, typ=ImplicitComponent):
+        subsys.options['skip_unchanged'] = True
+
+
+class TestSkipUnchanged(unittest.TestCase):
+
+    def _build_chain(self, skip):
+        prob = Problem()
+        model = prob.model
+        model.add_subsystem('px', IndepVarComp('x', 2.0))
+        comp = model.add_subsystem('comp', CountingComp())
+        model.connect('px.x', 'comp.x')
+        comp.options['skip_unchanged'] = skip
+
+        prob.setup(check=False)
+        return prob, comp
+
+    def test_skip_repeated_run(self):
+        prob, comp = self._build_chain(True)
+
+        prob.run_model()
+        assert_rel_error(self, prob['comp.y'], 12.0)
+        self.assertEqual(comp.count, 1)
+
+        prob.run_model()
+        assert_rel_error(self, prob['comp.y'], 12.0)
+        self.assertEqual(comp.count, 1)
+
+        prob['px.x'] = 3.0
+        prob.run_model()
+        assert_rel_error(self, prob['comp.y'], 27.0)
+        self.assertEqual(comp.count, 2)
+
+    def test_no_skip_by_default(self):
+        prob, comp = self._build_chain(False)
+
+        prob.run_model()
+        prob.run_model()
+        self.assertEqual(comp.count, 2)
+
+        # modifications are only tracked if some component uses them
+        self.assertIsNone(prob.model._outputs._versions)
+
+        # so the option can't be turned on after the vectors have been created
+        comp.options['skip_unchanged'] = True
+        with self.assertRaises(RuntimeError) as cm:
+            prob.run_model()
+        self.assertEqual(str(cm.exception),
+                         "comp: The 'skip_unchanged' option must be set before setup.")
+
+        prob, comp = self._build_chain(True)
+        prob.run_model()
+        self.assertIsNotNone(prob.model._outputs._versions)
+        self.assertIsNone(prob.model._vectors['output']['linear']._versions)
+
+    def test_residuals_after_skip(self):
+        prob, comp = self._build_chain(True)
+
+        prob.run_model()
+
+        # residuals are kept from the last evaluation
+        prob.model.run_apply_nonlinear()
+        self.assertEqual(comp.count, 1)
+        assert_rel_error(self, comp._residuals.get_norm(), 0.0, 1e-15)
+
+        # an external change to the outputs must be reflected in the residuals
+        prob['comp.y'] = 14.0
+        prob.model.run_apply_nonlinear()
+        self.assertEqual(comp.count, 2)
+        assert_rel_error(self, prob.model._residuals['comp.y'], 2.0)
+
+        # recovering the outputs from the cached residuals
+        prob.run_model()
+        self.assertEqual(comp.count, 2)
+        assert_rel_error(self, prob['comp.y'], 12.0)
+        assert_rel_error(self, comp._residuals.get_norm(), 0.0, 1e-15)
+
+    def test_fd_partials(self):
+        totals = []
+        for skip in (False, True):
+            prob, comp = self._build_chain(skip)
+            prob.run_model()
+
+            J = prob.compute_totals(of=['comp.y'], wrt=['px.x'], return_format='flat_dict')
+            totals.append(J['comp.y', 'px.x'])
+
+            # the values are restored after the perturbations
+            assert_rel_error(self, prob['comp.y'], 12.0)
+            prob.run_model()
+            assert_rel_error(self, prob['comp.y'], 12.0)
+
+        assert_rel_error(self, totals[1], totals[0], 1e-12)
+
+    def test_implicit(self):
+        prob = Problem()
+        model = prob.model
+        model.add_subsystem('px', IndepVarComp('x', 2.0))
+        comp = model.add_subsystem('comp', CountingImplComp())
+        model.connect('px.x', 'comp.x')
+        comp.options['skip_unchanged'] = True
+
+        model.nonlinear_solver = NewtonSolver()
+        model.linear_solver = DirectSolver()
+
+        prob.setup(check=False)
+        prob.set_solver_print(level=0)
+        prob.run_model()
+
+        assert_rel_error(self, prob['comp.y'], 4.0)
+        count = comp.count
+
+        prob.model.run_apply_nonlinear()
+        self.assertEqual(comp.count, count)
+
+        prob['comp.y'] = 1.0
+        prob.model.run_apply_nonlinear()
+        self.assertEqual(comp.count, count + 1)
+        assert_rel_error(self, prob.model._residuals['comp.y'], -3.0)
+
+    def test_sellar(self):
+        for model_class in (SellarDerivatives, SellarDerivativesGrouped, SellarStateConnection):
+            prob = Problem(model=model_class())
+            prob.setup(check=False)
+            _set_skip(prob.model)
+            prob.set_solver_print(level=0)
+            prob.run_model()
+
+            assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+            assert_rel_error(self, prob['obj'], 28.58830817, .00001)
+
+            prob['x'] = 2.0
+            prob.run_model()
+            prob['x'] = 1.0
+            prob.run_model()
+
+            assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+            assert_rel_error(self, prob['obj'], 28.58830817, .00001)
+
+            J = prob.compute_totals(of=['obj', 'con1'], wrt=['x', 'z'],
+                                    return_format='flat_dict')
+            assert_rel_error(self, J['obj', 'x'], [[2.98061391]], .00001)
+            assert_rel_error(self, J['con1', 'z'], np.array([[-9.61002186, -0.78449158]]),
+                             .00001)
+
+    def test_sellar_fewer_evaluations(self):
+        counts = []
+        for skip in (False, True):
+            prob = Problem(model=SellarDerivatives())
+            prob.setup(check=False)
+            if skip:
+                _set_skip(prob.model)
+            prob.set_solver_print(level=0)
+            prob.run_model()
+
+            assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+            counts.append(prob.model.d1.execution_count)
+
+        self.assertLess(counts[1], counts[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -79,6 +79,25 @@ class TestNumpyVec(unittest.TestCase):
         self.assertEqual(set_IDs[3], 2)
         self.assertEqual(set_IDs[4], 3)
 
+    def test_var_offsets(self):
+        root = self.p.model
+        iproc = root.comm.rank
+
+        for type_ in ('input', 'output'):
+            sizes = root._var_sizes['nonlinear'][type_]
+            offsets = root._get_var_offsets('nonlinear', type_)
+            for idx in range(sizes.shape[1] + 1):
+                self.assertEqual(offsets[iproc, idx], np.sum(sizes[iproc, :idx]))
+
+            for set_name, sizes in root._var_sizes_byset['linear'][type_].items():
+                offsets = root._get_var_offsets('linear', type_, set_name)
+                for idx in range(sizes.shape[1] + 1):
+                    self.assertEqual(offsets[iproc, idx], np.sum(sizes[iproc, :idx]))
+
+        # the tables are cached, and shared by the nonlinear and linear vectors
+        self.assertIs(root._get_var_offsets('nonlinear', 'input'),
+                      root._get_var_offsets('linear', 'input'))
+
     def test_transfer(self):
         root = self.p.model
 
@@ -0,0 +1,459 @@
+"""
+A harness that times the phases of benchmark scenarios and tracks the results by git commit.
+
+Each <Scenario> builds a <Problem> of a given size. The harness then separately times setup,
+final_setup, run_model, compute_totals and, optionally, a run_model with case recording. The
+results are stored in a sqlite database keyed by the git commit of the working tree, so runs
+can be compared against those of a baseline commit to find regressions.
+"""
+from __future__ import division, print_function
+
+import argparse
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from timeit import default_timer as etime
+
+from six import iteritems
+
+PHASES = ('setup', 'final_setup', 'run_model', 'compute_totals', 'record')
+
+
+class Scenario(object):
+    """
+    A benchmark model that can be built in several sizes.
+
+    Attributes
+    ----------
+    name : str
+        Name of the scenario.
+    build : callable
+        Function taking a size and returning a <Problem> that has not been set up.
+    sizes : list of int
+        Sizes for which the scenario is run.
+    setup_kwargs : dict
+        Keyword arguments passed to Problem.setup.
+    totals : callable, bool or None
+        If True, the driver's computation of the totals of its responses with respect to its
+        design variables is timed. If callable, it takes the <Problem> and returns the (of, wrt)
+        lists passed to Problem.compute_totals. If None, no totals are computed.
+    record : bool
+        If True, time a run_model of a fresh <Problem> that records all systems to a
+        <SqliteRecorder>.
+    """
+
+    def __init__(self, name, build, sizes, setup_kwargs=None, totals=None, record=False):
+        """
+        Store the scenario.
+
+        Parameters
+        ----------
+        name : str
+            Name of the scenario.
+        build : callable
+            Function taking a size and returning a <Problem> that has not been set up.
+        sizes : list of int
+            Sizes for which the scenario is run.
+        setup_kwargs : dict or None
+            Keyword arguments passed to Problem.setup.
+        totals : callable, bool or None
+            If True, time the driver's computation of the totals of its responses with respect
+            to its design variables. If callable, it takes the <Problem> and returns the
+            (of, wrt) lists passed to Problem.compute_totals.
+        record : bool
+            If True, also time a run_model that records all systems to a <SqliteRecorder>.
+        """
+        self.name = name
+        self.build = build
+        self.sizes = list(sizes)
+        self.setup_kwargs = {'check': False}
+        if setup_kwargs:
+            self.setup_kwargs.update(setup_kwargs)
+        self.totals = totals
+        self.record = record
+
+    def _time_once(self, size):
+        """
+        Build the model of the given size and time each phase once.
+
+        Parameters
+        ----------
+        size : int
+            Size of the model.
+
+        Returns
+        -------
+        dict
+            Elapsed time in seconds keyed by phase.
+        """
+        times = OrderedDict()
+
+        prob = self.build(size)
+
+        start = etime()
+        prob.setup(**self.setup_kwargs)
+        times['setup'] = etime() - start
+
+        start = etime()
+        prob.final_setup()
+        times['final_setup'] = etime() - start
+
+        start = etime()
+        prob.run_model()
+        times['run_model'] = etime() - start
+
+        if callable(self.totals):
+            of, wrt = self.totals(prob)
+            start = etime()
+            prob.compute_totals(of=of, wrt=wrt)
+            times['compute_totals'] = etime() - start
+        elif self.totals:
+            # the same computation that an optimizer asks the driver for
+            start = etime()
+            prob.driver._compute_totals(return_format='dict')
+            times['compute_totals'] = etime() - start
+
+        if self.record:
+            from openmdao.recorders.sqlite_recorder import SqliteRecorder
+
+            tempdir = tempfile.mkdtemp(prefix='benchmark-')
+            try:
+                prob = self.build(size)
+                recorder = SqliteRecorder(os.path.join(tempdir, 'cases.sql'))
+                prob.setup(**self.setup_kwargs)
+                prob.model.add_recorder(recorder, recurse=True)
+                prob.final_setup()
+
+                start = etime()
+                prob.run_model()
+                times['record'] = etime() - start
+
+                prob.cleanup()
+            finally:
+                shutil.rmtree(tempdir, ignore_errors=True)
+
+        return times
+
+    def run(self, size, repeat=3):
+        """
+        Time each phase for the given size, taking the fastest of several repetitions.
+
+        Parameters
+        ----------
+        size : int
+            Size of the model.
+        repeat : int
+            Number of repetitions.
+
+        Returns
+        -------
+        OrderedDict
+            Fastest elapsed time in seconds keyed by phase.
+        """
+        best = OrderedDict()
+        for i in range(repeat):
+            for phase, elapsed in iteritems(self._time_once(size)):
+                best[phase] = min(elapsed, best.get(phase, elapsed))
+        return best
+
+
+def get_commit(path=None):
+    """
+    Return the id of the git commit checked out in the given directory.
+
+    Parameters
+    ----------
+    path : str or None
+        Directory inside the git working tree. Defaults to the current directory.
+
+    Returns
+    -------
+    str
+        The full commit hash, with '-dirty' appended if there are uncommitted changes, or
+        'unknown' if it can't be determined.
+    """
+    try:
+        out = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=path,
+                                      stderr=subprocess.STDOUT)
+        status = subprocess.check_output(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                         cwd=path, stderr=subprocess.STDOUT)
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+    commit = out.decode('utf-8').strip()
+    if status.strip():
+        commit += '-dirty'
+    return commit
+
+
+def resolve_commit(rev, path=None):
+    """
+    Return the full hash of the git commit that the given revision refers to.
+
+    Parameters
+    ----------
+    rev : str
+        Any revision that git understands, such as a branch, tag or abbreviated hash, optionally
+        with '-dirty' appended as in the ids returned by get_commit.
+    path : str or None
+        Directory inside the git working tree. Defaults to the current directory.
+
+    Returns
+    -------
+    str or None
+        The full commit hash, with '-dirty' appended if it was given, or None if the revision
+        doesn't refer to a commit.
+    """
+    suffix = ''
+    if rev.endswith('-dirty'):
+        rev, suffix = rev[:-len('-dirty')], '-dirty'
+
+    try:
+        out = subprocess.check_output(['git', 'rev-parse', '--verify', '--quiet',
+                                       rev + '^{commit}'], cwd=path, stderr=subprocess.STDOUT)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.decode('utf-8').strip() + suffix
+
+
+class BenchmarkDB(object):
+    """
+    Results of benchmark runs, stored in a sqlite database.
+
+    Attributes
+    ----------
+    filename : str
+        Name of the database file.
+    _conn : sqlite3.Connection
+        Connection to the database.
+    """
+
+    def __init__(self, filename):
+        """
+        Open the database, creating it if needed.
+
+        Parameters
+        ----------
+        filename : str
+            Name of the database file.
+        """
+        self.filename = filename
+        self._conn = sqlite3.connect(filename)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS results (commit_id TEXT, timestamp REAL, "
+                           "scenario TEXT, size INTEGER, phase TEXT, time REAL)")
+        self._conn.commit()
+
+    def close(self):
+        """
+        Close the database.
+        """
+        self._conn.close()
+
+    def add(self, commit, scenario, size, times):
+        """
+        Store the times of one run of a scenario.
+
+        Parameters
+        ----------
+        commit : str
+            Commit id of the code that was run.
+        scenario : str
+            Name of the scenario.
+        size : int
+            Size of the model.
+        times : dict
+            Elapsed time in seconds keyed by phase.
+        """
+        stamp = time.time()
+        self._conn.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                               [(commit, stamp, scenario, size, phase, elapsed)
+                                for phase, elapsed in iteritems(times)])
+        self._conn.commit()
+
+    def get_commits(self):
+        """
+        Return the commits that have results, from the oldest to the most recently run.
+
+        Returns
+        -------
+        list of str
+            Commit ids.
+        """
+        rows = self._conn.execute("SELECT commit_id, MAX(timestamp) AS last FROM results "
+                                  "GROUP BY commit_id ORDER BY last")
+        return [row[0] for row in rows]
+
+    def get_times(self, commit):
+        """
+        Return the most recent times recorded for the given commit.
+
+        Parameters
+        ----------
+        commit : str
+            Commit id.
+
+        Returns
+        -------
+        dict
+            Elapsed time in seconds keyed by (scenario, size, phase).
+        """
+        rows = self._conn.execute("SELECT scenario, size, phase, time FROM results "
+                                  "WHERE commit_id = ? ORDER BY timestamp", (commit,))
+        return {(scenario, size, phase): elapsed for scenario, size, phase, elapsed in rows}
+
+    def find_regressions(self, commit, baseline, tolerance=0.1, min_time=1e-3):
+        """
+        Return the phases that are slower for the given commit than for the baseline.
+
+        Parameters
+        ----------
+        commit : str
+            Commit id to check.
+        baseline : str
+            Commit id to compare against.
+        tolerance : float
+            Allowed relative slowdown.
+        min_time : float
+            Allowed absolute slowdown in seconds, so that noise in very short phases is ignored.
+
+        Returns
+        -------
+        list of tuple
+            (scenario, size, phase, baseline time, time) for each regression, sorted by key.
+        """
+        base_times = self.get_times(baseline)
+        regressions = []
+        for key, elapsed in sorted(iteritems(self.get_times(commit))):
+            base = base_times.get(key)
+            if base is not None and elapsed > base * (1. + tolerance) and \
+                    elapsed - base > min_time:
+                regressions.append(key + (base, elapsed))
+        return regressions
+
+
+def run_benchmarks(scenarios, db=None, commit=None, repeat=3, out_stream=sys.stdout):
+    """
+    Run the given scenarios for all of their sizes and store the results.
+
+    Parameters
+    ----------
+    scenarios : list of <Scenario>
+        Scenarios to run.
+    db : <BenchmarkDB> or None
+        Where to store the results, if not None.
+    commit : str or None
+        Commit id under which the results are stored. Defaults to the commit of the current
+        directory.
+    repeat : int
+        Number of repetitions of each run; the fastest is kept.
+    out_stream : file-like or None
+        Where to write progress, if not None.
+
+    Returns
+    -------
+    dict
+        Elapsed time in seconds keyed by (scenario, size, phase).
+    """
+    if commit is None:
+        commit = get_commit()
+
+    results = {}
+    for scenario in scenarios:
+        for size in scenario.sizes:
+            times = scenario.run(size, repeat)
+            if db is not None:
+                db.add(commit, scenario.name, size, times)
+            for phase, elapsed in iteritems(times):
+                results[scenario.name, size, phase] = elapsed
+                if out_stream is not None:
+                    out_stream.write("%-30s %8d  %-15s %10.4f\n" %
+                                     (scenario.name, size, phase, elapsed))
+    return results
+
+
+def benchmark_main(scenarios, argv=None):
+    """
+    Run benchmark scenarios from the command line and report regressions.
+
+    Parameters
+    ----------
+    scenarios : list of <Scenario>
+        All available scenarios.
+    argv : list of str or None
+        Command line arguments. Defaults to sys.argv[1:].
+
+    Returns
+    -------
+    int
+        Exit status: 1 if any regressions were found, 2 if the baseline has no results, else 0.
+    """
+    parser = argparse.ArgumentParser(description='Run OpenMDAO benchmark scenarios.')
+    parser.add_argument('patterns', nargs='*', metavar='SCENARIO',
+                        help='Glob patterns of the scenarios to run. Default is all of them.')
+    parser.add_argument('-l', '--list', action='store_true', dest='list',
+                        help='List the scenarios and exit.')
+    parser.add_argument('-d', '--db', action='store', dest='db', default='benchmarks.db',
+                        help='Database file in which results are stored. '
+                             'Default is benchmarks.db.')
+    parser.add_argument('-b', '--baseline', action='store', dest='baseline', default=None,
+                        help='Commit to compare against, as any git revision. Default is the '
+                             'most recently run other commit in the database.')
+    parser.add_argument('-t', '--tolerance', action='store', dest='tolerance', type=float,
+                        default=0.1, help='Allowed relative slowdown. Default is 0.1.')
+    parser.add_argument('-r', '--repeat', action='store', dest='repeat', type=int, default=3,
+                        help='Number of repetitions of each run. Default is 3.')
+    options = parser.parse_args(argv)
+
+    if options.patterns:
+        scenarios = [s for s in scenarios
+                     if any(fnmatchcase(s.name, pat) for pat in options.patterns)]
+
+    if options.list:
+        for scenario in scenarios:
+            print("%-30s sizes: %s" % (scenario.name, scenario.sizes))
+        return 0
+
+    commit = get_commit()
+    db = BenchmarkDB(options.db)
+    try:
+        baseline = options.baseline
+        if baseline is not None:
+            # the results are stored under full hashes, so resolve the revision unless it is
+            # stored as given
+            commits = db.get_commits()
+            if baseline not in commits:
+                resolved = resolve_commit(baseline)
+                if resolved is None or resolved not in commits:
+                    print("No results for baseline '%s' in %s." % (baseline, options.db),
+                          file=sys.stderr)
+                    return 2
+                baseline = resolved
+
+        run_benchmarks(scenarios, db, commit, options.repeat)
+
+        if baseline is None:
+            others = [c for c in db.get_commits() if c != commit]
+            if not others:
+                print("\nNo baseline to compare against.")
+                return 0
+            baseline = others[-1]
+
+        regressions = db.find_regressions(commit, baseline, options.tolerance)
+    finally:
+        db.close()
+
+    if not regressions:
+        print("\nNo regressions against %s." % baseline)
+        return 0
+
+    print("\nRegressions against %s:" % baseline)
+    for scenario, size, phase, base, elapsed in regressions:
+        print("%-30s %8d  %-15s %10.4f -> %10.4f (%+.0f%%)" %
+              (scenario, size, phase, base, elapsed, 100. * (elapsed / base - 1.)))
+    return 1
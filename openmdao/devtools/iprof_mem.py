@@ -5,12 +5,39 @@ import os
 import atexit
 import argparse
 from collections import defaultdict
+from functools import wraps
+from inspect import isfunction
 
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from openmdao.core.system import System
 from openmdao.devtools.iprof_utils import _create_profile_callback, find_qualified_name, func_group, \
      _collect_methods
 
 
 _registered = False  # prevents multiple atexit registrations
+_mode = 'rss'
+
+# Methods at whose boundaries memory is measured in tracemalloc mode.
+_tracemalloc_methods = [
+    ('_setup*', (System,)),
+    ('_final_setup', (System,)),
+    ('_get_root_vectors', (System,)),
+    ('_solve_nonlinear', (System,)),
+    ('_apply_nonlinear', (System,)),
+    ('_linearize', (System,)),
+    ('_solve_linear', (System,)),
+    ('_apply_linear', (System,)),
+]
+
+_tm_matches = None
+_tm_wrapped = []  # (class, name, original function) of the wrapped methods
+_tm_stack = []  # [obj, name, start, peak, child net] for each running tracked call
+_tm_records = defaultdict(lambda: [0, 0, 0, 0])  # [calls, net, self net, peak] keyed by (path, name)
+_tm_started = False  # True if we turned on tracemalloc
 
 
 def _trace_mem_call(frame, arg, stack, context):
@@ -39,7 +66,106 @@ def _trace_mem_ret(frame, arg, stack, context):
         # print("%g (+%g) MB %s:%d:%s" % (usage, delta,
         #                                 key[0], key[1], key[2]))
 
-def setup(methods=None):
+def _tm_wrap(func, name):
+    """
+    Return a wrapper of the given method that records the memory allocated during each call.
+    """
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        stack = _tm_stack
+        # an override calling its parent method is a single call
+        if stack and stack[-1][0] is self and stack[-1][1] == name:
+            return func(self, *args, **kwargs)
+
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            parent = stack[-1]
+            parent[3] = max(parent[3], peak if _reset_peak else current)
+        entry = [self, name, current, current, 0]
+        stack.append(entry)
+        if _reset_peak:
+            _reset_peak()
+
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            stack.pop()
+            peak = max(entry[3], peak if _reset_peak else current)
+            net = current - entry[2]
+
+            path = getattr(self, 'pathname', None)
+            if path is None:
+                path = type(self).__name__
+            rec = _tm_records[path, name]
+            rec[0] += 1
+            rec[1] += net
+            rec[2] += net - entry[4]
+            rec[3] = max(rec[3], peak - entry[2])
+
+            if stack:
+                parent = stack[-1]
+                parent[3] = max(parent[3], peak)
+                parent[4] += net
+            if _reset_peak:
+                _reset_peak()
+
+    return wrapper
+
+
+# tracemalloc.reset_peak is only available in python 3.9 and later.  Without it, the peaks are
+# only measured at the boundaries of the tracked calls.
+_reset_peak = getattr(tracemalloc, 'reset_peak', None)
+
+
+def _all_subclasses(classes):
+    """
+    Return the given classes and all of their subclasses.
+    """
+    found = []
+    stack = list(classes)
+    while stack:
+        cls = stack.pop()
+        if cls not in found:
+            found.append(cls)
+            stack.extend(cls.__subclasses__())
+    return found
+
+
+def _tracemalloc_report(out_stream=sys.stdout):
+    """
+    Write the memory allocated by each tracked call and by each method over all systems.
+
+    Both tables are sorted by peak allocation, with the largest at the end.
+    """
+    mb = 1024. * 1024.
+
+    def write(rows, title):
+        out_stream.write("%s\n" % title)
+        out_stream.write("   Peak (MB)      Net (MB)     Self (MB)    Calls  Name\n")
+        out_stream.write("-" * 72 + "\n")
+        for name, (ncalls, net, self_net, peak) in sorted(rows, key=lambda x: x[1][3]):
+            out_stream.write("%12.4f  %12.4f  %12.4f  %7d  %s\n" %
+                             (peak / mb, net / mb, self_net / mb, ncalls, name))
+        out_stream.write("\n")
+
+    by_method = defaultdict(lambda: [0, 0, 0, 0])
+    rows = []
+    for (path, name), rec in list(_tm_records.items()):
+        rows.append(('%s:%s' % (path or '<model>', name), rec))
+        mrec = by_method[name]
+        mrec[0] += rec[0]
+        mrec[2] += rec[2]
+        mrec[3] = max(mrec[3], rec[3])
+    # a method's net total is the sum of the self net of all its calls
+    for mrec in by_method.values():
+        mrec[1] = mrec[2]
+
+    write(rows, "Memory allocated by system and method")
+    write(list(by_method.items()), "Memory allocated by method (setup phase) over all systems")
+
+
+def setup(methods=None, mode='rss', finalize=True):
     """
     Setup memory profiling.
 
@@ -47,8 +173,29 @@ def setup(methods=None):
     ----------
     methods : list of (glob, (classes...)) or None
         Methods to be profiled, based on glob patterns and isinstance checks.
+    mode : str
+        'rss' to report the changes in process memory across every call of the methods, or
+        'tracemalloc' to report the memory allocated by python during the calls of the methods
+        of each system.  The 'tracemalloc' mode only tracks the calls of the setup and run
+        methods of systems by default, and it is much faster since it doesn't need a profile
+        function.
+    finalize : bool
+        If True, register a function to print the report before exit.
     """
-    global _registered, _trace_memory, mem_usage
+    global _registered, _trace_memory, mem_usage, _mode, _tm_matches
+    if mode == 'tracemalloc':
+        if tracemalloc is None:
+            raise RuntimeError("tracemalloc mode requires python 3.4 or later.")
+        if not _registered:
+            _mode = mode
+            _tm_matches = _collect_methods(_tracemalloc_methods if methods is None else methods)
+            if finalize:
+                atexit.register(_tracemalloc_report)
+            _registered = True
+        return
+    elif mode != 'rss':
+        raise ValueError("Unknown memory profiling mode '%s'." % mode)
+
     if not _registered:
         from openmdao.devtools.debug import mem_usage
         if methods is None:
@@ -70,7 +217,8 @@ def setup(methods=None):
             print("---------------------------------------")
             print("Memory (MB)   Calls  File:Line:Function")
 
-        atexit.register(print_totals)
+        if finalize:
+            atexit.register(print_totals)
         _registered = True
 
 
@@ -78,7 +226,23 @@ def start():
     """
     Turn on memory profiling.
     """
-    global _trace_memory
+    global _trace_memory, _tm_started
+    if _mode == 'tracemalloc':
+        if _tm_wrapped:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tm_started = True
+        for name, classes in _tm_matches.items():
+            if not isinstance(classes, tuple):
+                classes = (classes,)
+            for cls in _all_subclasses(classes):
+                func = cls.__dict__.get(name)
+                if isfunction(func):
+                    _tm_wrapped.append((cls, name, func))
+                    setattr(cls, name, _tm_wrap(func, name))
+        return
+
     if sys.getprofile() is not None:
         raise RuntimeError("another profile function is already active.")
     if _trace_memory is None:
@@ -90,6 +254,16 @@ def stop():
     """
     Turn off memory profiling.
     """
+    global _tm_started
+    if _mode == 'tracemalloc':
+        for cls, name, func in _tm_wrapped:
+            setattr(cls, name, func)
+        del _tm_wrapped[:]
+        if _tm_started:
+            tracemalloc.stop()
+            _tm_started = False
+        return
+
     sys.setprofile(None)
 
 
@@ -100,9 +274,13 @@ def _profile_py_file():
 
     parser = argparse.ArgumentParser()
     parser.add_argument('-g', '--group', action='store', dest='group',
-                        default='openmdao_all',
-                        help='Determines which group of methods will be tracked. Options are %s' %
-                             sorted(func_group.keys()))
+                        default=None,
+                        help='Determines which group of methods will be tracked. Options are %s. '
+                             'The default is openmdao_all, or the setup and run methods of '
+                             'systems with --tracemalloc.' % sorted(func_group.keys()))
+    parser.add_argument('-t', '--tracemalloc', action='store_true', dest='tracemalloc',
+                        help='Use tracemalloc to report the memory allocated by python during the '
+                             'calls of each system, instead of the changes in process memory.')
     parser.add_argument('file', metavar='file', nargs=1,
                         help='Python file to profile.')
 
@@ -111,7 +289,10 @@ def _profile_py_file():
     progname = options.file[0]
     sys.path.insert(0, os.path.dirname(progname))
 
-    setup(methods=func_group[options.group])
+    if options.tracemalloc:
+        setup(methods=func_group.get(options.group), mode='tracemalloc')
+    else:
+        setup(methods=func_group[options.group or 'openmdao_all'])
     with open(progname, 'rb') as fp:
         code = compile(fp.read(), progname, 'exec')
 
@@ -1,6 +1,7 @@
 from __future__ import print_function
 
 import os
+import signal
 import sys
 from timeit import default_timer as etime
 import argparse
@@ -40,9 +41,11 @@ _profile_total = 0.0
 _matches = {}
 _call_stack = []
 _inst_data = {}
+_sample_interval = None
+_old_handler = None
 
 
-def setup(prefix='iprof', methods=None, prof_dir=None, finalize=True):
+def setup(prefix='iprof', methods=None, prof_dir=None, finalize=True, sample_interval=None):
     """
     Instruments certain important openmdao methods for profiling.
 
@@ -71,14 +74,29 @@ def setup(prefix='iprof', methods=None, prof_dir=None, finalize=True):
     finallize : bool
         If True, register a function to finalize the profile before exit.
 
+    sample_interval : float or None
+        If not None, instead of timing every call, sample the call stack every
+        sample_interval seconds of cpu time and attribute the interval to each
+        matching method on the stack.  The counts are then numbers of samples
+        rather than numbers of calls.  This has a much lower overhead, but it
+        requires signal.setitimer, so it is only available on unix.
+
     """
 
-    global _profile_prefix, _matches
+    global _profile_prefix, _matches, _sample_interval
     global _profile_setup, _profile_total, _profile_out
 
     if _profile_setup:
         raise RuntimeError("profiling is already set up.")
 
+    if sample_interval is not None:
+        if not hasattr(signal, 'setitimer'):
+            raise RuntimeError("sampling requires signal.setitimer, which is not available "
+                               "on this platform.")
+        if sample_interval <= 0.:
+            raise ValueError("sample_interval must be positive but is %s." % sample_interval)
+    _sample_interval = sample_interval
+
     if prof_dir is None:
         _profile_prefix = os.path.join(os.getcwd(), prefix)
     else:
@@ -102,7 +120,7 @@ def start():
     """
     Turn on profiling.
     """
-    global _profile_start, _profile_setup, _call_stack, _inst_data
+    global _profile_start, _profile_setup, _call_stack, _inst_data, _old_handler
     if _profile_start is not None:
         print("profiling is already active.")
         return
@@ -115,6 +133,11 @@ def start():
     if '$total' not in _inst_data:
         _inst_data['$total'] = [None, 0., 0]
 
+    if _sample_interval is not None:
+        _old_handler = signal.signal(signal.SIGPROF, _sample_callback)
+        signal.setitimer(signal.ITIMER_PROF, _sample_interval, _sample_interval)
+        return
+
     if sys.getprofile() is not None:
         raise RuntimeError("another profile function is already active.")
     sys.setprofile(_instance_profile_callback)
@@ -128,7 +151,11 @@ def stop():
     if _profile_start is None:
         return
 
-    sys.setprofile(None)
+    if _sample_interval is not None:
+        signal.setitimer(signal.ITIMER_PROF, 0.)
+        signal.signal(signal.SIGPROF, _old_handler)
+    else:
+        sys.setprofile(None)
 
     _call_stack.pop()
 
@@ -168,6 +195,35 @@ def _instance_profile_callback(frame, event, arg):
             _call_stack.pop()
 
 
+def _sample_callback(signum, frame):
+    """
+    Attributes one sample interval to every method on the stack that matches _matches.
+
+    Each matching frame along the stack, from the outermost inward, adds a level to the
+    call path, just as the calls do in _instance_profile_callback.
+    """
+    global _inst_data, _matches
+
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name in _matches:
+            obj = frame.f_locals.get('self')
+            if obj is not None and isinstance(obj, _matches[code.co_name]):
+                stack.append(("%s#%d#%d" % (code.co_filename, code.co_firstlineno, id(obj)),
+                              obj))
+        frame = frame.f_back
+
+    path = '$total'
+    for name, obj in reversed(stack):
+        path = '-'.join((path, name))
+        pdata = _inst_data.get(path)
+        if pdata is None:
+            _inst_data[path] = pdata = [obj, 0., 0]
+        pdata[1] += _sample_interval
+        pdata[2] += 1
+
+
 def _finalize_profile():
     """
     Called at exit to write out the profiling data.
@@ -303,6 +359,10 @@ def _prof_totals():
     parser.add_argument('-m', '--maxcalls', action='store', dest='maxcalls', type=int,
                         default=999999,
                         help='Max number of results to display.')
+    parser.add_argument('-s', '--sample', action='store', dest='sample', type=float,
+                        default=None, metavar='INTERVAL',
+                        help='Sample the call stack every INTERVAL seconds instead of timing '
+                             'every call. The counts are then numbers of samples.')
     parser.add_argument('files', metavar='file', nargs='*',
                         help='Raw profile data files or a python file.')
 
@@ -321,7 +381,8 @@ def _prof_totals():
         if len(options.files) > 1:
             print("iprofview can only process a single python file.", file=sys.stderr)
             sys.exit(-1)
-        _profile_py_file(options.files[0], methods=func_group[options.group])
+        _profile_py_file(options.files[0], methods=func_group[options.group],
+                         sample_interval=options.sample)
         options.files = ['iprof.0']
 
     call_data, totals = _process_profile(options.files)
@@ -342,7 +403,7 @@ def _prof_totals():
             out_stream.close()
 
 
-def _profile_py_file(fname=None, methods=None):
+def _profile_py_file(fname=None, methods=None, sample_interval=None):
     """
     Run instance-based profiling on the given python script.
 
@@ -352,6 +413,9 @@ def _profile_py_file(fname=None, methods=None):
         Name of the python script.
     methods : list of (glob, (classes...)) tuples or None
         List indicating which methods to track.
+    sample_interval : float or None
+        If not None, sample the call stack at this interval (in seconds) instead of
+        timing every call.
     """
     if fname is None:
         args = sys.argv[1:]
@@ -371,7 +435,7 @@ def _profile_py_file(fname=None, methods=None):
         '__cached__': None,
     }
 
-    setup(methods=methods, finalize=False)
+    setup(methods=methods, finalize=False, sample_interval=sample_interval)
     start()
     exec (code, globals_dict)
     _finalize_profile()
@@ -187,6 +187,10 @@ def _prof_view():
     parser.add_argument('-m', '--maxcalls', action='store', dest='maxcalls',
                         default=15000, type=int,
                         help='Maximum number of calls displayed at one time.  Default=15000.')
+    parser.add_argument('-s', '--sample', action='store', dest='sample', type=float,
+                        default=None, metavar='INTERVAL',
+                        help='Sample the call stack every INTERVAL seconds instead of timing '
+                             'every call. The counts are then numbers of samples.')
     parser.add_argument('files', metavar='file', nargs='+',
                         help='Raw profile data files or a python file.')
 
@@ -196,7 +200,8 @@ def _prof_view():
         if len(options.files) > 1:
             print("iprofview can only process a single python file.", file=sys.stderr)
             sys.exit(-1)
-        _profile_py_file(options.files[0], methods=func_group[options.group])
+        _profile_py_file(options.files[0], methods=func_group[options.group],
+                         sample_interval=options.sample)
         options.files = ['iprof.0']
 
     app = _Application(options)
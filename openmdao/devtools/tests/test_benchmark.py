@@ -0,0 +1,173 @@
+"""Test the benchmark harness."""
+from __future__ import division
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+import numpy as np
+from six import StringIO
+
+from openmdao.api import Problem, IndepVarComp, ExecComp
+from openmdao.devtools.benchmark import Scenario, BenchmarkDB, run_benchmarks, benchmark_main, \
+    get_commit, resolve_commit
+from openmdao.test_suite.components.sellar import SellarDerivatives
+
+
+def _build_sellar(size):
+    prob = Problem(model=SellarDerivatives())
+    prob.model.add_design_var('x')
+    prob.model.add_objective('obj')
+    prob.set_solver_print(level=0)
+    return prob
+
+
+def _build_chain(size):
+    prob = Problem()
+    prob.model.add_subsystem('px', IndepVarComp('x', np.ones(size)))
+    prob.model.add_subsystem('comp', ExecComp('y = 2.0*x', x=np.ones(size), y=np.ones(size)))
+    prob.model.connect('px.x', 'comp.x')
+    return prob
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.startdir = os.getcwd()
+        self.tempdir = tempfile.mkdtemp(prefix='test_benchmark-')
+        os.chdir(self.tempdir)
+
+    def tearDown(self):
+        os.chdir(self.startdir)
+        shutil.rmtree(self.tempdir, ignore_errors=True)
+
+    def test_phases(self):
+        scenario = Scenario('sellar', _build_sellar, [1], totals=True, record=True)
+        times = scenario.run(1, repeat=2)
+        self.assertEqual(list(times),
+                         ['setup', 'final_setup', 'run_model', 'compute_totals', 'record'])
+        for elapsed in times.values():
+            self.assertGreater(elapsed, 0.)
+
+        scenario = Scenario('chain', _build_chain, [1],
+                            totals=lambda prob: (['comp.y'], ['px.x']))
+        self.assertEqual(list(scenario.run(3, repeat=1)),
+                         ['setup', 'final_setup', 'run_model', 'compute_totals'])
+
+    def test_db(self):
+        db = BenchmarkDB('bench.db')
+        db.add('aaa', 'chain', 10, {'setup': 1.0, 'run_model': 0.5})
+        db.add('bbb', 'chain', 10, {'setup': 1.05, 'run_model': 0.8})
+        db.add('bbb', 'chain', 20, {'setup': 3.0})
+        db.close()
+
+        db = BenchmarkDB('bench.db')
+        self.assertEqual(db.get_commits(), ['aaa', 'bbb'])
+        self.assertEqual(db.get_times('aaa'),
+                         {('chain', 10, 'setup'): 1.0, ('chain', 10, 'run_model'): 0.5})
+
+        # only the run_model slowdown exceeds the tolerance; size 20 has no baseline
+        self.assertEqual(db.find_regressions('bbb', 'aaa'),
+                         [('chain', 10, 'run_model', 0.5, 0.8)])
+        self.assertEqual(db.find_regressions('bbb', 'aaa', tolerance=0.01),
+                         [('chain', 10, 'run_model', 0.5, 0.8),
+                          ('chain', 10, 'setup', 1.0, 1.05)])
+        self.assertEqual(db.find_regressions('bbb', 'aaa', min_time=0.5), [])
+
+        # the most recent run of a commit is used
+        db.add('bbb', 'chain', 10, {'run_model': 0.5})
+        self.assertEqual(db.find_regressions('bbb', 'aaa'), [])
+        db.close()
+
+    def test_run_benchmarks(self):
+        db = BenchmarkDB('bench.db')
+        stream = StringIO()
+        results = run_benchmarks([Scenario('chain', _build_chain, [2, 4])], db, commit='abc',
+                                 repeat=1, out_stream=stream)
+        self.assertEqual(sorted(results),
+                         [('chain', size, phase) for size in (2, 4)
+                          for phase in ('final_setup', 'run_model', 'setup')])
+        self.assertEqual(db.get_times('abc'), results)
+        self.assertEqual(len(stream.getvalue().splitlines()), 6)
+        db.close()
+
+    def test_main(self):
+        scenarios = [Scenario('chain', _build_chain, [2]), Scenario('other', _build_chain, [2])]
+
+        # fake an earlier commit that was much faster
+        commit = get_commit()
+        db = BenchmarkDB('bench.db')
+        db.add('old', 'chain', 2, {'setup': 1e-9, 'final_setup': 1e-9, 'run_model': 1e-9})
+        db.close()
+
+        status = benchmark_main(scenarios, ['chain', '-d', 'bench.db', '-r', '1',
+                                            '-b', 'old', '-t', '0.5'])
+        self.assertEqual(status, 1)
+
+        db = BenchmarkDB('bench.db')
+        self.assertEqual(db.get_commits(), ['old', commit])
+        self.assertEqual(set(key[0] for key in db.get_times(commit)), set(['chain']))
+        db.close()
+
+    def _git(self, *args):
+        return subprocess.check_output(('git', '-c', 'user.name=test', '-c',
+                                        'user.email=test@example.com') + args).decode('utf-8')
+
+    def _init_repo(self):
+        try:
+            self._git('init', '-q')
+        except (OSError, subprocess.CalledProcessError):
+            raise unittest.SkipTest("git is not available")
+
+        for i in range(2):
+            with open('model.txt', 'w') as f:
+                f.write('version %d\n' % i)
+            self._git('add', 'model.txt')
+            self._git('commit', '-q', '-m', 'version %d' % i)
+
+    def test_commits(self):
+        self._init_repo()
+        head = self._git('rev-parse', 'HEAD').strip()
+        first = self._git('rev-parse', 'HEAD~1').strip()
+        self.assertEqual(get_commit(), head)
+        self.assertEqual(resolve_commit('HEAD~1'), first)
+        self.assertEqual(resolve_commit(first[:7] + '-dirty'), first + '-dirty')
+        self.assertIsNone(resolve_commit('nosuchrev'))
+
+        # untracked files don't count as changes
+        with open('other.txt', 'w') as f:
+            f.write('other\n')
+        self.assertEqual(get_commit(), head)
+
+        with open('model.txt', 'w') as f:
+            f.write('changed\n')
+        self.assertEqual(get_commit(), head + '-dirty')
+
+    def test_main_baseline(self):
+        self._init_repo()
+        first = self._git('rev-parse', 'HEAD~1').strip()
+        scenarios = [Scenario('chain', _build_chain, [2])]
+
+        db = BenchmarkDB('bench.db')
+        db.add(first, 'chain', 2, {'setup': 1e-9, 'final_setup': 1e-9, 'run_model': 1e-9})
+        db.close()
+
+        # a baseline without results is an error, and nothing is run
+        for baseline in ('HEAD', 'nosuchrev'):
+            status = benchmark_main(scenarios, ['-d', 'bench.db', '-r', '1', '-b', baseline])
+            self.assertEqual(status, 2)
+
+        # the baseline is resolved to the full hash it is stored under
+        status = benchmark_main(scenarios, ['-d', 'bench.db', '-r', '1', '-b', 'HEAD~1',
+                                            '-t', '0.5'])
+        self.assertEqual(status, 1)
+
+        db = BenchmarkDB('bench.db')
+        self.assertEqual(db.get_commits(), [first, get_commit()])
+        db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
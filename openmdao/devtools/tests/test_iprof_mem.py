@@ -0,0 +1,80 @@
+"""Test the tracemalloc mode of the memory profiler."""
+from __future__ import division
+
+import unittest
+
+import numpy as np
+from six import StringIO
+
+from openmdao.api import Problem, IndepVarComp, ExecComp
+from openmdao.core.system import System
+import openmdao.devtools.iprof_mem as iprof_mem
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+@unittest.skipUnless(tracemalloc, "tracemalloc is required.")
+class TestTracemallocProfile(unittest.TestCase):
+
+    def tearDown(self):
+        iprof_mem.stop()
+        iprof_mem._registered = False
+        iprof_mem._mode = 'rss'
+        iprof_mem._tm_records.clear()
+
+    def test_tracemalloc(self):
+        size = 2000
+        original = System.__dict__['_setup_vectors']
+
+        iprof_mem.setup(mode='tracemalloc', finalize=False)
+        iprof_mem.start()
+
+        self.assertIsNot(System.__dict__['_setup_vectors'], original)
+
+        prob = Problem()
+        model = prob.model
+        model.add_subsystem('px', IndepVarComp('x', np.ones(size)))
+        model.add_subsystem('comp', ExecComp('y = 2.0*x', x=np.ones(size), y=np.ones(size)))
+        model.connect('px.x', 'comp.x')
+        prob.setup(check=False)
+        prob.run_model()
+
+        iprof_mem.stop()
+
+        # the wrappers are removed when profiling stops
+        self.assertIs(System.__dict__['_setup_vectors'], original)
+
+        records = iprof_mem._tm_records
+
+        # the root vectors hold at least 3 nonlinear vectors of 2 * size doubles
+        calls, net, self_net, peak = records['', '_get_root_vectors']
+        self.assertEqual(calls, 1)
+        self.assertGreater(net, 3 * 2 * size * 8)
+        self.assertGreaterEqual(peak, net)
+
+        # the setup of a group includes that of its subsystems, but its self net excludes them
+        comp_net = records['comp', '_setup_var_data'][1]
+        model_rec = records['', '_setup_var_data']
+        self.assertGreaterEqual(model_rec[1], comp_net)
+        self.assertLessEqual(model_rec[2], model_rec[1] - comp_net)
+
+        self.assertEqual(records['comp', '_solve_nonlinear'][0], 1)
+
+        stream = StringIO()
+        iprof_mem._tracemalloc_report(out_stream=stream)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(lines[0], "Memory allocated by system and method")
+        self.assertTrue(any(line.endswith('comp:_setup_vectors') for line in lines))
+        self.assertTrue(any(line.endswith('  _get_root_vectors') for line in lines))
+
+    def test_bad_mode(self):
+        with self.assertRaises(ValueError) as cm:
+            iprof_mem.setup(mode='junk')
+        self.assertEqual(str(cm.exception), "Unknown memory profiling mode 'junk'.")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Test the sampling mode of the instance-based profiler."""
+from __future__ import division
+
+import os
+import shutil
+import signal
+import tempfile
+import unittest
+
+from openmdao.api import Problem
+from openmdao.test_suite.components.sellar import SellarDerivativesGrouped
+import openmdao.devtools.iprofile as iprofile
+
+
+@unittest.skipUnless(hasattr(signal, 'setitimer'), "Sampling requires signal.setitimer.")
+class TestSamplingProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.startdir = os.getcwd()
+        self.tempdir = tempfile.mkdtemp(prefix='test_iprofile-')
+        os.chdir(self.tempdir)
+
+    def tearDown(self):
+        iprofile.stop()
+        iprofile._profile_setup = False
+        iprofile._profile_total = 0.0
+        iprofile._sample_interval = None
+        iprofile._call_stack = []
+        iprofile._inst_data = {}
+        if iprofile._profile_out is not None:
+            iprofile._profile_out.close()
+            iprofile._profile_out = None
+
+        os.chdir(self.startdir)
+        shutil.rmtree(self.tempdir, ignore_errors=True)
+
+    def test_bad_interval(self):
+        with self.assertRaises(ValueError) as cm:
+            iprofile.setup(finalize=False, sample_interval=0.)
+        self.assertEqual(str(cm.exception), "sample_interval must be positive but is 0.0.")
+
+    def test_sampling(self):
+        prob = Problem(model=SellarDerivativesGrouped())
+        prob.setup(check=False)
+        prob.set_solver_print(level=0)
+        prob.final_setup()
+
+        old_handler = signal.getsignal(signal.SIGPROF)
+
+        iprofile.setup(finalize=False, sample_interval=0.001)
+        iprofile.start()
+        for i in range(200):
+            prob.run_model()
+            prob.compute_totals(of=['obj'], wrt=['x', 'z'])
+        iprofile.stop()
+
+        self.assertIs(signal.getsignal(signal.SIGPROF), old_handler)
+
+        paths = [path for path in iprofile._inst_data if path != '$total']
+        self.assertTrue(paths)
+
+        # every path is rooted at $total and the parents of each path were sampled too
+        for path in paths:
+            self.assertTrue(path.startswith('$total-'))
+            parent = path.rsplit('-', 1)[0]
+            self.assertIn(parent, iprofile._inst_data)
+            if parent != '$total':
+                self.assertGreaterEqual(iprofile._inst_data[parent][2],
+                                        iprofile._inst_data[path][2])
+
+        # samples are attributed to the systems they were taken in
+        objs = set(data[0] for data in iprofile._inst_data.values())
+        self.assertIn(prob.model.mda, objs)
+
+        iprofile._finalize_profile()
+        call_data, totals = iprofile._process_profile(['iprof.0'])
+        self.assertIn('$total', call_data)
+        self.assertTrue(any(name.startswith('mda.') for name in totals))
+
+
+if __name__ == '__main__':
+    unittest.main()
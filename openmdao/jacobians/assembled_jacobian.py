@@ -95,14 +95,10 @@ class AssembledJacobian(Jacobian):
         """
         system = self._system
 
-        sizes = system._var_sizes['nonlinear'][type_]
-        iproc = system.comm.rank
+        offsets = system._get_var_offsets('nonlinear', type_)[system.comm.rank]
         idx = system._var_allprocs_abs2idx['nonlinear'][type_][abs_name]
 
-        ind1 = np.sum(sizes[iproc, :idx])
-        ind2 = np.sum(sizes[iproc, :idx + 1])
-
-        return ind1, ind2
+        return offsets[idx], offsets[idx + 1]
 
     def _initialize(self):
         """
@@ -1,8 +1,10 @@
 """Management of iteration stack for recording."""
+import threading
+
 from openmdao.utils.mpi import MPI
 
 
-class _RecIteration(object):
+class _RecIteration(threading.local):
     def __init__(self):
         self.stack = []
 
@@ -105,7 +107,7 @@ class Recording(object):
         do_recording = True
 
         for stack_item in recording_iteration.stack:
-            if stack_item[0] in ('_run_apply', '_compute_totals'):
+            if stack_item[0] in ('_run_apply', '_compute_totals', '_concurrent_worker'):
                 do_recording = False
                 break
 
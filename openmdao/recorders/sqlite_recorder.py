@@ -278,6 +278,8 @@ class SqliteRecorder(BaseRecorder):
         for kind, odict in iteritems(recording_requester._vectors):
             scaling_vecs[kind] = scaling = {}
             for vecname, vec in iteritems(odict):
+                if vec._do_scaling and vec._scaling is None:
+                    vec._initialize_scaling()
                 scaling[vecname] = vec._scaling
         scaling_factors = pickle.dumps(scaling_vecs,
                                        pickle.HIGHEST_PROTOCOL)
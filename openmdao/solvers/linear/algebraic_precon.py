@@ -0,0 +1,372 @@
+"""Define preconditioners built directly from the entries of an AssembledJacobian."""
+
+from __future__ import division, print_function
+
+import numpy as np
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
+
+from openmdao.solvers.solver import LinearSolver
+from openmdao.matrices.dense_matrix import DenseMatrix
+from openmdao.recorders.recording_iteration_stack import Recording
+
+
+class AlgebraicPrecon(LinearSolver):
+    """
+    Base class for preconditioners that operate on the matrix of an <AssembledJacobian>.
+
+    These are intended to be assigned to the 'precon' attribute of a Krylov solver.  The
+    approximate inverse is rebuilt from the assembled matrix only in _linearize, and applying
+    it is a purely algebraic operation on the vector data, so the system tree is never
+    traversed during a Krylov iteration.
+
+    Attributes
+    ----------
+    _offset : int
+        Row/column offset of the owning system's block within the assembled matrix.
+    """
+
+    SOLVER = 'LN: PRECON'
+
+    def __init__(self, **kwargs):
+        """
+        Initialize all attributes.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            options dictionary.
+        """
+        super(AlgebraicPrecon, self).__init__(**kwargs)
+        self._offset = 0
+
+    def _linearize_children(self):
+        """
+        Return a flag that is True when we need to call linearize on our subsystems' solvers.
+
+        Returns
+        -------
+        boolean
+            Flag for indicating child linerization
+        """
+        return False
+
+    def _get_matrix(self):
+        """
+        Return the block of the assembled matrix that belongs to our system.
+
+        Returns
+        -------
+        ndarray or scipy.sparse.csc_matrix
+            The (unscaled) square block of the internal jacobian matrix for this system.
+        """
+        system = self._system
+
+        if not (system._owns_assembled_jac or system._views_assembled_jac):
+            raise RuntimeError("%s in system '%s' requires an AssembledJacobian." %
+                               (type(self).__name__, system.pathname))
+
+        jac = system._jacobian
+        mtx = jac._int_mtx
+        start, end = jac._view_ranges[system.pathname][:2]
+        self._offset = start
+
+        if isinstance(mtx, DenseMatrix):
+            return mtx._matrix[start:end, start:end]
+
+        return scipy.sparse.csc_matrix(mtx._matrix)[start:end, start:end]
+
+    def _linearize(self):
+        """
+        Rebuild the preconditioner from the current assembled jacobian.
+        """
+        self._build(self._get_matrix())
+
+    def _build(self, matrix):
+        """
+        Compute and store whatever is needed to apply the approximate inverse.
+
+        Parameters
+        ----------
+        matrix : ndarray or scipy.sparse.csc_matrix
+            The square block of the assembled jacobian for our system.
+        """
+        pass
+
+    def _apply_inverse(self, b_data, mode):
+        """
+        Apply the approximate inverse to the given right-hand side.
+
+        Parameters
+        ----------
+        b_data : ndarray
+            Right-hand side array.
+        mode : str
+            'fwd' or 'rev'.
+
+        Returns
+        -------
+        ndarray
+            Result of applying the approximate inverse (transposed in rev mode).
+        """
+        pass
+
+    def solve(self, vec_names, mode, rel_systems=None):
+        """
+        Apply the preconditioner.
+
+        Parameters
+        ----------
+        vec_names : [str, ...]
+            list of names of the right-hand-side vectors.
+        mode : str
+            'fwd' or 'rev'.
+        rel_systems : set of str
+            Set of names of relevant systems based on the current linear solve.
+
+        Returns
+        -------
+        boolean
+            Failure flag; True if failed to converge, False is successful.
+        float
+            absolute error.
+        float
+            relative error.
+        """
+        self._vec_names = vec_names
+        self._mode = mode
+        self._rel_systems = rel_systems
+
+        system = self._system
+
+        with Recording(type(self).__name__, 0, self) as rec:
+            for vec_name in vec_names:
+                if vec_name not in system._rel_vec_names:
+                    continue
+                d_residuals = system._vectors['residual'][vec_name]
+                d_outputs = system._vectors['output'][vec_name]
+
+                if mode == 'fwd':
+                    x_vec = d_outputs
+                    b_vec = d_residuals
+                else:  # rev
+                    x_vec = d_residuals
+                    b_vec = d_outputs
+
+                # AssembledJacobians are unscaled.
+                with system._unscaled_context(outputs=[d_outputs], residuals=[d_residuals]):
+                    x_vec.set_data(self._apply_inverse(b_vec.get_data(), mode))
+
+            rec.abs = 0.0
+            rec.rel = 0.0
+
+        return False, 0., 0.
+
+
+class DiagonalPrecon(AlgebraicPrecon):
+    """
+    Point Jacobi preconditioner using the diagonal of the assembled jacobian.
+
+    Attributes
+    ----------
+    _inv_diag : ndarray
+        Reciprocal of the jacobian diagonal (zero entries are treated as one).
+    """
+
+    SOLVER = 'LN: DIAG'
+
+    def __init__(self, **kwargs):
+        """
+        Initialize all attributes.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            options dictionary.
+        """
+        super(DiagonalPrecon, self).__init__(**kwargs)
+        self._inv_diag = None
+
+    def _build(self, matrix):
+        """
+        Compute and store whatever is needed to apply the approximate inverse.
+
+        Parameters
+        ----------
+        matrix : ndarray or scipy.sparse.csc_matrix
+            The square block of the assembled jacobian for our system.
+        """
+        diag = np.array(matrix.diagonal(), dtype=float)
+        diag[diag == 0.0] = 1.0
+        self._inv_diag = 1.0 / diag
+
+    def _apply_inverse(self, b_data, mode):
+        """
+        Apply the approximate inverse to the given right-hand side.
+
+        Parameters
+        ----------
+        b_data : ndarray
+            Right-hand side array.
+        mode : str
+            'fwd' or 'rev'.
+
+        Returns
+        -------
+        ndarray
+            Result of applying the approximate inverse (transposed in rev mode).
+        """
+        return b_data * self._inv_diag
+
+
+class BlockJacobiPrecon(AlgebraicPrecon):
+    """
+    Block Jacobi preconditioner using the diagonal blocks of each local subsystem.
+
+    Attributes
+    ----------
+    _blocks : [(int, int, object), ...]
+        Start index, end index, and LU factorization of each diagonal block.
+    """
+
+    SOLVER = 'LN: BJAC'
+
+    def __init__(self, **kwargs):
+        """
+        Initialize all attributes.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            options dictionary.
+        """
+        super(BlockJacobiPrecon, self).__init__(**kwargs)
+        self._blocks = []
+
+    def _build(self, matrix):
+        """
+        Compute and store whatever is needed to apply the approximate inverse.
+
+        Parameters
+        ----------
+        matrix : ndarray or scipy.sparse.csc_matrix
+            The square block of the assembled jacobian for our system.
+        """
+        system = self._system
+        view_ranges = system._jacobian._view_ranges
+        offset = self._offset
+
+        ranges = []
+        for subsys in system._subsystems_myproc:
+            start, end = view_ranges[subsys.pathname][:2]
+            if end > start:
+                ranges.append((start - offset, end - offset))
+
+        # components (or groups without local children) form a single block
+        if not ranges:
+            ranges.append((0, matrix.shape[0]))
+
+        dense = isinstance(matrix, np.ndarray)
+
+        self._blocks = blocks = []
+        for start, end in ranges:
+            block = matrix[start:end, start:end]
+            if dense:
+                blocks.append((start, end, scipy.linalg.lu_factor(block)))
+            else:
+                blocks.append((start, end, scipy.sparse.linalg.splu(block.tocsc())))
+
+    def _apply_inverse(self, b_data, mode):
+        """
+        Apply the approximate inverse to the given right-hand side.
+
+        Parameters
+        ----------
+        b_data : ndarray
+            Right-hand side array.
+        mode : str
+            'fwd' or 'rev'.
+
+        Returns
+        -------
+        ndarray
+            Result of applying the approximate inverse (transposed in rev mode).
+        """
+        x_data = np.empty(b_data.shape)
+
+        for start, end, lu in self._blocks:
+            if isinstance(lu, tuple):
+                trans = 0 if mode == 'fwd' else 1
+                x_data[start:end] = scipy.linalg.lu_solve(lu, b_data[start:end], trans=trans)
+            else:
+                trans = 'N' if mode == 'fwd' else 'T'
+                x_data[start:end] = lu.solve(b_data[start:end], trans)
+
+        return x_data
+
+
+class ILUPrecon(AlgebraicPrecon):
+    """
+    Incomplete LU preconditioner computed with scipy.sparse.linalg.spilu.
+
+    Attributes
+    ----------
+    _ilu : scipy.sparse.linalg.SuperLU
+        Incomplete factorization of the assembled jacobian.
+    """
+
+    SOLVER = 'LN: ILU'
+
+    def __init__(self, **kwargs):
+        """
+        Initialize all attributes.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            options dictionary.
+        """
+        super(ILUPrecon, self).__init__(**kwargs)
+        self._ilu = None
+
+    def _declare_options(self):
+        """
+        Declare options before kwargs are processed in the init method.
+        """
+        self.options.declare('drop_tol', default=1e-4,
+                             desc='Drop tolerance for the incomplete factorization.')
+        self.options.declare('fill_factor', default=10.0,
+                             desc='Upper bound on the ratio of fill in the factorization '
+                                  'to the nonzeros of the original matrix.')
+
+    def _build(self, matrix):
+        """
+        Compute and store whatever is needed to apply the approximate inverse.
+
+        Parameters
+        ----------
+        matrix : ndarray or scipy.sparse.csc_matrix
+            The square block of the assembled jacobian for our system.
+        """
+        self._ilu = scipy.sparse.linalg.spilu(scipy.sparse.csc_matrix(matrix),
+                                              drop_tol=self.options['drop_tol'],
+                                              fill_factor=self.options['fill_factor'])
+
+    def _apply_inverse(self, b_data, mode):
+        """
+        Apply the approximate inverse to the given right-hand side.
+
+        Parameters
+        ----------
+        b_data : ndarray
+            Right-hand side array.
+        mode : str
+            'fwd' or 'rev'.
+
+        Returns
+        -------
+        ndarray
+            Result of applying the approximate inverse (transposed in rev mode).
+        """
+        return self._ilu.solve(b_data, 'N' if mode == 'fwd' else 'T')
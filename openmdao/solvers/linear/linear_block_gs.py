@@ -33,8 +33,7 @@ class LinearBlockGS(BlockLinearSolver):
                 for vec_name in vec_names:
                     if vec_name in subsys._rel_vec_names:
                         b_vec = system._vectors['residual'][vec_name]
-                        b_vec *= -1.0
-                        b_vec += self._rhs_vecs[vec_name]
+                        b_vec.scal_add_scal_vec(-1.0, 1.0, self._rhs_vecs[vec_name])
                 subsys._solve_linear(vec_names, mode, self._rel_systems)
 
         else:  # rev
@@ -50,8 +49,7 @@ class LinearBlockGS(BlockLinearSolver):
                         b_vec = system._vectors['output'][vec_name]
                         b_vec.set_const(0.0)
                         system._transfer(vec_name, mode, isub)
-                        b_vec *= -1.0
-                        b_vec += self._rhs_vecs[vec_name]
+                        b_vec.scal_add_scal_vec(-1.0, 1.0, self._rhs_vecs[vec_name])
                 subsys._solve_linear(vec_names, mode, self._rel_systems)
                 scope_out, scope_in = system._get_scope(subsys)
                 subsys._apply_linear(vec_names, self._rel_systems, mode, scope_out, scope_in)
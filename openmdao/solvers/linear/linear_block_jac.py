@@ -1,5 +1,7 @@
 """Define the LinearBlockJac class."""
 from openmdao.solvers.solver import BlockLinearSolver
+from openmdao.utils.concurrent import run_subsystems
+from openmdao.utils.general_utils import ContainsAll
 
 
 class LinearBlockJac(BlockLinearSolver):
@@ -9,6 +11,36 @@ class LinearBlockJac(BlockLinearSolver):
 
     SOLVER = 'LN: LNBJ'
 
+    def _declare_options(self):
+        """
+        Declare options before kwargs are processed in the init method.
+        """
+        self.options.declare('executor', values=[None, 'thread', 'process'], default=None,
+                             desc="If 'thread' or 'process', run the local subsystems "
+                                  "concurrently on a pool of threads or forked processes.")
+        self.options.declare('max_workers', types=int, default=None, allow_none=True, lower=1,
+                             desc='Maximum number of threads or processes used by the '
+                                  'executor. If None, use up to one per cpu.')
+
+    def _run_subsystems(self, subs, func, op, key):
+        """
+        Call func on each of the given subsystems, using the selected executor.
+
+        Parameters
+        ----------
+        subs : [<System>, ...]
+            Subsystems to run.
+        func : callable
+            Function taking a subsystem and op that operates on its linear vectors.
+        op : str
+            Operation, 'apply' or 'solve'.
+        key : hashable or None
+            Identifies func and subs, so that a pool of processes can be reused.
+        """
+        vec_names = self._vec_names
+        run_subsystems(func, subs, lambda subsys: _get_linear_vectors(subsys, vec_names),
+                       self.options['executor'], self.options['max_workers'], (op,), key)
+
     def _iter_execute(self):
         """
         Perform the operations in the iteration loop.
@@ -16,39 +48,71 @@ class LinearBlockJac(BlockLinearSolver):
         system = self._system
         mode = self._mode
         vec_names = self._vec_names
+        rel_systems = self._rel_systems
 
         subs = [s for s in system._subsystems_myproc
                 if self._rel_systems is None or s.pathname in self._rel_systems]
 
+        def run(subsys, op):
+            if op == 'apply':
+                scope_out, scope_in = system._get_scope(subsys)
+                subsys._apply_linear(vec_names, rel_systems, mode, scope_out, scope_in)
+            else:
+                subsys._solve_linear(vec_names, mode, rel_systems)
+
+        # both operations use one pool of processes, which is kept for as long as the
+        # right-hand sides and the relevant systems don't change
+        key = None
+        if self.options['executor'] == 'process':
+            if rel_systems is None or isinstance(rel_systems, ContainsAll):
+                rel_key = type(rel_systems)
+            else:
+                rel_key = frozenset(rel_systems)
+            key = (self, mode, tuple(vec_names), rel_key)
+
         if mode == 'fwd':
             for vec_name in vec_names:
                 system._transfer(vec_name, mode)
 
-            for subsys in subs:
-                scope_out, scope_in = system._get_scope(subsys)
-                subsys._apply_linear(vec_names, self._rel_systems, mode,
-                                     scope_out, scope_in)
+            self._run_subsystems(subs, run, 'apply', key)
 
             for vec_name in vec_names:
                 b_vec = system._vectors['residual'][vec_name]
-                b_vec *= -1.0
-                b_vec += self._rhs_vecs[vec_name]
+                b_vec.scal_add_scal_vec(-1.0, 1.0, self._rhs_vecs[vec_name])
 
-            for subsys in subs:
-                subsys._solve_linear(vec_names, mode, self._rel_systems)
+            self._run_subsystems(subs, run, 'solve', key)
 
         else:  # rev
-            for subsys in subs:
-                scope_out, scope_in = system._get_scope(subsys)
-                subsys._apply_linear(vec_names, self._rel_systems, mode,
-                                     scope_out, scope_in)
+            self._run_subsystems(subs, run, 'apply', key)
 
             for vec_name in vec_names:
                 system._transfer(vec_name, mode)
 
                 b_vec = system._vectors['output'][vec_name]
-                b_vec *= -1.0
-                b_vec += self._rhs_vecs[vec_name]
+                b_vec.scal_add_scal_vec(-1.0, 1.0, self._rhs_vecs[vec_name])
+
+            self._run_subsystems(subs, run, 'solve', key)
+
 
-            for subsys in subs:
-                subsys._solve_linear(vec_names, mode, self._rel_systems)
+def _get_linear_vectors(subsys, vec_names):
+    """
+    Return the linear vectors of the given subsystem for the given right-hand sides.
+
+    Parameters
+    ----------
+    subsys : <System>
+        The subsystem.
+    vec_names : [str, ...]
+        Names of the right-hand-side vectors.
+
+    Returns
+    -------
+    [<Vector>, ...]
+        The d_inputs, d_outputs, and d_residuals vectors for each relevant vec_name.
+    """
+    vecs = []
+    for vec_name in vec_names:
+        if vec_name in subsys._rel_vec_names:
+            for kind in ('input', 'output', 'residual'):
+                vecs.append(subsys._vectors[kind][vec_name])
+    return vecs
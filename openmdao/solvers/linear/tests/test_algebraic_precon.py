@@ -0,0 +1,155 @@
+"""Test the preconditioners built from an AssembledJacobian."""
+
+from __future__ import division, print_function
+
+import unittest
+from six import iteritems
+
+import numpy as np
+
+from openmdao.api import Problem, NewtonSolver, ScipyKrylov, DenseJacobian, CSCJacobian, \
+     DiagonalPrecon, BlockJacobiPrecon, ILUPrecon
+from openmdao.devtools.testutil import assert_rel_error
+from openmdao.test_suite.components.sellar import SellarDerivatives
+
+
+class TestAlgebraicPrecon(unittest.TestCase):
+
+    def _check_sellar(self, precon_class, jac_class, mode):
+        prob = Problem()
+        krylov = ScipyKrylov()
+        krylov.precon = precon_class()
+        model = prob.model = SellarDerivatives(nonlinear_solver=NewtonSolver(),
+                                               linear_solver=krylov)
+        model.jacobian = jac_class()
+
+        prob.setup(check=False, mode=mode)
+        prob.set_solver_print(level=0)
+        prob.run_model()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+        Jbase = {}
+        Jbase['con1', 'x'] = [[-0.98061433]]
+        Jbase['con1', 'z'] = np.array([[-9.61002285, -0.78449158]])
+        Jbase['con2', 'x'] = [[0.09692762]]
+        Jbase['con2', 'z'] = np.array([[1.94989079, 1.0775421]])
+        Jbase['obj', 'x'] = [[2.98061392]]
+        Jbase['obj', 'z'] = np.array([[9.61001155, 1.78448534]])
+
+        J = prob.compute_totals(of=['obj', 'con1', 'con2'], wrt=['x', 'z'],
+                                return_format='flat_dict')
+        for key, val in iteritems(Jbase):
+            assert_rel_error(self, J[key], val, .00001)
+
+    def test_diagonal(self):
+        for jac_class in (DenseJacobian, CSCJacobian):
+            for mode in ('fwd', 'rev'):
+                self._check_sellar(DiagonalPrecon, jac_class, mode)
+
+    def test_block_jacobi(self):
+        for jac_class in (DenseJacobian, CSCJacobian):
+            for mode in ('fwd', 'rev'):
+                self._check_sellar(BlockJacobiPrecon, jac_class, mode)
+
+    def test_ilu(self):
+        for jac_class in (DenseJacobian, CSCJacobian):
+            for mode in ('fwd', 'rev'):
+                self._check_sellar(ILUPrecon, jac_class, mode)
+
+    def test_exact_ilu_is_direct(self):
+        # With no dropped entries the ILU is an exact LU, so a single Krylov iteration is enough.
+        prob = Problem()
+        krylov = ScipyKrylov()
+        krylov.precon = ILUPrecon(drop_tol=0.0)
+        model = prob.model = SellarDerivatives(nonlinear_solver=NewtonSolver(),
+                                               linear_solver=krylov)
+        model.jacobian = CSCJacobian()
+
+        prob.setup(check=False)
+        prob.set_solver_print(level=0)
+        prob.run_model()
+
+        model.run_linearize()
+        d_inputs, d_outputs, d_residuals = model.get_linear_vectors()
+        d_residuals.set_const(1.0)
+        d_outputs.set_const(0.0)
+        model.run_solve_linear(['linear'], 'fwd')
+
+        self.assertLessEqual(model.linear_solver._iter_count, 2)
+
+    def test_block_jacobi_blocks(self):
+        prob = Problem()
+        krylov = ScipyKrylov()
+        krylov.precon = precon = BlockJacobiPrecon()
+        model = prob.model = SellarDerivatives(nonlinear_solver=NewtonSolver(),
+                                               linear_solver=krylov)
+        model.jacobian = DenseJacobian()
+
+        prob.setup(check=False)
+        prob.set_solver_print(level=0)
+        prob.run_model()
+
+        # one diagonal block per subsystem of the model
+        self.assertEqual(len(precon._blocks), len(model._subsystems_myproc))
+        self.assertEqual(precon._blocks[-1][1], len(model._outputs.get_data()))
+
+    def test_no_assembled_jac(self):
+        prob = Problem()
+        krylov = ScipyKrylov()
+        krylov.precon = DiagonalPrecon()
+        prob.model = SellarDerivatives(nonlinear_solver=NewtonSolver(), linear_solver=krylov)
+
+        prob.setup(check=False)
+        prob.set_solver_print(level=0)
+
+        with self.assertRaises(RuntimeError) as cm:
+            prob.run_model()
+
+        self.assertEqual(str(cm.exception),
+                         "DiagonalPrecon in system '' requires an AssembledJacobian.")
+
+
+class TestAlgebraicPreconFeature(unittest.TestCase):
+
+    def test_specify_precon(self):
+        import numpy as np
+
+        from openmdao.api import Problem, IndepVarComp, ScipyKrylov, NewtonSolver, ExecComp, \
+             CSCJacobian, ILUPrecon
+        from openmdao.test_suite.components.sellar import SellarDis1withDerivatives, \
+             SellarDis2withDerivatives
+
+        prob = Problem()
+        model = prob.model
+
+        model.add_subsystem('px', IndepVarComp('x', 1.0), promotes=['x'])
+        model.add_subsystem('pz', IndepVarComp('z', np.array([5.0, 2.0])), promotes=['z'])
+
+        model.add_subsystem('d1', SellarDis1withDerivatives(), promotes=['x', 'z', 'y1', 'y2'])
+        model.add_subsystem('d2', SellarDis2withDerivatives(), promotes=['z', 'y1', 'y2'])
+
+        model.add_subsystem('obj_cmp', ExecComp('obj = x**2 + z[1] + y1 + exp(-y2)',
+                                                z=np.array([0.0, 0.0]), x=0.0),
+                            promotes=['obj', 'x', 'z', 'y1', 'y2'])
+
+        model.add_subsystem('con_cmp1', ExecComp('con1 = 3.16 - y1'), promotes=['con1', 'y1'])
+        model.add_subsystem('con_cmp2', ExecComp('con2 = y2 - 24.0'), promotes=['con2', 'y2'])
+
+        model.jacobian = CSCJacobian()
+        model.nonlinear_solver = NewtonSolver()
+        model.linear_solver = ScipyKrylov()
+
+        model.linear_solver.precon = ILUPrecon()
+        model.linear_solver.precon.options['drop_tol'] = 1e-6
+
+        prob.setup()
+        prob.run_model()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@
 from __future__ import division, print_function
 
 import unittest
+from functools import partial
 
 import numpy as np
 
@@ -46,6 +47,45 @@ class TestLinearBlockJacSolver(LinearSolverTests.LinearSolverTestCase):
                              " an AssembledJacobian in system ''")
 
 
+class TestLinearBlockJacThreads(TestLinearBlockJacSolver):
+
+    linear_solver_class = partial(LinearBlockJac, executor='thread')
+
+
+class TestLinearBlockJacProcesses(unittest.TestCase):
+
+    def _compute_totals(self, executor, mode):
+        prob = Problem()
+        model = prob.model = Group()
+
+        model.add_subsystem('px', IndepVarComp('x', 1.0), promotes=['x'])
+        model.add_subsystem('pz', IndepVarComp('z', np.array([5.0, 2.0])), promotes=['z'])
+
+        model.add_subsystem('d1', SellarDis1withDerivatives(), promotes=['x', 'z', 'y1', 'y2'])
+        model.add_subsystem('d2', SellarDis2withDerivatives(), promotes=['z', 'y1', 'y2'])
+
+        model.add_subsystem('obj_cmp', ExecComp('obj = x**2 + z[1] + y1 + exp(-y2)',
+                                                z=np.array([0.0, 0.0]), x=0.0),
+                            promotes=['obj', 'x', 'z', 'y1', 'y2'])
+
+        model.nonlinear_solver = NonlinearBlockGS()
+        model.linear_solver = LinearBlockJac(executor=executor, max_workers=2, maxiter=4)
+
+        prob.setup(check=False, mode=mode)
+        prob.set_solver_print(level=0)
+        prob.run_model()
+
+        return prob.compute_totals(of=['obj'], wrt=['x', 'z'], return_format='flat_dict')
+
+    def test_sellar(self):
+        for mode in ('fwd', 'rev'):
+            J_serial = self._compute_totals(None, mode)
+            J = self._compute_totals('process', mode)
+
+            for key in J_serial:
+                assert_rel_error(self, J[key], J_serial[key], 1e-12)
+
+
 class TestBJacSolverFeature(unittest.TestCase):
 
     def test_specify_solver(self):
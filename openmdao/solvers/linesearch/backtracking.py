@@ -293,9 +293,10 @@ class ArmijoGoldsteinLS(NonlinearSolver):
             finally:
                 self._solver_info.pop()
 
-        u.add_scal_vec(-self.alpha, du)
-        self.alpha *= self.options['rho']
-        u.add_scal_vec(self.alpha, du)
+        # move from the old step length to the new one in a single update
+        rho = self.options['rho']
+        u.add_scal_vec(self.alpha * (rho - 1.0), du)
+        self.alpha *= rho
 
     def _run_iterator(self):
         """
@@ -90,8 +90,7 @@ class NonlinearBlockGS(NonlinearSolver):
 
         if use_aitken:
             # compute the change in the outputs after the NLBGS iteration
-            delta_outputs_n -= outputs
-            delta_outputs_n *= -1
+            delta_outputs_n.scal_add_scal_vec(-1.0, 1.0, outputs)
 
             if self._iter_count >= 2:
                 # Compute relaxation factor. This method is used by Kenway et al. in
@@ -1,6 +1,8 @@
 """Define the NonlinearBlockJac class."""
 from openmdao.solvers.solver import NonlinearSolver
 from openmdao.recorders.recording_iteration_stack import Recording
+from openmdao.utils.concurrent import run_subsystems, solve_nonlinear, \
+    get_nonlinear_vectors
 
 
 class NonlinearBlockJac(NonlinearSolver):
@@ -10,6 +12,17 @@ class NonlinearBlockJac(NonlinearSolver):
 
     SOLVER = 'NL: NLBJ'
 
+    def _declare_options(self):
+        """
+        Declare options before kwargs are processed in the init method.
+        """
+        self.options.declare('executor', values=[None, 'thread', 'process'], default=None,
+                             desc="If 'thread' or 'process', solve the local subsystems "
+                                  "concurrently on a pool of threads or forked processes.")
+        self.options.declare('max_workers', types=int, default=None, allow_none=True, lower=1,
+                             desc='Maximum number of threads or processes used by the '
+                                  'executor. If None, use up to one per cpu.')
+
     def _iter_execute(self):
         """
         Perform the operations in the iteration loop.
@@ -18,8 +31,9 @@ class NonlinearBlockJac(NonlinearSolver):
         self._system._transfer('nonlinear', 'fwd')
 
         with Recording('NonlinearBlockJac', 0, self) as rec:
-            for subsys in self._system._subsystems_myproc:
-                subsys._solve_nonlinear()
+            run_subsystems(solve_nonlinear, self._system._subsystems_myproc,
+                           get_nonlinear_vectors, self.options['executor'],
+                           self.options['max_workers'], key=self)
             self._system._check_reconf_update()
             rec.abs = 0.0
             rec.rel = 0.0
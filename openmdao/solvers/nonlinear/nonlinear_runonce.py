@@ -5,6 +5,7 @@ This is a simple nonlinear solver that just runs the system once.
 """
 from openmdao.solvers.solver import NonlinearSolver
 from openmdao.recorders.recording_iteration_stack import Recording
+from openmdao.utils.concurrent import solve_nonlinear
 from openmdao.utils.general_utils import warn_deprecation
 
 
@@ -33,11 +34,13 @@ class NonlinearRunOnce(NonlinearSolver):
         system = self._system
 
         with Recording('NLRunOnce', 0, self) as rec:
-            # If this is a parallel group, transfer all at once then run each subsystem.
-            if len(system._subsystems_myproc) != len(system._subsystems_allprocs):
+            # If this is a parallel group (under MPI or with an executor), transfer all at once
+            # then run each subsystem.
+            options = system.options
+            if len(system._subsystems_myproc) != len(system._subsystems_allprocs) or \
+                    ('executor' in options and options['executor'] is not None):
                 system._transfer('nonlinear', 'fwd')
-                for subsys in system._subsystems_myproc:
-                    subsys._solve_nonlinear()
+                system._run_subsystems_nonlinear(solve_nonlinear)
                 system._check_reconf_update()
             # If this is not a parallel group, transfer for each subsystem just prior to running it.
             else:
@@ -4,7 +4,7 @@ import unittest
 
 import numpy as np
 
-from openmdao.api import Problem, Group, IndepVarComp, ExecComp, LinearBlockGS
+from openmdao.api import Problem, Group, IndepVarComp, ExecComp, LinearBlockGS, LinearBlockJac
 from openmdao.devtools.testutil import assert_rel_error
 from openmdao.solvers.nonlinear.nonlinear_block_jac import NonlinearBlockJac
 from openmdao.test_suite.components.sellar import SellarDis1withDerivatives, SellarDis2withDerivatives
@@ -146,5 +146,141 @@ class TestNLBlockJacobi(unittest.TestCase):
         assert_rel_error(self, prob['y1'], 25.5886171567, .00001)
         assert_rel_error(self, prob['y2'], 12.05848819, .00001)
 
+    def test_feature_executor(self):
+        import numpy as np
+
+        from openmdao.api import Problem, Group, IndepVarComp, ExecComp, NonlinearBlockJac, LinearBlockGS
+        from openmdao.test_suite.components.sellar import SellarDis1withDerivatives, SellarDis2withDerivatives
+
+        prob = Problem()
+        model = prob.model = Group()
+
+        model.add_subsystem('px', IndepVarComp('x', 1.0), promotes=['x'])
+        model.add_subsystem('pz', IndepVarComp('z', np.array([5.0, 2.0])), promotes=['z'])
+
+        model.add_subsystem('d1', SellarDis1withDerivatives(), promotes=['x', 'z', 'y1', 'y2'])
+        model.add_subsystem('d2', SellarDis2withDerivatives(), promotes=['z', 'y1', 'y2'])
+
+        model.add_subsystem('obj_cmp', ExecComp('obj = x**2 + z[1] + y1 + exp(-y2)',
+                                                z=np.array([0.0, 0.0]), x=0.0),
+                            promotes=['obj', 'x', 'z', 'y1', 'y2'])
+
+        model.add_subsystem('con_cmp1', ExecComp('con1 = 3.16 - y1'), promotes=['con1', 'y1'])
+        model.add_subsystem('con_cmp2', ExecComp('con2 = y2 - 24.0'), promotes=['con2', 'y2'])
+
+        model.linear_solver = LinearBlockGS()
+
+        nlbj = model.nonlinear_solver = NonlinearBlockJac()
+        nlbj.options['executor'] = 'thread'
+        nlbj.options['max_workers'] = 2
+
+        prob.setup()
+
+        prob.run_model()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+
+class TestNLBlockJacobiExecutors(unittest.TestCase):
+
+    def _run_sellar(self, executor, scaling=False, linear_solver=None):
+        prob = Problem()
+        model = prob.model = Group()
+
+        model.add_subsystem('px', IndepVarComp('x', 1.0), promotes=['x'])
+        model.add_subsystem('pz', IndepVarComp('z', np.array([5.0, 2.0])), promotes=['z'])
+
+        model.add_subsystem('d1', SellarDis1withDerivatives(scaling=scaling),
+                            promotes=['x', 'z', 'y1', 'y2'])
+        model.add_subsystem('d2', SellarDis2withDerivatives(scaling=scaling),
+                            promotes=['z', 'y1', 'y2'])
+
+        model.add_subsystem('obj_cmp', ExecComp('obj = x**2 + z[1] + y1 + exp(-y2)',
+                                                z=np.array([0.0, 0.0]), x=0.0),
+                            promotes=['obj', 'x', 'z', 'y1', 'y2'])
+
+        model.linear_solver = LinearBlockGS() if linear_solver is None else linear_solver
+        model.nonlinear_solver = NonlinearBlockJac(executor=executor, maxiter=50)
+
+        prob.setup(check=False)
+        prob.set_solver_print(level=0)
+        prob.run_model()
+
+        return prob
+
+    def test_executors(self):
+        for scaling in (False, True):
+            serial = self._run_sellar(None, scaling)
+
+            for executor in ('thread', 'process'):
+                prob = self._run_sellar(executor, scaling)
+
+                assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+                assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+                assert_rel_error(self, prob['obj'], serial['obj'], 1e-12)
+
+                self.assertEqual(prob.model.nonlinear_solver._iter_count,
+                                 serial.model.nonlinear_solver._iter_count)
+
+    def test_process_pool(self):
+        from openmdao.utils import concurrent
+
+        num_pools = [0]
+        create_process_pool = concurrent._create_process_pool
+
+        def counting_create_process_pool(func, nworkers):
+            num_pools[0] += 1
+            return create_process_pool(func, nworkers)
+
+        concurrent._create_process_pool = counting_create_process_pool
+        try:
+            prob = self._run_sellar('process')
+            self.assertEqual(num_pools[0], 1)
+
+            # the workers are forked again for a new run
+            prob['x'] = 2.0
+            prob.run_model()
+            self.assertEqual(num_pools[0], 2)
+
+            serial = self._run_sellar(None)
+            serial['x'] = 2.0
+            serial.run_model()
+            assert_rel_error(self, prob['obj'], serial['obj'], 1e-12)
+        finally:
+            concurrent._create_process_pool = create_process_pool
+
+        prob.cleanup()
+        self.assertEqual(concurrent._process_pools, {})
+
+        prob = self._run_sellar('thread')
+        prob.cleanup()
+        self.assertEqual(concurrent._thread_pools, {})
+
+    def test_linearize(self):
+        from openmdao.utils import concurrent
+
+        prob = self._run_sellar('process', linear_solver=LinearBlockJac(executor='process'))
+        nl_solver = prob.model.nonlinear_solver
+        ln_solver = prob.model.linear_solver
+
+        J = prob.compute_totals(of=['obj'], wrt=['x'], return_format='flat_dict')
+        assert_rel_error(self, J['obj', 'x'], [[2.98061391]], .00001)
+        owners = set(pool_key[0][0] for pool_key in concurrent._process_pools)
+        self.assertEqual(owners, set([nl_solver, ln_solver]))
+
+        # linearizing only discards the pools of the linear solvers, whose workers would use
+        # the old jacobians
+        prob.model._linearize()
+        owners = [pool_key[0][0] for pool_key in concurrent._process_pools]
+        self.assertEqual(owners, [nl_solver])
+
+        prob.cleanup()
+
+    def test_bad_executor(self):
+        with self.assertRaises(ValueError):
+            NonlinearBlockJac(executor='mpi')
+
+
 if __name__ == "__main__":
     unittest.main()
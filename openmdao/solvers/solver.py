@@ -3,6 +3,7 @@
 from __future__ import division, print_function
 
 import os
+import threading
 
 import numpy as np
 
@@ -16,10 +17,12 @@ from openmdao.utils.options_dictionary import OptionsDictionary
 from openmdao.utils.record_util import create_local_meta, check_path
 
 
-class SolverInfo(object):
+class SolverInfo(threading.local):
     """
     Communal object for storing some formatting for solver iprint.
 
+    Each thread has its own prefix and stack.
+
     Attributes
     ----------
     prefix : str
@@ -3,12 +3,43 @@
 import numpy as np
 import scipy.linalg as linalg
 from scipy.optimize import minimize
-from six.moves import zip, range
+from scipy.sparse.linalg import eigsh
+from six.moves import range
 
 from openmdao.surrogate_models.surrogate_model import SurrogateModel
+from openmdao.utils.concurrent import concurrent_map
 
 MACHINE_EPSILON = np.finfo(np.double).eps
 
+# Tikhonov regularization parameter h of R, relative to its largest eigenvalue. Both
+# factorizations invert R + h^2 R^-1 instead of R, which leaves the eigenvalues that are much
+# larger than h unchanged and suppresses the ones that are much smaller.
+TIKHONOV = 1e-8
+
+# R is factorized by Cholesky if its estimated reciprocal condition number is at least this.
+# R^-1, and so the regularized matrix, is then accurate enough that the likelihood is the same
+# as that of the eigendecomposition, which is used otherwise.
+MIN_CHOLESKY_RCOND = 1e-10
+
+# update extends the Cholesky factor by the rows of R itself, which is only accurate if the
+# regularization is negligible, i.e., if the estimated reciprocal condition number of R is at
+# least this.
+MIN_UPDATE_RCOND = 1e-4
+
+# Nugget added, relative to their variances, to the responses and derivatives of a model trained
+# with gradients. The derivatives nearly determine the responses when the correlation lengths
+# are long compared to the spacing of the points, so without it, R becomes singular to machine
+# precision there and the likelihood is dominated by rounding errors.
+GRADIENT_NUGGET = 1e-6
+
+# Maximum number of elements of the temporary (points, training points, dimensions) arrays that
+# are created when evaluating many points at once.
+CHUNK_ELEMENTS = 2 ** 20
+
+# Attributes that hold the trained state of a KrigingSurrogate.
+_STATE_ATTRS = ('n_dims', 'n_samples', 'thetas', 'alpha', 'L', 'R_pinv', 'sigma2',
+                'X_mean', 'X_std', 'Y_mean', 'Y_std', '_n_optimized', '_G')
+
 
 class KrigingSurrogate(SurrogateModel):
     """
@@ -16,9 +47,16 @@ class KrigingSurrogate(SurrogateModel):
 
     Predictions are returned as a tuple of mean and RMSE. Based on Gaussian Processes
     for Machine Learning (GPML) by Rasmussen and Williams. (see also: scikit-learn).
+
+    The hyper-parameters are found by maximizing the likelihood with analytic gradients, using
+    a Tikhonov regularized Cholesky factorization of the correlation matrix R. Only if R is
+    nearly singular, which happens for densely spaced or duplicate training points and a
+    nugget close to zero, a much slower eigendecomposition is used instead, so for large
+    training sets a small nugget (e.g., 1e-6) keeps training fast.
     """
 
-    def __init__(self, nugget=10. * MACHINE_EPSILON, eval_rmse=False):
+    def __init__(self, nugget=10. * MACHINE_EPSILON, eval_rmse=False, n_start=1, executor=None,
+                 max_workers=None, retrain_growth=0.5):
         """
         Initialize all attributes.
 
@@ -32,6 +70,22 @@ class KrigingSurrogate(SurrogateModel):
         eval_rmse : bool
             Flag indicating whether the Root Mean Squared Error (RMSE) should be computed.
             Set to False by default.
+
+        n_start : int
+            Number of starting points of the hyper-parameter optimization. The first one is
+            always the same; the others are drawn at random. Default: 1
+
+        executor : str or None
+            None (serial) or 'process'. How the optimizations from the different starting
+            points are run. Threads are not supported, because the optimizers of scipy used for
+            them are not thread-safe.
+
+        max_workers : int or None
+            Maximum number of processes used by the executor.
+
+        retrain_growth : float
+            Fraction by which update may grow the number of training points before the
+            hyper-parameters are optimized again by a full training. Default: 0.5
         """
         super(KrigingSurrogate, self).__init__()
 
@@ -43,7 +97,8 @@ class KrigingSurrogate(SurrogateModel):
         self.nugget = nugget
 
         self.alpha = np.zeros(0)
-        self.L = np.zeros(0)
+        self.L = None
+        self.R_pinv = None
         self.sigma2 = np.zeros(0)
 
         # Normalized Training Values
@@ -56,6 +111,31 @@ class KrigingSurrogate(SurrogateModel):
 
         self.eval_rmse = eval_rmse
 
+        if executor not in (None, 'process'):
+            raise ValueError("executor must be None or 'process', but got %r." % (executor,))
+
+        self.n_start = n_start
+        self.executor = executor
+        self.max_workers = max_workers
+        self.retrain_growth = retrain_growth
+
+        # training data before normalization, kept so that update can retrain the model
+        self._x = np.zeros(0)
+        self._y = np.zeros(0)
+
+        # number of training points when the hyper-parameters were last optimized
+        self._n_optimized = 0
+
+        # indices of all pairs (i < j) of training points and their squared distances
+        self._pairs = None
+        self._sq_dists = np.zeros(0)
+
+        # if the model was trained with gradients, the normalized derivatives of the training
+        # responses, of shape (points, outputs, inputs), and the differences of all pairs of
+        # training points, of shape (points, points, inputs)
+        self._G = None
+        self._diffs = None
+
     def train(self, x, y):
         """
         Train the surrogate model with the given set of inputs and outputs.
@@ -69,10 +149,57 @@ class KrigingSurrogate(SurrogateModel):
             Model responses at given inputs.
         """
         super(KrigingSurrogate, self).train(x, y)
+        self._fit(x, y)
+
+    def train_grad(self, x, y, grad):
+        """
+        Train the surrogate model with the derivatives of the responses as well.
+
+        In this gradient-enhanced Kriging, the derivatives are observations of the derivatives
+        of the Gaussian process, so R gets a row and a column for the derivative with respect
+        to each input at each training point. Each derivative carries about as much information
+        as a training point, so far fewer points are needed for the same accuracy, but R is
+        (1 + n_dims) times larger. A small nugget, GRADIENT_NUGGET, is added to the variances
+        of the responses and the derivatives, so that the model closely approximates rather
+        than exactly interpolates them.
+
+        Parameters
+        ----------
+        x : array-like
+            Training input locations
+
+        y : array-like
+            Model responses at given inputs.
+
+        grad : array-like
+            Derivatives of the responses with respect to the inputs, of shape
+            (n_samples, n_outputs, n_inputs).
+        """
+        super(KrigingSurrogate, self).train(x, y)
+        self._fit(x, y, grad)
+
+    def _fit(self, x, y, grad=None):
+        """
+        Normalize the training data and optimize the hyper-parameters.
+
+        Parameters
+        ----------
+        x : array-like
+            Training input locations
+
+        y : array-like
+            Model responses at given inputs.
 
+        grad : array-like or None
+            Derivatives of the responses with respect to the inputs, of shape
+            (n_samples, n_outputs, n_inputs).
+        """
         x, y = np.atleast_2d(x, y)
+        if grad is not None:
+            grad = np.reshape(grad, (x.shape[0], y.shape[1], x.shape[1]))
 
         self.n_samples, self.n_dims = x.shape
+        self._x, self._y = x, y
 
         if self.n_samples <= 1:
             raise ValueError('KrigingSurrogate require at least 2 training points.')
@@ -86,86 +213,463 @@ class KrigingSurrogate(SurrogateModel):
         X_std[X_std == 0.] = 1.
         Y_std[Y_std == 0.] = 1.
 
-        X = (x - X_mean) / X_std
-        Y = (y - Y_mean) / Y_std
+        # scale in place, so that no temporary copy of the training data is made
+        X = x - X_mean
+        X /= X_std
+        Y = y - Y_mean
+        Y /= Y_std
 
         self.X = X
         self.Y = Y
         self.X_mean, self.X_std = X_mean, X_std
         self.Y_mean, self.Y_std = Y_mean, Y_std
 
-        def _calcll(thetas):
-            """Calculate loglike (callback function)."""
-            loglike = self._calculate_reduced_likelihood_params(np.exp(thetas))[0]
-            return -loglike
+        # The distances don't depend on the hyper-parameters, so compute them only once.
+        self._pairs = np.triu_indices(self.n_samples, 1)
+        self._sq_dists = np.square(X[self._pairs[0]] - X[self._pairs[1]])
+
+        if grad is None:
+            self._G = self._diffs = None
+        else:
+            self._G = grad * X_std / Y_std[:, np.newaxis]
+            self._diffs = X[:, np.newaxis, :] - X
+
+        def _calcll(log_thetas):
+            """Calculate loglike and its gradient (callback function)."""
+            thetas = np.exp(log_thetas)
+            loglike, params = self._calculate_reduced_likelihood_params(thetas, grad=True)
+            return -loglike, -params['grad'] * thetas
 
         bounds = [(np.log(1e-5), np.log(1e5)) for _ in range(self.n_dims)]
 
-        optResult = minimize(_calcll, 1e-1 * np.ones(self.n_dims), method='slsqp',
-                             options={'eps': 1e-3},
-                             bounds=bounds)
+        starts = [1e-1 * np.ones(self.n_dims)]
+        if self.n_start > 1:
+            # seeded, so that training is repeatable
+            rand = np.random.RandomState(self.n_samples)
+            starts.extend(rand.uniform(np.log(1e-3), np.log(1e2),
+                                       (self.n_start - 1, self.n_dims)))
 
-        if not optResult.success:
+        def _optimize(x0):
+            return minimize(_calcll, x0, method='slsqp', jac=True, bounds=bounds)
+
+        results = concurrent_map(_optimize, starts, self.executor, self.max_workers)
+
+        successes = [result for result in results if result.success]
+        if not successes:
             raise ValueError(
-                'Kriging Hyper-parameter optimization failed: {0}'.format(optResult.message))
+                'Kriging Hyper-parameter optimization failed: {0}'.format(results[0].message))
+        optResult = min(successes, key=lambda result: result.fun)
 
         self.thetas = np.exp(optResult.x)
         _, params = self._calculate_reduced_likelihood_params()
         self.alpha = params['alpha']
-        self.U = params['U']
-        self.S_inv = params['S_inv']
-        self.Vh = params['Vh']
+        self.L = params['L']
+        self.R_pinv = params['R_pinv']
         self.sigma2 = params['sigma2']
+        self._n_optimized = self.n_samples
+
+    def update(self, x, y):
+        """
+        Add training points, keeping the hyper-parameters and the normalization of the data.
+
+        The Cholesky factor of R is extended by the rows of the new points, which costs
+        O(n^2 k) for k new points instead of the O(n^3) of a full training. The model is
+        retrained instead if R is not factorized by Cholesky, if the nugget is an array, if R
+        is not well enough conditioned for its regularization to be negligible (e.g., for a
+        duplicate point), or once the number of training points has grown by retrain_growth
+        since the hyper-parameters were optimized.
+
+        Parameters
+        ----------
+        x : array-like
+            New training input locations.
+
+        y : array-like
+            Model responses at the new inputs.
+        """
+        if self._G is not None:
+            raise RuntimeError("KrigingSurrogate trained with gradients does not support "
+                               "incremental updates.")
+
+        x, y = np.atleast_2d(x, y)
+        n_old = self.n_samples
+        n = n_old + x.shape[0]
+
+        X_new = (x - self.X_mean) / self.X_std
+        Y_new = (y - self.Y_mean) / self.Y_std
+
+        L = None
+        if self.L is not None and np.ndim(self.nugget) == 0 and \
+                n <= (1. + self.retrain_growth) * self._n_optimized:
+            # R = [[R11, B], [B^T, C]] = [[L11, 0], [L21, L22]] [[L11^T, L21^T], [0, L22^T]]
+            Bt = self._correlation(X_new)
+            L21 = linalg.solve_triangular(self.L, Bt.T, lower=True, check_finite=False).T
+            C = np.exp(-np.square(X_new[:, np.newaxis, :] - X_new).dot(self.thetas))
+            C[np.diag_indices_from(C)] = 1. + self.nugget
+            try:
+                L22 = linalg.cholesky(C - L21.dot(L21.T), lower=True, check_finite=False)
+            except linalg.LinAlgError:
+                pass
+            else:
+                L = np.zeros((n, n))
+                L[:n_old, :n_old] = self.L
+                L[n_old:, :n_old] = L21
+                L[n_old:, n_old:] = L22
+
+                # L11 is the factor of R11 + h^2 R11^-1, which only equals R11 to rounding if R is
+                # well conditioned. R is positive, so its row sums are R 1 ~= L11 (L11^T 1).
+                row_sums = np.concatenate([self.L.dot(np.sum(self.L, axis=0)) +
+                                           np.sum(Bt, axis=0),
+                                           np.sum(Bt, axis=1) + np.sum(C, axis=1)])
+                rcond, info = linalg.lapack.dpocon(L, np.max(row_sums), uplo='L')
+                if rcond < MIN_UPDATE_RCOND:
+                    L = None
+
+        if L is None:
+            self.train(np.vstack([self._x, x]), np.vstack([self._y, y]))
+            return
+
+        self.n_samples = n
+        self._x = np.vstack([self._x, x])
+        self._y = np.vstack([self._y, y])
+        self.X = np.vstack([self.X, X_new])
+        self.Y = np.vstack([self.Y, Y_new])
+        self._pairs = np.triu_indices(n, 1)
+        self._sq_dists = np.square(self.X[self._pairs[0]] - self.X[self._pairs[1]])
+
+        self.L = L
+        self.alpha = linalg.cho_solve((L, True), self.Y, check_finite=False)
+        self.sigma2 = np.einsum('ij,ij->j', self.Y, self.alpha) / n * np.square(self.Y_std)
+
+    def get_state(self):
+        """
+        Return the trained state of the model, so that it can be cached.
+
+        Returns
+        -------
+        dict
+            Hyper-parameters, factorization of R and normalization of the training data, keyed
+            by attribute name. The training data itself is not included.
+        """
+        return {name: getattr(self, name) for name in _STATE_ATTRS}
+
+    def set_state(self, state, x, y):
+        """
+        Restore the trained state returned by get_state for the same options and training data.
+
+        Parameters
+        ----------
+        state : dict
+            Trained state, as returned by get_state.
+
+        x : array-like
+            Training input locations.
+
+        y : array-like
+            Model responses at given inputs.
+        """
+        super(KrigingSurrogate, self).train(x, y)
+
+        for name in _STATE_ATTRS:
+            setattr(self, name, state[name])
+
+        self._x, self._y = np.atleast_2d(x, y)
+        self.X = (self._x - self.X_mean) / self.X_std
+        self.Y = (self._y - self.Y_mean) / self.Y_std
+
+        self._pairs = np.triu_indices(self.n_samples, 1)
+        self._sq_dists = np.square(self.X[self._pairs[0]] - self.X[self._pairs[1]])
+        if self._G is not None:
+            self._diffs = self.X[:, np.newaxis, :] - self.X
+
+    def _cache_options(self):
+        """
+        Return the options of the model that affect its trained state.
 
-    def _calculate_reduced_likelihood_params(self, thetas=None):
+        Returns
+        -------
+        tuple
+            Values of the options.
+        """
+        return (self.nugget, self.n_start)
+
+    def _calculate_reduced_likelihood_params(self, thetas=None, grad=False):
         """
         Calculate quantity with same maximum location as the log-likelihood for a given theta.
 
+        The Tikhonov regularized inverse of R is computed by Cholesky if R is not nearly
+        singular. Otherwise, e.g., for densely spaced training points, it is computed from the
+        eigendecomposition of R instead.
+
         Parameters
         ----------
         thetas : ndarray, optional
             Given input correlation coefficients. If none given, uses self.thetas
             from training.
+        grad : bool
+            If True, also return the gradient of the reduced likelihood with respect to thetas.
+
+        Returns
+        -------
+        float
+            The reduced likelihood.
+        dict
+            'alpha', 'sigma2', and either the Cholesky factor 'L' of the regularized R or the
+            pseudo-inverse 'R_pinv' of R (the other one is None), plus 'grad' if requested.
         """
         if thetas is None:
             thetas = self.thetas
 
-        X, Y = self.X, self.Y
-        params = {}
+        Y = self._observations()
+        n = Y.shape[0]
+        i, j = self._pairs
+        params = {'L': None, 'R_pinv': None}
 
         # Correlation Matrix
-        distances = np.zeros((self.n_samples, self.n_dims, self.n_samples))
-        for i in range(self.n_samples):
-            distances[i, :, i + 1:] = np.abs(X[i, ...] - X[i + 1:, ...]).T
-            distances[i + 1:, :, i] = distances[i, :, i + 1:].T
-
-        R = np.exp(-thetas.dot(np.square(distances)))
-        R[np.diag_indices_from(R)] = 1. + self.nugget
-
-        [U, S, Vh] = linalg.svd(R)
-
-        # Penrose-Moore Pseudo-Inverse:
-        # Given A = USV^* and Ax=b, the least-squares solution is
-        # x = V S^-1 U^* b.
-        # Tikhonov regularization is used to make the solution significantly
-        # more robust.
-        h = 1e-8 * S[0]
-        inv_factors = S / (S ** 2. + h ** 2.)
-
-        alpha = Vh.T.dot(np.einsum('j,kj,kl->jl', inv_factors, U, Y))
-        logdet = -np.sum(np.log(inv_factors))
-        sigma2 = np.dot(Y.T, alpha).sum(axis=0) / self.n_samples
-        reduced_likelihood = -(np.log(np.sum(sigma2)) +
-                               logdet / self.n_samples)
+        if self._G is None:
+            r = np.exp(-self._sq_dists.dot(thetas))
+            R = np.empty((n, n))
+            R[i, j] = r
+            R[j, i] = r
+            R[np.diag_indices_from(R)] = 1. + self.nugget
+        else:
+            R, K = self._gradient_correlation(thetas)
+
+        try:
+            L = linalg.cholesky(R, lower=True, check_finite=False)
+        except linalg.LinAlgError:
+            L = None
+        else:
+            rcond, info = linalg.lapack.dpocon(L, np.max(np.sum(np.abs(R), axis=1)), uplo='L')
+            if rcond < MIN_CHOLESKY_RCOND:
+                L = None
+
+        # number of degrees of freedom, i.e., the rank of R
+        n_eff = n
+
+        if L is not None:
+            # Only the largest eigenvalue is needed for the Tikhonov regularization. The
+            # regularized matrix S = R + h^2 R^-1 is well conditioned, since its eigenvalues are
+            # at least 2 h. dpotri only fills the lower triangle.
+            lam_max, q_max = eigsh(R, k=1, which='LA', v0=np.ones(n))
+            h2 = (TIKHONOV * lam_max[0]) ** 2
+            R_inv, info = linalg.lapack.dpotri(L, lower=1)
+            R_inv = np.tril(R_inv) + np.tril(R_inv, -1).T
+            L = linalg.cholesky(R + h2 * R_inv, lower=True, check_finite=False)
+
+            alpha = linalg.cho_solve((L, True), Y, check_finite=False)
+            logdet = 2. * np.sum(np.log(np.diag(L)))
+            params['L'] = L
+        else:
+            lam, Q = linalg.eigh(R, check_finite=False)
+
+            # Penrose-Moore Pseudo-Inverse:
+            # Given A = Q diag(lam) Q^T and Ax=b, the least-squares solution is
+            # x = Q diag(1 / lam) Q^T b.
+            # Tikhonov regularization is used to make the solution significantly
+            # more robust. Eigenvalues within the rounding error of R, such as the zero
+            # eigenvalues of duplicate training points, are taken as zero: they are left out of
+            # the pseudo-inverse and the determinant, and the likelihood is normalized by the
+            # rank of R, so it doesn't depend on their rounding noise. Duplicate points then
+            # give the likelihood of the distinct points.
+            lam_max = np.max(np.abs(lam))
+            h2 = (TIKHONOV * lam_max) ** 2
+            nonzero = lam > 10. * n * MACHINE_EPSILON * lam_max
+            n_eff = np.count_nonzero(nonzero)
+            lam_nz = np.where(nonzero, lam, 1.)
+            lam2 = lam_nz ** 2 + h2
+            inv_factors = np.where(nonzero, lam_nz / lam2, 0.)
+
+            QtY = Q.T.dot(Y)
+            alpha = Q.dot(inv_factors[:, np.newaxis] * QtY)
+            logdet = np.sum(np.log(lam2 / lam_nz)[nonzero])
+            params['R_pinv'] = np.dot(Q * inv_factors, Q.T)
+
+        sigma2 = np.einsum('ij,ij->j', Y, alpha) / n_eff
+        sigma2_sum = np.sum(sigma2)
+        reduced_likelihood = -(np.log(sigma2_sum) + logdet / n_eff)
+
+        if grad:
+            # d(lnL)/d(theta_k) = sum_ij dR_ij/d(theta_k) * W_ij, where W is the gradient of lnL
+            # with respect to R. Without gradients, only the off diagonal terms of
+            # dR/d(theta_k) = -d_k^2 * R are nonzero.
+            if L is not None:
+                # With the gradient G = (a a^T / sigma2 - S^-1) / n of lnL with respect to S,
+                # dS = dR - h^2 R^-1 dR R^-1 gives W = G - h^2 R^-1 G R^-1, where
+                # h^2 R^-1 S^-1 R^-1 = R^-1 - S^-1, so that no matrix products are needed.
+                S_inv, info = linalg.lapack.dpotri(L, lower=1)
+                S_inv = np.tril(S_inv) + np.tril(S_inv, -1).T
+                beta = R_inv.dot(alpha)
+                W = (alpha.dot(alpha.T) - h2 * beta.dot(beta.T)) / (n * sigma2_sum) - \
+                    (2. * S_inv - R_inv) / n
+
+                # h depends on the largest eigenvalue, whose derivative is q q^T
+                dlnL_dh2 = (np.sum(alpha * beta) / sigma2_sum - np.sum(R_inv * S_inv)) / n
+                W += dlnL_dh2 * 2. * h2 / lam_max[0] * q_max.dot(q_max.T)
+            else:
+                # Derivatives of the matrix functions of R follow from the divided differences
+                # of the functions of its eigenvalues (Daleckii-Krein).
+                # The zero eigenvalues stay zero, since the rank of R doesn't change.
+                dlam = lam[:, np.newaxis] - lam
+                dinv = inv_factors[:, np.newaxis] - inv_factors
+                close = np.abs(dlam) <= 1e-12 * lam_max
+                gamma = np.where(close, 0., dinv / np.where(close, 1., dlam))
+                avg = 0.5 * (lam[:, np.newaxis] + lam)[close]
+                gamma[close] = (h2 - avg ** 2) / (avg ** 2 + h2) ** 2
+                gamma[~nonzero[:, np.newaxis] & ~nonzero] = 0.
+
+                dlogdet = np.where(nonzero, 2. * lam_nz / lam2 - 1. / lam_nz, 0.)
+                Wq = -gamma * QtY.dot(QtY.T) / (n_eff * sigma2_sum)
+                Wq[np.diag_indices_from(Wq)] -= dlogdet / n_eff
+
+                # h depends on the largest eigenvalue
+                dinv_dh2 = -inv_factors / lam2
+                dlnL_dh2 = -(np.einsum('i,ij,ij', dinv_dh2, QtY, QtY) / sigma2_sum +
+                             np.sum(1. / lam2[nonzero])) / n_eff
+                imax = np.argmax(np.abs(lam))
+                Wq[imax, imax] += dlnL_dh2 * 2. * h2 / lam[imax]
+                W = Q.dot(Wq).dot(Q.T)
+
+            if self._G is None:
+                params['grad'] = -2. * (r * W[i, j]).dot(self._sq_dists)
+            else:
+                params['grad'] = self._gradient_likelihood_grad(thetas, R, K, W)
 
         params['alpha'] = alpha
         params['sigma2'] = sigma2 * np.square(self.Y_std)
-        params['S_inv'] = inv_factors
-        params['U'] = U
-        params['Vh'] = Vh
 
         return reduced_likelihood, params
 
+    def _observations(self):
+        """
+        Return the normalized observations the model is trained on.
+
+        Returns
+        -------
+        ndarray
+            The responses at the training points, followed, if the model was trained with
+            gradients, by their derivatives with respect to each input in turn.
+        """
+        if self._G is None:
+            return self.Y
+
+        return np.vstack([self.Y, self._G.transpose(2, 0, 1).reshape(-1, self.Y.shape[1])])
+
+    def _gradient_correlation(self, thetas):
+        """
+        Assemble the correlation matrix of the responses and their derivatives.
+
+        With k_ij = exp(-sum_l theta_l (X_il - X_jl)^2), the covariances are k_ij between
+        responses, dk_ij/dX_jm = 2 theta_m (X_im - X_jm) k_ij between a response and a
+        derivative, and d2k_ij/dX_il dX_jm = (2 theta_l delta_lm - 4 theta_l theta_m
+        (X_il - X_jl) (X_im - X_jm)) k_ij between derivatives.
+
+        Parameters
+        ----------
+        thetas : ndarray
+            Correlation coefficients.
+
+        Returns
+        -------
+        ndarray
+            Correlation matrix, of (1 + n_dims) blocks of n_samples rows and columns.
+        ndarray
+            Correlation k of the responses, including the nuggets.
+        """
+        n, d = self.n_samples, self.n_dims
+        D = self._diffs
+
+        # the nugget of the derivatives is 2 theta_m k_ii, scaled with their variance
+        K = np.exp(-np.square(D).dot(thetas))
+        K[np.diag_indices_from(K)] = 1. + self.nugget + GRADIENT_NUGGET
+        TD = 2. * thetas * D
+
+        R = np.empty((1 + d, n, 1 + d, n))
+        R[0, :, 0, :] = K
+        R[0, :, 1:, :] = (TD * K[:, :, np.newaxis]).transpose(0, 2, 1)
+        R[1:, :, 0, :] = -(TD * K[:, :, np.newaxis]).transpose(2, 0, 1)
+        R[1:, :, 1:, :] = -np.einsum('ijl,ijm,ij->limj', TD, TD, K)
+        dims = np.arange(d)
+        R[1 + dims, :, 1 + dims, :] += 2. * thetas[:, np.newaxis, np.newaxis] * K
+
+        return R.reshape((1 + d) * n, (1 + d) * n), K
+
+    def _gradient_likelihood_grad(self, thetas, R, K, W):
+        """
+        Calculate the gradient of the reduced likelihood of a model trained with gradients.
+
+        Parameters
+        ----------
+        thetas : ndarray
+            Correlation coefficients.
+        R : ndarray
+            Correlation matrix, as returned by _gradient_correlation.
+        K : ndarray
+            Correlation of the responses, as returned by _gradient_correlation.
+        W : ndarray
+            Gradient of the reduced likelihood with respect to R.
+
+        Returns
+        -------
+        ndarray
+            Gradient of the reduced likelihood with respect to thetas.
+        """
+        n, d = self.n_samples, self.n_dims
+        D = self._diffs
+        W = W.reshape(1 + d, n, 1 + d, n)
+        W_gg = W[1:, :, 1:, :]
+
+        # Every block of R is a function of theta times k, and dk/d(theta_k) = -D_k^2 k.
+        # The blocks are symmetric, which doubles the terms of the blocks below the diagonal.
+        WR = np.einsum('bicj,bicj->ij', W, R.reshape(W.shape))
+        grad = -np.einsum('ij,ijk->k', WR, np.square(D))
+        grad += 4. * np.einsum('ikj,ijk,ij->k', W[0, :, 1:, :], D, K)
+        grad += 2. * np.einsum('kikj,ij->k', W_gg, K)
+        W_gg_D = np.einsum('kimj,ijm->kij', W_gg, thetas * D)
+        grad -= 8. * np.einsum('kij,ijk,ij->k', W_gg_D, D, K)
+
+        return grad
+
+    def _chunks(self, n_eval):
+        """
+        Return slices that split the evaluation points into chunks of bounded memory use.
+
+        Parameters
+        ----------
+        n_eval : int
+            Number of evaluation points.
+
+        Returns
+        -------
+        list of slice
+            Slices of the evaluation points.
+        """
+        chunk_size = max(1, CHUNK_ELEMENTS // (self.n_samples * max(self.n_dims, 1)))
+        return [slice(start, start + chunk_size) for start in range(0, n_eval, chunk_size)]
+
+    def _correlation(self, x_n):
+        """
+        Calculate the correlation of the given normalized points with the training points.
+
+        Parameters
+        ----------
+        x_n : ndarray
+            Normalized points, one per row.
+
+        Returns
+        -------
+        ndarray
+            Correlation, one row per point and one column per training observation.
+        """
+        diffs = x_n[:, np.newaxis, :] - self.X
+        r = np.exp(-np.square(diffs).dot(self.thetas))
+        if self._G is None:
+            return r
+
+        # the covariances with the derivatives at the training points follow in blocks
+        dr = 2. * self.thetas * diffs * r[:, :, np.newaxis]
+        return np.hstack([r, dr.transpose(0, 2, 1).reshape(r.shape[0], -1)])
+
     def predict(self, x):
         """
         Calculate predicted value of the response based on the current trained model.
@@ -173,39 +677,62 @@ class KrigingSurrogate(SurrogateModel):
         Parameters
         ----------
         x : array-like
-            Point at which the surrogate is evaluated.
+            Point(s) at which the surrogate is evaluated, one per row.
         """
         super(KrigingSurrogate, self).predict(x)
 
-        thetas = self.thetas
-        if isinstance(x, list):
-            x = np.array(x)
-        x = np.atleast_2d(x)
+        x = np.atleast_2d(np.asarray(x))
         n_eval = x.shape[0]
 
         # Normalize input
         x_n = (x - self.X_mean) / self.X_std
 
-        r = np.zeros((n_eval, self.n_samples), dtype=x.dtype)
-        for r_i, x_i in zip(r, x_n):
-            r_i[:] = np.exp(-thetas.dot(np.square((x_i - self.X).T)))
+        dtype = np.result_type(x_n, self.alpha)
+        y_t = np.empty((n_eval, self.alpha.shape[1]), dtype=dtype)
+        if self.eval_rmse:
+            mse = np.empty(y_t.shape, dtype=dtype)
+
+        for chunk in self._chunks(n_eval):
+            r = self._correlation(x_n[chunk])
+
+            # Scaled Predictor
+            y_t[chunk] = r.dot(self.alpha)
 
-        # Scaled Predictor
-        y_t = np.dot(r, self.alpha)
+            if self.eval_rmse:
+                if self.L is not None:
+                    v = linalg.solve_triangular(self.L, r.T, lower=True)
+                    mse[chunk] = np.outer(1. - np.einsum('ij,ij->j', v, v), self.sigma2)
+                else:
+                    mse[chunk] = np.outer(1. - np.einsum('ij,ij->i', r.dot(self.R_pinv), r),
+                                          self.sigma2)
 
         # Predictor
         y = self.Y_mean + self.Y_std * y_t
 
         if self.eval_rmse:
-            mse = (1. - np.dot(np.dot(r, self.Vh.T),
-                               np.einsum('j,kj,lk->jl', self.S_inv, self.U, r))) * self.sigma2
-
             # Forcing negative RMSE to zero if negative due to machine precision
             mse[mse < 0.] = 0.
             return y, np.sqrt(mse)
 
         return y
 
+    def vectorized_predict(self, x):
+        """
+        Calculate predicted values of the response at multiple points.
+
+        Parameters
+        ----------
+        x : array-like
+            Points at which the surrogate is evaluated, one per row.
+
+        Returns
+        -------
+        ndarray or tuple of ndarray
+            Predicted values, one row per point, and the RMSE if eval_rmse is True.
+        """
+        # predict already evaluates all rows at once
+        return KrigingSurrogate.predict(self, x)
+
     def linearize(self, x):
         """
         Calculate the jacobian of the Kriging surface at the requested point.
@@ -215,21 +742,78 @@ class KrigingSurrogate(SurrogateModel):
         x : array-like
             Point at which the surrogate Jacobian is evaluated.
         """
-        thetas = self.thetas
+        return self.vectorized_linearize(x)[0]
+
+    def vectorized_linearize(self, x):
+        """
+        Calculate the jacobians of the Kriging surface at multiple points.
+
+        Parameters
+        ----------
+        x : array-like
+            Points at which the surrogate Jacobian is evaluated, one per row.
+
+        Returns
+        -------
+        ndarray
+            Jacobians, of shape (n_points, n_outputs, n_inputs).
+        """
+        x = np.atleast_2d(np.asarray(x))
+        n_eval = x.shape[0]
+        n_out = self.alpha.shape[1]
 
         # Normalize Input
         x_n = (x - self.X_mean) / self.X_std
 
-        r = np.exp(-thetas.dot(np.square((x_n - self.X).T)))
+        # With r_s = exp(-sum_k theta_k (x_k - X_sk)^2), the gradient of y_t = r.alpha is
+        # dy_t/dx_k = -2 theta_k (x_k r.alpha - r.(X_k alpha)), so no array of the size of
+        # (points, training points, dimensions) is needed.
+        if self._G is None:
+            X_alpha = np.einsum('sk,so->sko', self.X, self.alpha).reshape(self.n_samples, -1)
+        scale = np.einsum('o,k->ok', self.Y_std, -2. * self.thetas / self.X_std)
+
+        jac = np.empty((n_eval, n_out, self.n_dims), dtype=np.result_type(x_n, self.alpha))
+        for chunk in self._chunks(n_eval):
+            if self._G is not None:
+                jac[chunk] = self._gradient_linearize(x_n[chunk]) * scale
+                continue
+
+            r = self._correlation(x_n[chunk])
+            r_alpha = r.dot(self.alpha)
+            r_X_alpha = r.dot(X_alpha).reshape(-1, self.n_dims, n_out)
+            grad = np.einsum('pk,po->pok', x_n[chunk], r_alpha) - r_X_alpha.transpose(0, 2, 1)
+            jac[chunk] = grad * scale
 
-        # Z = einsum('i,ij->ij', X, Y) is equivalent to, but much faster and
-        # memory efficient than, diag(X).dot(Y) for vector X and 2D array Y.
-        # I.e. Z[i,j] = X[i]*Y[i,j]
-        gradr = r * -2 * np.einsum('i,ij->ij', thetas, (x_n - self.X).T)
-        jac = np.einsum('i,j,ij->ij', self.Y_std, 1. /
-                        self.X_std, gradr.dot(self.alpha).T)
         return jac
 
+    def _gradient_linearize(self, x_n):
+        """
+        Calculate the normalized jacobians of a model trained with gradients, divided by -2 theta.
+
+        Parameters
+        ----------
+        x_n : ndarray
+            Normalized points, one per row.
+
+        Returns
+        -------
+        ndarray
+            Jacobians, of shape (n_points, n_outputs, n_inputs).
+        """
+        n, d = self.n_samples, self.n_dims
+        alpha_y = self.alpha[:n]
+        alpha_g = self.alpha[n:].reshape(d, n, -1)
+
+        diffs = x_n[:, np.newaxis, :] - self.X
+        r = np.exp(-np.square(diffs).dot(self.thetas))
+
+        # With the columns 2 theta_m (x_m - X_jm) r_j of the derivatives, y_t = r.alpha_y +
+        # sum_m (2 theta_m (x_m - X_m) r).alpha_gm, whose derivative with respect to x_k is
+        # -2 theta_k [(x_k - X_k) r.(alpha_y + 2 sum_m theta_m (x_m - X_m) alpha_gm) -
+        # r.alpha_gk].
+        s = alpha_y + 2. * np.einsum('pjm,mjo->pjo', self.thetas * diffs, alpha_g)
+        return np.einsum('pjk,pj,pjo->pok', diffs, r, s) - np.einsum('pj,kjo->pok', r, alpha_g)
+
 
 class FloatKrigingSurrogate(KrigingSurrogate):
     """
@@ -249,3 +833,20 @@ class FloatKrigingSurrogate(KrigingSurrogate):
         """
         dist = super(FloatKrigingSurrogate, self).predict(x)
         return dist[0]  # mean value
+
+    def vectorized_predict(self, x):
+        """
+        Calculate predicted values of the response at multiple points.
+
+        Parameters
+        ----------
+        x : array-like
+            Points at which the surrogate is evaluated, one per row.
+
+        Returns
+        -------
+        ndarray
+            Mean of the predictions, one row per point.
+        """
+        dist = super(FloatKrigingSurrogate, self).vectorized_predict(x)
+        return dist[0] if self.eval_rmse else dist
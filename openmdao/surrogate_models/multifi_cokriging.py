@@ -18,9 +18,9 @@ from numpy import atleast_2d as array2d
 
 from scipy import linalg
 from scipy.optimize import minimize
-from scipy.spatial.distance import squareform
 
 from openmdao.surrogate_models.surrogate_model import MultiFiSurrogateModel
+from openmdao.utils.concurrent import concurrent_map
 
 import logging
 _logger = logging.getLogger()
@@ -30,6 +30,7 @@ NUGGET = 10. * MACHINE_EPSILON  # nugget for robustness
 
 INITIAL_RANGE_DEFAULT = 0.3  # initial range for optimizer
 TOLERANCE_DEFAULT = 1e-6    # stopping criterion for MLE optimization
+COARSE_TOLERANCE = 1e-2     # stopping criterion of the derivative-free part of the MLE
 
 THETA0_DEFAULT = 0.5
 THETAL_DEFAULT = 1e-5
@@ -132,14 +133,8 @@ def l1_cross_distances(X, Y=None):
     """
     if Y is None:
         X = array2d(X)
-        n_samples, n_features = X.shape
-        n_nonzero_cross_dist = n_samples * (n_samples - 1) // 2
-        D = np.zeros((n_nonzero_cross_dist, n_features))
-        ll_1 = 0
-        for k in range(n_samples - 1):
-            ll_0 = ll_1
-            ll_1 = ll_0 + n_samples - k - 1
-            D[ll_0:ll_1] = np.abs(X[k] - X[(k + 1):])
+        i, j = np.triu_indices(X.shape[0], 1)
+        D = np.abs(X[i] - X[j])
     else:
         X = array2d(X)
         Y = array2d(Y)
@@ -147,15 +142,8 @@ def l1_cross_distances(X, Y=None):
         n_samples_Y, n_features_Y = Y.shape
         if n_features_X != n_features_Y:
             raise ValueError("X and Y must have the same dimensions.")
-        n_features = n_features_X
 
-        n_nonzero_cross_dist = n_samples_X * n_samples_Y
-        D = np.zeros((n_nonzero_cross_dist, n_features))
-        ll_1 = 0
-        for k in range(n_samples_X):
-            ll_0 = ll_1
-            ll_1 = ll_0 + n_samples_Y  # - k - 1
-            D[ll_0:ll_1] = np.abs(X[k] - Y)
+        D = np.abs(X[:, np.newaxis, :] - Y).reshape(n_samples_X * n_samples_Y, n_features_X)
 
     return D
 
@@ -171,7 +159,8 @@ class MultiFiCoKriging(object):
     }
 
     def __init__(self, regr='constant', rho_regr='constant',
-                 theta=None, theta0=None, thetaL=None, thetaU=None):
+                 theta=None, theta0=None, thetaL=None, thetaU=None,
+                 n_start=1, executor=None, max_workers=None):
         """
         Initialize all attributes.
 
@@ -229,6 +218,19 @@ class MultiFiCoKriging(object):
             for all levels of code.
             if list: a list of nlevel arrays specifying value for each level
 
+        n_start: int, optional
+            Number of starting points of the maximum likelihood estimation at each level.
+            The first one is theta0; the others are drawn at random between thetaL and
+            thetaU. Default: 1
+
+        executor: str or None, optional
+            None (serial) or 'process'. How the maximum likelihood estimations from the
+            different starting points, and for the different levels, are run. Threads are not
+            supported, because the optimizers of scipy used for them are not thread-safe.
+
+        max_workers: int or None, optional
+            Maximum number of processes used by the executor.
+
 
         Attributes
         ----------
@@ -293,22 +295,59 @@ class MultiFiCoKriging(object):
         self.theta0 = theta0
         self.thetaL = thetaL
         self.thetaU = thetaU
+        if executor not in (None, 'process'):
+            raise ValueError("executor must be None or 'process', but got %r." % (executor,))
+
+        self.n_start = n_start
+        self.executor = executor
+        self.max_workers = max_workers
 
         self._nfev = 0
 
+        # for each level, the indices of all pairs (i < j) of samples and their squared
+        # componentwise distances
+        self._pairs = []
+        self._D2 = []
+
     def _build_R(self, lvl, theta):
         """
         Build the correlation matrix with given theta for the specified level.
+
+        Parameters
+        ----------
+        lvl: int
+            Level of fidelity.
+
+        theta: array_like
+            Autocorrelation parameters, one per feature or a single isotropic one.
+
+        Returns
+        -------
+        R: ndarray
+            Correlation matrix.
+
+        r: ndarray
+            Correlation of each pair of samples.
+
+        D2: ndarray
+            Squared distances of each pair of samples, one column per element of theta.
         """
-        D = self.D[lvl]
-        n_samples = self.n_samples[lvl]
+        theta = np.ravel(theta)
+        D2 = self._D2[lvl]
+        if theta.size == 1:
+            D2 = np.sum(D2, axis=1, keepdims=True)
+        elif theta.size != D2.shape[1]:
+            raise ValueError("Length of theta must be 1 or %s" % D2.shape[1])
 
-        R = np.eye(n_samples) * (1. + NUGGET)
+        r = np.exp(-D2.dot(theta))
 
-        corr = squareform(self.corr(theta, D))
-        R = R + corr
+        i, j = self._pairs[lvl]
+        R = np.empty((self.n_samples[lvl], self.n_samples[lvl]))
+        R[i, j] = r
+        R[j, i] = r
+        R[np.diag_indices_from(R)] = 1. + NUGGET
 
-        return R
+        return R, r, D2
 
     def fit(self, X, y,
             initial_range=INITIAL_RANGE_DEFAULT, tol=TOLERANCE_DEFAULT):
@@ -357,6 +396,8 @@ class MultiFiCoKriging(object):
         self.G = nlevel * [0]
         self.sigma2 = nlevel * [0]
         self._R_adj = nlevel * [None]
+        self._pairs = nlevel * [None]
+        self._D2 = nlevel * [None]
 
         y_best = y[nlevel - 1]
         for i in range(nlevel - 1)[::-1]:
@@ -370,11 +411,14 @@ class MultiFiCoKriging(object):
 
         for lvl in range(nlevel):
 
-            # Calculate matrix of distances D between samples
+            # Calculate matrix of distances D between samples. They don't depend on theta,
+            # so their squares are kept for the likelihood estimation.
             self.D[lvl] = l1_cross_distances(X[lvl])
             if (np.min(np.sum(self.D[lvl], axis=1)) == 0.):
                 raise Exception("Multiple input features cannot have the same"
                                 " value.")
+            self._pairs[lvl] = np.triu_indices(n_samples[lvl], 1)
+            self._D2[lvl] = np.square(self.D[lvl])
 
             # Regression matrix and parameters
             self.F[lvl] = self.regr(X[lvl])
@@ -408,22 +452,26 @@ class MultiFiCoKriging(object):
 
         self.rlf_value = np.zeros(nlevel)
 
+        # Maximum Likelihood Estimation of the parameters. The levels are independent, so the
+        # optimizations from all starting points of all levels can run concurrently.
+        levels = [lvl for lvl in range(nlevel) if self.theta[lvl] is None]
+        jobs = [(lvl, x0) for lvl in levels for x0 in self._rlf_starts(lvl)]
+        results = concurrent_map(lambda job: self._max_rlf(job[0], job[1], initial_range, tol),
+                                 jobs, self.executor, self.max_workers)
+
+        for lvl in levels:
+            sols = [sol for (job_lvl, _), sol in zip(jobs, results) if job_lvl == lvl]
+            self._nfev += sum(sol['nfev'] for sol in sols)
+            self.theta[lvl] = min(sols, key=lambda sol: sol['rlf_value'])['theta']
+
         for lvl in range(nlevel):
             # Determine Gaussian Process model parameters
-            if self.theta[lvl] is None:
-                # Maximum Likelihood Estimation of the parameters
-                sol = self._max_rlf(
-                    lvl=lvl, initial_range=initial_range, tol=tol)
-                self.theta[lvl] = sol['theta']
-                self.rlf_value[lvl] = sol['rlf_value']
-
-                if np.isinf(self.rlf_value[lvl]):
+            self.rlf_value[lvl] = self.rlf(lvl=lvl)
+            if np.isinf(self.rlf_value[lvl]) or self.rlf_value[lvl] >= 1e20:
+                if lvl in levels:
                     raise Exception("Bad parameter region. "
                                     "Try increasing upper bound")
-            else:
-                self.rlf_value[lvl] = self.rlf(lvl=lvl)
-                if np.isinf(self.rlf_value[lvl]):
-                    raise Exception("Bad point. Try increasing theta0.")
+                raise Exception("Bad point. Try increasing theta0.")
 
         return
 
@@ -459,9 +507,47 @@ class MultiFiCoKriging(object):
             # Use built-in autocorrelation parameters
             theta = self.theta[lvl]
 
-        # Initialize output
-        rlf_value = 1e20
+        rlf_value, params = self._calculate_rlf(lvl, theta)
 
+        if params is not None:
+            self._err = params['err']
+            self.beta_rho[lvl] = params['beta'][:self.q[lvl]]
+            self.beta_regr[lvl] = params['beta'][self.q[lvl]:]
+            self.beta[lvl] = params['beta']
+            self.sigma2[lvl] = params['sigma2']
+            self.C[lvl] = params['C']
+            self.G[lvl] = params['G']
+
+        return rlf_value
+
+    def _calculate_rlf(self, lvl, theta, grad=False):
+        """
+        Evaluate the negative reduced likelihood function and the BLUP parameters for theta.
+
+        Unlike rlf, this doesn't change the model, so it can run concurrently.
+
+        Parameters
+        ----------
+        lvl: int
+            Level of fidelity.
+
+        theta: array_like
+            Autocorrelation parameters.
+
+        grad: bool
+            If True, also compute the gradient of the function with respect to theta.
+
+        Returns
+        -------
+        rlf_value: double
+            The value of the negative concentrated reduced likelihood function, or 1e20 if R
+            isn't positive definite.
+
+        params: dict or None
+            'beta', 'err', 'sigma2', the Cholesky factor 'C' of R, and the triangular factor
+            'G' of the QR factorization of the regression matrix, plus 'grad' if requested.
+            None if R isn't positive definite.
+        """
         # Retrieve data
         n_samples = self.n_samples[lvl]
         y = self.y[lvl]
@@ -469,53 +555,77 @@ class MultiFiCoKriging(object):
         p = self.p[lvl]
         q = self.q[lvl]
 
-        R = self._build_R(lvl, theta)
+        R, r, D2 = self._build_R(lvl, theta)
 
         try:
             C = linalg.cholesky(R, lower=True)
         except linalg.LinAlgError:
             _logger.warning(('Cholesky decomposition of R at level %i failed' % lvl) +
                             ' with theta=' + str(theta))
-            return rlf_value
+            return 1e20, None
 
         # Get generalized least squares solution
         Ft = solve_triangular(C, F, lower=True)
         Yt = solve_triangular(C, y, lower=True)
-        try:
-            Q, G = linalg.qr(Ft, econ=True)
-        except TypeError:   # qr() got an unexpected keyword argument 'econ'
-            # DeprecationWarning: qr econ argument will be removed after scipy
-            # 0.7. The economy transform will then be available through the
-            # mode='economic' argument.
-            Q, G = linalg.qr(Ft, mode='economic')
-            pass
+        Q, G = linalg.qr(Ft, mode='economic')
 
         # Universal Kriging
         beta = solve_triangular(G, np.dot(Q.T, Yt))
 
         err = Yt - np.dot(Ft, beta)
         err2 = np.dot(err.T, err)[0, 0]
-        self._err = err
         sigma2 = err2 / (n_samples - p - q)
         detR = ((np.diag(C))**(2. / n_samples)).prod()
 
         rlf_value = (n_samples - p - q) * np.log10(sigma2) \
             + n_samples * np.log10(detR)
 
-        self.beta_rho[lvl] = beta[:q]
-        self.beta_regr[lvl] = beta[q:]
-        self.beta[lvl] = beta
-        self.sigma2[lvl] = sigma2
-        self.C[lvl] = C
-        self.G[lvl] = G
+        params = {'beta': beta, 'err': err, 'sigma2': sigma2, 'C': C, 'G': G}
 
-        return rlf_value
+        if grad:
+            # With the residual a = R^-1 (y - F beta), the gradient of the function with
+            # respect to R is (R^-1 - (n - p - q) a a^T / err2) / ln(10), and only the off
+            # diagonal terms of dR/d(theta_k) = -d_k^2 * R are nonzero. dpotri only fills the
+            # lower triangle, so R^-1[j, i] is used for the pairs (i < j).
+            i, j = self._pairs[lvl]
+            a = solve_triangular(C.T, err, lower=False)[:, 0]
+            R_inv, info = linalg.lapack.dpotri(C, lower=1)
+            W = R_inv[j, i] - (n_samples - p - q) * a[i] * a[j] / err2
+            params['grad'] = -2. * (r * W).dot(D2) / np.log(10.)
+
+        return rlf_value, params
 
-    def _max_rlf(self, lvl, initial_range, tol):
+    def _rlf_starts(self, lvl):
+        """
+        Return the starting points of the maximum likelihood estimation at the given level.
+
+        Parameters
+        ----------
+        lvl: int
+            Level of fidelity.
+
+        Returns
+        -------
+        list of ndarray
+            Starting points, as log10(theta).
+        """
+        starts = [np.log10(self.theta0[lvl][0])]
+        if self.n_start > 1:
+            # seeded, so that training is repeatable
+            rand = np.random.RandomState(self.n_samples[lvl])
+            starts.extend(rand.uniform(np.log10(self.thetaL[lvl][0]),
+                                       np.log10(self.thetaU[lvl][0]),
+                                       (self.n_start - 1, self.theta0[lvl].size)))
+        return starts
+
+    def _max_rlf(self, lvl, x0, initial_range, tol):
         """
         Estimate autocorrelation parameter theta as maximizer of the reduced likelihood function.
 
         (Minimization of the negative reduced likelihood function is used for convenience.)
+        The function has many local minima, and it is dominated by rounding errors where R is
+        nearly singular, so a derivative-free optimizer first locates a minimum with a coarse
+        tolerance. The analytic gradient of the function then converges to it quickly.
 
         Parameters
         ----------
@@ -524,6 +634,9 @@ class MultiFiCoKriging(object):
         lvl: integer
             Level of fidelity
 
+        x0: array_like
+            Starting point, as log10(theta).
+
         initial_range: float
             Initial range of the optimizer
 
@@ -532,47 +645,47 @@ class MultiFiCoKriging(object):
 
         Returns
         -------
-        optimal_theta: array_like
-        optimal_rlf_value: double
-            The optimal negative reduced likelihood function value.
-
         res: dict
             res['theta']: optimal theta
             res['rlf_value']: optimal value for likelihood
+            res['nfev']: number of evaluations of the likelihood
         """
-        # Initialize input
         thetaL = self.thetaL[lvl]
         thetaU = self.thetaU[lvl]
 
         def rlf_transform(x):
-            return self.rlf(theta=10.**x, lvl=lvl)
+            return self._calculate_rlf(lvl, 10.**x)[0]
 
-        # Use specified starting point as first guess
-        theta0 = self.theta0[lvl]
-        x0 = np.log10(theta0[0])
+        def rlf_grad_transform(x):
+            theta = 10. ** x
+            rlf_value, params = self._calculate_rlf(lvl, theta, grad=True)
+            if params is None:
+                return rlf_value, np.zeros(x.size)
+            return rlf_value, params['grad'] * theta * np.log(10.)
 
         constraints = []
-        for i in range(theta0.size):
+        for i in range(x0.size):
             constraints.append({'type': 'ineq', 'fun': lambda log10t, i=i:
                                 log10t[i] - np.log10(thetaL[0][i])})
             constraints.append({'type': 'ineq', 'fun': lambda log10t, i=i:
                                 np.log10(thetaU[0][i]) - log10t[i]})
 
-        constraints = tuple(constraints)
         sol = minimize(rlf_transform, x0, method='COBYLA',
-                       constraints=constraints,
+                       constraints=tuple(constraints),
                        options={'rhobeg': initial_range,
-                                'tol': tol, 'disp': 0})
+                                'tol': max(tol, COARSE_TOLERANCE), 'disp': 0})
 
-        log10_optimal_x = sol['x']
-        optimal_rlf_value = sol['fun']
-        self._nfev += sol['nfev']
-
-        optimal_theta = 10. ** log10_optimal_x
+        bounds = list(zip(np.log10(thetaL[0]), np.log10(thetaU[0])))
+        x_coarse = np.clip(sol['x'], *zip(*bounds))
+        polished = minimize(rlf_grad_transform, x_coarse, method='SLSQP', jac=True,
+                            bounds=bounds, tol=tol)
 
         res = {}
-        res['theta'] = optimal_theta
-        res['rlf_value'] = optimal_rlf_value
+        res['nfev'] = sol['nfev'] + polished['nfev']
+        if polished['fun'] <= sol['fun']:
+            sol = polished
+        res['theta'] = 10. ** sol['x']
+        res['rlf_value'] = sol['fun']
 
         return res
 
@@ -813,7 +926,8 @@ class MultiFiCoKrigingSurrogate(MultiFiSurrogateModel):
 
     def __init__(self, regr='constant', rho_regr='constant',
                  theta=None, theta0=None, thetaL=None, thetaU=None,
-                 tolerance=TOLERANCE_DEFAULT, initial_range=INITIAL_RANGE_DEFAULT):
+                 tolerance=TOLERANCE_DEFAULT, initial_range=INITIAL_RANGE_DEFAULT,
+                 n_start=1, executor=None, max_workers=None):
         """
         Initialize all attributes.
         """
@@ -821,8 +935,16 @@ class MultiFiCoKrigingSurrogate(MultiFiSurrogateModel):
 
         self.tolerance = tolerance
         self.initial_range = initial_range
+
+        # options that determine the trained model; fit replaces those of the model by
+        # the estimated ones
+        self._options = (regr, rho_regr, theta, theta0, thetaL, thetaU, tolerance,
+                         initial_range, n_start)
+
         self.model = MultiFiCoKriging(regr=regr, rho_regr=rho_regr, theta=theta,
-                                      theta0=theta0, thetaL=thetaL, thetaU=thetaU)
+                                      theta0=theta0, thetaL=thetaL, thetaU=thetaU,
+                                      n_start=n_start, executor=executor,
+                                      max_workers=max_workers)
 
     def predict(self, new_x):
         """
@@ -839,6 +961,53 @@ class MultiFiCoKrigingSurrogate(MultiFiSurrogateModel):
         self.model.fit(X, Y, tol=self.tolerance,
                        initial_range=self.initial_range)
 
+    def get_state(self):
+        """
+        Return the trained state of the model, so that it can be cached.
+
+        Returns
+        -------
+        dict
+            Autocorrelation parameters of each level, keyed by 'theta_<level>'.
+        """
+        return {'theta_%d' % lvl: theta for lvl, theta in enumerate(self.model.theta)}
+
+    def set_state(self, state, X, Y):
+        """
+        Restore the trained state returned by get_state for the same options and training data.
+
+        The model is fitted with the cached autocorrelation parameters, which skips their
+        maximum likelihood estimation.
+
+        Parameters
+        ----------
+        state : dict
+            Trained state, as returned by get_state.
+
+        X : array-like or list of array-like
+            Training input locations, for each level of fidelity.
+
+        Y : array-like or list of array-like
+            Model responses at given inputs, for each level of fidelity.
+        """
+        self.trained = True
+
+        X, Y = self._fit_adapter(X, Y)
+        self.model.theta = [state['theta_%d' % lvl] for lvl in range(len(X))]
+        self.model.fit(X, Y, tol=self.tolerance,
+                       initial_range=self.initial_range)
+
+    def _cache_options(self):
+        """
+        Return the options of the model that affect its trained state.
+
+        Returns
+        -------
+        tuple
+            Values of the options.
+        """
+        return self._options
+
     def _fit_adapter(self, X, Y):
         """
         Manage special case with one fidelity.
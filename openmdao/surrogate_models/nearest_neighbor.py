@@ -5,6 +5,9 @@ https://github.com/SMarone/NDInterp
 """
 
 from collections import OrderedDict
+
+import numpy as np
+
 from openmdao.surrogate_models.surrogate_model import SurrogateModel
 from openmdao.surrogate_models.nn_interpolators.linear_interpolator import \
     LinearInterpolator
@@ -33,7 +36,8 @@ class NearestNeighbor(SurrogateModel):
             must be one of 'linear', 'weighted', or 'rbf'.
 
         **kwargs : dict
-            keyword arguments
+            keyword arguments of the interpolant, e.g., workers, the number of threads of the
+            KD-tree queries, and cache_size, the number of points whose neighbors are cached.
         """
         super(NearestNeighbor, self).__init__()
 
@@ -80,6 +84,26 @@ class NearestNeighbor(SurrogateModel):
         super(NearestNeighbor, self).predict(x)
         return self.interpolant(x, **kwargs)
 
+    def vectorized_predict(self, x, **kwargs):
+        """
+        Calculate predicted values of the response at multiple points.
+
+        Parameters
+        ----------
+        x : array-like
+            Points at which the surrogate is evaluated, one per row.
+
+        kwargs :
+            Additional keyword arguments passed to the interpolant.
+
+        Returns
+        -------
+        ndarray
+            Predicted values, one row per point.
+        """
+        # the interpolants evaluate all rows at once
+        return self.predict(x, **kwargs)
+
     def linearize(self, x, **kwargs):
         """
         Calculate the jacobian of the interpolant at the requested point.
@@ -96,3 +120,22 @@ class NearestNeighbor(SurrogateModel):
         if jac.shape[0] == 1 and len(jac.shape) > 2:
             return jac[0, ...]
         return jac
+
+    def vectorized_linearize(self, x, **kwargs):
+        """
+        Calculate the jacobians of the interpolant at multiple points.
+
+        Parameters
+        ----------
+        x : array-like
+            Points at which the surrogate Jacobian is evaluated, one per row.
+
+        kwargs :
+            Additional keyword arguments passed to the interpolant.
+
+        Returns
+        -------
+        ndarray
+            Jacobians, of shape (n_points, n_outputs, n_inputs).
+        """
+        return self.interpolant.gradient(np.atleast_2d(x), **kwargs)
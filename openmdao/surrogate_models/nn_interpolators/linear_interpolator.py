@@ -3,7 +3,6 @@
 import numpy as np
 
 from openmdao.surrogate_models.nn_interpolators.nn_base import NNBase
-from six.moves import range
 
 
 class LinearInterpolator(NNBase):
@@ -13,46 +12,44 @@ class LinearInterpolator(NNBase):
 
     def _find_hyperplane(self, nloc):
         """
-        Find hyperplane.
+        Find the hyperplanes through the neighbors of each point, for each dependent dimension.
 
         Parameters
         ----------
-        nloc : number of locations
+        nloc : ndarray
+            Indices of the indep_dims + 1 neighbors of each point.
+
+        Returns
+        -------
+        ndarray
+            Normal vectors, of shape (points, indep_dims + 1, dep_dims).
+        ndarray
+            Constants of the planes, of shape (points, dep_dims).
         """
-        # Extra Inputs for Finding the normal are found below
-        # Number of row vectors needed always dimensions - 1
         indep_dims = self._indep_dims
         dep_dims = self._dep_dims
 
         # Number of Prediction Points
         nppts = nloc.shape[0]
 
-        # Preallocate storage
-        pc = np.empty((nppts, dep_dims), dtype='float')
-        normal = np.empty((nppts, indep_dims + 1, dep_dims), dtype='float')
-        nvect = np.empty((nppts, indep_dims, indep_dims + 1), dtype='float')
-        trnd = np.concatenate((self._tp[nloc, :],
-                               self._tv[nloc, 0].reshape(nppts, indep_dims + 1, 1)),
-                              axis=2)
-        nvect[:, :, :-1] = trnd[:, 1:, :-1] - trnd[:, :-1, :-1]
-
-        for i in range(dep_dims):
-            # Planar vectors need both dep and ind dimensions
-            trnd[:, :, -1] = self._tv[nloc, i]
-
-            # Go through each neighbor
-            # Creates array[neighbor, dimension] from NN results
-            nvect[:, :, -1] = trnd[:, 1:, -1] - trnd[:, :-1, -1]
-
-            # Normal vector is in the null space of nvect.
-            # Since nvect is of size indep x (indep + 1),
-            # the normal vector will be the last entry in
-            # V in the U, Sigma, V = svd(nvect).
-            normal[:, :, i] = np.linalg.svd(nvect)[2][:, -1, :]
-
-            # Use the point of the closest neighbor to
-            # solve for pc - the constant of the n-dimensional plane.
-            pc[:, i] = np.einsum('ij,ij->i', trnd[:, 0, :], normal[:, :, i])
+        # The planar vectors from each neighbor to the next, in the independent dimensions and
+        # one dependent dimension, for all of the dependent dimensions at once.
+        tp = self._tp[nloc]
+        tv = self._tv[nloc]
+        nvect = np.empty((nppts, dep_dims, indep_dims, indep_dims + 1))
+        nvect[..., :-1] = (tp[:, 1:, :] - tp[:, :-1, :])[:, np.newaxis]
+        nvect[..., -1] = (tv[:, 1:, :] - tv[:, :-1, :]).transpose(0, 2, 1)
+
+        # Normal vector is in the null space of nvect.
+        # Since nvect is of size indep x (indep + 1),
+        # the normal vector will be the last entry in
+        # V in the U, Sigma, V = svd(nvect).
+        normal = np.linalg.svd(nvect)[2][..., -1, :].transpose(0, 2, 1)
+
+        # Use the point of the closest neighbor to
+        # solve for pc - the constant of the n-dimensional plane.
+        pc = (np.einsum('ij,ijk->ik', tp[:, 0, :], normal[:, :-1, :]) +
+              tv[:, 0, :] * normal[:, -1, :])
 
         return normal, pc
 
@@ -62,20 +59,18 @@ class LinearInterpolator(NNBase):
 
         Parameters
         ----------
-        prediction_points : array
-        """
-        if len(prediction_points.shape) == 1:
-            # Reshape vector to n x 1 array
-            prediction_points.shape = (1, prediction_points.shape[0])
+        prediction_points : ndarray
+            Points at which the interpolant is evaluated, one per row, or a single point.
 
-        normalized_pts = (prediction_points - self._tpm) / self._tpr
+        Returns
+        -------
+        ndarray
+            Predicted values, one row per point.
+        """
+        normalized_pts = self._normalize(prediction_points)
 
         # Linear interp only uses as many neighbors as it has dimensions
-        points_needed = self._indep_dims + 1
-
-        # KData query takes (data, #ofneighbors) to determine closest
-        # training points to predicted data
-        ndist, nloc = self._KData.query(normalized_pts.real, points_needed)
+        ndist, nloc = self._query(normalized_pts, self._indep_dims + 1)
 
         normal, pc = self._find_hyperplane(nloc)
 
@@ -83,20 +78,17 @@ class LinearInterpolator(NNBase):
         predictions = np.einsum('ij,ijk->ik', normalized_pts,
                                 normal[:, :self._indep_dims, :]) - pc
 
-        # Check to see if there are any collinear points and replace them
-        n0 = np.where(normal[:, -1, :] == 0)
-        predictions[n0, :] = self._tv[nloc[0, n0], :]
+        # Where the plane is parallel to the dependent dimension, e.g. for collinear points,
+        # use the value of the closest neighbor.
+        flat = normal[:, -1, :] == 0
+        rows, cols = np.nonzero(flat)
+        predictions[rows, cols] = -self._tv[nloc[rows, 0], cols]
 
-        # Finish computation for the good normals
-        n = np.where(normal[:, -1, :] != 0)
-        predictions[n] /= -normal[:, -1, :][n]
+        # Finish computation for all of the planes
+        predictions /= -np.where(flat, 1., normal[:, -1, :])
 
         # Rescale to original units
-        predictions = (predictions * self._tvr) + self._tvm
-
-        self._pt_cache = (normalized_pts, ndist, nloc)
-
-        return predictions
+        return (predictions * self._tvr) + self._tvm
 
     def gradient(self, PredPoints):
         """
@@ -105,30 +97,22 @@ class LinearInterpolator(NNBase):
         Parameters
         ----------
         PredPoints : ndarray
-        """
-        if len(PredPoints.shape) == 1:
-            # Reshape vector to n x 1 array
-            PredPoints.shape = (1, PredPoints.shape[0])
+            Points at which the gradient is evaluated, one per row, or a single point.
 
-        normPredPts = (PredPoints - self._tpm) / self._tpr
-        nppts = normPredPts.shape[0]
-        gradient = np.zeros((nppts, self._dep_dims, self._indep_dims), dtype="float")
+        Returns
+        -------
+        ndarray
+            Gradients, of shape (points, dep_dims, indep_dims).
+        """
+        normPredPts = self._normalize(PredPoints)
 
         # Linear interp only uses as many neighbors as it has dimensions
-        dims = self._indep_dims + 1
-
-        # Find the neighbors
-        if self._pt_cache is not None and \
-                np.allclose(self._pt_cache[0], normPredPts):
-            ndist, nloc = self._pt_cache[1:]
-        else:
-            ndist, nloc = self._KData.query(normPredPts.real, dims)
+        ndist, nloc = self._query(normPredPts, self._indep_dims + 1)
 
         normal, pc = self._find_hyperplane(nloc)
-        if np.any(normal[:, -1, :]) == 0:
-            return gradient
-        gradient[:] = (-normal[:, :-1, :] / normal[:, -1, :]).squeeze().T
 
-        grad = gradient * (self._tvr[:, np.newaxis] / self._tpr)
+        # the gradient of a plane that is parallel to the dependent dimension is set to zero
+        last = normal[:, np.newaxis, -1, :]
+        gradient = np.where(last == 0., 0., -normal[:, :-1, :] / np.where(last == 0., 1., last))
 
-        return grad
+        return gradient.transpose(0, 2, 1) * (self._tvr[:, np.newaxis] / self._tpr)
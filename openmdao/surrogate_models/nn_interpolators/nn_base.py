@@ -1,17 +1,65 @@
 """Define the NNBase class."""
 
-import numpy as np
-
+from collections import OrderedDict
+from distutils.version import LooseVersion
 from math import ceil
+
+import numpy as np
+import scipy
 from scipy.spatial import cKDTree
 
+# cKDTree.query takes 'workers' since scipy 1.6, and 'n_jobs' before that.
+_WORKERS_ARG = 'workers' if LooseVersion(scipy.__version__) >= LooseVersion('1.6') else 'n_jobs'
+
+# Large training sets, such as memory-mapped ones, are normalized in chunks of rows with this
+# many elements, so that no temporary copies of them are made.
+CHUNK_ELEMENTS = 2 ** 20
+
+
+def _scale(values, minimum, value_range):
+    """
+    Scale the given values by their minimum and range, in chunks of rows.
+
+    Parameters
+    ----------
+    values : ndarray
+        Values, one row per point.
+    minimum : ndarray
+        Minimum of each column.
+    value_range : ndarray
+        Range of each column.
+
+    Returns
+    -------
+    ndarray
+        Scaled values, one row per point.
+    """
+    scaled = np.empty(values.shape)
+    rows = max(1, CHUNK_ELEMENTS // max(1, values.shape[1]))
+    for start in range(0, values.shape[0], rows):
+        chunk = scaled[start:start + rows]
+        np.subtract(values[start:start + rows], minimum, out=chunk)
+        chunk /= value_range
+    return scaled
+
 
 class NNBase(object):
     """
     Base class for common functionality between nearest neighbor interpolants.
+
+    Attributes
+    ----------
+    workers : int
+        Number of threads used by the KD-tree queries; -1 uses all of the processors.
+    cache_size : int
+        Maximum number of points whose neighbors are kept in the LRU cache.
+    _neighbors : OrderedDict
+        LRU cache of the (distances, indices) of the neighbors of recently queried points,
+        keyed by (number of neighbors, normalized point).
     """
 
-    def __init__(self, training_points, training_values, num_leaves=2):
+    def __init__(self, training_points, training_values, num_leaves=None, workers=1,
+                 cache_size=128):
         """
         Initialize nearest neighbor interpolant by scaling input to the unit hypercube.
 
@@ -25,6 +73,17 @@ class NNBase(object):
             ndarray of shape (num_points x dependent dims) containing
             training output values.
 
+        num_leaves : int or None
+            Number of leaves of the KD-tree. By default, the leaves have the default size of
+            cKDTree, so that the queries take logarithmic time.
+
+        workers : int
+            Number of threads used by the KD-tree queries; -1 uses all of the processors.
+
+        cache_size : int
+            Maximum number of points whose neighbors are cached, so that they are not searched
+            again when the interpolant or its gradient is evaluated at the same point.
+            0 disables the cache.
         """
         # training_points and training_values are the known points and their
         # respective values which will be interpolated against.
@@ -38,9 +97,9 @@ class NNBase(object):
         self._tpr[self._tpr == 0] = 1
         self._tvr[self._tvr == 0] = 1
 
-        # Normalize all points
-        self._tp = (training_points - self._tpm) / self._tpr
-        self._tv = (training_values - self._tvm) / self._tvr
+        # Normalize all points. The KD-tree uses the normalized points without copying them.
+        self._tp = _scale(training_points, self._tpm, self._tpr)
+        self._tv = _scale(training_values, self._tvm, self._tvr)
 
         # Record number of dimensions and points
         self._indep_dims = training_points.shape[1]
@@ -48,8 +107,78 @@ class NNBase(object):
         self._ntpts = training_points.shape[0]
 
         # Make training data into a Tree
-        leavesz = ceil(self._ntpts / float(num_leaves))
-        self._KData = cKDTree(self._tp, leafsize=leavesz)
+        if num_leaves is None:
+            self._KData = cKDTree(self._tp)
+        else:
+            leavesz = ceil(self._ntpts / float(num_leaves))
+            self._KData = cKDTree(self._tp, leafsize=leavesz)
+
+        self.workers = workers
+        self.cache_size = cache_size
+        self._neighbors = OrderedDict()
+
+    def _normalize(self, prediction_points):
+        """
+        Scale the given points like the training points.
+
+        Parameters
+        ----------
+        prediction_points : ndarray
+            Points, one per row, or a single point.
+
+        Returns
+        -------
+        ndarray
+            Normalized points, one per row.
+        """
+        return (np.atleast_2d(prediction_points) - self._tpm) / self._tpr
+
+    def _query(self, normalized_pts, k):
+        """
+        Find the k nearest training points of each of the given points.
+
+        The neighbors of the most recently queried points are taken from the LRU cache. Batches
+        of more points than fit in the cache are queried without it.
+
+        Parameters
+        ----------
+        normalized_pts : ndarray
+            Normalized points, one per row. Only their real part is used.
+
+        k : int
+            Number of neighbors.
+
+        Returns
+        -------
+        ndarray
+            Distances to the neighbors, of shape (points, k).
+        ndarray
+            Indices of the neighbors, of shape (points, k).
+        """
+        pts = np.ascontiguousarray(normalized_pts.real)
+        npts = pts.shape[0]
+        query_args = {_WORKERS_ARG: self.workers}
+
+        if npts > self.cache_size:
+            ndist, nloc = self._KData.query(pts, k, **query_args)
+            return ndist.reshape(npts, k), nloc.reshape(npts, k)
+
+        cache = self._neighbors
+        keys = [(k, pt.tobytes()) for pt in pts]
+        missing = [i for i, key in enumerate(keys) if key not in cache]
+
+        if missing:
+            ndist, nloc = self._KData.query(pts[missing], k, **query_args)
+            for i, dist, loc in zip(missing, ndist.reshape(-1, k), nloc.reshape(-1, k)):
+                cache[keys[i]] = (dist, loc)
+
+        ndist = np.empty((npts, k))
+        nloc = np.empty((npts, k), dtype=int)
+        for i, key in enumerate(keys):
+            ndist[i], nloc[i] = cache[key]
+            cache[key] = cache.pop(key)
+
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
 
-        # Cache for gradients
-        self._pt_cache = None
+        return ndist, nloc
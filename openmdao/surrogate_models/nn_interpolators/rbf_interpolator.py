@@ -2,8 +2,7 @@
 
 import numpy as np
 
-from openmdao.surrogate_models.nn_interpolators.nn_base import NNBase
-from six.moves import range
+from openmdao.surrogate_models.nn_interpolators.nn_base import NNBase, _WORKERS_ARG
 from scipy.sparse import csc_matrix
 from scipy.sparse.linalg import spsolve
 
@@ -13,20 +12,20 @@ class RBFInterpolator(NNBase):
     Compactly Supported Radial Basis Function.
     """
 
-    def _find_R(self, npp, T, loc):
+    def _find_R(self, T):
         """
-        Find R.
+        Find the nonzero entries of R, the basis functions of the neighbors of each point.
 
         Parameters
         ----------
-        npp : int
+        T : ndarray
+            Distances to all but the farthest of the n neighbors, relative to the farthest one.
 
-        T : int
-
-        loc : int
+        Returns
+        -------
+        ndarray
+            Values of the basis functions, of the same shape as T.
         """
-        R = np.zeros((npp, self._ntpts), dtype="float")
-
         # Choose type of CRBF R matrix
         if self.comp == -1:
             # Comp #1 - a
@@ -148,10 +147,7 @@ class RBFInterpolator(NNBase):
 
         Cb = np.polyval(cb_poly, T)
 
-        for i in range(npp):
-            R[i, loc[i, :-1]] = Cf[i, :] * Cb[i, :]
-
-        return R
+        return Cf * Cb
 
     def _find_dR(self, PrdPts, ploc, pdist):
         """
@@ -297,7 +293,8 @@ class RBFInterpolator(NNBase):
 
         return grad.reshape((PrdPts.shape[0], self._dep_dims, self._indep_dims))
 
-    def __init__(self, training_points, training_values, num_leaves=2, n=5, comp=2):
+    def __init__(self, training_points, training_values, num_leaves=None, n=5, comp=2, workers=1,
+                 cache_size=128):
         """
         Initialize all attributes.
 
@@ -307,13 +304,20 @@ class RBFInterpolator(NNBase):
 
         training_values : ndarray
 
-        num_leaves : int
+        num_leaves : int or None
 
         n : int
 
         comp : int
+
+        workers : int
+            Number of threads used by the KD-tree queries; -1 uses all of the processors.
+
+        cache_size : int
+            Maximum number of points whose neighbors are cached. 0 disables the cache.
         """
-        super(RBFInterpolator, self).__init__(training_points, training_values, num_leaves)
+        super(RBFInterpolator, self).__init__(training_points, training_values, num_leaves,
+                                              workers, cache_size)
 
         if self._ntpts < n:
             raise ValueError('RBFInterpolator only given {0} training points, but requested n={1}.'
@@ -323,11 +327,13 @@ class RBFInterpolator(NNBase):
         self.comp = comp
 
         # For weights, first find the training points radial neighbors
-        tdist, tloc = self._KData.query(self._tp, n)
+        tdist, tloc = self._KData.query(self._tp, n, **{_WORKERS_ARG: workers})
         Tt = tdist[:, :-1] / tdist[:, -1:]
-        # Next determine weight matrix
-        Rt = self._find_R(self._ntpts, Tt, tloc)
-        weights = (spsolve(csc_matrix(Rt), self._tv))[..., np.newaxis]
+        # Next determine weight matrix, which only has n - 1 nonzeros per row
+        rows = np.repeat(np.arange(self._ntpts), n - 1)
+        Rt = csc_matrix((self._find_R(Tt).ravel(), (rows, tloc[:, :-1].ravel())),
+                        shape=(self._ntpts, self._ntpts))
+        weights = spsolve(Rt, self._tv).reshape(self._ntpts, -1)[..., np.newaxis]
 
         self.N = n
         self.weights = weights
@@ -340,16 +346,12 @@ class RBFInterpolator(NNBase):
         ----------
         prediction_points : ndarray
         """
-        if len(prediction_points.shape) == 1:
-            # Reshape vector to n x 1 array
-            prediction_points.shape = (1, prediction_points.shape[0])
-
-        normalized_pts = (prediction_points - self._tpm) / self._tpr
+        normalized_pts = self._normalize(prediction_points)
         nppts = normalized_pts.shape[0]
         # Setup prediction points and find their radial neighbors
-        ndist, nloc = self._KData.query(normalized_pts, self.N)
+        ndist, nloc = self._query(normalized_pts, self.N)
         # Check if complex step is being run
-        if np.any(np.abs(normalized_pts[0, :].imag)) > 0:
+        if np.any(normalized_pts.imag):
             dimdiff = np.subtract(normalized_pts.reshape((nppts, 1, self._indep_dims)),
                                   self._tp[nloc, :])
             # KD Tree ignores imaginary part, muse redo ndist if complex
@@ -358,12 +360,10 @@ class RBFInterpolator(NNBase):
         # Take farthest distance of each point
         Tp = ndist[:, :-1] / ndist[:, -1:]
 
-        Rp = self._find_R(nppts, Tp, nloc)
-        predz = ((np.dot(Rp, self.weights[..., 0]) * self._tvr) +
+        Rp = self._find_R(Tp)
+        predz = ((np.einsum('ij,ijk->ik', Rp, self.weights[nloc[:, :-1], :, 0]) * self._tvr) +
                  self._tvm).reshape(nppts, self._dep_dims)
 
-        self._pt_cache = (normalized_pts, ndist, nloc)
-
         return predz
 
     def gradient(self, prediction_points):
@@ -374,17 +374,9 @@ class RBFInterpolator(NNBase):
         ----------
         prediction_points : ndarray
         """
-        if len(prediction_points.shape) == 1:
-            # Reshape vector to n x 1 array
-            prediction_points.shape = (1, prediction_points.shape[0])
-
-        normalized_pts = (prediction_points - self._tpm) / self._tpr
+        normalized_pts = self._normalize(prediction_points)
         # Setup prediction points and find their radial neighbors
-        if self._pt_cache is not None and \
-                np.allclose(self._pt_cache[0], normalized_pts):
-            pdist, ploc = self._pt_cache[1:]
-        else:
-            pdist, ploc = self._KData.query(normalized_pts, self.N)
+        pdist, ploc = self._query(normalized_pts, self.N)
 
         # Find Gradient
         grad = self._find_dR(normalized_pts[:, np.newaxis, :], ploc,
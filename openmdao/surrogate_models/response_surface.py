@@ -1,17 +1,31 @@
-
 """
 Surrogate Model based on second order response surface equations.
 """
 
-from numpy import zeros, einsum
+import numpy as np
+from numpy import zeros
 from numpy.dual import lstsq
+from scipy.linalg import cho_factor, cho_solve, LinAlgError
 from openmdao.surrogate_models.surrogate_model import SurrogateModel
-from six.moves import range
+
+# The Cholesky factorization of the normal equations is used when they are better conditioned
+# than this; otherwise the regression is solved by SVD.
+MAX_NORMAL_COND = 1e10
+
+# Training sets with more terms than this are streamed through the normal equations in chunks of
+# rows, so that the terms of all of the training points are never held in memory at once.
+CHUNK_ELEMENTS = 2 ** 20
 
 
 class ResponseSurface(SurrogateModel):
     """
     Surrogate Model based on second order response surface equations.
+
+    The least squares regression is solved by a Cholesky factorization of its normal equations,
+    or by the pseudo-inverse of the terms of the training points if those are badly conditioned.
+    Either one is kept, so training again with new responses at the same training points only
+    costs a matrix product. Large training sets, such as memory-mapped ones, are streamed through
+    the normal equations in chunks instead.
     """
 
     def __init__(self):
@@ -25,6 +39,23 @@ class ResponseSurface(SurrogateModel):
         # vector of response surface equation coefficients
         self.betas = zeros(0)
 
+        # X^T X and X^T y of the least squares regression
+        self._XtX = zeros(0)
+        self._XtY = zeros(0)
+
+        # Cholesky factor of X^T X or pseudo-inverse of X (the other one is None), and the
+        # training inputs and terms X they were computed for
+        self._cho = None
+        self._pinv = None
+        self._x = None
+        self._X = None
+
+        # indices (i <= j) of the cross terms x_i * x_j
+        self._triu = None
+
+        # Hessian of the response surface, of shape (n, n, n outputs)
+        self._hess = zeros(0)
+
     def train(self, x, y):
         """
         Calculate response surface equation coefficients using least squares regression.
@@ -39,12 +70,197 @@ class ResponseSurface(SurrogateModel):
         """
         super(ResponseSurface, self).train(x, y)
 
-        m = self.m = x.shape[0]
-        n = self.n = x.shape[1]
+        n_terms = ((x.shape[1] + 1) * (x.shape[1] + 2)) // 2
+        if x.shape[0] * n_terms > CHUNK_ELEMENTS:
+            self.m = x.shape[0]
+            self.n = x.shape[1]
+            self._triu = np.triu_indices(self.n)
+
+            self._XtX = zeros((n_terms, n_terms))
+            self._XtY = zeros((n_terms,) + y.shape[1:])
+            self._accumulate(x, y)
+
+            # the factorization isn't kept for a set of training inputs, which would be copied
+            self._x = self._X = None
+            self._solve_normal_equations()
+            return
+
+        if self._x is None or not np.array_equal(x, self._x):
+            self.m = x.shape[0]
+            self.n = x.shape[1]
+            self._triu = np.triu_indices(self.n)
+
+            X = self._features(x)
+            self._XtX = X.T.dot(X)
+            self._factorize(X)
+
+            # copy the inputs, so that the factorization isn't reused if they change in place
+            self._x = np.array(x)
+            self._X = X
+
+        # Normal equations, kept so that update can add training points
+        self._XtY = self._X.T.dot(y)
+
+        # Determine response surface equation coefficients (betas) using least
+        # squares
+        if self._cho is not None:
+            self.betas = cho_solve(self._cho, self._XtY)
+        else:
+            self.betas = self._pinv.dot(y)
+
+        self._set_hessian()
+
+    def train_grad(self, x, y, grad):
+        """
+        Calculate response surface equation coefficients using the derivatives of the responses.
+
+        The derivatives add an equation per input to the least squares regression at each
+        training point, so far fewer points are needed to determine the coefficients.
+
+        Parameters
+        ----------
+        x : array-like
+            Training input locations
+
+        y : array-like
+            Model responses at given inputs.
+
+        grad : array-like
+            Derivatives of the responses with respect to the inputs, of shape y.shape plus
+            (n_inputs,).
+        """
+        super(ResponseSurface, self).train(x, y)
+
+        self.m = x.shape[0]
+        self.n = x.shape[1]
+        self._triu = np.triu_indices(self.n)
+
+        n_terms = ((self.n + 1) * (self.n + 2)) // 2
+        self._XtX = zeros((n_terms, n_terms))
+        self._XtY = zeros((n_terms,) + y.shape[1:])
+        self._accumulate(x, y, np.reshape(grad, y.shape + (self.n,)))
+
+        self._x = self._X = None
+        self._solve_normal_equations()
+
+    def update(self, x, y):
+        """
+        Add training points by updating the normal equations of the least squares regression.
+
+        Parameters
+        ----------
+        x : array-like
+            New training input locations.
+
+        y : array-like
+            Model responses at the new inputs.
+        """
+        self.m += x.shape[0]
+        self._accumulate(x, y)
+
+        # the factorization no longer belongs to a set of training inputs
+        self._x = self._X = None
+        self._solve_normal_equations()
+
+    def _accumulate(self, x, y, grad=None):
+        """
+        Add the terms of the given training points to the normal equations, in chunks of rows.
+
+        Parameters
+        ----------
+        x : array-like
+            Training input locations.
+
+        y : array-like
+            Model responses at given inputs.
+
+        grad : array-like or None
+            Derivatives of the responses with respect to the inputs, of shape y.shape plus
+            (n_inputs,).
+        """
+        n_eqs = 1 if grad is None else 1 + self.n
+        rows = max(1, CHUNK_ELEMENTS // (self._XtX.shape[0] * n_eqs))
+        for start in range(0, x.shape[0], rows):
+            X = self._features(x[start:start + rows])
+            self._XtX += X.T.dot(X)
+            self._XtY += X.T.dot(y[start:start + rows])
+
+            if grad is not None:
+                dX = self._feature_grads(x[start:start + rows])
+                dY = np.moveaxis(grad[start:start + rows], -1, 0)
+                self._XtX += np.tensordot(dX, dX, axes=([0, 1], [0, 1]))
+                self._XtY += np.tensordot(dX, dY, axes=([0, 1], [0, 1]))
+
+    def _solve_normal_equations(self):
+        """
+        Determine the response surface equation coefficients from the normal equations alone.
+        """
+        self._factorize(None)
+
+        if self._cho is not None:
+            self.betas = cho_solve(self._cho, self._XtY)
+        else:
+            # the least squares solution of the normal equations is also the minimum norm one
+            # if they are singular
+            self.betas, rs, r, s = lstsq(self._XtX, self._XtY)
+
+        self._set_hessian()
 
-        X = zeros((m, ((n + 1) * (n + 2)) // 2))
+    def _factorize(self, X):
+        """
+        Factorize the normal equations, or compute the pseudo-inverse of X if they are singular.
 
-        # Modify X to include constant, squared terms and cross terms
+        Parameters
+        ----------
+        X : ndarray or None
+            Terms of the training points, one row per point. If None, no pseudo-inverse is
+            computed.
+        """
+        self._cho = self._pinv = None
+        try:
+            cho = cho_factor(self._XtX, lower=True)
+        except LinAlgError:
+            pass
+        else:
+            diag = np.abs(np.diag(cho[0]))
+            if np.min(diag) ** 2 * MAX_NORMAL_COND > np.max(diag) ** 2:
+                self._cho = cho
+                return
+
+        if X is not None:
+            self._pinv = np.linalg.pinv(X)
+
+    def _set_hessian(self):
+        """
+        Compute the Hessian of the response surface from its coefficients.
+        """
+        n = self.n
+        i, j = self._triu
+        betas = self.betas.reshape(self.betas.shape[0], -1)
+
+        hess = zeros((n, n, betas.shape[1]))
+        hess[i, j] = betas[n + 1:]
+        hess[j, i] += betas[n + 1:]
+        self._hess = hess
+
+    def _features(self, x):
+        """
+        Calculate the terms of the response surface equation at the given points.
+
+        Parameters
+        ----------
+        x : ndarray
+            Points, one per row.
+
+        Returns
+        -------
+        ndarray
+            Constant, linear, squared and cross terms, one row per point.
+        """
+        n = self.n
+        i, j = self._triu
+
+        X = zeros((x.shape[0], ((n + 1) * (n + 2)) // 2), dtype=np.result_type(x, float))
 
         # Constant Terms
         X[:, 0] = 1.0
@@ -52,18 +268,40 @@ class ResponseSurface(SurrogateModel):
         # Linear Terms
         X[:, 1:n + 1] = x
 
-        # Quadratic Terms
-        X_offset = X[:, n + 1:]
-        for i in range(n):
-            # Z = einsum('i,ij->ij', X, Y) is equivalent to, but much faster and
-            # memory efficient than, diag(X).dot(Y) for vector X and 2D array Y.
-            # I.e. Z[i,j] = X[i]*Y[i,j]
-            X_offset[:, :n - i] = einsum('i,ij->ij', x[:, i], x[:, i:])
-            X_offset = X_offset[:, n - i:]
+        # Quadratic Terms, x_i * x_j for i <= j
+        X[:, n + 1:] = x[:, i] * x[:, j]
 
-        # Determine response surface equation coefficients (betas) using least
-        # squares
-        self.betas, rs, r, s = lstsq(X, y)
+        return X
+
+    def _feature_grads(self, x):
+        """
+        Calculate the derivatives of the terms of the response surface equation.
+
+        Parameters
+        ----------
+        x : ndarray
+            Points, one per row.
+
+        Returns
+        -------
+        ndarray
+            Derivatives of the terms with respect to each input, of shape
+            (n_inputs, points, terms).
+        """
+        n = self.n
+        i, j = self._triu
+        quad = n + 1 + np.arange(i.size)
+
+        dX = zeros((n, x.shape[0], ((n + 1) * (n + 2)) // 2), dtype=np.result_type(x, float))
+
+        # Linear Terms
+        dX[:, :, 1:n + 1] = np.eye(n)[:, np.newaxis, :]
+
+        # Quadratic Terms, d(x_i * x_j)/dx_k = delta_ik x_j + delta_jk x_i
+        dX[i, :, quad] += x[:, j].T
+        dX[j, :, quad] += x[:, i].T
+
+        return dX
 
     def predict(self, x):
         """
@@ -76,26 +314,26 @@ class ResponseSurface(SurrogateModel):
         """
         super(ResponseSurface, self).predict(x)
 
-        n = x.size
-
-        X = zeros(((self.n + 1) * (self.n + 2)) // 2)
-
-        # Modify X to include constant, squared terms and cross terms
+        # Predict new_y using X and betas
+        return self._features(np.reshape(x, (1, self.n)))[0].dot(self.betas)
 
-        # Constant Terms
-        X[0] = 1.0
+    def vectorized_predict(self, x):
+        """
+        Calculate predicted values of the response at multiple points.
 
-        # Linear Terms
-        X[1:n + 1] = x
+        Parameters
+        ----------
+        x : array-like
+            Points at which the surrogate is evaluated, one per row.
 
-        # Quadratic Terms
-        X_offset = X[n + 1:]
-        for i in range(n):
-            X_offset[:n - i] = x[i] * x[i:]
-            X_offset = X_offset[n - i:]
+        Returns
+        -------
+        ndarray
+            Predicted values, one row per point.
+        """
+        super(ResponseSurface, self).predict(x)
 
-        # Predict new_y using X and betas
-        return X.dot(self.betas)
+        return self._features(np.reshape(x, (-1, self.n))).dot(self.betas)
 
     def linearize(self, x):
         """
@@ -106,16 +344,24 @@ class ResponseSurface(SurrogateModel):
         x : array-like
             Point at which the surrogate Jacobian is evaluated.
         """
-        n = self.n
-        betas = self.betas
+        return self.vectorized_linearize(np.reshape(x, (1, self.n)))[0]
 
-        x = x.flat
+    def vectorized_linearize(self, x):
+        """
+        Calculate the jacobians of the response surface at multiple points.
 
-        jac = betas[1:n + 1, :].copy()
-        beta_offset = betas[n + 1:, :]
-        for i in range(n):
-            jac[i, :] += x[i:].dot(beta_offset[:n - i, :])
-            jac[i:, :] += x[i] * beta_offset[:n - i, :]
-            beta_offset = beta_offset[n - i:, :]
+        Parameters
+        ----------
+        x : array-like
+            Points at which the surrogate Jacobian is evaluated, one per row.
+
+        Returns
+        -------
+        ndarray
+            Jacobians, of shape (n_points, n_outputs, n_inputs).
+        """
+        n = self.n
+        x = np.reshape(x, (-1, n))
+        linear = self.betas.reshape(self.betas.shape[0], -1)[1:n + 1].T
 
-        return jac.T
+        return linear + np.einsum('pj,kjo->pok', x, self._hess)
@@ -0,0 +1,205 @@
+"""Persistent cache of trained surrogate models."""
+
+from __future__ import division
+
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+from six import iteritems
+
+from openmdao import __version__
+from openmdao.surrogate_models.surrogate_model import SurrogateModel
+from openmdao.utils.class_util import overrides_method
+
+# Name of the array holding the names of the state entries that are None.
+_NONE_KEY = '__none__'
+
+
+def get_training_hash(surrogate, x, y, grad=None):
+    """
+    Return a hash of everything that the trained state of a surrogate depends on.
+
+    This covers the class of the surrogate, its options that affect training and the training
+    data.
+
+    Parameters
+    ----------
+    surrogate : <SurrogateModel>
+        The surrogate model.
+    x : ndarray or list of ndarray
+        Training inputs, or a list of them for each level of fidelity.
+    y : ndarray or list of ndarray
+        Training outputs, or a list of them for each level of fidelity.
+    grad : ndarray or None
+        Derivatives of the training outputs, if the surrogate is trained with them.
+
+    Returns
+    -------
+    str
+        Hex digest of the hash.
+    """
+    sha = hashlib.sha1()
+
+    def update(item):
+        if isinstance(item, (list, tuple)):
+            sha.update(repr((type(item).__name__, len(item))).encode('utf-8'))
+            for it in item:
+                update(it)
+        elif isinstance(item, np.ndarray):
+            item = np.ascontiguousarray(item)
+            sha.update(repr((item.dtype.str, item.shape)).encode('utf-8'))
+            # hash the buffer itself, since large (e.g., memory-mapped) data isn't copied then
+            sha.update(item.data)
+        elif callable(item):
+            sha.update(repr((item.__module__, item.__name__)).encode('utf-8'))
+        else:
+            sha.update(repr(item).encode('utf-8'))
+
+    cls = type(surrogate)
+    update((__version__, cls.__module__, cls.__name__))
+    update(surrogate._cache_options())
+    update(x)
+    update(y)
+    if grad is not None:
+        update(grad)
+
+    return sha.hexdigest()
+
+
+class SurrogateCache(object):
+    """
+    Cache of trained surrogate models that is persisted in a directory.
+
+    The trained state of each surrogate is stored in an npz file named after the hash of its
+    class, its options and its training data, so a surrogate trained on the same data, in the
+    same or in another process, can be restored instead of trained again. Only surrogates that
+    define ``get_state`` and ``set_state`` are cached. The files are read without pickle, and
+    they are written atomically, so several processes can share a directory.
+
+    Attributes
+    ----------
+    directory : str
+        Name of the directory in which the trained surrogates are stored.
+    """
+
+    def __init__(self, directory):
+        """
+        Initialize attributes.
+
+        Parameters
+        ----------
+        directory : str
+            Name of the directory in which the trained surrogates are stored. It is created
+            when the first surrogate is saved.
+        """
+        self.directory = directory
+
+    def _filename(self, surrogate, x, y, grad=None):
+        """
+        Return the name of the file of the given surrogate and training data.
+
+        Parameters
+        ----------
+        surrogate : <SurrogateModel>
+            The surrogate model.
+        x : ndarray or list of ndarray
+            Training inputs.
+        y : ndarray or list of ndarray
+            Training outputs.
+        grad : ndarray or None
+            Derivatives of the training outputs, if the surrogate is trained with them.
+
+        Returns
+        -------
+        str or None
+            Name of the file, or None if the surrogate can't be cached.
+        """
+        if not overrides_method('get_state', surrogate, SurrogateModel):
+            return None
+
+        return os.path.join(self.directory, get_training_hash(surrogate, x, y, grad) + '.npz')
+
+    def load(self, surrogate, x, y, grad=None):
+        """
+        Restore the trained state of the surrogate for the given training data, if it is cached.
+
+        Parameters
+        ----------
+        surrogate : <SurrogateModel>
+            The surrogate model.
+        x : ndarray or list of ndarray
+            Training inputs.
+        y : ndarray or list of ndarray
+            Training outputs.
+        grad : ndarray or None
+            Derivatives of the training outputs, if the surrogate is trained with them.
+
+        Returns
+        -------
+        bool
+            True if the surrogate was restored from the cache.
+        """
+        filename = self._filename(surrogate, x, y, grad)
+        if filename is None or not os.path.isfile(filename):
+            return False
+
+        with np.load(filename, allow_pickle=False) as data:
+            state = {name: None for name in data[_NONE_KEY]}
+            for name in data.files:
+                if name != _NONE_KEY:
+                    val = data[name]
+                    state[name] = val.item() if val.ndim == 0 else val
+
+        surrogate.set_state(state, x, y)
+        return True
+
+    def save(self, surrogate, x, y, grad=None):
+        """
+        Store the trained state of the surrogate for the given training data.
+
+        Parameters
+        ----------
+        surrogate : <SurrogateModel>
+            The trained surrogate model.
+        x : ndarray or list of ndarray
+            Training inputs.
+        y : ndarray or list of ndarray
+            Training outputs.
+        grad : ndarray or None
+            Derivatives of the training outputs, if the surrogate is trained with them.
+        """
+        filename = self._filename(surrogate, x, y, grad)
+        if filename is None:
+            return
+
+        arrays = {}
+        none_names = []
+        for name, val in iteritems(surrogate.get_state()):
+            if val is None:
+                none_names.append(name)
+            else:
+                arrays[name] = np.asarray(val)
+        arrays[_NONE_KEY] = np.array(none_names, dtype=str)
+
+        if not os.path.isdir(self.directory):
+            try:
+                os.makedirs(self.directory)
+            except OSError:
+                # another process may have created it in the meantime
+                if not os.path.isdir(self.directory):
+                    raise
+
+        # write to a temporary file first, so that other processes never read a partial file
+        fd, tmp_name = tempfile.mkstemp(suffix='.npz', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+            if os.name == 'nt' and os.path.exists(filename):
+                os.remove(filename)
+            os.rename(tmp_name, filename)
+        except Exception:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
@@ -1,6 +1,7 @@
 """
 Class definition for SurrogateModel, the base class for all surrogate models.
 """
+import numpy as np
 
 
 class SurrogateModel(object):
@@ -28,6 +29,91 @@ class SurrogateModel(object):
         """
         self.trained = True
 
+    def train_grad(self, x, y, grad):
+        """
+        Train the surrogate model with the derivatives of the responses as well.
+
+        Surrogate models that can use derivatives of the responses override this. MetaModel
+        then calls it when 'train_grad:' data is given for an output.
+
+        Parameters
+        ----------
+        x : array-like
+            Training input locations.
+
+        y : array-like
+            Model responses at given inputs.
+
+        grad : array-like
+            Derivatives of the responses with respect to the inputs, of shape
+            (n_samples, n_outputs, n_inputs).
+        """
+        msg = "{0} does not support training with derivatives.".format(type(self).__name__)
+        raise RuntimeError(msg)
+
+    def update(self, x, y):
+        """
+        Add training points to the already trained surrogate model.
+
+        Surrogate models that can be updated more cheaply than retrained on all of their
+        training points override this. MetaModel then calls it, with only the new points, when
+        warm_restart is True.
+
+        Parameters
+        ----------
+        x : array-like
+            New training input locations.
+
+        y : array-like
+            Model responses at the new inputs.
+        """
+        msg = "{0} does not support incremental updates.".format(type(self).__name__)
+        raise RuntimeError(msg)
+
+    def get_state(self):
+        """
+        Return the trained state of the surrogate model, so that it can be cached.
+
+        Surrogate models that are expensive to train override this and set_state, so that
+        SurrogateCache can restore them instead of training them again.
+
+        Returns
+        -------
+        dict
+            Arrays, scalars or None, keyed by name.
+        """
+        msg = "{0} does not support caching of its trained state.".format(type(self).__name__)
+        raise RuntimeError(msg)
+
+    def set_state(self, state, x, y):
+        """
+        Restore the trained state returned by get_state for the same options and training data.
+
+        Parameters
+        ----------
+        state : dict
+            Trained state, as returned by get_state.
+
+        x : array-like
+            Training input locations.
+
+        y : array-like
+            Model responses at given inputs.
+        """
+        msg = "{0} does not support caching of its trained state.".format(type(self).__name__)
+        raise RuntimeError(msg)
+
+    def _cache_options(self):
+        """
+        Return the options of the surrogate model that affect its trained state.
+
+        Returns
+        -------
+        tuple
+            Values of the options.
+        """
+        return ()
+
     def predict(self, x):
         """
         Calculate a predicted value of the response based on the current trained model.
@@ -49,7 +135,7 @@ class SurrogateModel(object):
         Parameters
         ----------
         x : array-like
-            Vectorized point(s) at which the surrogate is evaluated.
+            Points at which the surrogate is evaluated, one per row.
         """
         pass
 
@@ -65,6 +151,22 @@ class SurrogateModel(object):
         msg = "{0} has not defined a jacobian method.".format(type(self).__name__)
         raise RuntimeError(msg)
 
+    def vectorized_linearize(self, x):
+        """
+        Calculate the jacobians of the interpolant at multiple points.
+
+        Parameters
+        ----------
+        x : array-like
+            Points at which the surrogate Jacobian is evaluated, one per row.
+
+        Returns
+        -------
+        ndarray
+            Jacobians, of shape (n_points, n_outputs, n_inputs).
+        """
+        return np.array([self.linearize(x_i) for x_i in x])
+
 
 class MultiFiSurrogateModel(SurrogateModel):
     """
@@ -6,6 +6,7 @@ import itertools
 import numpy as np
 
 from openmdao.api import KrigingSurrogate
+from openmdao.surrogate_models import kriging
 from openmdao.devtools.testutil import assert_rel_error
 from six.moves import zip
 
@@ -149,5 +150,336 @@ class TestKrigingSurrogate(unittest.TestCase):
         jac = surrogate.linearize(np.array([[0.5, 0.5]]))
         assert_rel_error(self, jac, np.array([[1, 1], [1, -1], [1, 2]]), 5e-4)
 
+    def test_vectorized(self):
+        np.random.seed(11)
+        x = 10. * np.random.random((30, 2))
+        y = np.array([[branin(case), branin(case[::-1])] for case in x])
+
+        surrogate = KrigingSurrogate(eval_rmse=True)
+        surrogate.train(x, y)
+
+        new_x = 10. * np.random.random((7, 2))
+        mu, sigma = surrogate.vectorized_predict(new_x)
+        jac = surrogate.vectorized_linearize(new_x)
+        self.assertEqual(jac.shape, (7, 2, 2))
+
+        for i, x0 in enumerate(new_x):
+            mu0, sigma0 = surrogate.predict(x0)
+            assert_rel_error(self, mu[i], mu0[0], 1e-12)
+            assert_rel_error(self, sigma[i], sigma0[0], 1e-6)
+            assert_rel_error(self, jac[i], surrogate.linearize(x0), 1e-12)
+
+            fd = np.zeros((2, 2))
+            for k in range(2):
+                step = np.zeros(2)
+                step[k] = 1e-6
+                fd[:, k] = (surrogate.predict(x0 + step)[0][0] -
+                            surrogate.predict(x0 - step)[0][0]) / 2e-6
+            assert_rel_error(self, jac[i], fd, 1e-5)
+
+        # the results don't depend on how the points are split into chunks
+        chunk_elements = kriging.CHUNK_ELEMENTS
+        kriging.CHUNK_ELEMENTS = 2 * 30 * 2
+        try:
+            mu2, sigma2 = surrogate.vectorized_predict(new_x)
+            jac2 = surrogate.vectorized_linearize(new_x)
+        finally:
+            kriging.CHUNK_ELEMENTS = chunk_elements
+
+        assert_rel_error(self, mu2, mu, 1e-12)
+        assert_rel_error(self, sigma2, sigma, 1e-6)
+        assert_rel_error(self, jac2, jac, 1e-12)
+
+    def test_likelihood_gradient(self):
+        np.random.seed(11)
+        x = np.random.random((30, 2))
+        y = np.array([[branin(case)] for case in 10. * x])
+
+        surrogate = KrigingSurrogate()
+        surrogate.train(x, y)
+
+        # R is factorized by Cholesky for the first thetas, and by eigendecomposition for the
+        # others
+        for thetas, cholesky in [(np.array([30., 20.]), True), (np.array([0.1, 0.2]), False)]:
+            loglike, params = surrogate._calculate_reduced_likelihood_params(thetas, grad=True)
+            self.assertEqual(params['L'] is not None, cholesky)
+
+            fd = np.zeros(2)
+            for k in range(2):
+                step = np.zeros(2)
+                step[k] = 1e-3 * thetas[k]
+                fd[k] = (surrogate._calculate_reduced_likelihood_params(thetas + step)[0] -
+                         surrogate._calculate_reduced_likelihood_params(thetas - step)[0]) \
+                    / (2. * step[k])
+
+            assert_rel_error(self, params['grad'], fd, 1e-4)
+
+    def test_factorizations(self):
+        np.random.seed(11)
+        x = np.random.random((30, 2))
+        y = np.array([[branin(case)] for case in 10. * x])
+
+        surrogate = KrigingSurrogate()
+        surrogate.train(x, y)
+
+        # both factorizations give the same regularized likelihood, also for thetas at which R
+        # is badly conditioned
+        min_rcond = kriging.MIN_CHOLESKY_RCOND
+        try:
+            for thetas in [np.array([0.5, 1.]), np.array([0.1, 0.2])]:
+                results = []
+                for rcond in [0., 2.]:
+                    kriging.MIN_CHOLESKY_RCOND = rcond
+                    results.append(surrogate._calculate_reduced_likelihood_params(thetas,
+                                                                                  grad=True))
+                self.assertTrue(results[0][1]['L'] is not None)
+                self.assertTrue(results[1][1]['L'] is None)
+
+                assert_rel_error(self, results[0][0], results[1][0], 1e-8)
+                for name in ['alpha', 'sigma2', 'grad']:
+                    assert_rel_error(self, results[0][1][name], results[1][1][name], 1e-6)
+        finally:
+            kriging.MIN_CHOLESKY_RCOND = min_rcond
+
+    def test_cholesky_path(self):
+        rand = np.random.RandomState(0)
+        x = rand.uniform(0., 1., (300, 3))
+        y = np.sin(3. * x[:, :1]) + np.square(x[:, 1:2]) - np.cos(2. * x[:, 2:])
+
+        # a small nugget keeps R well enough conditioned for Cholesky
+        surrogate = KrigingSurrogate(nugget=1e-6)
+        surrogate.train(x, y)
+        self.assertTrue(surrogate.L is not None)
+
+        # without it, R is nearly singular at the optimal thetas
+        surrogate = KrigingSurrogate()
+        surrogate.train(x, y)
+        self.assertTrue(surrogate.L is None)
+
+    def test_duplicate_points(self):
+        x = np.array([[0.0], [2.0], [3.0], [4.0], [6.0]])
+        y = np.array([[branin_1d(case)] for case in x])
+
+        surrogate = KrigingSurrogate(eval_rmse=True)
+        surrogate.train(x, y)
+
+        # the training data is kept, but the duplicates make R singular and add no information
+        dup_surrogate = KrigingSurrogate(eval_rmse=True)
+        dup_surrogate.train(np.vstack([x, x]), np.vstack([y, y]))
+
+        self.assertEqual(dup_surrogate.n_samples, 10)
+        assert_rel_error(self, dup_surrogate.thetas, surrogate.thetas, 1e-6)
+
+        new_x = np.array([3.5])
+        for actual, expected in zip(dup_surrogate.predict(new_x), surrogate.predict(new_x)):
+            assert_rel_error(self, actual, expected, 1e-6)
+
+        # different responses at the same point are matched in the least squares sense
+        dup_surrogate.train(np.vstack([x, x[:1]]), np.vstack([y, [[y[0, 0] + 1.]]]))
+        assert_rel_error(self, dup_surrogate.predict(x[0])[0], [[y[0, 0] + 0.5]], 1e-6)
+        assert_rel_error(self, dup_surrogate.predict(x[1])[0], [y[1]], 1e-6)
+
+    def test_multistart(self):
+        x = np.array([[-2., 0.], [-0.5, 1.5], [1., 3.], [8.5, 4.5],
+                      [-3.5, 6.], [4., 7.5], [-5., 9.], [5.5, 10.5],
+                      [10., 12.], [7., 13.5], [2.5, 15.]])
+        y = np.array([[branin(case)] for case in x])
+
+        single = KrigingSurrogate(nugget=0.)
+        single.train(x, y)
+
+        surrogate = KrigingSurrogate(nugget=0., n_start=4, executor='process', max_workers=2)
+        surrogate.train(x, y)
+
+        self.assertTrue(surrogate._calculate_reduced_likelihood_params()[0] >=
+                        single._calculate_reduced_likelihood_params()[0] - 1e-10)
+
+        for x0, y0 in zip(x, y):
+            assert_rel_error(self, surrogate.predict(x0), [y0], 1e-9)
+
+        # the same optimizations are run in serial
+        serial = KrigingSurrogate(nugget=0., n_start=4)
+        serial.train(x, y)
+        assert_rel_error(self, serial.thetas, surrogate.thetas, 1e-12)
+
+        with self.assertRaises(ValueError) as cm:
+            KrigingSurrogate(executor='thread')
+        self.assertEqual(str(cm.exception), "executor must be None or 'process', but got 'thread'.")
+
+    def test_update(self):
+        x = np.linspace(0., 10., 24)[:, np.newaxis]
+        y = np.sin(x)
+
+        # the nugget keeps R well conditioned, so that it is factorized by Cholesky
+        surrogate = KrigingSurrogate(nugget=1e-3, eval_rmse=True)
+        surrogate.train(x[::2], y[::2])
+        self.assertTrue(surrogate.L is not None)
+        thetas = surrogate.thetas.copy()
+
+        # the Cholesky factor is extended, and the hyper-parameters are kept
+        surrogate.update(x[1::8], y[1::8])
+        self.assertEqual(surrogate.n_samples, 15)
+        assert_rel_error(self, surrogate.thetas, thetas, 1e-15)
+
+        _, params = surrogate._calculate_reduced_likelihood_params()
+        self.assertTrue(params['L'] is not None)
+        # the regularization, which update leaves out, is negligible
+        assert_rel_error(self, surrogate.L, params['L'], 1e-8)
+        assert_rel_error(self, surrogate.alpha, params['alpha'], 1e-8)
+        assert_rel_error(self, surrogate.sigma2, params['sigma2'], 1e-8)
+
+        mu, rmse = surrogate.vectorized_predict(x)
+        assert_rel_error(self, mu, y, 5e-2)
+
+        # a duplicate point is kept as well
+        surrogate.update(x[:1], y[:1])
+        self.assertEqual(surrogate.n_samples, 16)
+        _, params = surrogate._calculate_reduced_likelihood_params()
+        assert_rel_error(self, surrogate.alpha, params['alpha'], 1e-8)
+
+        # without the nugget, the duplicate makes R singular, so the model is trained again
+        surrogate = KrigingSurrogate()
+        surrogate.train(x[:8:2], y[:8:2])
+        self.assertTrue(surrogate.L is not None)
+        surrogate.update(x[:1], y[:1])
+        self.assertEqual(surrogate.n_samples, 5)
+        self.assertEqual(surrogate._n_optimized, 5)
+
+    def test_update_retrain(self):
+        np.random.seed(11)
+        x = 10. * np.random.random((16, 2))
+        y = np.array([[branin(case)] for case in x])
+
+        surrogate = KrigingSurrogate(retrain_growth=0.25)
+        surrogate.train(x[:8], y[:8])
+        surrogate.update(x[8:10], y[8:10])
+        self.assertEqual(surrogate._n_optimized, 8)
+
+        # growing beyond retrain_growth optimizes the hyper-parameters again
+        surrogate.update(x[10:], y[10:])
+        self.assertEqual(surrogate._n_optimized, 16)
+
+        full = KrigingSurrogate()
+        full.train(x, y)
+        assert_rel_error(self, surrogate.thetas, full.thetas, 1e-6)
+        assert_rel_error(self, surrogate.predict(np.array([5., 5.])),
+                         full.predict(np.array([5., 5.])), 1e-6)
+
+    def test_train_grad(self):
+        def f(x):
+            return np.sin(3. * x[:, :1]) * np.cos(2. * x[:, 1:]) + x[:, :1] ** 2
+
+        def df(x):
+            return np.stack([3. * np.cos(3. * x[:, 0]) * np.cos(2. * x[:, 1]) + 2. * x[:, 0],
+                             -2. * np.sin(3. * x[:, 0]) * np.sin(2. * x[:, 1])],
+                            axis=1)[:, np.newaxis, :]
+
+        rand = np.random.RandomState(0)
+        x = rand.uniform(-1., 1., (12, 2))
+        y = f(x)
+        grad = df(x)
+
+        surrogate = KrigingSurrogate(eval_rmse=True)
+        surrogate.train_grad(x, y, grad)
+
+        # both the values and the derivatives are closely approximated
+        mu, rmse = surrogate.vectorized_predict(x)
+        assert_rel_error(self, mu, y, 1e-3)
+        assert_rel_error(self, rmse, np.zeros(y.shape), 1e-2)
+        assert_rel_error(self, surrogate.vectorized_linearize(x), grad, 1e-3)
+
+        # the jacobian of the prediction matches its finite differences
+        x_test = rand.uniform(-1., 1., (5, 2))
+        fd = np.zeros((5, 1, 2))
+        for k in range(2):
+            step = np.zeros(2)
+            step[k] = 1e-4
+            fd[:, :, k] = (surrogate.vectorized_predict(x_test + step)[0] -
+                           surrogate.vectorized_predict(x_test - step)[0]) / 2e-4
+        assert_rel_error(self, surrogate.vectorized_linearize(x_test), fd, 1e-5)
+        for x0, jac in zip(x_test, fd):
+            assert_rel_error(self, surrogate.linearize(x0), jac, 1e-5)
+
+        # the same samples are several times more accurate with their derivatives
+        x_test = rand.uniform(-1., 1., (200, 2))
+        plain = KrigingSurrogate()
+        plain.train(x, y)
+        err_plain = np.linalg.norm(plain.vectorized_predict(x_test) - f(x_test))
+        err_grad = np.linalg.norm(surrogate.vectorized_predict(x_test)[0] - f(x_test))
+        self.assertLess(3. * err_grad, err_plain)
+
+        with self.assertRaises(RuntimeError) as cm:
+            surrogate.update(x_test[:2], f(x_test[:2]))
+        self.assertEqual(str(cm.exception), "KrigingSurrogate trained with gradients does "
+                                            "not support incremental updates.")
+
+    def test_train_grad_accuracy(self):
+        def f(x):
+            return np.sin(3. * x[:, :1]) + x[:, 1:] ** 2 * np.cos(2. * x[:, :1])
+
+        def df(x):
+            return np.stack([3. * np.cos(3. * x[:, 0]) - 2. * x[:, 1] ** 2 * np.sin(2. * x[:, 0]),
+                             2. * x[:, 1] * np.cos(2. * x[:, 0])], axis=1)[:, np.newaxis, :]
+
+        x_test = np.random.RandomState(123).uniform(0., 1., (500, 2))
+
+        for n in [10, 20, 30, 40, 60]:
+            for seed in range(4):
+                x = np.random.RandomState(seed).uniform(0., 1., (n, 2))
+
+                plain = KrigingSurrogate()
+                plain.train(x, f(x))
+                err_plain = np.linalg.norm(plain.vectorized_predict(x_test) - f(x_test))
+
+                surrogate = KrigingSurrogate()
+                surrogate.train_grad(x, f(x), df(x))
+                err_grad = np.linalg.norm(surrogate.vectorized_predict(x_test) - f(x_test))
+
+                # the derivatives make the model more accurate
+                self.assertLess(err_grad, err_plain, msg='n=%d, seed=%d' % (n, seed))
+
+                # the likelihood is smooth at the optimum, rather than dominated by rounding
+                # errors of a nearly singular R: its finite differences with respect to
+                # log(thetas) vanish and match the analytic gradient
+                thetas = surrogate.thetas
+                _, params = surrogate._calculate_reduced_likelihood_params(thetas, grad=True)
+                fd = np.zeros(2)
+                for k in range(2):
+                    step = np.zeros(2)
+                    step[k] = 1e-5 * thetas[k]
+                    fd[k] = (surrogate._calculate_reduced_likelihood_params(thetas + step)[0] -
+                             surrogate._calculate_reduced_likelihood_params(thetas - step)[0]) / \
+                        2e-5
+                assert_rel_error(self, fd, np.zeros(2), 1e-2)
+                self.assertLess(np.max(np.abs(params['grad'] * thetas - fd)), 1e-4)
+
+    def test_train_grad_likelihood_gradient(self):
+        np.random.seed(11)
+        x = np.random.random((10, 2))
+        y = np.array([[branin(case)] for case in 10. * x])
+        grad = np.zeros((10, 1, 2))
+        for k in range(2):
+            step = np.zeros(2)
+            step[k] = 1e-6
+            grad[:, 0, k] = [(branin(case + step) - branin(case - step)) / 2e-6 * 10.
+                             for case in 10. * x]
+
+        surrogate = KrigingSurrogate()
+        surrogate.train_grad(x, y, grad)
+
+        for thetas in [np.array([3., 2.]), np.array([10., 10.])]:
+            loglike, params = surrogate._calculate_reduced_likelihood_params(thetas, grad=True)
+
+            fd = np.zeros(2)
+            for k in range(2):
+                step = np.zeros(2)
+                step[k] = 1e-5 * thetas[k]
+                fd[k] = (surrogate._calculate_reduced_likelihood_params(thetas + step)[0] -
+                         surrogate._calculate_reduced_likelihood_params(thetas - step)[0]) \
+                    / (2. * step[k])
+
+            assert_rel_error(self, params['grad'], fd, 1e-4)
+
+
 if __name__ == "__main__":
     unittest.main()
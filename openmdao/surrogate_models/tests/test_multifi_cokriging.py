@@ -170,6 +170,52 @@ class CoKrigingSurrogateTest(unittest.TestCase):
         else:
             self.fail("ValueError Expected")
 
+    def test_rlf_gradient(self):
+        def f_expensive(x):
+            return ((x*6-2)**2)*sin((x*6-2)*2)
+        def f_cheap(x):
+            return 0.5*((x*6-2)**2)*sin((x*6-2)*2)+(x-0.5)*10. - 5
+
+        x = array([[[0.0], [0.4], [0.6], [1.0]],
+                   [[0.1], [0.2], [0.3], [0.5], [0.7],
+                    [0.8], [0.9], [0.0], [0.4], [0.6], [1.0]]])
+        y = array([[f_expensive(v) for v in array(x[0]).ravel()],
+                   [f_cheap(v) for v in array(x[1]).ravel()]])
+
+        cokrig = MultiFiCoKrigingSurrogate()
+        cokrig.train_multifi(x, y)
+        model = cokrig.model
+
+        # compare the analytic gradient of the likelihood with central differences, where the
+        # correlation matrices are well conditioned
+        for lvl in range(model.nlevel):
+            theta = array([30.])
+            rlf_value, params = model._calculate_rlf(lvl, theta, grad=True)
+            h = 1e-5
+            fd = (model._calculate_rlf(lvl, theta + h)[0] -
+                  model._calculate_rlf(lvl, theta - h)[0]) / (2. * h)
+            assert_rel_error(self, params['grad'], fd, 1e-5)
+
+    def test_multistart(self):
+        x = array([[0.05], [.25], [0.61], [0.95]])
+        y = array([0.738513784857542, -0.210367746201974, -0.489015457891476, 12.3033138316612])
+
+        krig1 = MultiFiCoKrigingSurrogate()
+        krig1.train(x, y)
+
+        krig2 = MultiFiCoKrigingSurrogate(n_start=4, executor='process', max_workers=2)
+        krig2.train(x, y)
+
+        # the best of several starting points is at least as likely as the one from theta0
+        self.assertLessEqual(krig2.model.rlf_value[0], krig1.model.rlf_value[0] + 1e-10)
+
+        mu, sigma = krig2.predict(x[0])
+        assert_rel_error(self, mu, [[y[0]]], 1e-4)
+
+        with self.assertRaises(ValueError) as cm:
+            MultiFiCoKrigingSurrogate(executor='thread')
+        self.assertEqual(str(cm.exception), "executor must be None or 'process', but got 'thread'.")
+
 
 if __name__ == "__main__":
     unittest.main()
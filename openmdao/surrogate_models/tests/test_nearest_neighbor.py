@@ -2,6 +2,7 @@ import numpy as np
 import unittest
 
 from openmdao.api import NearestNeighbor
+from openmdao.surrogate_models.nn_interpolators import nn_base
 from openmdao.devtools.testutil import assert_rel_error
 
 
@@ -17,6 +18,64 @@ class TestNearestNeighbor(unittest.TestCase):
 
         self.assertEqual(expected_msg, str(cm.exception))
 
+    def test_vectorized(self):
+        np.random.seed(11)
+        x = np.random.random((60, 2))
+        y = np.column_stack([np.sin(4. * x[:, 0]) * x[:, 1], x[:, 0] + x[:, 1] ** 2])
+        x_eval = 0.1 + 0.8 * np.random.random((20, 2))
+
+        for interpolant_type in ('linear', 'weighted', 'rbf'):
+            surrogate = NearestNeighbor(interpolant_type=interpolant_type, workers=2)
+            surrogate.train(x, y)
+
+            mu = surrogate.vectorized_predict(x_eval)
+            jac = surrogate.vectorized_linearize(x_eval)
+            self.assertEqual(mu.shape, (20, 2))
+            self.assertEqual(jac.shape, (20, 2, 2))
+
+            # batches of more points than the cache holds are queried without it
+            surrogate.interpolant.cache_size = 0
+            assert_rel_error(self, surrogate.vectorized_predict(x_eval), mu, 1e-12)
+            assert_rel_error(self, surrogate.vectorized_linearize(x_eval), jac, 1e-12)
+
+            for x0, mu0, jac0 in zip(x_eval, mu, jac):
+                assert_rel_error(self, surrogate.predict(x0), mu0[np.newaxis], 1e-12)
+                assert_rel_error(self, surrogate.linearize(x0), jac0, 1e-12)
+
+    def test_neighbor_cache(self):
+        surrogate = NearestNeighbor(interpolant_type='weighted', cache_size=2)
+        x = np.array([[0.], [1.], [2.], [3.], [4.], [5.]])
+        surrogate.train(x, x ** 2)
+
+        surrogate.predict(np.array([0.5]))
+        surrogate.predict(np.array([1.5]))
+        surrogate.predict(np.array([0.5]))
+        surrogate.predict(np.array([2.5]))
+
+        # the least recently used point was dropped
+        cached = [np.frombuffer(key[1]) * 5. for key in surrogate.interpolant._neighbors]
+        assert_rel_error(self, np.array(cached), np.array([[0.5], [2.5]]), 1e-12)
+
+
+    def test_chunked_normalization(self):
+        x = np.random.RandomState(0).uniform(-3., 5., size=(50, 2))
+        y = np.vstack([np.sin(x[:, 0]) * x[:, 1], x[:, 0] ** 2]).T
+        x_eval = np.array([[0.5, 1.5], [-1., 2.], [3., -2.]])
+
+        surrogate = NearestNeighbor(interpolant_type='rbf')
+        surrogate.train(x, y)
+        expected = surrogate.vectorized_predict(x_eval)
+
+        # the training data is normalized 3 points at a time
+        chunk_elements = nn_base.CHUNK_ELEMENTS
+        nn_base.CHUNK_ELEMENTS = 6
+        try:
+            surrogate.train(x, y)
+        finally:
+            nn_base.CHUNK_ELEMENTS = chunk_elements
+
+        assert_rel_error(self, surrogate.vectorized_predict(x_eval), expected, 1e-15)
+
 
 class TestLinearInterpolator1D(unittest.TestCase):
     def setUp(self):
@@ -2,10 +2,11 @@
 
 import unittest, itertools
 
-
+import numpy as np
 from numpy import array, linspace, sin, cos, pi
 
 from openmdao.api import ResponseSurface
+from openmdao.surrogate_models import response_surface
 from openmdao.devtools.testutil import assert_rel_error
 from six.moves import zip
 
@@ -137,6 +138,119 @@ class TestResponseSurfaceSurrogate(unittest.TestCase):
         jac = surrogate.linearize(array([[0.5, 0.5]]))
         assert_rel_error(self, jac, array([[1, 1], [1, -1]]), 1e-5)
 
+    def test_update(self):
+        x = array([[a, b] for a, b in
+                   itertools.product(linspace(-5, 10, 5), linspace(0, 15, 5))])
+        y = array([[branin(case)] for case in x])
+
+        full = ResponseSurface()
+        full.train(x, y)
+
+        surrogate = ResponseSurface()
+        surrogate.train(x[:10], y[:10])
+        surrogate.update(x[10:], y[10:])
+
+        self.assertEqual(surrogate.m, 25)
+        assert_rel_error(self, surrogate.betas, full.betas, 1e-9)
+        assert_rel_error(self, surrogate.predict(array([pi, 2.275])),
+                         full.predict(array([pi, 2.275])), 1e-9)
+
+    def test_vectorized(self):
+        x = array([[a, b, c] for a, b, c in
+                   itertools.product(linspace(-1, 1, 4), repeat=3)])
+        y = array([[a * b + c ** 2 - 2. * a, 3. * b * c + a + 1.] for a, b, c in x])
+
+        surrogate = ResponseSurface()
+        surrogate.train(x, y)
+
+        x_eval = array([[0.2, -0.5, 0.7], [1.5, 0.3, -0.4], [-0.8, 0.9, 0.1]])
+        mu = surrogate.vectorized_predict(x_eval)
+        jac = surrogate.vectorized_linearize(x_eval)
+
+        for x0, mu0, jac0 in zip(x_eval, mu, jac):
+            a, b, c = x0
+            assert_rel_error(self, mu0, [a * b + c ** 2 - 2. * a, 3. * b * c + a + 1.], 1e-9)
+            assert_rel_error(self, jac0, [[b - 2., a, 2. * c], [1., 3. * c, 3. * b]], 1e-9)
+            assert_rel_error(self, surrogate.predict(x0), mu0, 1e-12)
+            assert_rel_error(self, surrogate.linearize(x0), jac0, 1e-12)
+
+    def test_retrain_same_inputs(self):
+        x = array([[a, b] for a, b in
+                   itertools.product(linspace(-5, 10, 5), linspace(0, 15, 5))])
+        y = array([[branin(case)] for case in x])
+
+        surrogate = ResponseSurface()
+        surrogate.train(x, y)
+        cho = surrogate._cho
+
+        # the factorization is reused for new responses at the same inputs
+        surrogate.train(x.copy(), 2. * y + 1.)
+        self.assertTrue(surrogate._cho is cho)
+
+        fresh = ResponseSurface()
+        fresh.train(x, 2. * y + 1.)
+        assert_rel_error(self, surrogate.betas, fresh.betas, 1e-10)
+
+        # but not for different inputs
+        surrogate.train(x + 1., y)
+        self.assertFalse(surrogate._cho is cho)
+
+    def test_streamed(self):
+        x = array([[a, b] for a, b in
+                   itertools.product(linspace(-5, 10, 5), linspace(0, 15, 5))])
+        y = array([[branin(case)] for case in x])
+
+        full = ResponseSurface()
+        full.train(x, y)
+
+        # the training points are streamed through the normal equations, 2 at a time
+        chunk_elements = response_surface.CHUNK_ELEMENTS
+        response_surface.CHUNK_ELEMENTS = 2 * 6
+        try:
+            surrogate = ResponseSurface()
+            surrogate.train(x, y)
+            self.assertTrue(surrogate._x is None)
+            assert_rel_error(self, surrogate.betas, full.betas, 1e-9)
+
+            surrogate.update(x[:3], y[:3])
+            full.update(x[:3], y[:3])
+        finally:
+            response_surface.CHUNK_ELEMENTS = chunk_elements
+
+        self.assertEqual(surrogate.m, 28)
+        assert_rel_error(self, surrogate.betas, full.betas, 1e-9)
+        assert_rel_error(self, surrogate.predict(array([pi, 2.275])),
+                         full.predict(array([pi, 2.275])), 1e-9)
+
+    def test_train_grad(self):
+        def f(x):
+            return 1. + x[:, :1] - 2. * x[:, 1:2] * x[:, 2:] + 3. * x[:, :1] ** 2
+
+        def df(x):
+            return np.stack([1. + 6. * x[:, 0], -2. * x[:, 2], -2. * x[:, 1]],
+                            axis=1)[:, np.newaxis, :]
+
+        rand = np.random.RandomState(0)
+        x = rand.uniform(-1., 1., (4, 3))
+        x_test = rand.uniform(-1., 1., (5, 3))
+
+        # 4 points determine the 10 terms with their derivatives
+        surrogate = ResponseSurface()
+        surrogate.train_grad(x, f(x), df(x))
+        assert_rel_error(self, surrogate.vectorized_predict(x_test), f(x_test), 1e-12)
+        assert_rel_error(self, surrogate.vectorized_linearize(x_test), df(x_test), 1e-12)
+
+        # also when the training points are streamed through the normal equations
+        chunk_elements = response_surface.CHUNK_ELEMENTS
+        response_surface.CHUNK_ELEMENTS = 2 * 10 * 4
+        try:
+            surrogate = ResponseSurface()
+            surrogate.train_grad(x, f(x), df(x))
+        finally:
+            response_surface.CHUNK_ELEMENTS = chunk_elements
+
+        assert_rel_error(self, surrogate.vectorized_predict(x_test), f(x_test), 1e-12)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,156 @@
+"""Test the cache of trained surrogate models."""
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from openmdao.api import KrigingSurrogate, MultiFiCoKrigingSurrogate, NearestNeighbor
+from openmdao.devtools.testutil import assert_rel_error
+from openmdao.surrogate_models.surrogate_cache import SurrogateCache, get_training_hash
+
+
+def branin(x):
+    x1 = 15 * x[:, 0] - 5
+    x2 = 15 * x[:, 1]
+    return ((x2 - (5.1 / (4. * np.pi ** 2.)) * x1 ** 2. + 5. * x1 / np.pi - 6.) ** 2. +
+            10. * (1. - 1. / (8. * np.pi)) * np.cos(x1) + 10.)[:, np.newaxis]
+
+
+class TestSurrogateCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tempdir, 'surrogates')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir, ignore_errors=True)
+
+    def test_kriging(self):
+        x = np.random.RandomState(1).uniform(size=(20, 2))
+        y = branin(x)
+        x_test = np.random.RandomState(2).uniform(size=(5, 2))
+
+        cache = SurrogateCache(self.cache_dir)
+
+        krig1 = KrigingSurrogate(eval_rmse=True)
+        self.assertFalse(cache.load(krig1, x, y))
+        krig1.train(x, y)
+        cache.save(krig1, x, y)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        krig2 = KrigingSurrogate(eval_rmse=True)
+        self.assertTrue(cache.load(krig2, x, y))
+        self.assertTrue(krig2.trained)
+
+        # the training data isn't stored, but rebuilt from the given one
+        filename = os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0])
+        with np.load(filename) as data:
+            self.assertFalse(set(data.files) & set(['X', 'Y', '_x', '_y']))
+        assert_rel_error(self, krig2.X, krig1.X, 1e-15)
+        assert_rel_error(self, krig2.Y, krig1.Y, 1e-15)
+
+        mu1, rmse1 = krig1.vectorized_predict(x_test)
+        mu2, rmse2 = krig2.vectorized_predict(x_test)
+        assert_rel_error(self, mu2, mu1, 1e-15)
+        assert_rel_error(self, rmse2, rmse1, 1e-15)
+        assert_rel_error(self, krig2.thetas, krig1.thetas, 1e-15)
+
+        # the restored model can be updated
+        x_new = np.array([[0.5, 0.5]])
+        krig1.update(x_new, branin(x_new))
+        krig2.update(x_new, branin(x_new))
+        assert_rel_error(self, krig2.vectorized_predict(x_test)[0],
+                         krig1.vectorized_predict(x_test)[0], 1e-15)
+
+        # different training data, options or class miss the cache
+        self.assertFalse(cache.load(KrigingSurrogate(), x, 2. * y))
+        self.assertFalse(cache.load(KrigingSurrogate(nugget=1e-6), x, y))
+        self.assertFalse(cache.load(KrigingSurrogate(n_start=3), x, y))
+
+    def test_kriging_grad(self):
+        x = np.random.RandomState(1).uniform(size=(10, 2))
+        y = branin(x)
+        grad = np.random.RandomState(2).uniform(size=(10, 1, 2))
+        x_test = np.random.RandomState(3).uniform(size=(5, 2))
+
+        cache = SurrogateCache(self.cache_dir)
+
+        krig1 = KrigingSurrogate()
+        krig1.train_grad(x, y, grad)
+        cache.save(krig1, x, y, grad)
+
+        # the derivatives are part of the key
+        self.assertFalse(cache.load(KrigingSurrogate(), x, y))
+        self.assertFalse(cache.load(KrigingSurrogate(), x, y, 2. * grad))
+
+        krig2 = KrigingSurrogate()
+        self.assertTrue(cache.load(krig2, x, y, grad))
+        assert_rel_error(self, krig2.vectorized_predict(x_test),
+                         krig1.vectorized_predict(x_test), 1e-15)
+        assert_rel_error(self, krig2.vectorized_linearize(x_test),
+                         krig1.vectorized_linearize(x_test), 1e-15)
+
+    def test_training_hash(self):
+        x = np.random.RandomState(1).uniform(size=(20, 2))
+        y = branin(x)
+        krig = KrigingSurrogate()
+
+        key = get_training_hash(krig, x, y)
+        self.assertEqual(get_training_hash(KrigingSurrogate(), x.copy(), y.copy()), key)
+
+        # options that don't affect the trained model don't change the hash
+        self.assertEqual(get_training_hash(KrigingSurrogate(eval_rmse=True, executor='process'),
+                                           x, y), key)
+
+        self.assertNotEqual(get_training_hash(krig, x.astype(np.float32), y), key)
+        self.assertNotEqual(get_training_hash(krig, x.reshape(10, 4), y), key)
+        self.assertNotEqual(get_training_hash(krig, [x], [y]), key)
+
+    def test_multifi_cokriging(self):
+        x_hi = np.random.RandomState(1).uniform(size=(6, 2))
+        x_lo = np.vstack([np.random.RandomState(2).uniform(size=(10, 2)), x_hi])
+        x = [x_hi, x_lo]
+        y = [branin(x_hi), branin(x_lo) + 30. * x_lo[:, 1:] + 10.]
+
+        cache = SurrogateCache(self.cache_dir)
+
+        cokrig1 = MultiFiCoKrigingSurrogate()
+        cokrig1.train_multifi(x, y)
+        cache.save(cokrig1, x, y)
+
+        cokrig2 = MultiFiCoKrigingSurrogate()
+        self.assertTrue(cache.load(cokrig2, x, y))
+
+        # the likelihood maximization is skipped
+        self.assertEqual(cokrig2.model._nfev, 0)
+
+        mu1, sigma1 = cokrig1.predict([0.4, 0.6])
+        mu2, sigma2 = cokrig2.predict([0.4, 0.6])
+        assert_rel_error(self, mu2, mu1, 1e-10)
+        assert_rel_error(self, sigma2, sigma1, 1e-8)
+
+        self.assertFalse(cache.load(MultiFiCoKrigingSurrogate(n_start=2), x, y))
+
+    def test_not_cacheable(self):
+        x = np.random.RandomState(1).uniform(size=(20, 2))
+        y = branin(x)
+        cache = SurrogateCache(self.cache_dir)
+
+        nn = NearestNeighbor()
+        nn.train(x, y)
+        cache.save(nn, x, y)
+        self.assertFalse(os.path.exists(self.cache_dir))
+        self.assertFalse(cache.load(NearestNeighbor(), x, y))
+
+        with self.assertRaises(RuntimeError) as cm:
+            nn.get_state()
+        self.assertEqual(str(cm.exception),
+                         "NearestNeighbor does not support caching of its trained state.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,392 @@
+"""Utilities for running independent subsystems concurrently on a single node without MPI."""
+
+from __future__ import division
+
+import atexit
+import multiprocessing
+import threading
+from multiprocessing.pool import ThreadPool
+
+from six import iteritems
+
+from openmdao.recorders.recording_iteration_stack import recording_iteration
+from openmdao.vectors.shared_memory_vector import SharedMemoryVector
+
+# Name pushed onto the recording iteration stack of worker threads and processes.  Iterations
+# run inside a worker are not recorded, since recorders are neither thread- nor fork-safe.
+WORKER_STACK_NAME = '_concurrent_worker'
+
+# Function run by a forked worker process; set in each worker when its pool is created.
+_process_func = None
+
+# Thread pools are kept alive between calls, keyed by number of threads.
+_thread_pools = {}
+
+# Process pools are kept alive between calls, keyed by (task key, number of processes).
+_process_pools = {}
+
+
+class _WorkerState(threading.local):
+    """
+    Per-thread record of whether we are running inside a worker.
+
+    Attributes
+    ----------
+    in_worker : bool
+        True in worker threads and processes.
+    """
+
+    def __init__(self):
+        """
+        Initialize attributes.
+        """
+        self.in_worker = False
+
+
+_worker_state = _WorkerState()
+
+
+def _get_fork_context():
+    """
+    Return a multiprocessing context that creates worker processes by forking.
+
+    Returns
+    -------
+    module or multiprocessing.context.BaseContext
+        Object providing a Pool class that forks its workers.
+    """
+    if not hasattr(multiprocessing, 'get_context'):  # python 2 always forks on posix
+        return multiprocessing
+
+    try:
+        return multiprocessing.get_context('fork')
+    except ValueError:
+        raise RuntimeError("The 'process' executor requires a platform that supports fork.")
+
+
+def _init_process_worker(func):
+    """
+    Initialize a forked worker process.
+
+    Parameters
+    ----------
+    func : callable
+        Function that the worker applies to the items it is sent.
+    """
+    global _process_func
+
+    _process_func = func
+    _worker_state.in_worker = True
+    recording_iteration.stack.append((WORKER_STACK_NAME, 0))
+
+    # the pools of the parent are not ours to use or shut down
+    _thread_pools.clear()
+    _process_pools.clear()
+
+
+def _run_process_task(item):
+    """
+    Run one task inside a forked worker process.
+
+    Parameters
+    ----------
+    item : object
+        Item to process.
+
+    Returns
+    -------
+    object
+        Return value of func for the given item; it must be picklable.
+    """
+    return _process_func(item)
+
+
+def _create_process_pool(func, nworkers):
+    """
+    Fork a pool of worker processes that apply func to the items they are sent.
+
+    Parameters
+    ----------
+    func : callable
+        Function taking a single item.
+    nworkers : int
+        Number of processes.
+
+    Returns
+    -------
+    multiprocessing.pool.Pool
+        The pool. Its workers see a snapshot of this process at the time of the call.
+    """
+    # forked workers inherit the arguments of the initializer, so func needn't be picklable
+    return _get_fork_context().Pool(nworkers, initializer=_init_process_worker,
+                                    initargs=(func,))
+
+
+def _close_pool(pool):
+    """
+    Shut down a thread or process pool, waiting for its workers to finish.
+
+    Parameters
+    ----------
+    pool : multiprocessing.pool.Pool
+        The pool.
+    """
+    pool.close()
+    pool.join()
+
+
+def discard_process_pools(owner_type=None):
+    """
+    Shut down the persistent process pools, so that the next calls fork new workers.
+
+    Their workers hold a snapshot of this process from the time they were forked, so this must
+    be called when state that they use, other than the items they are sent, may have changed.
+
+    Parameters
+    ----------
+    owner_type : type or None
+        If given, only shut down the pools whose owner is an instance of this type. The owner is
+        the first item of the key of a pool if that is a tuple, and the key itself otherwise.
+    """
+    for pool_key in list(_process_pools):
+        key = pool_key[0]
+        owner = key[0] if isinstance(key, tuple) else key
+        if owner_type is None or isinstance(owner, owner_type):
+            _close_pool(_process_pools.pop(pool_key))
+
+
+def shutdown_pools():
+    """
+    Shut down all thread and process pools.
+
+    It is called by Problem.cleanup and when the interpreter exits.
+    """
+    discard_process_pools()
+    while _thread_pools:
+        _close_pool(_thread_pools.popitem()[1])
+
+
+atexit.register(shutdown_pools)
+
+
+def concurrent_map(func, items, executor=None, max_workers=None, key=None):
+    """
+    Apply func to each item, possibly concurrently.
+
+    With the 'thread' executor, func runs in a pool of threads sharing this process's memory, so
+    it may modify the items in place.  This only gives a speedup if func spends most of its time
+    in code that releases the GIL (compiled NumPy/SciPy routines, external codes, etc.).
+
+    With the 'process' executor, a pool of worker processes is forked, so each worker sees a
+    snapshot of the current state of this process.  Changes that func makes in a worker are
+    lost; anything that must be kept has to be returned by func and applied by the caller.
+    Without a key, the pool is shut down after the call.  With a key, the pool is kept, and
+    later calls with an equal key send their items to the same workers, which keep applying the
+    func they were forked with.  The items must then be picklable, and func must not depend on
+    any state that changes between those calls other than through its items (see
+    discard_process_pools).
+
+    Parameters
+    ----------
+    func : callable
+        Function taking a single item.
+    items : list
+        Items to process.
+    executor : str or None
+        None (serial), 'thread', or 'process'.
+    max_workers : int or None
+        Maximum number of threads or processes. If None, one per item up to the cpu count.
+    key : hashable or None
+        With the 'process' executor, identifies func, so that its pool of processes is reused.
+        A tuple key starts with the owner of the pool, see discard_process_pools.
+
+    Returns
+    -------
+    list
+        Return values of func, in the same order as items.
+    """
+    # Nested calls from inside a worker run serially, so a pool never waits on itself.
+    if executor is None or len(items) < 2 or _worker_state.in_worker:
+        return [func(item) for item in items]
+
+    if max_workers is None:
+        max_workers = multiprocessing.cpu_count()
+    nworkers = max(1, min(max_workers, len(items)))
+
+    if executor == 'thread':
+        from openmdao.solvers.solver import Solver
+
+        stack = list(recording_iteration.stack)
+        solver_info = Solver._solver_info
+        prefix = solver_info.prefix
+        info_stack = list(solver_info.stack)
+
+        def wrapper(item):
+            _worker_state.in_worker = True
+            recording_iteration.stack = stack + [(WORKER_STACK_NAME, 0)]
+            solver_info.prefix = prefix
+            solver_info.stack = list(info_stack)
+            return func(item)
+
+        if nworkers not in _thread_pools:
+            _thread_pools[nworkers] = ThreadPool(nworkers)
+        return _thread_pools[nworkers].map(wrapper, items)
+
+    elif executor == 'process':
+        if key is None:
+            # the workers inherit the items, so they needn't be picklable
+            pool = _create_process_pool(lambda i: func(items[i]), nworkers)
+            try:
+                return pool.map(_run_process_task, range(len(items)))
+            finally:
+                _close_pool(pool)
+
+        pool_key = (key, nworkers)
+        if pool_key not in _process_pools:
+            _process_pools[pool_key] = _create_process_pool(func, nworkers)
+        return _process_pools[pool_key].map(_run_process_task, items)
+
+    raise ValueError("Unknown executor '%s'." % executor)
+
+
+def get_vector_data(vectors):
+    """
+    Return copies of the real and imaginary data of the given vectors.
+
+    Parameters
+    ----------
+    vectors : [<Vector>, ...]
+        Vectors whose data is requested.
+
+    Returns
+    -------
+    list of (dict, dict or None)
+        For each vector, copies of the real data and, if allocated, the imaginary data, keyed by
+        var_set.
+    """
+    data = []
+    for vec in vectors:
+        real = {set_name: arr.copy() for set_name, arr in iteritems(vec._data)}
+        if vec._alloc_complex:
+            imag = {set_name: arr.copy() for set_name, arr in iteritems(vec._imag_data)}
+        else:
+            imag = None
+        data.append((real, imag))
+    return data
+
+
+def set_vector_data(vectors, data):
+    """
+    Copy data returned by get_vector_data back into the given vectors.
+
+    Parameters
+    ----------
+    vectors : [<Vector>, ...]
+        Vectors to be updated.
+    data : list of (dict, dict or None)
+        Data as returned by get_vector_data for the same vectors.
+    """
+    for vec, (real, imag) in zip(vectors, data):
+        for set_name, arr in iteritems(real):
+            vec._data[set_name][:] = arr
+        if imag is not None:
+            for set_name, arr in iteritems(imag):
+                vec._imag_data[set_name][:] = arr
+        vec._bump_version()
+
+
+def run_subsystems(func, subsystems, get_vectors, executor=None, max_workers=None, args=(),
+                   key=None):
+    """
+    Call func(subsys, *args) on each subsystem, where func may only modify that subsystem's vectors.
+
+    With the 'process' executor, the workers write directly into the root vectors if they are
+    <SharedMemoryVector>s; otherwise the subsystems' vector data is copied back from the workers.
+    With a key, the pool of workers is kept for later calls with an equal key, as with
+    concurrent_map. Each call then sends its args, which must be picklable, and, unless the
+    vectors are shared, the current data of the subsystems' vectors to the workers, which keep
+    using the func and get_vectors they were forked with.
+
+    Parameters
+    ----------
+    func : callable
+        Function taking a subsystem and args.
+    subsystems : [<System>, ...]
+        Subsystems to run; they must be independent of one another.
+    get_vectors : callable
+        Function taking a subsystem and returning the list of its vectors that func modifies.
+    executor : str or None
+        None (serial), 'thread', or 'process'.
+    max_workers : int or None
+        Maximum number of threads or processes. If None, one per item up to the cpu count.
+    args : tuple
+        Additional arguments of func.
+    key : hashable or None
+        With the 'process' executor, identifies func, get_vectors and subsystems, so that the
+        pool of processes is reused. A tuple key starts with the owner of the pool.
+    """
+    if executor != 'process' or len(subsystems) < 2:
+        concurrent_map(lambda subsys: func(subsys, *args), subsystems, executor, max_workers)
+        return
+
+    root_vector = subsystems[0]._outputs._root_vector
+    shared = isinstance(root_vector, SharedMemoryVector)
+
+    if key is not None:
+        # workers forked outside of complex step would not see the complex data, and vice versa
+        cs_key = (root_vector._vector_info._under_complex_step,)
+        key = key + cs_key if isinstance(key, tuple) else (key,) + cs_key
+
+    def run(task):
+        i, task_args, data = task
+        subsys = subsystems[i]
+        if data is not None:
+            set_vector_data(get_vectors(subsys), data)
+        func(subsys, *task_args)
+        if not shared:
+            return get_vector_data(get_vectors(subsys))
+
+    # a persistent worker has a stale copy of any vector that isn't shared
+    send_data = key is not None and not shared
+    tasks = [(i, args, get_vector_data(get_vectors(subsys)) if send_data else None)
+             for i, subsys in enumerate(subsystems)]
+
+    results = concurrent_map(run, tasks, executor, max_workers, key)
+
+    for subsys, data in zip(subsystems, results):
+        vecs = get_vectors(subsys)
+        if shared:
+            # the workers' modification counters are lost, so mark everything as changed
+            for vec in vecs:
+                vec._bump_version()
+        else:
+            set_vector_data(vecs, data)
+
+
+def solve_nonlinear(subsys):
+    """
+    Solve the given subsystem.
+
+    Parameters
+    ----------
+    subsys : <System>
+        The subsystem.
+    """
+    subsys._solve_nonlinear()
+
+
+def get_nonlinear_vectors(subsys):
+    """
+    Return the nonlinear vectors of the given subsystem.
+
+    Parameters
+    ----------
+    subsys : <System>
+        The subsystem.
+
+    Returns
+    -------
+    [<Vector>, ...]
+        The inputs, outputs, and residuals vectors.
+    """
+    return [subsys._inputs, subsys._outputs, subsys._residuals]
@@ -0,0 +1,194 @@
+"""Persistent cache of the setup data that depends only on the structure of a model."""
+
+from __future__ import division
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+import numpy as np
+from six import iteritems
+
+from openmdao import __version__
+from openmdao.core.group import Group
+
+
+def get_structural_hash(model, mode):
+    """
+    Return a hash of everything that the relevance and transfer setup of a model depends on.
+
+    This covers the system tree, the variables with their shapes, sizes and var_sets, the
+    src_indices, the connections, the design variables and responses, the derivative mode and
+    the number of processors. Values of variables and settings such as scaling and solvers do not
+    affect the hash.
+
+    The model must have been set up up to and including its global connections.
+
+    Parameters
+    ----------
+    model : <System>
+        The top level system.
+    mode : str
+        Derivative direction, either 'fwd' or 'rev'.
+
+    Returns
+    -------
+    str
+        Hex digest of the hash.
+    """
+    sha = hashlib.sha1()
+
+    def update(*items):
+        sha.update(repr(items).encode('utf-8'))
+
+    update(__version__, mode, model.comm.size, model.comm.rank, model._vec_names)
+
+    for subsys in model.system_iter(include_self=True, recurse=True):
+        update(subsys.pathname, type(subsys).__name__)
+
+    for type_ in ('input', 'output'):
+        allprocs_abs2meta = model._var_allprocs_abs2meta[type_]
+        abs2meta = model._var_abs2meta[type_]
+        abs2prom = model._var_abs2prom[type_]
+        for abs_name in model._var_allprocs_abs_names[type_]:
+            meta = allprocs_abs2meta[abs_name]
+            update(abs_name, abs2prom.get(abs_name), meta['shape'], meta['size'],
+                   meta['var_set'], meta.get('distributed'))
+
+            src_indices = abs2meta[abs_name].get('src_indices') if abs_name in abs2meta else None
+            if src_indices is not None:
+                src_indices = np.asarray(src_indices)
+                update(src_indices.shape, src_indices.tobytes())
+
+    update(sorted(iteritems(model._conn_global_abs_in2out)))
+
+    for vois in (model.get_design_vars(recurse=True, get_sizes=False),
+                 model.get_responses(recurse=True, get_sizes=False)):
+        update([(name, meta['parallel_deriv_color'], meta['vectorize_derivs'])
+                for name, meta in sorted(iteritems(vois))])
+
+    return sha.hexdigest()
+
+
+class SetupCache(object):
+    """
+    Cache of setup plans that is persisted in a file.
+
+    A setup plan holds the data that setup derives from the structure of a model alone: the
+    relevance dictionary and the transfer index arrays of every group. Plans are keyed by the
+    structural hash of the model, so a subsequent setup of a structurally identical model can
+    reuse them instead of recomputing them.
+
+    The cache is only used when running on a single process. Since the file is read with pickle,
+    only use cache files from a trusted source.
+
+    Attributes
+    ----------
+    filename : str
+        Name of the file in which the plans are stored.
+    _plans : dict
+        Setup plans keyed by structural hash.
+    _key : str or None
+        Structural hash of the model currently being set up.
+    """
+
+    def __init__(self, filename):
+        """
+        Load the plans from the given file, if it exists.
+
+        A file that cannot be read or does not hold a dictionary of plans is ignored, so every
+        lookup misses and the file is overwritten by the next save.
+
+        Parameters
+        ----------
+        filename : str
+            Name of the file in which the plans are stored.
+        """
+        self.filename = filename
+        self._plans = {}
+        self._key = None
+
+        if os.path.isfile(filename):
+            try:
+                with open(filename, 'rb') as f:
+                    plans = pickle.load(f)
+            except Exception:
+                plans = None
+
+            if isinstance(plans, dict):
+                self._plans = plans
+
+    def apply(self, model, mode):
+        """
+        Look up the plan for the given model and pass its transfer index arrays to its groups.
+
+        Parameters
+        ----------
+        model : <System>
+            The top level system, set up up to and including its global connections.
+        mode : str
+            Derivative direction, either 'fwd' or 'rev'.
+
+        Returns
+        -------
+        dict or None
+            The relevance dictionary of the model, or None if no plan was found.
+        """
+        if model.comm.size > 1:
+            self._key = None
+            return None
+
+        self._key = key = get_structural_hash(model, mode)
+        plan = self._plans.get(key)
+        if plan is None:
+            return None
+        if not isinstance(plan, dict) or 'transfers' not in plan or 'relevant' not in plan:
+            # an incompatible plan is replaced by the next save
+            del self._plans[key]
+            return None
+
+        transfer_plans = plan['transfers']
+        for group in model.system_iter(include_self=True, recurse=True, typ=Group):
+            group._transfer_plan = transfer_plans.get(group.pathname)
+
+        return plan['relevant']
+
+    def save(self, model):
+        """
+        Store the plan of the given model, after its final setup, if it is not cached yet.
+
+        Parameters
+        ----------
+        model : <System>
+            The top level system.
+        """
+        key = self._key
+        if key is None or key in self._plans:
+            return
+
+        transfers = {}
+        for group in model.system_iter(include_self=True, recurse=True, typ=Group):
+            transfers[group.pathname] = group._transfer_indices
+
+        self._plans[key] = {
+            'relevant': model._relevant,
+            'transfers': transfers,
+        }
+
+        # write to a temporary file first, so that other processes never read a partial file
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        fd, tmp_name = tempfile.mkstemp(suffix='.pkl', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(self._plans, f, pickle.HIGHEST_PROTOCOL)
+            if hasattr(os, 'replace'):
+                os.replace(tmp_name, self.filename)
+            else:
+                if os.name == 'nt' and os.path.exists(self.filename):
+                    os.remove(self.filename)
+                os.rename(tmp_name, self.filename)
+        except Exception:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
@@ -0,0 +1,172 @@
+"""Test the cache of setup plans."""
+from __future__ import division
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from six import iteritems
+
+from openmdao.api import Problem, Group, IndepVarComp, ExecComp
+from openmdao.devtools.testutil import assert_rel_error
+from openmdao.test_suite.components.sellar import SellarDerivativesGrouped
+from openmdao.utils.setup_cache import SetupCache
+
+
+def _build_sellar(cache_file, mode='rev'):
+    prob = Problem(model=SellarDerivativesGrouped())
+    model = prob.model
+    model.add_design_var('z')
+    model.add_design_var('x')
+    model.add_objective('obj')
+    model.add_constraint('con1', upper=0.0)
+
+    prob.setup(check=False, mode=mode, setup_cache=cache_file)
+    prob.set_solver_print(level=0)
+    return prob
+
+
+def _build_chain(cache_file, size):
+    prob = Problem()
+    model = prob.model
+    model.add_subsystem('px', IndepVarComp('x', np.ones(size)))
+    model.add_subsystem('comp', ExecComp('y = 2.0*x', x=np.ones(size), y=np.ones(size)))
+    model.connect('px.x', 'comp.x')
+
+    prob.setup(check=False, setup_cache=cache_file)
+    return prob
+
+
+class TestSetupCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp(prefix='test_setup_cache-')
+        self.cache_file = os.path.join(self.tempdir, 'plans.pkl')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir, ignore_errors=True)
+
+    def test_reuse_plan(self):
+        prob = _build_sellar(self.cache_file)
+        self.assertIsNone(prob.model._transfer_plan)
+        prob.run_model()
+        self.assertTrue(os.path.isfile(self.cache_file))
+
+        J0 = prob.compute_totals(of=['obj', 'con1'], wrt=['x', 'z'], return_format='flat_dict')
+        indices0 = prob.model.mda._transfer_indices
+
+        prob = _build_sellar(self.cache_file)
+
+        # the plan is loaded at setup and used up by the final setup
+        self.assertIsNotNone(prob.model._transfer_plan)
+        self.assertEqual(len(prob._setup_cache._plans), 1)
+        prob.run_model()
+        self.assertIsNone(prob.model._transfer_plan)
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+        J = prob.compute_totals(of=['obj', 'con1'], wrt=['x', 'z'], return_format='flat_dict')
+        for key, val in iteritems(J0):
+            assert_rel_error(self, J[key], val, 1e-10)
+
+        indices = prob.model.mda._transfer_indices
+        for vec_name, (xfer_in, xfer_out, _, _, _, _) in iteritems(indices):
+            for key, inds in iteritems(xfer_in):
+                np.testing.assert_array_equal(inds, indices0[vec_name][0][key])
+                np.testing.assert_array_equal(xfer_out[key], indices0[vec_name][1][key])
+
+    def test_structural_change(self):
+        prob = _build_chain(self.cache_file, 3)
+        prob.run_model()
+        assert_rel_error(self, prob['comp.y'], 2.0 * np.ones(3))
+
+        # a different size is a different structure, so a new plan is made
+        prob = _build_chain(self.cache_file, 4)
+        self.assertIsNone(prob.model._transfer_plan)
+        prob.run_model()
+        assert_rel_error(self, prob['comp.y'], 2.0 * np.ones(4))
+
+        self.assertEqual(len(SetupCache(self.cache_file)._plans), 2)
+
+        prob = _build_chain(self.cache_file, 3)
+        self.assertIsNotNone(prob.model._transfer_plan)
+        prob['px.x'] = np.array([1.0, 2.0, 3.0])
+        prob.run_model()
+        assert_rel_error(self, prob['comp.y'], [2.0, 4.0, 6.0])
+
+    def test_mode(self):
+        _build_sellar(self.cache_file, mode='rev').final_setup()
+
+        prob = _build_sellar(self.cache_file, mode='fwd')
+        self.assertIsNone(prob.model._transfer_plan)
+        prob.run_model()
+
+        J = prob.compute_totals(of=['obj'], wrt=['x'], return_format='flat_dict')
+        assert_rel_error(self, J['obj', 'x'], [[2.98061391]], .00001)
+
+    def test_unreadable_cache(self):
+        with open(self.cache_file, 'wb') as f:
+            f.write(b'not a pickle')
+
+        # an unreadable cache is a miss and is replaced by a valid one
+        prob = _build_chain(self.cache_file, 3)
+        self.assertIsNone(prob.model._transfer_plan)
+        prob.run_model()
+        assert_rel_error(self, prob['comp.y'], 2.0 * np.ones(3))
+
+        self.assertEqual(len(SetupCache(self.cache_file)._plans), 1)
+        self.assertEqual(os.listdir(self.tempdir), ['plans.pkl'])
+
+        prob = _build_chain(self.cache_file, 3)
+        self.assertIsNotNone(prob.model._transfer_plan)
+
+    def test_incompatible_cache(self):
+        prob = _build_chain(self.cache_file, 3)
+        prob.run_model()
+        key = prob._setup_cache._key
+
+        for plans in ([1, 2, 3], {key: 'garbage'}, {key: {'relevant': {}}}):
+            with open(self.cache_file, 'wb') as f:
+                pickle.dump(plans, f)
+
+            prob = _build_chain(self.cache_file, 3)
+            self.assertIsNone(prob.model._transfer_plan)
+            prob.run_model()
+            assert_rel_error(self, prob['comp.y'], 2.0 * np.ones(3))
+
+            prob = _build_chain(self.cache_file, 3)
+            self.assertIsNotNone(prob.model._transfer_plan)
+
+
+class TestSetupCacheFeature(unittest.TestCase):
+
+    def setUp(self):
+        self.startdir = os.getcwd()
+        self.tempdir = tempfile.mkdtemp(prefix='test_setup_cache-')
+        os.chdir(self.tempdir)
+
+    def tearDown(self):
+        os.chdir(self.startdir)
+        shutil.rmtree(self.tempdir, ignore_errors=True)
+
+    def test_setup_cache(self):
+        from openmdao.api import Problem
+        from openmdao.test_suite.components.sellar import SellarDerivatives
+
+        for i in range(3):
+            prob = Problem(model=SellarDerivatives())
+
+            # only the first setup computes the relevance and transfer data
+            prob.setup(setup_cache='setup_plans.pkl')
+            prob.run_model()
+
+            assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+            assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+
+if __name__ == '__main__':
+    unittest.main()
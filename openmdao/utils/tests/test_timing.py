@@ -0,0 +1,142 @@
+"""Test the timing of the execution methods of systems and solvers."""
+from __future__ import division
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from six import StringIO
+
+from openmdao.api import Problem, NewtonSolver, DirectSolver, ScipyKrylov, LinearBlockGS
+from openmdao.devtools.testutil import assert_rel_error
+from openmdao.test_suite.components.sellar import SellarDerivativesGrouped, SellarDerivatives
+from openmdao.utils.timing import ExecutionTimer
+
+
+def _get_record(timings, system, owner, method):
+    for timing in timings:
+        if (timing['system'], timing['owner'], timing['method']) == (system, owner, method):
+            return timing
+
+
+class TestExecutionTimer(unittest.TestCase):
+
+    def setUp(self):
+        self.startdir = os.getcwd()
+        self.tempdir = tempfile.mkdtemp(prefix='test_timing-')
+        os.chdir(self.tempdir)
+
+    def tearDown(self):
+        os.chdir(self.startdir)
+        shutil.rmtree(self.tempdir, ignore_errors=True)
+
+    def test_disabled(self):
+        prob = Problem(model=SellarDerivatives())
+        prob.setup(check=False)
+        prob.run_model()
+
+        self.assertIsNone(prob.timer)
+        self.assertNotIn('_solve_nonlinear', prob.model.__dict__)
+
+    def test_counts(self):
+        prob = Problem(model=SellarDerivativesGrouped())
+        prob.setup(check=False, timing=True)
+        mda = prob.model.mda
+        mda.nonlinear_solver = NewtonSolver()
+        mda.linear_solver = DirectSolver()
+        prob.model.linear_solver = ScipyKrylov()
+        prob.model.linear_solver.precon = LinearBlockGS()
+        prob.set_solver_print(level=0)
+
+        prob.run_model()
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+
+        timings = prob.timer.get_timings()
+
+        model_solve = _get_record(timings, '', 'system', '_solve_nonlinear')
+        self.assertEqual(model_solve['calls'], 1)
+        self.assertGreaterEqual(model_solve['time'], model_solve['self_time'])
+
+        # the model's solver calls solve_nonlinear on mda, whose solver is Newton
+        mda_solve = _get_record(timings, 'mda', 'system', '_solve_nonlinear')
+        newton = _get_record(timings, 'mda', 'nonlinear_solver', 'solve')
+        self.assertEqual(mda_solve['calls'], 1)
+        self.assertEqual(newton['calls'], 1)
+        self.assertLessEqual(newton['time'], mda_solve['time'])
+        self.assertLessEqual(mda_solve['self_time'], mda_solve['time'] - newton['time'] + 1e-12)
+
+        ln_newton = _get_record(timings, 'mda', 'nonlinear_solver.linear_solver', 'solve')
+        d1_linearize = _get_record(timings, 'mda.d1', 'system', '_linearize')
+        self.assertGreater(ln_newton['calls'], 0)
+        self.assertGreaterEqual(d1_linearize['calls'], ln_newton['calls'])
+
+        self.assertGreater(_get_record(timings, 'mda', 'system', '_transfer')['calls'], 0)
+        self.assertIsNone(_get_record(timings, '', 'linear_solver', 'solve'))
+
+        prob.compute_totals(of=['obj'], wrt=['x', 'z'])
+        timings = prob.timer.get_timings()
+        self.assertEqual(_get_record(timings, '', 'linear_solver', 'solve')['calls'], 1)
+        self.assertGreater(_get_record(timings, '', 'linear_solver.precon', 'solve')['calls'], 0)
+
+        prob.timer.reset()
+        self.assertEqual(prob.timer.get_timings(), [])
+
+    def test_resetup(self):
+        prob = Problem(model=SellarDerivatives())
+        prob.setup(check=False, timing=True)
+        prob.run_model()
+        timer = prob.timer
+
+        # a new setup keeps the timer, and the model is not wrapped twice
+        prob.setup(check=False, timing=True)
+        prob.run_model()
+        self.assertIs(prob.timer, timer)
+        self.assertEqual(_get_record(timer.get_timings(), '', 'system',
+                                     '_solve_nonlinear')['calls'], 2)
+
+    def test_report_and_dump(self):
+        prob = Problem(model=SellarDerivativesGrouped())
+        prob.setup(check=False, timing=True)
+        prob.set_solver_print(level=0)
+
+        stream = StringIO()
+        prob.final_setup()
+        prob.timer.report(out_stream=stream)
+        self.assertEqual(stream.getvalue(), "No timed calls.\n")
+
+        prob.run_model()
+
+        stream = StringIO()
+        prob.timer.report(out_stream=stream)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(lines[0].split()[:3], ['System', '/', 'method'])
+        self.assertEqual(lines[2].strip(), '<model>')
+        self.assertIn('    d1', lines)
+
+        prob.timer.dump('timings.json')
+        with open('timings.json') as f:
+            data = json.load(f)
+        self.assertEqual(data, prob.timer.get_timings())
+
+    def test_feature_timing(self):
+        from openmdao.api import Problem
+        from openmdao.test_suite.components.sellar import SellarDerivativesGrouped
+
+        prob = Problem(model=SellarDerivativesGrouped())
+        prob.setup(timing=True)
+        prob.set_solver_print(level=0)
+
+        prob.run_model()
+        prob.compute_totals(of=['obj'], wrt=['x', 'z'])
+
+        # write a table of the call counts and times of each system and solver
+        prob.timer.report()
+
+        # and save the same data as JSON
+        prob.timer.dump('timings.json')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,244 @@
+"""Lightweight timers and call counters for the execution methods of systems and solvers."""
+
+from __future__ import division, print_function
+
+import json
+import sys
+import threading
+from collections import OrderedDict
+from timeit import default_timer as etime
+
+from six import iteritems
+
+from openmdao.solvers.solver import Solver
+
+# Methods of each system that are timed.
+SYSTEM_METHODS = ('_solve_nonlinear', '_apply_nonlinear', '_linearize', '_apply_linear',
+                  '_solve_linear', '_transfer')
+
+# Attributes of systems and solvers that may hold the solvers that are timed.
+SOLVER_ATTRS = ('nonlinear_solver', 'linear_solver', 'linesearch', 'precon')
+
+
+class _TimerStack(threading.local):
+    """
+    Per-thread stack of the child times of the timed calls that are running.
+
+    Attributes
+    ----------
+    stack : list of float
+        For each running timed call, the time spent so far in timed calls made from it.
+    """
+
+    def __init__(self):
+        """
+        Initialize attributes.
+        """
+        self.stack = []
+
+
+class ExecutionTimer(object):
+    """
+    Collect call counts and wall times of the execution methods of a model.
+
+    Instrumenting a model replaces the timed methods of each of its systems and solvers by
+    timing wrappers on the instance, so a model that is not instrumented runs without any
+    overhead. For every method, the number of calls, the total time, and the self time (the
+    total time minus the time spent in timed calls made from it) are recorded.
+
+    Only the calls made on this process are timed; calls made inside the worker processes of a
+    'process' executor are not seen.
+
+    Attributes
+    ----------
+    _records : OrderedDict
+        [calls, total time, self time] keyed by (system pathname, owner, method), where owner is
+        'system' or the attribute path of a solver of the system, e.g., 'linear_solver.precon'.
+    _wrapped : dict
+        Ids of the instrumented objects, mapped to the objects, so no object is wrapped twice.
+    _depths : dict
+        Depth of each instrumented system in the model tree, keyed by pathname.
+    _local : <_TimerStack>
+        Per-thread stack of child times.
+    """
+
+    def __init__(self):
+        """
+        Initialize attributes.
+        """
+        self._records = OrderedDict()
+        self._wrapped = {}
+        self._depths = {}
+        self._local = _TimerStack()
+
+    def instrument(self, model):
+        """
+        Time the execution methods of all local systems and solvers in the given model.
+
+        Objects that are already instrumented are skipped, so this may be called again after
+        a new setup of the same model.
+
+        Parameters
+        ----------
+        model : <System>
+            The top level system.
+        """
+        for system in model.system_iter(include_self=True, recurse=True):
+            path = system.pathname
+            self._depths[path] = path.count('.') + 1 if path else 0
+            self._wrap(system, path, 'system', SYSTEM_METHODS)
+            self._instrument_solvers(system, path, '')
+
+    def _instrument_solvers(self, obj, path, prefix):
+        """
+        Time the solve method of the solvers held by the given system or solver, recursively.
+
+        Parameters
+        ----------
+        obj : <System> or <Solver>
+            Object holding the solvers.
+        path : str
+            Pathname of the system that owns the solvers.
+        prefix : str
+            Attribute path from the system to obj, including a trailing dot.
+        """
+        for attr in SOLVER_ATTRS:
+            solver = getattr(obj, attr, None)
+            if isinstance(solver, Solver):
+                owner = prefix + attr
+                self._wrap(solver, path, owner, ('solve',))
+                self._instrument_solvers(solver, path, owner + '.')
+
+    def _wrap(self, obj, path, owner, methods):
+        """
+        Replace the given methods of obj by timing wrappers.
+
+        Parameters
+        ----------
+        obj : <System> or <Solver>
+            Object to instrument.
+        path : str
+            Pathname of the system that obj is or belongs to.
+        owner : str
+            'system' or the attribute path of the solver.
+        methods : tuple of str
+            Names of the methods to time.
+        """
+        if id(obj) in self._wrapped:
+            return
+        self._wrapped[id(obj)] = obj
+
+        for method in methods:
+            func = getattr(obj, method, None)
+            if func is not None:
+                record = self._records.setdefault((path, owner, method), [0, 0., 0.])
+                setattr(obj, method, self._timed(func, record))
+
+    def _timed(self, func, record):
+        """
+        Return a wrapper around func that updates the given record on each call.
+
+        Parameters
+        ----------
+        func : callable
+            Bound method to time.
+        record : list
+            The [calls, total time, self time] record of the method.
+
+        Returns
+        -------
+        callable
+            The wrapper.
+        """
+        local = self._local
+
+        def wrapper(*args, **kwargs):
+            stack = local.stack
+            stack.append(0.)
+            start = etime()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = etime() - start
+                child = stack.pop()
+                record[0] += 1
+                record[1] += elapsed
+                record[2] += elapsed - child
+                if stack:
+                    stack[-1] += elapsed
+
+        return wrapper
+
+    def reset(self):
+        """
+        Set all counts and times to zero.
+        """
+        for record in self._records.values():
+            record[:] = [0, 0., 0.]
+
+    def get_timings(self):
+        """
+        Return the counts and times of all methods that have been called.
+
+        Returns
+        -------
+        list of dict
+            For each method, a dict with keys 'system', 'owner', 'method', 'calls', 'time',
+            and 'self_time'. Times are in seconds.
+        """
+        timings = []
+        for (path, owner, method), (calls, total, self_time) in iteritems(self._records):
+            if calls:
+                timings.append({'system': path, 'owner': owner, 'method': method,
+                                'calls': calls, 'time': total, 'self_time': self_time})
+        return timings
+
+    def dump(self, filename):
+        """
+        Write the counts and times of all methods that have been called to a JSON file.
+
+        Parameters
+        ----------
+        filename : str
+            Name of the file.
+        """
+        with open(filename, 'w') as f:
+            json.dump(self.get_timings(), f, indent=1)
+
+    def report(self, out_stream=sys.stdout):
+        """
+        Write the counts and times as a table indented by the position of each system in the tree.
+
+        Parameters
+        ----------
+        out_stream : file-like
+            Where to write the report.
+        """
+        timings = self.get_timings()
+        if not timings:
+            out_stream.write("No timed calls.\n")
+            return
+
+        rows = []
+        last_path = None
+        for timing in timings:
+            path = timing['system']
+            indent = '  ' * self._depths.get(path, 0)
+            if path != last_path:
+                rows.append((indent + (path.rsplit('.', 1)[-1] if path else '<model>'),
+                             '', '', '', ''))
+                last_path = path
+            name = timing['method'] if timing['owner'] == 'system' else \
+                '%s.%s' % (timing['owner'], timing['method'])
+            calls = timing['calls']
+            rows.append((indent + '  ' + name, str(calls), '%.6f' % timing['time'],
+                         '%.6f' % timing['self_time'], '%.3f' % (1e3 * timing['time'] / calls)))
+
+        header = ('System / method', 'Calls', 'Total (s)', 'Self (s)', 'Avg (ms)')
+        width = max(len(header[0]), max(len(row[0]) for row in rows))
+        fmt = '{0:<%d}  {1:>8}  {2:>12}  {3:>12}  {4:>10}' % width
+
+        out_stream.write(fmt.format(*header) + '\n')
+        out_stream.write('-' * (width + 50) + '\n')
+        for row in rows:
+            out_stream.write(fmt.format(*row).rstrip() + '\n')
@@ -7,6 +7,7 @@ from six import iteritems, itervalues
 from six.moves import range, zip
 
 import numpy as np
+from scipy.linalg.blas import daxpy, dscal, ddot, dnrm2
 
 from openmdao.vectors.vector import Vector, Transfer
 
@@ -58,18 +59,37 @@ class DefaultTransfer(Transfer):
         mode : str
             'fwd' or 'rev'.
 
+        Returns
+        -------
+        bool or None
+            In fwd mode, False if no input value was changed by the transfer. The values are only
+            compared if the modifications of in_vec are tracked.
         """
         in_inds = self._in_inds
         out_inds = self._out_inds
 
         if mode == 'fwd':
             do_complex = in_vec._vector_info._under_complex_step and out_vec._alloc_complex
+            changed = do_complex or in_vec._versions is None
+
+            if do_complex and in_vec._cplx_data is not None and out_vec._cplx_data is not None:
+                # real and imaginary parts at once
+                for key in in_inds:
+                    in_set_name, out_set_name = key
+                    in_vec._cplx_data[in_set_name][in_inds[key]] = \
+                        out_vec._cplx_data[out_set_name][out_inds[key]]
+                return changed
 
             for key in in_inds:
                 in_set_name, out_set_name = key
+                in_data = in_vec._data[in_set_name]
+                vals = out_vec._data[out_set_name][out_inds[key]]
+
+                if not changed:
+                    changed = not np.array_equal(in_data[in_inds[key]], vals)
+
                 # this works whether the vecs have multi columns or not due to broadcasting
-                in_vec._data[in_set_name][in_inds[key]] = \
-                    out_vec._data[out_set_name][out_inds[key]]
+                in_data[in_inds[key]] = vals
 
                 # Imaginary transfer
                 # (for CS, so only need in fwd)
@@ -77,6 +97,8 @@ class DefaultTransfer(Transfer):
                     in_vec._imag_data[in_set_name][in_inds[key]] = \
                         out_vec._imag_data[out_set_name][out_inds[key]]
 
+            return changed
+
         else:  # rev
             for key in in_inds:
                 in_set_name, out_set_name = key
@@ -92,6 +114,10 @@ class DefaultVector(Vector):
 
     TRANSFER = DefaultTransfer
 
+    # Whether the real and imaginary data of complex step vectors are views of one complex array,
+    # so that complex values can be accessed without copying.
+    _interleave_complex = True
+
     def _create_data(self):
         """
         Allocate list of arrays, one for each var_set.
@@ -110,13 +136,14 @@ class DefaultVector(Vector):
         ncol = self._ncol
 
         sizes_byset_t = system._var_sizes_byset[self._name][type_]
-        sizes_t = system._var_sizes[self._name][type_]
+        offsets_byset = {set_name: system._get_var_offsets(self._name, type_, set_name)[iproc]
+                         for set_name in sizes_byset_t}
 
         data = {}
         indices = {}
         nsets = len(sizes_byset_t)  # if we only have 1 varset, we can do some speedups
         for set_name in system._num_var_byset[self._name][type_]:
-            size = np.sum(sizes_byset_t[set_name][iproc, :])
+            size = offsets_byset[set_name][-1]
             data[set_name] = np.zeros(size) if ncol == 1 else np.zeros((size, ncol))
             if nsets == 1:
                 indices[set_name] = slice(None)
@@ -124,6 +151,7 @@ class DefaultVector(Vector):
                 indices[set_name] = np.empty(size, int)
 
         if nsets > 1:
+            offsets = system._get_var_offsets(self._name, type_)[iproc]
             abs2meta_t = system._var_abs2meta[type_]
             allprocs_abs2idx_byset_t = system._var_allprocs_abs2idx_byset[self._name][type_]
             allprocs_abs2idx_t = system._var_allprocs_abs2idx[self._name][type_]
@@ -131,12 +159,10 @@ class DefaultVector(Vector):
                 set_name = abs2meta_t[abs_name]['var_set']
 
                 idx_byset = allprocs_abs2idx_byset_t[abs_name]
-                ind_byset1 = np.sum(sizes_byset_t[set_name][iproc, :idx_byset])
-                ind_byset2 = np.sum(sizes_byset_t[set_name][iproc, :idx_byset + 1])
+                ind_byset1, ind_byset2 = offsets_byset[set_name][idx_byset:idx_byset + 2]
 
                 idx = allprocs_abs2idx_t[abs_name]
-                ind1 = np.sum(sizes_t[iproc, :idx])
-                ind2 = np.sum(sizes_t[iproc, :idx + 1])
+                ind1, ind2 = offsets[idx:idx + 2]
 
                 indices[set_name][ind_byset1:ind_byset2] = np.arange(ind1, ind2)
 
@@ -155,7 +181,7 @@ class DefaultVector(Vector):
         _, tmp_indices = self._create_data()
 
         ext_sizes_t = system._ext_sizes[vec_name][type_]
-        int_sizes_t = np.sum(system._var_sizes[vec_name][type_][iproc, :])
+        int_sizes_t = system._get_var_offsets(vec_name, type_)[iproc, -1]
         old_sizes_total = np.sum([len(data) for data in itervalues(root_vec._data)])
 
         old_sizes = (
@@ -185,7 +211,7 @@ class DefaultVector(Vector):
 
         for set_name in system._num_var_byset[self._name][type_]:
             ext_sizes_byset_t = system._ext_sizes_byset[vec_name][type_][set_name]
-            int_sizes_byset_t = np.sum(sizes_byset[type_][set_name][iproc, :])
+            int_sizes_byset_t = system._get_var_offsets(vec_name, type_, set_name)[iproc, -1]
             old_sizes_total_byset = len(root_vec._data[set_name])
 
             old_sizes_byset = (
@@ -199,11 +225,8 @@ class DefaultVector(Vector):
                 ext_sizes_byset_t[1],
             )
 
-            root_vec._data[set_name] = np.concatenate([
-                root_vec._data[set_name][:old_sizes_byset[0]],
-                np.zeros(new_sizes_byset[1]),
-                root_vec._data[set_name][old_sizes_byset[0] + old_sizes_byset[1]:],
-            ])
+            root_vec._resize_data(set_name, old_sizes_byset[0], old_sizes_byset[1],
+                                  new_sizes_byset[1])
 
             if nsets == 1:
                 root_vec._indices[set_name] = slice(None)
@@ -217,14 +240,115 @@ class DefaultVector(Vector):
 
         root_vec._initialize_views()
 
+    def _resize_data(self, set_name, start, old_size, new_size):
+        """
+        Resize the part of the given var_set of this (root) vector owned by a reconfigured system.
+
+        The values before that part are kept, those after it are moved to directly follow it, and
+        the part itself is zeroed.  The data arrays are leading views of buffers that are
+        over-allocated when they grow, so most resizes happen in place and a sequence of resizes
+        takes amortized linear time.
+
+        Parameters
+        ----------
+        set_name : str
+            Name of the var_set.
+        start : int
+            Index of the start of the resized part.
+        old_size : int
+            Old size of the resized part.
+        new_size : int
+            New size of the resized part.
+        """
+        if self._cplx_data is not None:
+            arrays = [(self._cplx_data, self._cplx_buffers)]
+        else:
+            arrays = [(self._data, self._data_buffers)]
+            if self._alloc_complex:
+                arrays.append((self._imag_data, self._imag_buffers))
+
+        for data, buffers in arrays:
+            array = data[set_name]
+            buf = buffers.get(set_name, array)
+
+            old_stop = start + old_size
+            new_stop = start + new_size
+            total = array.shape[0] - old_size + new_size
+
+            if total > buf.shape[0]:
+                # grow by at least half of the current capacity
+                capacity = max(total, buf.shape[0] + buf.shape[0] // 2)
+                new_buf = self._allocate_buffer((capacity,) + array.shape[1:], array.dtype)
+                new_buf[:start] = array[:start]
+                new_buf[new_stop:total] = array[old_stop:]
+                buf = new_buf
+            else:
+                # numpy handles the overlap of source and destination here
+                buf[new_stop:total] = array[old_stop:]
+                buf[start:new_stop] = 0.
+
+            buffers[set_name] = buf
+            data[set_name] = buf[:total]
+
+        if self._cplx_data is not None:
+            self._bind_cplx_data()
+
+    def _use_pool_data(self, buffers, imag_buffers):
+        """
+        Replace the data of this (root) vector by leading views of the given shared buffers.
+
+        The values of a pooled vector are only valid while no other vector using the same buffers
+        has been written to, so they must be reset before each use.
+
+        Parameters
+        ----------
+        buffers : dict of ndarray
+            Flat buffers keyed by var_set, at least as large as the data of this vector.
+        imag_buffers : dict of ndarray
+            Flat buffers for the imaginary data keyed by var_set, if it is allocated.
+        """
+        for set_name, data in iteritems(self._data):
+            self._data[set_name] = buffers[set_name][:data.size].reshape(data.shape)
+            if self._alloc_complex:
+                self._imag_data[set_name] = \
+                    imag_buffers[set_name][:data.size].reshape(data.shape)
+
+        self._initialize_views()
+
+    def _allocate_buffer(self, shape, dtype=float):
+        """
+        Allocate a zeroed buffer for the root data.
+
+        Parameters
+        ----------
+        shape : tuple of int
+            Shape of the buffer.
+        dtype : dtype
+            Data type of the buffer.
+
+        Returns
+        -------
+        ndarray
+            The buffer.
+        """
+        return np.zeros(shape, dtype=dtype)
+
     def _extract_data(self):
         """
         Extract views of arrays from root_vector.
 
         Returns
         -------
-        [ndarray[:], ...]
-            list of zeros arrays of correct size, one for each var_set.
+        dict of ndarray
+            Views of the data, keyed by var_set.
+        dict of ndarray
+            Views of the imaginary data, keyed by var_set.
+        dict of ndarray or None
+            Views of the interleaved complex data keyed by var_set, or None if not used.
+        dict
+            Scaling arrays keyed by 'phys' and 'norm', then by var_set.
+        dict
+            Indices into the root vector, keyed by var_set.
         """
         system = self._system
         type_ = self._typ
@@ -236,17 +360,23 @@ class DefaultVector(Vector):
 
         data = {}
         imag_data = {}
+        cplx_data = {} if self._alloc_complex and root_vec._cplx_data is not None else None
         indices = {}
         scaling = {}
         if self._do_scaling:
-            scaling['phys'] = {}
-            scaling['norm'] = {}
+            if root_vec._scaling is None:
+                # sliced from the root when it is built on first use
+                scaling = None
+            else:
+                scaling['phys'] = {}
+                scaling['norm'] = {}
 
         nsets = len(sizes_byset)  # if we only have 1 varset, we can do some speedups
 
-        for set_name, sizes in iteritems(sizes_byset):
+        for set_name in sizes_byset:
+            size = system._get_var_offsets(self._name, type_, set_name)[iproc, -1]
             ind_byset1 = system._ext_sizes_byset[self._name][type_][set_name][0]
-            ind_byset2 = ind_byset1 + np.sum(sizes[iproc, :])
+            ind_byset2 = ind_byset1 + size
 
             data[set_name] = root_vec._data[set_name][ind_byset1:ind_byset2]
             if nsets == 1:
@@ -258,21 +388,41 @@ class DefaultVector(Vector):
             if self._alloc_complex:
                 if root_vec._alloc_complex:
                     imag_data[set_name] = root_vec._imag_data[set_name][ind_byset1:ind_byset2]
+                    if cplx_data is not None:
+                        cplx_data[set_name] = \
+                            root_vec._cplx_data[set_name][ind_byset1:ind_byset2]
                 else:
                     shape = root_vec._data[set_name][ind_byset1:ind_byset2].shape
                     imag_data[set_name] = np.zeros(shape)
 
-            if self._do_scaling:
-                for typ in ('phys', 'norm'):
-                    root_scale = root_vec._scaling[typ][set_name]
-                    rs0 = root_scale[0]
-                    if rs0 is None:
-                        scaling[typ][set_name] = (rs0, root_scale[1][ind_byset1:ind_byset2])
-                    else:
-                        scaling[typ][set_name] = (rs0[ind_byset1:ind_byset2],
-                                                  root_scale[1][ind_byset1:ind_byset2])
+            if scaling:
+                self._slice_root_scaling(scaling, set_name, ind_byset1, ind_byset2)
+
+        return data, imag_data, cplx_data, scaling, indices
+
+    def _slice_root_scaling(self, scaling, set_name, ind_byset1, ind_byset2):
+        """
+        Add views of the scaling arrays of the root vector for one var_set to scaling.
 
-        return data, imag_data, scaling, indices
+        Parameters
+        ----------
+        scaling : dict
+            Scaling arrays keyed by 'phys' and 'norm', then by var_set.
+        set_name : str
+            Name of the var_set.
+        ind_byset1 : int
+            Start of the range of this vector in the root data of the var_set.
+        ind_byset2 : int
+            End of the range of this vector in the root data of the var_set.
+        """
+        for typ in ('phys', 'norm'):
+            root_scale = self._root_vector._scaling[typ][set_name]
+            rs0 = root_scale[0]
+            if rs0 is None:
+                scaling[typ][set_name] = (rs0, root_scale[1][ind_byset1:ind_byset2])
+            else:
+                scaling[typ][set_name] = (rs0[ind_byset1:ind_byset2],
+                                          root_scale[1][ind_byset1:ind_byset2])
 
     def _initialize_data(self, root_vector):
         """
@@ -290,33 +440,51 @@ class DefaultVector(Vector):
         if root_vector is None:  # we're the root
             self._data, self._indices = self._create_data()
 
-            if self._do_scaling:
+            if not self._do_scaling:
+                pass
+            elif self._name == 'nonlinear':
                 self._scaling = {'phys': {}, 'norm': {}}
                 for set_name, data in iteritems(self._data):
-                    if self._name == 'linear':
-                        # reuse the nonlinear scaling vecs since they're the same as ours
-                        nlvec = self._system._root_vecs[self._kind]['nonlinear']
-                        self._scaling['phys'][set_name] = (None,
-                                                           nlvec._scaling['phys'][set_name][1])
-                        self._scaling['norm'][set_name] = (None,
-                                                           nlvec._scaling['norm'][set_name][1])
-                    else:
-                        dphys1 = np.ones(data.size)
-                        dnorm1 = np.ones(data.size)
-                        if self._name == 'nonlinear':
-                            dphys0 = np.zeros(data.size)
-                            dnorm0 = np.zeros(data.size)
-                        else:
-                            dphys0 = dnorm0 = None
-                        self._scaling['phys'][set_name] = (dphys0, dphys1)
-                        self._scaling['norm'][set_name] = (dnorm0, dnorm1)
+                    size = data.shape[0]
+                    self._scaling['phys'][set_name] = (np.zeros(size), np.ones(size))
+                    self._scaling['norm'][set_name] = (np.zeros(size), np.ones(size))
+            elif self._name == 'linear':
+                # reuse the nonlinear scaling vecs since they're the same as ours
+                nlvec = self._system._root_vecs[self._kind]['nonlinear']
+                self._scaling = {'phys': {}, 'norm': {}}
+                for set_name in self._data:
+                    self._scaling['phys'][set_name] = (None, nlvec._scaling['phys'][set_name][1])
+                    self._scaling['norm'][set_name] = (None, nlvec._scaling['norm'][set_name][1])
+            else:
+                # the vectors of a voi only hold its relevant variables, so they can only share
+                # the arrays of the linear vectors if all variables are relevant
+                relevant_names = self._system._var_allprocs_relevant_names
+                if len(relevant_names[self._name][self._typ]) == \
+                        len(relevant_names['linear'][self._typ]):
+                    self._scaling = self._system._root_vecs[self._kind]['linear']._scaling
+                else:
+                    self._scaling = None
 
             # Allocate imaginary for complex step
             if self._alloc_complex:
-                self._imag_data = deepcopy(self._data)
+                if self._interleave_complex:
+                    self._cplx_data = {set_name: np.zeros(data.shape, dtype=complex)
+                                       for set_name, data in iteritems(self._data)}
+                    self._bind_cplx_data()
+                else:
+                    self._imag_data = deepcopy(self._data)
 
         else:
-            self._data, self._imag_data, self._scaling, self._indices = self._extract_data()
+            self._data, self._imag_data, self._cplx_data, self._scaling, self._indices = \
+                self._extract_data()
+
+    def _bind_cplx_data(self):
+        """
+        Make the real and imaginary data views of the interleaved complex data.
+        """
+        for set_name, cplx in iteritems(self._cplx_data):
+            self._data[set_name] = cplx.real
+            self._imag_data[set_name] = cplx.imag
 
     def _initialize_views(self):
         """
@@ -331,27 +499,31 @@ class DefaultVector(Vector):
         kind = self._kind
         iproc = self._iproc
         ncol = self._ncol
-        do_scaling = self._do_scaling
+        # the scaling arrays of the vectors of a voi are either shared or built on first use
+        do_scaling = self._do_scaling and self._name in ('nonlinear', 'linear')
         if do_scaling:
             factors = system._scale_factors
             scaling = self._scaling
 
         self._views = self._names = views = {}
         self._views_flat = views_flat = {}
+        self._abs_name_cache = {}
 
         alloc_complex = self._alloc_complex
         self._imag_views = imag_views = {}
         self._imag_views_flat = imag_views_flat = {}
+        self._cplx_views = cplx_views = {}
+        cplx_data = self._cplx_data if alloc_complex else None
 
         allprocs_abs2idx_byset_t = system._var_allprocs_abs2idx_byset[self._name][type_]
-        sizes_byset_t = system._var_sizes_byset[self._name][type_]
+        offsets_byset = {set_name: system._get_var_offsets(self._name, type_, set_name)[iproc]
+                         for set_name in system._var_sizes_byset[self._name][type_]}
         abs2meta_t = system._var_abs2meta[type_]
         for abs_name in system._var_relevant_names[self._name][type_]:
             idx_byset = allprocs_abs2idx_byset_t[abs_name]
             set_name = abs2meta_t[abs_name]['var_set']
 
-            ind_byset1 = np.sum(sizes_byset_t[set_name][iproc, :idx_byset])
-            ind_byset2 = np.sum(sizes_byset_t[set_name][iproc, :idx_byset + 1])
+            ind_byset1, ind_byset2 = offsets_byset[set_name][idx_byset:idx_byset + 2]
             shape = abs2meta_t[abs_name]['shape']
             if ncol > 1:
                 if not isinstance(shape, tuple):
@@ -371,6 +543,13 @@ class DefaultVector(Vector):
                     v.shape = shape
                 imag_views[abs_name] = v
 
+                if cplx_data is not None:
+                    v = cplx_data[set_name][ind_byset1:ind_byset2]
+                    if shape != v.shape:
+                        v = v.view()
+                        v.shape = shape
+                    cplx_views[abs_name] = v
+
             if do_scaling:
                 for scaleto in ('phys', 'norm'):
                     scale0, scale1 = factors[abs_name][kind, scaleto]
@@ -379,16 +558,170 @@ class DefaultVector(Vector):
                         vec[0][ind_byset1:ind_byset2] = scale0
                     vec[1][ind_byset1:ind_byset2] = scale1
 
+        self._initialize_single_data()
+
+    def _initialize_scaling(self):
+        """
+        Build the scaling arrays of a vector of a voi, when it is scaled for the first time.
+
+        Sets the following attributes:
+        _scaling
+        _fused_scaling
+        """
+        system = self._system
+        root_vec = self._root_vector
+        self._scaling = scaling = {'phys': {}, 'norm': {}}
+
+        if root_vec is self:
+            factors = system._scale_factors
+            kind = self._kind
+            type_ = self._typ
+            offsets_byset = {set_name: system._get_var_offsets(self._name, type_, set_name)[
+                             self._iproc] for set_name in self._data}
+            for set_name, data in iteritems(self._data):
+                size = data.shape[0]
+                scaling['phys'][set_name] = (None, np.ones(size))
+                scaling['norm'][set_name] = (None, np.ones(size))
+
+            allprocs_abs2idx_byset_t = system._var_allprocs_abs2idx_byset[self._name][type_]
+            abs2meta_t = system._var_abs2meta[type_]
+            for abs_name in system._var_relevant_names[self._name][type_]:
+                idx_byset = allprocs_abs2idx_byset_t[abs_name]
+                set_name = abs2meta_t[abs_name]['var_set']
+                ind_byset1, ind_byset2 = offsets_byset[set_name][idx_byset:idx_byset + 2]
+                for scaleto in ('phys', 'norm'):
+                    scaling[scaleto][set_name][1][ind_byset1:ind_byset2] = \
+                        factors[abs_name][kind, scaleto][1]
+        else:
+            if root_vec._scaling is None:
+                root_vec._initialize_scaling()
+
+            type_ = self._typ
+            ext_sizes_byset_t = system._ext_sizes_byset[self._name][type_]
+            for set_name, data in iteritems(self._data):
+                ind_byset1 = ext_sizes_byset_t[set_name][0]
+                self._slice_root_scaling(scaling, set_name, ind_byset1,
+                                         ind_byset1 + data.shape[0])
+
+        self._initialize_single_data()
+
+    def _initialize_single_data(self):
+        """
+        Set up the fast path used when all the data is in one flat array.
+
+        Must be called again whenever the arrays in _data are replaced.
+
+        Sets the following attributes:
+        _single_data
+        _single_imag
+        _single_blas
+        _fused_scaling
+        """
+        self._single_data = self._single_imag = self._single_blas = self._fused_scaling = None
+
+        if len(self._data) != 1 or self._ncol != 1:
+            return
+
+        set_name, data = next(iteritems(self._data))
+
+        # the BLAS routines need non-empty float64 arrays with a constant stride
+        if data.size == 0 or data.dtype != np.float64:
+            return
+
+        if data.flags.c_contiguous:
+            self._single_blas = (data, 1)
+            if self._alloc_complex and self._imag_data[set_name].flags.c_contiguous:
+                self._single_imag = self._imag_data[set_name]
+        elif self._cplx_data is not None and self._cplx_data[set_name].flags.c_contiguous:
+            # the real part of the interleaved complex data is every other entry of its buffer
+            self._single_blas = (self._cplx_data[set_name].view(np.float64), 2)
+        else:
+            return
+
+        self._single_data = data
+
+        if self._do_scaling and self._scaling is not None:
+            self._fused_scaling = fused = {}
+            for scale_to in ('phys', 'norm'):
+                adder, factor = self._scaling[scale_to][set_name]
+                if adder is not None and not adder.any():
+                    adder = None
+                if np.all(factor == 1.0):
+                    factor = None
+                fused[scale_to] = (adder, factor)
+
     def _clone_data(self):
         """
         For each item in _data, replace it with a copy of the data.
         """
-        for set_name, data in iteritems(self._data):
-            self._data[set_name] = np.array(data)
+        if self._vector_info._under_complex_step and self._cplx_data is not None:
+            for set_name, data in iteritems(self._cplx_data):
+                self._cplx_data[set_name] = np.array(data)
+            self._bind_cplx_data()
+        else:
+            # the real data is no longer a view of the complex data
+            self._cplx_data = None
 
-        if self._vector_info._under_complex_step:
-            for set_name, data in iteritems(self._imag_data):
-                self._imag_data[set_name] = np.array(data)
+            for set_name, data in iteritems(self._data):
+                self._data[set_name] = np.array(data)
+
+            if self._vector_info._under_complex_step:
+                for set_name, data in iteritems(self._imag_data):
+                    self._imag_data[set_name] = np.array(data)
+
+        self._initialize_single_data()
+
+    def _use_blas(self, vec, do_complex=False):
+        """
+        Return whether the BLAS fast path can be used for an operation with another vector.
+
+        Parameters
+        ----------
+        vec : <Vector>
+            The other vector.
+        do_complex : bool
+            Whether the imaginary data takes part in the operation.
+
+        Returns
+        -------
+        bool
+            True if both vectors have the fast path, with contiguous imaginary data if needed.
+        """
+        if self._single_data is None or vec._single_data is None:
+            return False
+        return not do_complex or (self._single_imag is not None and
+                                  vec._single_imag is not None)
+
+    def _axpy(self, val, vec, do_complex=False):
+        """
+        Add val times vec to self with the BLAS fast path.
+
+        Parameters
+        ----------
+        val : float
+            scalar.
+        vec : <Vector>
+            this vector times val is added to self.
+        do_complex : bool
+            Whether the imaginary data is added as well.
+        """
+        x, incx = vec._single_blas
+        y, incy = self._single_blas
+        daxpy(x, y, n=self._single_data.size, a=val, incx=incx, incy=incy)
+        if do_complex:
+            daxpy(vec._single_imag, self._single_imag, a=val)
+
+    def _scal(self, val):
+        """
+        Multiply the real data by val with the BLAS fast path.
+
+        Parameters
+        ----------
+        val : float
+            scalar.
+        """
+        x, incx = self._single_blas
+        dscal(val, x, n=self._single_data.size, incx=incx)
 
     def __iadd__(self, vec):
         """
@@ -404,12 +737,20 @@ class DefaultVector(Vector):
         <Vector>
             self + vec
         """
-        for set_name, data in iteritems(self._data):
-            data += vec._data[set_name]
+        do_complex = vec._alloc_complex and self._vector_info._under_complex_step
+        if do_complex and self._cplx_data is not None and vec._cplx_data is not None:
+            for set_name, data in iteritems(self._cplx_data):
+                data += vec._cplx_data[set_name]
+        elif self._use_blas(vec, do_complex):
+            self._axpy(1.0, vec, do_complex)
+        else:
+            for set_name, data in iteritems(self._data):
+                data += vec._data[set_name]
 
-        if vec._alloc_complex and self._vector_info._under_complex_step:
-            for set_name, data in iteritems(self._imag_data):
-                data += vec._imag_data[set_name]
+            if do_complex:
+                for set_name, data in iteritems(self._imag_data):
+                    data += vec._imag_data[set_name]
+        self._bump_version()
         return self
 
     def __isub__(self, vec):
@@ -426,11 +767,19 @@ class DefaultVector(Vector):
         <Vector>
             self - vec
         """
-        for set_name, data in iteritems(self._data):
-            data -= vec._data[set_name]
-        if vec._alloc_complex and self._vector_info._under_complex_step:
-            for set_name, data in iteritems(self._imag_data):
-                data -= vec._imag_data[set_name]
+        do_complex = vec._alloc_complex and self._vector_info._under_complex_step
+        if do_complex and self._cplx_data is not None and vec._cplx_data is not None:
+            for set_name, data in iteritems(self._cplx_data):
+                data -= vec._cplx_data[set_name]
+        elif self._use_blas(vec, do_complex):
+            self._axpy(-1.0, vec, do_complex)
+        else:
+            for set_name, data in iteritems(self._data):
+                data -= vec._data[set_name]
+            if do_complex:
+                for set_name, data in iteritems(self._imag_data):
+                    data -= vec._imag_data[set_name]
+        self._bump_version()
         return self
 
     def __imul__(self, val):
@@ -447,17 +796,28 @@ class DefaultVector(Vector):
         <Vector>
             self * val
         """
-        if self._vector_info._under_complex_step:
+        if (self._vector_info._under_complex_step and self._cplx_data is not None and
+                np.imag(val) == 0.0):
+            for data in itervalues(self._cplx_data):
+                data *= np.real(val)
+        elif self._vector_info._under_complex_step:
+            # update in place, so that the views and any fast path arrays stay valid
             r_val = np.real(val)
             i_val = np.imag(val)
             for key in self._data:
                 r_data = self._data[key]
                 i_data = self._imag_data[key]
-                self._data[key] = r_val * r_data + i_val * i_data
-                self._imag_data[key] = r_val * i_data + i_val * r_data
+                r_old = r_data.copy()
+                r_data *= r_val
+                r_data += i_val * i_data
+                i_data *= r_val
+                i_data += i_val * r_old
+        elif self._single_data is not None:
+            self._scal(val)
         else:
             for data in itervalues(self._data):
                 data *= val
+        self._bump_version()
         return self
 
     def add_scal_vec(self, val, vec):
@@ -471,16 +831,74 @@ class DefaultVector(Vector):
         vec : <Vector>
             this vector times val is added to self.
         """
-        if self._vector_info._under_complex_step:
+        if (self._vector_info._under_complex_step and self._cplx_data is not None and
+                vec._cplx_data is not None and np.imag(val) == 0.0):
+            r_val = np.real(val)
+            for set_name, data in iteritems(self._cplx_data):
+                data += r_val * vec._cplx_data[set_name]
+        elif self._vector_info._under_complex_step:
             r_val = np.real(val)
             i_val = np.imag(val)
             for set_name, data in iteritems(self._data):
                 data += r_val * vec._data[set_name] + i_val * vec._imag_data[set_name]
             for set_name, data in iteritems(self._imag_data):
                 data += i_val * vec._data[set_name] + r_val * vec._imag_data[set_name]
+        elif self._use_blas(vec):
+            self._axpy(val, vec)
         else:
             for set_name, data in iteritems(self._data):
                 data += val * vec._data[set_name]
+        self._bump_version()
+
+    def scal_add_scal_vec(self, self_val, val, vec):
+        """
+        Perform the in-place update self = self_val * self + val * vec.
+
+        Parameters
+        ----------
+        self_val : int or float
+            scalar multiplying self.
+        val : int or float
+            scalar multiplying vec.
+        vec : <Vector>
+            this vector times val is added to self.
+        """
+        data = self._single_data
+        if (data is None or vec._single_data is None or
+                self._vector_info._under_complex_step):
+            super(DefaultVector, self).scal_add_scal_vec(self_val, val, vec)
+            return
+
+        if self_val == -1.0 and val == 1.0:
+            np.subtract(vec._single_data, data, out=data)
+        else:
+            if self_val != 1.0:
+                self._scal(self_val)
+            self._axpy(val, vec)
+        self._bump_version()
+
+    def scale(self, scale_to):
+        """
+        Scale this vector to normalized or physical form.
+
+        Parameters
+        ----------
+        scale_to : str
+            Values are "phys" or "norm" to scale to physical or normalized.
+        """
+        if self._do_scaling and self._scaling is None:
+            self._initialize_scaling()
+
+        data = self._single_data
+        if data is None:
+            super(DefaultVector, self).scale(scale_to)
+            return
+
+        adder, factor = self._fused_scaling[scale_to]
+        if factor is not None:
+            data *= factor
+        if adder is not None:
+            data += adder
 
     def set_vec(self, vec):
         """
@@ -491,11 +909,21 @@ class DefaultVector(Vector):
         vec : <Vector>
             the vector whose values self is set to.
         """
-        for set_name, data in iteritems(self._data):
-            data[:] = vec._data[set_name]
-        if self._vector_info._under_complex_step:
-            for set_name, data in iteritems(self._imag_data):
-                data[:] = vec._imag_data[set_name][:]
+        do_complex = self._vector_info._under_complex_step
+        if do_complex and self._cplx_data is not None and vec._cplx_data is not None:
+            for set_name, data in iteritems(self._cplx_data):
+                data[:] = vec._cplx_data[set_name]
+        elif self._use_blas(vec, do_complex):
+            self._single_data[:] = vec._single_data
+            if do_complex:
+                self._single_imag[:] = vec._single_imag
+        else:
+            for set_name, data in iteritems(self._data):
+                data[:] = vec._data[set_name]
+            if do_complex:
+                for set_name, data in iteritems(self._imag_data):
+                    data[:] = vec._imag_data[set_name][:]
+        self._bump_version()
 
     def set_const(self, val):
         """
@@ -508,6 +936,7 @@ class DefaultVector(Vector):
         """
         for data in itervalues(self._data):
             data[:] = val
+        self._bump_version()
 
     def dot(self, vec):
         """
@@ -523,6 +952,11 @@ class DefaultVector(Vector):
         float
             The computed dot product value.
         """
+        if self._use_blas(vec):
+            x, incx = self._single_blas
+            y, incy = vec._single_blas
+            return ddot(x, y, n=self._single_data.size, incx=incx, incy=incy)
+
         global_sum = 0
         for set_name, data in iteritems(self._data):
             global_sum += np.dot(data, vec._data[set_name])
@@ -538,6 +972,10 @@ class DefaultVector(Vector):
         float
             norm of this vector.
         """
+        if self._single_data is not None:
+            x, incx = self._single_blas
+            return dnrm2(x, n=self._single_data.size, incx=incx)
+
         global_sum = 0
         for data in itervalues(self._data):
             global_sum += np.sum(data**2)
@@ -647,6 +1085,9 @@ class DefaultVector(Vector):
             u_data += change
             du_data += change / alpha
 
+        u._bump_version()
+        du._bump_version()
+
     def _enforce_bounds_wall(self, du, alpha, lower_bounds, upper_bounds):
         """
         Enforce lower/upper bounds on each scalar separately, then backtrack along the wall.
@@ -697,6 +1138,9 @@ class DefaultVector(Vector):
             changed_either = change_lower.astype(bool) + change_upper.astype(bool)
             du_data[changed_either] = 0.
 
+        u._bump_version()
+        du._bump_version()
+
     def __getstate__(self):
         """
         Return state as a dict.
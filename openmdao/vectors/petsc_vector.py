@@ -155,6 +155,9 @@ class PETScVector(DefaultVector):
 
     TRANSFER = PETScTransfer
 
+    # PETSc needs contiguous arrays to wrap
+    _interleave_complex = False
+
     def _initialize_data(self, root_vector):
         """
         Internally allocate vectors.
@@ -0,0 +1,115 @@
+"""Define a Vector class whose data lives in memory shared with forked worker processes."""
+from __future__ import division
+
+import mmap
+
+import numpy as np
+from six import iteritems
+
+from openmdao.vectors.default_vector import DefaultVector
+
+
+def _shared_zeros(shape, dtype=float):
+    """
+    Return a zeroed array that is backed by an anonymous shared memory map.
+
+    Memory mapped this way is inherited (not copied) by processes forked afterwards, so values
+    written by a worker process are seen directly by its parent.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of the array.
+    dtype : dtype
+        Data type of the array.
+
+    Returns
+    -------
+    ndarray
+        Shared array.
+    """
+    size = int(np.prod(shape))
+    # mmap can't map zero bytes
+    buf = mmap.mmap(-1, max(size * np.dtype(dtype).itemsize, 1))
+    return np.frombuffer(buf, dtype=dtype, count=size).reshape(shape)
+
+
+def _shared_copy(array):
+    """
+    Return a copy of the given array that is backed by an anonymous shared memory map.
+
+    Parameters
+    ----------
+    array : ndarray
+        Array to copy.
+
+    Returns
+    -------
+    ndarray
+        Shared copy of the array.
+    """
+    shared = _shared_zeros(array.shape, array.dtype)
+    shared[:] = array
+    return shared
+
+
+class SharedMemoryVector(DefaultVector):
+    """
+    DefaultVector whose root data arrays are allocated in shared memory.
+
+    This allows the 'process' executor of a <ParallelGroup> to let its forked workers write
+    their results directly into the root vectors, so no data needs to be copied back.
+    """
+
+    def _initialize_data(self, root_vector):
+        """
+        Internally allocate vectors.
+
+        Sets the following attributes:
+        _data
+        _indices
+
+        Parameters
+        ----------
+        root_vector : Vector or None
+            the root's vector instance or None, if we are at the root.
+        """
+        super(SharedMemoryVector, self)._initialize_data(root_vector)
+
+        if root_vector is None:
+            self._share_data()
+
+    def _allocate_buffer(self, shape, dtype=float):
+        """
+        Allocate a zeroed buffer for the root data in shared memory.
+
+        Parameters
+        ----------
+        shape : tuple of int
+            Shape of the buffer.
+        dtype : dtype
+            Data type of the buffer.
+
+        Returns
+        -------
+        ndarray
+            The buffer.
+        """
+        return _shared_zeros(shape, dtype)
+
+    def _share_data(self):
+        """
+        Move the real and imaginary data of this (root) vector into shared memory.
+        """
+        if self._cplx_data is not None:
+            for set_name, data in iteritems(self._cplx_data):
+                self._cplx_data[set_name] = _shared_copy(data)
+            self._bind_cplx_data()
+            return
+
+        for set_name, data in iteritems(self._data):
+            self._data[set_name] = _shared_copy(data)
+
+        if self._alloc_complex:
+            for set_name, data in iteritems(self._imag_data):
+                self._imag_data[set_name] = _shared_copy(data)
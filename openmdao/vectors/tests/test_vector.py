@@ -1,6 +1,9 @@
 import unittest
 
+import numpy as np
+
 from openmdao.api import Problem, IndepVarComp
+from openmdao.devtools.testutil import assert_rel_error
 
 try:
     from openmdao.parallel_api import PETScVector
@@ -56,6 +59,171 @@ class TestVector(unittest.TestCase):
 
         self.assertEqual(new_vec.dot(p.model._outputs), 9.)
 
+
+class TestSingleVarSet(unittest.TestCase):
+
+    def _build(self, var_sets, force_alloc_complex=False):
+        p = Problem()
+        comp = IndepVarComp()
+        comp.add_output('v1', val=np.array([1.0, -2.0]), ref=3.0, ref0=1.0, var_set=var_sets[0])
+        comp.add_output('v2', val=4.0, ref=0.5, var_set=var_sets[1])
+        comp.add_output('v3', val=np.array([2.0, 5.0, -1.0]), var_set=var_sets[2])
+        p.model.add_subsystem('des_vars', comp, promotes=['*'])
+        p.setup(check=False, force_alloc_complex=force_alloc_complex)
+        p.final_setup()
+        return p
+
+    def _check_ops(self, p):
+        outputs = p.model._outputs
+        vec = outputs._clone()
+        vec.set_const(0.5)
+        results = []
+
+        work = outputs._clone()
+        work += vec
+        results.append(work.get_data())
+        work -= outputs
+        results.append(work.get_data())
+        work *= -3.0
+        results.append(work.get_data())
+        work.add_scal_vec(2.5, outputs)
+        results.append(work.get_data())
+        work.scal_add_scal_vec(-1.0, 1.0, outputs)
+        results.append(work.get_data())
+        work.scal_add_scal_vec(0.5, -2.0, vec)
+        results.append(work.get_data())
+        results.append(work.dot(outputs))
+        results.append(work.get_norm())
+        work.set_vec(outputs)
+        results.append(work.get_data())
+
+        outputs.scale('norm')
+        results.append(outputs.get_data())
+        outputs.scale('phys')
+        results.append(outputs.get_data())
+
+        return results
+
+    def test_fast_path(self):
+        p = self._build([0, 0, 0])
+        self.assertIsNotNone(p.model._outputs._single_data)
+
+        p2 = self._build([0, 1, 2])
+        self.assertIsNone(p2.model._outputs._single_data)
+
+        # the data of the multi var_set vector is ordered by var_set, like the single set's
+        for fast, slow in zip(self._check_ops(p), self._check_ops(p2)):
+            assert_rel_error(self, fast, slow, 1e-15)
+
+        assert_rel_error(self, p['v1'], [1.0, -2.0], 1e-15)
+        assert_rel_error(self, p['v2'], 4.0, 1e-15)
+
+    def test_fast_path_complex_storage(self):
+        p = self._build([0, 0, 0], force_alloc_complex=True)
+
+        # the real data is every other entry of the complex data
+        outputs = p.model._outputs
+        self.assertIs(outputs._single_data, outputs._data[0])
+        self.assertTrue(np.shares_memory(outputs._single_blas[0], outputs._cplx_data[0]))
+        self.assertEqual(outputs._single_blas[1], 2)
+
+        for fast, slow in zip(self._check_ops(p), self._check_ops(self._build([0, 1, 2]))):
+            assert_rel_error(self, fast, slow, 1e-15)
+
+        assert_rel_error(self, p['v1'], [1.0, -2.0], 1e-15)
+        assert_rel_error(self, outputs._imag_data[0], np.zeros(6), 1e-15)
+
+    def test_fused_scaling(self):
+        p = self._build([0, 0, 0])
+        adder, factor = p.model._outputs._fused_scaling['norm']
+        assert_rel_error(self, factor, [0.5, 0.5, 2.0, 1.0, 1.0, 1.0], 1e-15)
+        assert_rel_error(self, adder, [-0.5, -0.5, 0.0, 0.0, 0.0, 0.0], 1e-15)
+
+        # linear vectors have no adder
+        adder, factor = p.model._vectors['output']['linear']._fused_scaling['phys']
+        self.assertIsNone(adder)
+        assert_rel_error(self, factor, [2.0, 2.0, 0.5, 1.0, 1.0, 1.0], 1e-15)
+
+    def test_view_consistency(self):
+        p = self._build([0, 0, 0])
+        outputs = p.model._outputs
+
+        outputs *= 2.0
+        assert_rel_error(self, outputs['des_vars.v2'], 8.0, 1e-15)
+
+        outputs['des_vars.v2'] = 3.0
+        self.assertEqual(outputs._single_data[2], 3.0)
+
+
+class TestInterleavedComplex(unittest.TestCase):
+
+    def setUp(self):
+        p = Problem()
+        comp = IndepVarComp()
+        comp.add_output('v1', val=np.array([1.0, -2.0]))
+        comp.add_output('v2', val=4.0)
+        p.model.add_subsystem('des_vars', comp, promotes=['*'])
+        p.setup(check=False, force_alloc_complex=True)
+        p.final_setup()
+        self.p = p
+
+    def tearDown(self):
+        self.p.model._outputs._vector_info._under_complex_step = False
+
+    def test_storage(self):
+        outputs = self.p.model._outputs
+        cplx = outputs._cplx_data[0]
+        self.assertEqual(cplx.dtype, complex)
+        self.assertTrue(np.shares_memory(outputs._data[0], cplx))
+        self.assertTrue(np.shares_memory(outputs._imag_data[0], cplx))
+        self.assertEqual(outputs._single_blas[1], 2)
+
+        # only the nonlinear vectors get imaginary storage
+        self.assertFalse(self.p.model._vectors['output']['linear']._alloc_complex)
+
+    def test_views(self):
+        outputs = self.p.model._outputs
+        outputs._vector_info._under_complex_step = True
+
+        # complex values are views, not copies
+        v1 = outputs['des_vars.v1']
+        self.assertIs(outputs['des_vars.v1'], v1)
+        v1[1] += 0.5j
+        assert_rel_error(self, outputs._imag_views['des_vars.v1'], [0.0, 0.5], 1e-15)
+
+        outputs['des_vars.v2'] = 3.0 - 1.0j
+        assert_rel_error(self, outputs._views['des_vars.v2'], 3.0, 1e-15)
+        assert_rel_error(self, outputs._imag_views['des_vars.v2'], -1.0, 1e-15)
+
+    def test_ops(self):
+        outputs = self.p.model._outputs
+        outputs._vector_info._under_complex_step = True
+        outputs['des_vars.v1'] = np.array([1.0 + 1.0j, -2.0])
+        expected = outputs._cplx_data[0].copy()
+
+        work = outputs._clone()
+        self.assertIsNotNone(work._cplx_data)
+
+        work += outputs
+        expected += expected
+        assert_rel_error(self, work._cplx_data[0], expected, 1e-15)
+
+        work *= -3.0
+        expected *= -3.0
+        assert_rel_error(self, work._cplx_data[0], expected, 1e-15)
+
+        work.add_scal_vec(2.0, outputs)
+        expected += 2.0 * outputs._cplx_data[0]
+        assert_rel_error(self, work._cplx_data[0], expected, 1e-15)
+
+        work -= outputs
+        expected -= outputs._cplx_data[0]
+        assert_rel_error(self, work._cplx_data[0], expected, 1e-15)
+
+        work.set_vec(outputs)
+        assert_rel_error(self, work._cplx_data[0], outputs._cplx_data[0], 1e-15)
+
+
 if __name__ == '__main__':
 
     unittest.main()
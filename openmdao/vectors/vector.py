@@ -1,5 +1,7 @@
 """Define the base Vector and Transfer classes."""
 from __future__ import division, print_function
+from collections import defaultdict
+
 import numpy as np
 
 from six.moves import range
@@ -34,6 +36,26 @@ class VectorInfo(object):
         self._under_complex_step = False
 
 
+def _uses_skip_unchanged(system):
+    """
+    Return True if the given system or any of its local descendants has 'skip_unchanged' set.
+
+    Parameters
+    ----------
+    system : <System>
+        The system.
+
+    Returns
+    -------
+    bool
+        True if modifications of the system's vectors need to be tracked.
+    """
+    for subsys in system.system_iter(include_self=True, recurse=True):
+        if 'skip_unchanged' in subsys.options and subsys.options['skip_unchanged']:
+            return True
+    return False
+
+
 class Vector(object):
     """
     Base Vector class.
@@ -65,6 +87,9 @@ class Vector(object):
         Dictionary mapping absolute variable names to the flattened ndarray views.
     _names : set([str, ...])
         Set of variables that are relevant in the current context.
+    _abs_name_cache : dict
+        Absolute names (or None, if not found) of the promoted or relative names that have been
+        looked up while _names is _views, keyed by name.
     _root_vector : Vector
         Pointer to the vector owned by the root system.
     _alloc_complex : Bool
@@ -86,6 +111,11 @@ class Vector(object):
         by varset name.
     _complex_view_cache : {}
         Temporary storage of complex views used by in-place numpy operations.
+    _cplx_data : dict or None
+        Interleaved complex storage keyed by varset name, of which _data and _imag_data are the
+        real and imaginary views; None if the two parts are stored separately.
+    _cplx_views : dict
+        Dictionary mapping absolute variable names to complex ndarray views of _cplx_data.
     _ncol : int
         Number of columns for multi-vectors.
     _icol : int or None
@@ -96,8 +126,32 @@ class Vector(object):
         and dependent systems.
     _do_scaling : bool
         True if this vector performs scaling.
-    _scaling : dict
-        Contains scale factors to convert data arrays.
+    _scaling : dict or None
+        Contains scale factors to convert data arrays. None until first used for the vectors of
+        a design variable or response that only hold some of the variables.
+    _versions : defaultdict(int) or None
+        Modification counters keyed by system pathname, shared by all vectors with the same root.
+        None if modifications aren't tracked, because no component has 'skip_unchanged' set.
+    _version_path : [str, ...]
+        Pathnames of the owning system and all of its ancestors, starting with the root.
+    _single_data : ndarray or None
+        The data array if the vector consists of a single, non-empty, flat var_set; otherwise None.
+        When set, it allows the arithmetic operations to bypass the loops over var_sets.
+    _single_imag : ndarray or None
+        The imaginary data array that goes with _single_data, if allocated and contiguous.
+    _single_blas : tuple or None
+        The contiguous float64 array that holds _single_data at every inc-th entry and inc, as
+        passed to the BLAS routines. inc is 2 if _single_data is the real view of complex data.
+    _fused_scaling : dict or None
+        Scaling of _single_data keyed by 'phys' or 'norm', as (adder, factor) tuples, where
+        trivial adders and factors are replaced by None.
+    _data_buffers : dict
+        Over-allocated storage of the root data keyed by var_set, of which the root data arrays
+        are leading views. Only set for var_sets that have been resized by a reconfiguration.
+    _imag_buffers : dict
+        Over-allocated storage of the root imaginary data, like _data_buffers.
+    _cplx_buffers : dict
+        Over-allocated storage of the root interleaved complex data, like _data_buffers.
     """
 
     _vector_info = VectorInfo()
@@ -143,6 +197,7 @@ class Vector(object):
         # self._names will either be equivalent to self._views or to the
         # set of variables relevant to the current matvec product.
         self._names = self._views
+        self._abs_name_cache = {}
 
         self._root_vector = None
         self._data = {}
@@ -155,6 +210,8 @@ class Vector(object):
             self._imag_views = {}
             self._complex_view_cache = {}
             self._imag_views_flat = {}
+        self._cplx_data = None
+        self._cplx_views = {}
 
         self._do_scaling = ((kind == 'input' and system._has_input_scaling) or
                             (kind == 'output' and system._has_output_scaling) or
@@ -162,10 +219,27 @@ class Vector(object):
 
         self._scaling = {}
 
+        self._single_data = None
+        self._single_imag = None
+        self._single_blas = None
+        self._fused_scaling = None
+
+        self._data_buffers = {}
+        self._imag_buffers = {}
+        self._cplx_buffers = {}
+
         if root_vector is None:
             self._root_vector = self
+            if name == 'nonlinear' and _uses_skip_unchanged(system):
+                self._versions = defaultdict(int)
+            else:
+                self._versions = None
         else:
             self._root_vector = root_vector
+            self._versions = root_vector._versions
+
+        names = system.pathname.split('.') if system.pathname else []
+        self._version_path = [''] + ['.'.join(names[:i + 1]) for i in range(len(names))]
 
         if resize:
             if root_vector is None:
@@ -177,7 +251,7 @@ class Vector(object):
         self._initialize_data(root_vector)
         self._initialize_views()
 
-        self._length = np.sum(self._system._var_sizes[self._name][self._typ][self._iproc, :])
+        self._length = system._get_var_offsets(self._name, self._typ)[self._iproc, -1]
 
     def __str__(self):
         """
@@ -259,6 +333,7 @@ class Vector(object):
         """
         for set_name, data in iteritems(self._data):
             data[:] = array[self._indices[set_name]]
+        self._bump_version()
 
     def iadd_data(self, array):
         """
@@ -271,6 +346,41 @@ class Vector(object):
         """
         for set_name, data in iteritems(self._data):
             data += array[self._indices[set_name]]
+        self._bump_version()
+
+    def _bump_version(self, pathname=None):
+        """
+        Record that the data of this vector has been modified.
+
+        Because the data of a system's vector is a view into that of its ancestors, a change
+        recorded here is seen by this system and all of its descendants.
+
+        Parameters
+        ----------
+        pathname : str or None
+            Pathname of a descendant system to which the modification was restricted.
+            If None, the owning system is used.
+        """
+        if self._versions is None:
+            return
+        if pathname is None:
+            pathname = self._system.pathname
+        self._versions[pathname] += 1
+
+    def _get_version(self):
+        """
+        Return a counter that increases whenever data visible to this vector is modified.
+
+        Only modifications made through the Vector interface or through transfers are counted;
+        writes made directly into the views are not. Modifications must be tracked.
+
+        Returns
+        -------
+        int
+            Sum of the modification counters of the owning system and all of its ancestors.
+        """
+        versions = self._versions
+        return sum([versions[path] for path in self._version_path])
 
     def _contains_abs(self, abs_name):
         """
@@ -322,8 +432,35 @@ class Vector(object):
         boolean
             True or False.
         """
-        abs_name = name2abs_name(self._system, name, self._names, self._typ)
-        return abs_name is not None
+        return self._name2abs_name(name) is not None
+
+    def _name2abs_name(self, name):
+        """
+        Map the given promoted or relative name to the absolute name of a variable in _names.
+
+        While all views are in scope, the result is cached, so repeated lookups of the same name
+        cost a single dict access.
+
+        Parameters
+        ----------
+        name : str
+            Promoted or relative variable name in the owning system's namespace.
+
+        Returns
+        -------
+        str or None
+            Absolute variable name if found, else None.
+        """
+        names = self._names
+        if names is not self._views:
+            return name2abs_name(self._system, name, names, self._typ)
+
+        try:
+            return self._abs_name_cache[name]
+        except KeyError:
+            abs_name = self._abs_name_cache[name] = name2abs_name(self._system, name, names,
+                                                                  self._typ)
+            return abs_name
 
     def __getitem__(self, name):
         """
@@ -339,10 +476,15 @@ class Vector(object):
         float or ndarray
             variable value (not scaled, not dimensionless).
         """
-        abs_name = name2abs_name(self._system, name, self._names, self._typ)
+        abs_name = self._name2abs_name(name)
         if abs_name is not None:
             if self._vector_info._under_complex_step:
-                if self._typ == 'input':
+                if abs_name in self._cplx_views:
+                    if self._icol is None:
+                        return self._cplx_views[abs_name]
+                    else:
+                        return self._cplx_views[abs_name][:, self._icol]
+                elif self._typ == 'input':
                     if self._icol is None:
                         return self._views[abs_name] + 1j * self._imag_views[abs_name]
                     else:
@@ -379,14 +521,19 @@ class Vector(object):
         value : float or list or tuple or ndarray
             variable value to set (not scaled, not dimensionless)
         """
-        abs_name = name2abs_name(self._system, name, self._names, self._typ)
+        abs_name = self._name2abs_name(name)
         if abs_name is not None:
             if self._icol is None:
                 slc = _full_slice
             else:
                 slc = (_full_slice, self._icol)
-            value, _ = ensure_compatible(name, value, self._views[abs_name][slc].shape)
-            if self._vector_info._under_complex_step:
+            view = self._views[abs_name]
+            # skip the conversion if the value already is an array of the right shape
+            if not (isinstance(value, np.ndarray) and value.shape == view[slc].shape):
+                value, _ = ensure_compatible(name, value, view[slc].shape)
+            if self._vector_info._under_complex_step and abs_name in self._cplx_views:
+                self._cplx_views[abs_name][slc] = value
+            elif self._vector_info._under_complex_step:
 
                 # setitem overwrites anything you may have done with numpy indexing
                 try:
@@ -394,10 +541,11 @@ class Vector(object):
                 except KeyError:
                     pass
 
-                self._views[abs_name][slc] = value.real
+                view[slc] = value.real
                 self._imag_views[abs_name][slc] = value.imag
             else:
-                self._views[abs_name][slc] = value
+                view[slc] = value
+            self._bump_version()
         else:
             msg = 'Variable name "{}" not found.'
             raise KeyError(msg.format(name))
@@ -494,6 +642,25 @@ class Vector(object):
         """
         pass
 
+    def scal_add_scal_vec(self, self_val, val, vec):
+        """
+        Perform the in-place update self = self_val * self + val * vec.
+
+        Subclasses may implement this without temporary arrays.
+
+        Parameters
+        ----------
+        self_val : int or float
+            scalar multiplying self.
+        val : int or float
+            scalar multiplying vec.
+        vec : <Vector>
+            this vector times val is added to self.
+        """
+        if self_val != 1.0:
+            self *= self_val
+        self.add_scal_vec(val, vec)
+
     def scale(self, scale_to):
         """
         Scale this vector to normalized or physical form.
@@ -645,6 +812,7 @@ class Vector(object):
             self._views[abs_name][:] = value.real
             self._imag_views[abs_name][:] = value.imag
         self._complex_view_cache = {}
+        self._bump_version()
 
     def print_variables(self):
         """
@@ -745,5 +913,10 @@ class Transfer(object):
             pointer to the output vector.
         mode : str
             'fwd' or 'rev'.
+
+        Returns
+        -------
+        bool or None
+            In fwd mode, False if no input value was changed by the transfer; None if unknown.
         """
         pass